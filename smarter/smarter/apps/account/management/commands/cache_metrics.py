@@ -0,0 +1,68 @@
+"""
+Django manage.py command to print the top offenders of the @cache_results metrics.
+"""
+
+from smarter.common.conf import smarter_settings
+from smarter.lib.cache.metrics import get_metrics, reset_metrics
+from smarter.lib.django.management.base import SmarterCommand
+
+SORT_KEYS = {
+    "misses": lambda metrics: metrics["misses"],
+    "compute": lambda metrics: metrics["compute_ms"],
+    "bytes": lambda metrics: metrics["avg_bytes"] or 0,
+    "errors": lambda metrics: metrics["errors"],
+    "hit-rate": lambda metrics: -(metrics["hit_rate"] if metrics["hit_rate"] is not None else 1),
+}
+"""The orders of the top offenders, each from worst to best."""
+
+
+class Command(SmarterCommand):
+    """Django manage.py command to print the top offenders of the @cache_results metrics."""
+
+    def add_arguments(self, parser):
+        """Add arguments to the command."""
+        parser.add_argument(
+            "--sort",
+            type=str,
+            choices=list(SORT_KEYS),
+            default="compute",
+            help="The order of the offenders: total recompute time (default), misses, average value size, errors, "
+            "or lowest hit rate.",
+        )
+        parser.add_argument("--limit", type=int, default=20, help="The number of functions to print. Defaults to 20.")
+        parser.add_argument("--reset", action="store_true", help="Delete all the metrics after printing them.")
+
+    def handle(self, *args, **options):
+        """Print the top offenders of the @cache_results metrics."""
+        self.handle_begin()
+
+        try:
+            metrics = get_metrics()
+        # pylint: disable=broad-except
+        except Exception as e:
+            self.handle_completed_failure(msg=f"cache_metrics command failed with error: {e}")
+            return
+
+        metrics.sort(key=SORT_KEYS[options["sort"]], reverse=True)
+        self.stdout.write(
+            f"sample rate: {smarter_settings.cache_metrics_sample_rate}, functions: {len(metrics)}, "
+            f"sorted by: {options['sort']}"
+        )
+        self.stdout.write(
+            f"{'calls':>10} {'hit rate':>8} {'misses':>10} {'errors':>7} {'avg ms':>9} {'total s':>9} "
+            f"{'avg bytes':>10}  function"
+        )
+        for row in metrics[: options["limit"]]:
+            hit_rate = "-" if row["hit_rate"] is None else f"{row['hit_rate']:.1%}"
+            avg_ms = "-" if row["avg_compute_ms"] is None else f"{row['avg_compute_ms']:.1f}"
+            avg_bytes = "-" if row["avg_bytes"] is None else str(row["avg_bytes"])
+            self.stdout.write(
+                f"{row['calls']:>10} {hit_rate:>8} {row['misses']:>10} {row['errors']:>7} {avg_ms:>9} "
+                f"{row['compute_ms'] / 1000:>9.1f} {avg_bytes:>10}  {row['name']}"
+            )
+
+        if options["reset"]:
+            reset_metrics()
+            self.stdout.write("cache metrics were reset.")
+
+        self.handle_completed_success(msg="cache_metrics command completed successfully.")
@@ -422,7 +422,7 @@ class Account(MetaDataModel):
             invalidate,
         )
 
-        @cache_results(cls.cache_expiration)
+        @cache_results(cls.cache_expiration, local=True)
         def _get_account_by_number(account_number: str, class_name: str) -> "Account":
             try:
                 logger.debug(
@@ -2,14 +2,16 @@
 """Django signal receivers for account app."""
 
 from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.forms.models import model_to_dict
 
 from smarter.lib import json, logging
+from smarter.lib.cache.tags import invalidate_tags, model_tag, model_tags
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
-from .models import Account, Charge, User, UserProfile
+from .models import Account, Charge, MetaDataWithOwnershipModel, User, UserProfile
 from .signals import (
     cache_invalidate,
     charge_authorized,
@@ -162,6 +164,8 @@ def user_profile_post_save(sender: UserProfile, instance: UserProfile, created,
         instance,
         created,
     )
+    user_profile_tag = model_tag(UserProfile, instance.pk)
+    transaction.on_commit(lambda: invalidate_tags(user_profile_tag))
 
 
 @receiver(post_delete, sender=UserProfile)
@@ -173,6 +177,25 @@ def user_profile_post_delete(sender: UserProfile, instance: UserProfile, **kwarg
         instance,
         instance.id,  # type: ignore
     )
+    user_profile_tag = model_tag(UserProfile, instance.pk)
+    transaction.on_commit(lambda: invalidate_tags(user_profile_tag))
+
+
+@receiver(post_save, dispatch_uid=f"{module_prefix}.metadata_with_ownership_post_save")
+@receiver(post_delete, dispatch_uid=f"{module_prefix}.metadata_with_ownership_post_delete")
+def metadata_with_ownership_changed(sender, instance, **kwargs):
+    """
+    Signal receiver for created/saved/deleted of any MetaDataWithOwnershipModel,
+    such as plugins, connections, providers and secrets.
+
+    - invalidate the cache tags of its model, once the transaction commits, so
+      that results which were cached with these tags are recomputed. Before the
+      commit, a concurrent request would cache the old rows under the new version.
+    """
+    if not isinstance(instance, MetaDataWithOwnershipModel):
+        return
+    tags = model_tags(instance)
+    transaction.on_commit(lambda: invalidate_tags(*tags))
 
 
 @receiver(post_save, sender=Account)
@@ -265,7 +265,7 @@ def get_cached_account_for_user(invalidate: Optional[bool] = False, user: Option
         logger.warning("%s.get_cached_account_for_user() user has no ID: %s", HERE, user)
         raise Account.DoesNotExist()
 
-    @cache_results()
+    @cache_results(local=True)
     def get_cached_account_for_user_by_id(user_id, class_name=UserProfile.__name__):
         """
         In-memory cache for user accounts.
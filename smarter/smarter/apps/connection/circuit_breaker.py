@@ -0,0 +1,265 @@
+"""
+Circuit breaker and bulkhead isolation for plugin connections.
+
+A customer database or API that is down or overloaded makes every plugin call
+that uses it wait for its full timeout, which ties up worker threads and slows
+every prompt that selects the plugin. Two mechanisms bound that damage:
+
+:class:`CircuitBreaker`
+    Counts calls and failures per connection in a fixed window. Once at least
+    ``plugin_circuit_breaker_min_calls`` calls have been made and the failure
+    rate reaches ``plugin_circuit_breaker_failure_rate``, the circuit **opens**
+    and calls are rejected immediately. After
+    ``plugin_circuit_breaker_reset_timeout`` seconds it becomes **half-open**
+    and lets a single trial call through. A successful trial **closes** the
+    circuit, a failed one opens it again.
+
+    State is held in the Django cache (Redis), so every worker process and
+    pod shares it. Outcomes are recorded by the connection signal receivers in
+    :mod:`smarter.apps.connection.receivers`.
+
+:class:`Bulkhead`
+    Caps concurrent executions per connection in each worker process.
+    Executions beyond ``plugin_bulkhead_max_concurrency`` are rejected rather
+    than queued.
+
+Both are applied by :meth:`ConnectionBase.execution_guard`, which raises
+:class:`SmarterConnectionUnavailableError` when a call is rejected.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.core.cache import cache
+
+from smarter.common.conf import smarter_settings
+from smarter.common.helpers.logger_helpers import formatted_text
+from smarter.lib import logging
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+from .exceptions import SmarterConnectionUnavailableError
+
+logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.CONNECTION_LOGGING])
+logger_prefix = formatted_text(__name__)
+
+CACHE_PREFIX = "smarter.connection.circuit_breaker."
+
+
+class CircuitState:
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker whose state is shared by all workers through the Django cache.
+
+    :param name: A stable name for the protected resource, such as ``"SqlConnection:42"``.
+    :param failure_rate: The failure rate that opens the circuit. Defaults to ``plugin_circuit_breaker_failure_rate``.
+    :param min_calls: The minimum number of calls in the window before the circuit can open.
+        Defaults to ``plugin_circuit_breaker_min_calls``.
+    :param window: The counting window in seconds. Defaults to ``plugin_circuit_breaker_window``.
+    :param reset_timeout: How long the circuit stays open, in seconds. Defaults to
+        ``plugin_circuit_breaker_reset_timeout``.
+    """
+
+    # a tripped circuit with no trial call in this many reset timeouts is forgotten.
+    TRIPPED_TTL_MULTIPLIER = 10
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        window: Optional[int] = None,
+        reset_timeout: Optional[int] = None,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate or smarter_settings.plugin_circuit_breaker_failure_rate
+        self.min_calls = min_calls or smarter_settings.plugin_circuit_breaker_min_calls
+        self.window = window or smarter_settings.plugin_circuit_breaker_window
+        self.reset_timeout = reset_timeout or smarter_settings.plugin_circuit_breaker_reset_timeout
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name} {self.state}>"
+
+    def _key(self, suffix: str) -> str:
+        return f"{CACHE_PREFIX}{self.name}.{suffix}"
+
+    @property
+    def _open_key(self) -> str:
+        # present, holding the time the circuit opened, for reset_timeout seconds.
+        return self._key("open")
+
+    @property
+    def _tripped_key(self) -> str:
+        # present from the time the circuit opens until a trial call succeeds.
+        return self._key("tripped")
+
+    @property
+    def _probe_key(self) -> str:
+        return self._key("probe")
+
+    def _increment(self, suffix: str) -> int:
+        key = self._key(suffix)
+        cache.add(key, 0, timeout=self.window)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # the window expired between add() and incr().
+            cache.set(key, 1, timeout=self.window)
+            return 1
+
+    @property
+    def state(self) -> str:
+        """Return the current :class:`CircuitState`."""
+        values = cache.get_many([self._open_key, self._tripped_key])
+        if values.get(self._open_key) is not None:
+            return CircuitState.OPEN
+        if values.get(self._tripped_key) is not None:
+            return CircuitState.HALF_OPEN
+        return CircuitState.CLOSED
+
+    @property
+    def retry_after(self) -> int:
+        """Return the number of seconds until the circuit becomes half-open, or 0."""
+        opened_at = cache.get(self._open_key)
+        if opened_at is None:
+            return 0
+        return max(int(opened_at + self.reset_timeout - time.time()), 0)
+
+    def allow_request(self) -> bool:
+        """
+        Return True if a call may proceed.
+
+        A closed circuit allows every call. An open circuit allows none. A half-open
+        circuit allows one trial call per ``reset_timeout``, across all workers.
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.OPEN:
+            return False
+        return cache.add(self._probe_key, time.time(), timeout=self.reset_timeout)
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit if it was half-open."""
+        self._increment("calls")
+        if self.state == CircuitState.HALF_OPEN:
+            logger.info("%s %s closed after a successful trial call.", logger_prefix, self.name)
+            self.reset()
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the failure rate is exceeded."""
+        state = self.state
+        if state == CircuitState.OPEN:
+            # a call that started before the circuit opened.
+            return
+        if state == CircuitState.HALF_OPEN:
+            logger.warning("%s %s trial call failed. Reopening.", logger_prefix, self.name)
+            self.open()
+            return
+        calls = self._increment("calls")
+        failures = self._increment("failures")
+        if calls >= self.min_calls and failures / calls >= self.failure_rate:
+            logger.warning(
+                "%s %s opened after %s of %s calls failed within %s seconds.",
+                logger_prefix,
+                self.name,
+                failures,
+                calls,
+                self.window,
+            )
+            self.open()
+
+    def open(self) -> None:
+        """Open the circuit for ``reset_timeout`` seconds."""
+        cache.set(self._open_key, time.time(), timeout=self.reset_timeout)
+        cache.set(self._tripped_key, True, timeout=self.reset_timeout * self.TRIPPED_TTL_MULTIPLIER)
+        cache.delete_many([self._probe_key, self._key("calls"), self._key("failures")])
+
+    def reset(self) -> None:
+        """Close the circuit and clear its counters."""
+        cache.delete_many(
+            [self._open_key, self._tripped_key, self._probe_key, self._key("calls"), self._key("failures")]
+        )
+
+
+class Bulkhead:
+    """
+    Caps concurrent executions per resource in this worker process.
+
+    Semaphores are shared by every :class:`Bulkhead` with the same name.
+
+    :param name: A stable name for the protected resource.
+    :param max_concurrency: The maximum number of concurrent executions. Defaults to
+        ``plugin_bulkhead_max_concurrency``.
+    """
+
+    _semaphores: dict[str, threading.BoundedSemaphore] = {}
+    _semaphores_lock = threading.Lock()
+
+    def __init__(self, name: str, max_concurrency: Optional[int] = None):
+        self.name = name
+        self.max_concurrency = max_concurrency or smarter_settings.plugin_bulkhead_max_concurrency
+
+    @property
+    def semaphore(self) -> threading.BoundedSemaphore:
+        """Return the shared semaphore for this resource."""
+        key = f"{self.name}:{self.max_concurrency}"
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            with self._semaphores_lock:
+                semaphore = self._semaphores.setdefault(key, threading.BoundedSemaphore(self.max_concurrency))
+        return semaphore
+
+    @contextmanager
+    def acquire(self) -> Iterator[bool]:
+        """
+        Hold one of the resource's execution slots for the duration of the ``with`` block.
+
+        :return: True if a slot was acquired, otherwise False. The block runs either way,
+            so callers must check the value.
+        """
+        semaphore = self.semaphore
+        acquired = semaphore.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                semaphore.release()
+
+
+@contextmanager
+def execution_guard(name: str, connection_name: Optional[str] = None) -> Iterator[None]:
+    """
+    Run the ``with`` block only if the circuit breaker and bulkhead for ``name`` allow it.
+
+    :param name: A stable name for the protected resource.
+    :param connection_name: The name of the connection, for the tool result.
+    :raises SmarterConnectionUnavailableError: If the circuit is open or the bulkhead is full.
+    """
+    breaker = CircuitBreaker(name)
+    # the bulkhead is checked first, so that a rejected call never claims the half-open trial call.
+    with Bulkhead(name).acquire() as acquired:
+        if not acquired:
+            raise SmarterConnectionUnavailableError(
+                f"{name} has reached its limit of concurrent executions.",
+                connection_name=connection_name,
+                retry_after=1,
+            )
+        if not breaker.allow_request():
+            raise SmarterConnectionUnavailableError(
+                f"{name} circuit breaker is {breaker.state}.",
+                connection_name=connection_name,
+                retry_after=breaker.retry_after or breaker.reset_timeout,
+            )
+        yield
+
+
+__all__ = ["Bulkhead", "CircuitBreaker", "CircuitState", "execution_guard"]
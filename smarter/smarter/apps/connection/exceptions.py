@@ -0,0 +1,84 @@
+"""Connection exceptions."""
+
+from typing import Optional
+
+from smarter.common.exceptions import SmarterException
+from smarter.lib import json
+
+
+class SmarterConnectionError(SmarterException):
+    """Base class for all connection exceptions."""
+
+
+class SmarterConnectionTimeoutError(SmarterConnectionError):
+    """
+    Exception raised when a connection query exceeds its execution deadline.
+
+    :param message: The error message.
+    :param connection_name: The name of the connection that timed out.
+    :param timeout: The deadline that was exceeded, in seconds.
+    """
+
+    def __init__(self, message: str = "", connection_name: Optional[str] = None, timeout: Optional[float] = None):
+        self.connection_name = connection_name
+        self.timeout = timeout
+        super().__init__(message)
+
+    def tool_result(self) -> str:
+        """
+        Return a structured timeout result suitable for an LLM tool message.
+
+        :return: A JSON string describing the timeout.
+        :rtype: str
+        """
+        return json.dumps(
+            {
+                "error": "timeout",
+                "connection": self.connection_name,
+                "timeout_seconds": self.timeout,
+                "message": (
+                    f"The data source did not respond within {self.timeout} seconds. "
+                    "Tell the user that the data is temporarily unavailable, or retry with narrower arguments."
+                ),
+            },
+            indent=None,
+        )
+
+
+class SmarterConnectionUnavailableError(SmarterConnectionError):
+    """
+    Exception raised when a connection is not accepting calls, because its circuit
+    breaker is open or it has reached its limit of concurrent executions.
+
+    :param message: The error message.
+    :param connection_name: The name of the unavailable connection.
+    :param retry_after: The number of seconds after which the caller may retry.
+    """
+
+    def __init__(self, message: str = "", connection_name: Optional[str] = None, retry_after: Optional[int] = None):
+        self.connection_name = connection_name
+        self.retry_after = retry_after
+        super().__init__(message)
+
+    def tool_result(self) -> str:
+        """
+        Return a structured "temporarily unavailable" result suitable for an LLM tool message.
+
+        :return: A JSON string describing the outage.
+        :rtype: str
+        """
+        return json.dumps(
+            {
+                "error": "unavailable",
+                "connection": self.connection_name,
+                "retry_after_seconds": self.retry_after,
+                "message": (
+                    "The data source is temporarily unavailable. "
+                    "Tell the user to try again shortly. Do not retry this tool call now."
+                ),
+            },
+            indent=None,
+        )
+
+
+__all__ = ["SmarterConnectionError", "SmarterConnectionTimeoutError", "SmarterConnectionUnavailableError"]
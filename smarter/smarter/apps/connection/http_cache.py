@@ -0,0 +1,376 @@
+"""
+HTTP response cache for :class:`ApiConnection` requests.
+
+Responses to ``GET`` requests are cached according to their HTTP caching headers:
+
+- ``Cache-Control: no-store`` responses are never stored.
+- ``Cache-Control: max-age`` / ``s-maxage`` and ``Expires`` set the freshness lifetime,
+  less any ``Age`` reported by upstream caches.
+- ``Cache-Control: no-cache`` responses are stored but always revalidated.
+- Stale responses that carry an ``ETag`` or ``Last-Modified`` validator are revalidated
+  with ``If-None-Match`` / ``If-Modified-Since``. A ``304 Not Modified`` refreshes the
+  stored response without transferring the body again.
+
+A per-request ``ttl`` overrides the freshness lifetime advertised by the server, which
+is how API plugins opt slow-changing endpoints into caching. Cache keys include the
+connection identity, so cached responses are never shared between connections (and
+therefore never between the credentials of different accounts).
+
+Storage is two-tier: a small in-process LRU front, bounded by bytes and entry count,
+answers fresh responses without a network round trip, and the Django cache (Redis)
+shares responses between worker processes. Responses larger than
+:attr:`ApiResponseCache.MAX_ENTRY_BYTES` are not cached, and Redis entries expire
+shortly after they can no longer be revalidated.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.core.cache import cache
+
+from smarter.common.helpers.logger_helpers import formatted_text
+from smarter.lib import json, logging
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+if TYPE_CHECKING:
+    from smarter.apps.connection.models import ApiConnection
+
+logger = logging.getSmarterLogger(
+    __name__, any_switches=[SmarterWaffleSwitches.CONNECTION_LOGGING, SmarterWaffleSwitches.CACHE_LOGGING]
+)
+logger_prefix = formatted_text(f"{__name__}")
+
+CACHE_KEY_PREFIX = "smarter.apps.connection.http_cache"
+REFRESHED_HEADERS = ["cache-control", "date", "etag", "expires", "last-modified"]
+"""Response headers that a ``304 Not Modified`` response updates on the stored response."""
+STORED_HEADERS = REFRESHED_HEADERS + ["age", "content-type"]
+"""Response headers that are stored with a cached response."""
+
+
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    """
+    Parse a ``Cache-Control`` header into a dict of lower-cased directives.
+
+    :param value: The header value, e.g. ``'public, max-age=300'``.
+    :return: A dict such as ``{"public": None, "max-age": "300"}``.
+    :rtype: dict[str, Optional[str]]
+    """
+    directives: dict[str, Optional[str]] = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date header into a POSIX timestamp, or None if it is missing or invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def freshness_lifetime(headers: dict[str, str], ttl: Optional[int] = None) -> Optional[float]:
+    """
+    Return the number of seconds for which a response is fresh.
+
+    :param headers: The response headers, with lower-cased names.
+    :param ttl: Optional lifetime that overrides the response's caching headers.
+    :return: The remaining freshness lifetime in seconds, or None if the response must not be stored.
+    :rtype: Optional[float]
+    """
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives:
+        return None
+    if ttl is not None:
+        return float(ttl)
+    if "no-cache" in directives:
+        return 0.0
+
+    lifetime: Optional[float] = None
+    for directive in ("s-maxage", "max-age"):
+        try:
+            lifetime = float(directives[directive] or 0)
+            break
+        except (KeyError, ValueError):
+            continue
+    if lifetime is None:
+        expires = parse_http_date(headers.get("expires"))
+        date = parse_http_date(headers.get("date")) or time.time()
+        lifetime = expires - date if expires is not None else 0.0
+    try:
+        age = float(headers.get("age") or 0)
+    except ValueError:
+        age = 0.0
+    return max(0.0, lifetime - age)
+
+
+@dataclass
+class CachedHttpResponse:
+    """
+    A response to an HTTP ``GET`` request, in a form that can be stored in the cache.
+
+    The interface is the subset of :class:`requests.Response` used by API connections
+    and their signal receivers.
+    """
+
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    fresh_until: float = 0.0
+    from_cache: bool = field(default=False, compare=False)
+
+    @classmethod
+    def from_response(cls, response) -> "CachedHttpResponse":
+        """Create a cacheable response from a :class:`requests.Response` whose body has been read."""
+        headers = {name.lower(): value for name, value in response.headers.items() if name.lower() in STORED_HEADERS}
+        return cls(url=response.url, status_code=response.status_code, headers=headers, content=response.content)
+
+    @property
+    def ok(self) -> bool:
+        """True if the status code is less than 400."""
+        return self.status_code < HTTPStatus.BAD_REQUEST
+
+    @property
+    def is_fresh(self) -> bool:
+        """True if the response can be used without revalidation."""
+        return time.time() < self.fresh_until
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Return the conditional request headers that revalidate this response."""
+        retval = {}
+        if self.headers.get("etag"):
+            retval["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            retval["If-Modified-Since"] = self.headers["last-modified"]
+        return retval
+
+    @property
+    def size(self) -> int:
+        """The approximate size of the response in bytes."""
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def json(self) -> Any:
+        """Decode the response body as JSON."""
+        return json.loads(self.content)
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+
+class LocalResponseCache:
+    """
+    A thread-safe, in-process LRU cache of :class:`CachedHttpResponse` objects,
+    bounded by both total size and number of entries.
+
+    :param max_bytes: The maximum combined :attr:`CachedHttpResponse.size` of all entries.
+    :param max_entries: The maximum number of entries.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedHttpResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedHttpResponse]:
+        """Return the entry for ``key``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedHttpResponse) -> None:
+        """Store ``entry``, evicting the least recently used entries as necessary."""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for ``key``, if any."""
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ApiResponseCache:
+    """
+    Two-tier HTTP response cache for :class:`ApiConnection` ``GET`` requests.
+
+    See the module docstring for the caching rules.
+    """
+
+    MAX_ENTRY_BYTES = 256 * 1024
+    """Responses larger than this are not cached."""
+    MAX_TTL = 24 * 60 * 60
+    """The maximum freshness lifetime of a cached response, in seconds."""
+    REVALIDATION_TTL = 60 * 60
+    """How long a stale response with a validator is kept in Redis for revalidation, in seconds."""
+    LOCAL_MAX_BYTES = 8 * 1024 * 1024
+    """The maximum size of the in-process front, in bytes."""
+    LOCAL_MAX_ENTRIES = 1024
+    """The maximum number of entries in the in-process front."""
+
+    def __init__(self):
+        self.local = LocalResponseCache(max_bytes=self.LOCAL_MAX_BYTES, max_entries=self.LOCAL_MAX_ENTRIES)
+
+    def cache_key(
+        self,
+        connection: "ApiConnection",
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> str:
+        """
+        Return the cache key for a ``GET`` request.
+
+        The key covers the connection identity, the URL, and all query parameters and
+        request headers, so responses that vary on any of them are stored separately.
+        """
+        request = json.dumps(
+            {
+                "connection": connection.session_identity,
+                "url": url,
+                "params": sorted((str(k), str(v)) for k, v in (params or {}).items()),
+                "headers": sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items()),
+            },
+            indent=None,
+        )
+        return f"{CACHE_KEY_PREFIX}.{hashlib.sha256(request.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[CachedHttpResponse]:
+        """Return the cached response for ``key`` from the in-process front or Redis, or None."""
+        entry = self.local.get(key)
+        if entry is not None and entry.is_fresh:
+            return entry
+        entry = cache.get(key)
+        if isinstance(entry, CachedHttpResponse):
+            if entry.is_fresh:
+                self.local.set(key, entry)
+            return entry
+        return None
+
+    def set(self, key: str, entry: CachedHttpResponse) -> bool:
+        """
+        Store ``entry`` if it is cacheable.
+
+        :return: True if the response was stored.
+        :rtype: bool
+        """
+        if entry.status_code != HTTPStatus.OK or len(entry.content) > self.MAX_ENTRY_BYTES:
+            return False
+        remaining = entry.fresh_until - time.time()
+        timeout = remaining + self.REVALIDATION_TTL if entry.validators else remaining
+        if timeout <= 0:
+            return False
+        if entry.from_cache:
+            entry = replace(entry, from_cache=False)
+        cache.set(key, entry, timeout=int(timeout) + 1)
+        if entry.is_fresh:
+            self.local.set(key, entry)
+        return True
+
+    def delete(self, key: str) -> None:
+        """Remove the cached response for ``key``."""
+        self.local.delete(key)
+        cache.delete(key)
+
+    def fetch(
+        self,
+        connection: "ApiConnection",
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        ttl: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> CachedHttpResponse:
+        """
+        Return the response to a ``GET`` request, from the cache if possible.
+
+        :param connection: The API connection that sends the request.
+        :param url: The request URL.
+        :param params: Optional query parameters.
+        :param headers: Optional request headers, in addition to the connection's session headers.
+        :param ttl: Optional freshness lifetime in seconds that overrides the response's
+            caching headers. ``0`` disables caching for this request.
+        :param timeout: Optional total deadline in seconds. See :meth:`ApiConnection.request_with_deadline`.
+        :return: The response. ``from_cache`` is True if no request body was transferred.
+        :rtype: CachedHttpResponse
+        :raises SmarterConnectionTimeoutError: If the request does not complete within the deadline.
+        :raises requests.exceptions.RequestException: If the request fails.
+        """
+        if ttl == 0:
+            response = connection.request_with_deadline("GET", url, timeout=timeout, params=params, headers=headers)
+            return CachedHttpResponse.from_response(response)
+
+        key = self.cache_key(connection, url, params, headers)
+        cached = self.get(key)
+        if cached is not None and cached.is_fresh:
+            logger.debug("%s.fetch() cache hit for %s", logger_prefix, url)
+            return replace(cached, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            request_headers.update(cached.validators)
+        response = connection.request_with_deadline("GET", url, timeout=timeout, params=params, headers=request_headers)
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED and cached is not None:
+            logger.debug("%s.fetch() revalidated %s", logger_prefix, url)
+            # entries are shared with other threads through the in-process front, so update a copy.
+            cached = replace(cached, headers=dict(cached.headers), from_cache=True)
+            for name in REFRESHED_HEADERS:
+                if name in response.headers:
+                    cached.headers[name] = response.headers[name]
+            lifetime = freshness_lifetime(cached.headers, ttl)
+            if lifetime is None:
+                self.delete(key)
+            else:
+                cached.fresh_until = time.time() + min(lifetime, self.MAX_TTL)
+                self.set(key, cached)
+            return cached
+
+        entry = CachedHttpResponse.from_response(response)
+        lifetime = freshness_lifetime(entry.headers, ttl)
+        if lifetime is None:
+            self.delete(key)
+        else:
+            entry.fresh_until = time.time() + min(lifetime, self.MAX_TTL)
+            if self.set(key, entry):
+                logger.debug("%s.fetch() cached %s for %.0f seconds", logger_prefix, url, lifetime)
+        return entry
+
+
+api_response_cache = ApiResponseCache()
+
+__all__ = ["ApiResponseCache", "CachedHttpResponse", "LocalResponseCache", "api_response_cache"]
@@ -1,17 +1,25 @@
 """ApiConnection model."""
 
+import contextvars
+import threading
+import time
 from http import HTTPStatus
 from typing import Any, Optional, Union
-from urllib.parse import urljoin
+from urllib.parse import quote, urljoin
 
 import requests
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.urls import reverse
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
 
 from smarter.apps.account.models import (
     MetaDataWithOwnershipModelManager,
 )
+from smarter.apps.connection.exceptions import SmarterConnectionTimeoutError
+from smarter.apps.connection.http_cache import api_response_cache
 from smarter.apps.connection.signals import (
     api_connection_attempted,
     api_connection_failed,
@@ -21,9 +29,11 @@ from smarter.apps.connection.signals import (
     api_connection_success,
 )
 from smarter.apps.secret.models import Secret
+from smarter.common.conf import smarter_settings
 from smarter.common.helpers.logger_helpers import formatted_text
 from smarter.common.utils import to_snake_case
 from smarter.lib import logging
+from smarter.lib.django.cancellation import cancel_on_disconnect
 from smarter.lib.django.validators import SmarterValidator
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
@@ -32,6 +42,40 @@ from .connection_base import ConnectionBase
 logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.CONNECTION_LOGGING])
 logger_prefix = formatted_text(f"{__name__}")
 
+_http_sessions: dict[str, requests.Session] = {}
+"""
+Process-wide pool of HTTP sessions, keyed by :attr:`ApiConnection.session_identity`.
+Each session holds a urllib3 connection pool, which is thread-safe, so a single
+session is shared by all of the worker threads in the process.
+"""
+_http_sessions_lock = threading.Lock()
+
+_request_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "smarter_api_request_deadline", default=None
+)
+"""The :func:`time.monotonic` deadline of the request that :meth:`ApiConnection.request_with_deadline` is sending."""
+
+
+class DeadlineRetry(Retry):
+    """
+    urllib3 retries that fit in the deadline of :meth:`ApiConnection.request_with_deadline`.
+
+    Retries happen inside :meth:`requests.Session.request`, so their backoff and
+    ``Retry-After`` delays would otherwise run past the deadline. A retry is given
+    up, as if the retries were exhausted, unless its delay ends before the deadline.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        deadline = _request_deadline.get()
+        if deadline is not None:
+            delay = retry.get_backoff_time()
+            if response is not None and retry.respect_retry_after_header:
+                delay = max(delay, retry.get_retry_after(response) or 0.0)
+            if time.monotonic() + delay >= deadline:
+                raise MaxRetryError(_pool, url, error or ResponseError("no time is left before the request deadline"))
+        return retry
+
 
 class ApiConnection(ConnectionBase):
     """
@@ -98,9 +142,25 @@ class ApiConnection(ConnectionBase):
         blank=True,
         null=True,
     )
+    API_DEFAULT_TIMEOUT = 30
+    """The default total deadline for API requests in seconds."""
+    API_RESPONSE_CHUNK_SIZE = 16 * 1024
+    """The number of bytes read from the response body between deadline checks."""
+    API_WARM_UP_TIMEOUT = 5
+    """The maximum time in seconds that :meth:`warm_up` waits for the API."""
+    API_RETRY_STATUS_CODES = [
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ]
+    """HTTP response codes that are retried for idempotent requests."""
+    API_RETRY_BACKOFF_MAX = 5
+    """The maximum delay between retries in seconds."""
+
     timeout = models.IntegerField(
         help_text="The timeout for the API request in seconds. Default is 30 seconds.",
-        default=30,
+        default=API_DEFAULT_TIMEOUT,
         validators=[MinValueValidator(1)],
         blank=True,
         null=True,
@@ -155,12 +215,151 @@ class ApiConnection(ConnectionBase):
     def connection_string(self) -> str:
         return self.get_connection_string()
 
+    @property
+    def session_identity(self) -> str:
+        """
+        Return the key of this connection's pooled HTTP session.
+
+        This is the :attr:`connection_identity` combined with the last modification
+        timestamp of the API key, so that rotating the key replaces the session along
+        with its cached ``Authorization`` header.
+
+        :return: The session identity.
+        :rtype: str
+        """
+        api_key_updated_at = self.api_key.updated_at.isoformat() if self.api_key else None
+        return f"{self.connection_identity}:{self.api_key_id}:{api_key_updated_at}"  # type: ignore[attr-defined]
+
+    @property
+    def auth_headers(self) -> dict[str, str]:
+        """
+        Return the authentication headers for this connection.
+
+        :return: A dict containing the ``Authorization`` header, or an empty dict.
+        :rtype: dict[str, str]
+        """
+        api_key = self.api_key.get_secret() if self.api_key else None
+        if not api_key:
+            return {}
+        if self.auth_method == "basic":
+            return {"Authorization": f"Basic {api_key}"}
+        if self.auth_method == "token":
+            return {"Authorization": f"Bearer {api_key}"}
+        return {}
+
+    @property
+    def proxies(self) -> Optional[dict[str, str]]:
+        """
+        Return the :mod:`requests` proxy configuration for this connection.
+
+        :return: A dict mapping URL schemes to the proxy URL, or None if no proxy is configured.
+        :rtype: Optional[dict[str, str]]
+        """
+        if not self.proxy_host:
+            return None
+        scheme = "socks5h" if self.proxy_protocol == "socks" else self.proxy_protocol or "http"
+        credentials = ""
+        if self.proxy_username:
+            password = self.proxy_password.get_secret() if self.proxy_password else None
+            credentials = quote(self.proxy_username, safe="")
+            if password:
+                credentials += ":" + quote(password, safe="")
+            credentials += "@"
+        port = f":{self.proxy_port}" if self.proxy_port else ""
+        proxy_url = f"{scheme}://{credentials}{self.proxy_host}{port}"
+        return {"http": proxy_url, "https": proxy_url}
+
+    def build_http_session(self) -> requests.Session:
+        """
+        Build a new HTTP session for this connection.
+
+        The session carries the connection's authentication headers and proxy settings,
+        keeps up to ``smarter_settings.plugin_api_pool_maxsize`` connections alive, and
+        retries idempotent requests that fail with a connection error or a retryable
+        status code. See :attr:`API_RETRY_STATUS_CODES`. Retries that would run past the
+        deadline of :meth:`request_with_deadline` are not made, see :class:`DeadlineRetry`.
+
+        :return: The HTTP session.
+        :rtype: requests.Session
+        """
+        retry = DeadlineRetry(
+            total=smarter_settings.plugin_api_max_retries,
+            backoff_factor=smarter_settings.plugin_api_retry_backoff_factor,
+            backoff_max=self.API_RETRY_BACKOFF_MAX,
+            status_forcelist=[int(code) for code in self.API_RETRY_STATUS_CODES],
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=smarter_settings.plugin_api_pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.auth_headers)
+        proxies = self.proxies
+        if proxies:
+            session.proxies.update(proxies)
+        return session
+
+    @property
+    def http_session(self) -> requests.Session:
+        """
+        Return this connection's pooled HTTP session.
+
+        Sessions are shared by all requests to this connection in the worker process, so
+        the TCP and TLS handshakes, authentication headers and proxy settings are set up
+        once rather than on every API plugin call. Editing the connection or rotating its
+        API key replaces the session, because :attr:`session_identity` changes.
+
+        :return: The pooled HTTP session.
+        :rtype: requests.Session
+        """
+        session_identity = self.session_identity
+        session = _http_sessions.get(session_identity)
+        if session is not None:
+            return session
+        with _http_sessions_lock:
+            session = _http_sessions.get(session_identity)
+            if session is None:
+                self.close_http_session()
+                session = self.build_http_session()
+                _http_sessions[session_identity] = session
+        return session
+
+    def close_http_session(self) -> None:
+        """
+        Close and remove any pooled HTTP sessions belonging to this connection.
+
+        :return: None
+        """
+        prefix = f"{self.__class__.__name__}:{self.pk}:"
+        for session_identity in [key for key in list(_http_sessions) if key.startswith(prefix)]:
+            session = _http_sessions.pop(session_identity, None)
+            if session is not None:
+                session.close()
+
+    def warm_up(self) -> bool:
+        """
+        Open this connection's pooled HTTP session ahead of the first plugin call.
+
+        Sends a ``HEAD`` request to :attr:`base_url` so that the DNS lookup and the TCP and
+        TLS handshakes are done, and the socket is left in the session's connection pool.
+        Any HTTP response counts as success, because only reachability is being checked.
+
+        :return: True if the API is reachable, otherwise False.
+        :rtype: bool
+        """
+        timeout = min(self.timeout or self.API_DEFAULT_TIMEOUT, self.API_WARM_UP_TIMEOUT)
+        try:
+            self.http_session.head(self.base_url, timeout=timeout, allow_redirects=False)
+            return True
+        except requests.exceptions.RequestException as e:
+            logger.warning("%s.warm_up() %s is not reachable: %s", self.formatted_class_name, self.name, e)
+            return False
+
     def test_proxy(self) -> bool:
-        proxy_dict = {
-            self.proxy_protocol: f"{self.proxy_protocol}://{self.proxy_username}:{self.proxy_password}@{self.proxy_host}:{self.proxy_port}",
-        }
         try:
-            response = requests.get("https://www.google.com", proxies=proxy_dict, timeout=self.timeout)
+            response = requests.get("https://www.google.com", proxies=self.proxies, timeout=self.timeout)
             return response.status_code in [HTTPStatus.OK, HTTPStatus.PERMANENT_REDIRECT]
         except requests.exceptions.RequestException as e:
             logger.error("%s.test_proxy() proxy test connection failed: %s", self.formatted_class_name, e)
@@ -207,34 +406,102 @@ class ApiConnection(ConnectionBase):
         super().validate()
         return self.test_connection()
 
+    def request_with_deadline(
+        self, method: str, url: str, timeout: Optional[int] = None, **kwargs
+    ) -> requests.Response:
+        """
+        Send an HTTP request that must complete within a total deadline.
+
+        The ``timeout`` argument of :mod:`requests` bounds each socket operation, not the
+        request as a whole, so a server that trickles its response can hold the worker
+        indefinitely. This method streams the response body and gives up once the total
+        deadline has passed. The request is also abandoned if the client disconnects.
+
+        Requests are sent on the connection's pooled :attr:`http_session`.
+
+        :param method: The HTTP method.
+        :param url: The request URL.
+        :param timeout: Optional total deadline in seconds. Defaults to :attr:`timeout`.
+        :param kwargs: Additional keyword arguments for :meth:`requests.Session.request`.
+        :return: The response, with its body already read.
+        :rtype: requests.Response
+        :raises SmarterConnectionTimeoutError: If the request does not complete within the deadline.
+        :raises SmarterConnectionUnavailableError: If the connection's circuit breaker is open
+            or it has reached its limit of concurrent executions.
+        :raises requests.exceptions.RequestException: If the request fails for any other reason.
+        """
+        with self.execution_guard():
+            timeout = timeout or self.timeout or self.API_DEFAULT_TIMEOUT
+            deadline = time.monotonic() + timeout
+            timeout_error = SmarterConnectionTimeoutError(
+                f"API request exceeded its {timeout} second deadline.", connection_name=self.name, timeout=timeout
+            )
+            token = _request_deadline.set(deadline)
+            try:
+                response = self.http_session.request(method, url, timeout=timeout, stream=True, **kwargs)
+            except requests.exceptions.Timeout as e:
+                raise timeout_error from e
+            except requests.exceptions.RequestException as e:
+                if time.monotonic() >= deadline:
+                    raise timeout_error from e
+                raise
+            finally:
+                _request_deadline.reset(token)
+
+            chunks: list[bytes] = []
+            with cancel_on_disconnect(response.close) as scope:
+                try:
+                    for chunk in response.iter_content(chunk_size=self.API_RESPONSE_CHUNK_SIZE):
+                        chunks.append(chunk)
+                        if time.monotonic() >= deadline:
+                            response.close()
+                            raise timeout_error
+                except requests.exceptions.Timeout as e:
+                    raise timeout_error from e
+                except (requests.exceptions.RequestException, OSError, AttributeError) as e:
+                    if scope is not None and scope.cancelled:
+                        raise requests.exceptions.ConnectionError(f"API request to {url} was cancelled.") from e
+                    raise
+
+            # pylint: disable=W0212
+            response._content = b"".join(chunks)
+            return response
+
     def execute_query(
-        self, endpoint: str, params: Optional[dict] = None, limit: Optional[int] = None
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        limit: Optional[int] = None,
+        timeout: Optional[int] = None,
+        cache_ttl: Optional[int] = None,
     ) -> Union[dict[str, Any], list[Any], bool]:
         """
         Execute the API query and return the results.
 
         This method constructs the full URL by combining the base URL and the endpoint,
-        and sends a GET request to the API with the provided parameters.
+        and sends a GET request to the API with the provided parameters. Responses are
+        cached according to their HTTP caching headers. See :mod:`smarter.apps.connection.http_cache`.
 
         :param endpoint: The API endpoint to query.
         :param params: A dictionary of parameters to include in the API request.
         :param limit: The maximum number of rows to return from the API response.
+        :param timeout: Optional total deadline in seconds. Defaults to :attr:`timeout`.
+        :param cache_ttl: Optional cache lifetime in seconds that overrides the response's
+            caching headers. ``0`` disables caching.
         :return: The API response as a JSON object or False if the request fails.
+        :raises SmarterConnectionTimeoutError: If the request does not complete within the deadline.
+        :raises SmarterConnectionUnavailableError: If the connection's circuit breaker is open
+            or it has reached its limit of concurrent executions.
         """
         params = params or {}
         url = urljoin(self.base_url, endpoint)
-        headers = {}
-        if self.auth_method == "basic" and self.api_key:
-            headers["Authorization"] = f"Basic {self.api_key}"
-        elif self.auth_method == "token" and self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
 
+        response = None
         try:
             api_connection_attempted.send(sender=self.__class__, connection=self)
             api_connection_query_attempted.send(sender=self.__class__, connection=self)
-            response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            if response.status_code in [HTTPStatus.OK, HTTPStatus.PERMANENT_REDIRECT]:
+            response = api_response_cache.fetch(self, url, params=params, ttl=cache_ttl, timeout=timeout)
+            if response.ok:
                 api_connection_success.send(sender=self.__class__, connection=self)
                 api_connection_query_success.send(sender=self.__class__, connection=self, response=response)
                 if limit:
@@ -246,16 +513,20 @@ class ApiConnection(ConnectionBase):
                     return response_data
                 return response.json()
             else:
-                # we connected, but the query failed.
-                api_connection_query_success.send(sender=self.__class__, connection=self, response=response)
-                api_connection_failed.send(sender=self.__class__, connection=self, response=response, error=None)
+                # query failed, but connection was successful
+                api_connection_success.send(sender=self.__class__, connection=self, response=response, error=None)
+                api_connection_query_failed.send(sender=self.__class__, connection=self, response=response, error=None)
                 return False
+        except SmarterConnectionTimeoutError as e:
+            api_connection_query_failed.send(sender=self.__class__, connection=self, response=response, error=e)
+            logger.warning("%s.execute_query() %s", self.formatted_class_name, e)
+            raise
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
             # connection failed, and so by extension, so did the query
             api_connection_query_failed.send(sender=self.__class__, connection=self, response=response, error=e)
             api_connection_failed.send(sender=self.__class__, connection=self, response=response, error=e)
             return False
-        except (requests.exceptions.HTTPError, requests.exceptions.RequestException) as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             # query failed, but connection was successful
             api_connection_success.send(sender=self.__class__, connection=self, response=response, error=e)
             api_connection_query_failed.send(sender=self.__class__, connection=self, response=response, error=e)
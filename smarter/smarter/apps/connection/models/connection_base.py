@@ -1,6 +1,8 @@
 """ConnectionBase abstract model."""
 
 from abc import abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
 
 from django.db import models
 from django.urls import reverse
@@ -10,6 +12,7 @@ from smarter.apps.account.models import (
     User,
 )
 from smarter.apps.api.v1.manifests.enum import SAMKinds
+from smarter.apps.connection.circuit_breaker import CircuitBreaker, execution_guard
 from smarter.common.exceptions import SmarterConfigurationError
 from smarter.common.helpers.logger_helpers import formatted_text
 from smarter.lib import logging
@@ -132,6 +135,59 @@ class ConnectionBase(MetaDataWithOwnershipModel):
             )
             raise SmarterConfigurationError(f"Unsupported connection kind '{self.kind}' for connection '{self.name}'.")
 
+    @property
+    def connection_identity(self) -> str:
+        """
+        Return a string that identifies this connection's current configuration.
+
+        The identity combines the primary key and the last modification timestamp,
+        so it changes whenever the connection is edited. It is used to key pooled
+        connections, HTTP sessions and cached query results.
+
+        :return: The connection identity.
+        :rtype: str
+        """
+        updated_at = self.updated_at.isoformat() if self.updated_at else None
+        return f"{self.__class__.__name__}:{self.pk}:{updated_at}"
+
+    @property
+    def circuit_breaker_name(self) -> str:
+        """
+        Return the name of this connection's circuit breaker and bulkhead.
+
+        Unlike :attr:`connection_identity`, this does not change when the connection is
+        edited, so that every worker counts failures against the same circuit.
+        """
+        return f"{self.__class__.__name__}:{self.pk}"
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return this connection's circuit breaker. See :mod:`smarter.apps.connection.circuit_breaker`."""
+        return CircuitBreaker(self.circuit_breaker_name)
+
+    @contextmanager
+    def execution_guard(self) -> Iterator[None]:
+        """
+        Run the ``with`` block only if this connection's circuit breaker and bulkhead allow it.
+
+        :raises SmarterConnectionUnavailableError: If the circuit is open or the connection
+            has reached its limit of concurrent executions.
+        """
+        with execution_guard(self.circuit_breaker_name, connection_name=self.name):
+            yield
+
+    def warm_up(self) -> bool:
+        """
+        Prepare this connection ahead of the first plugin call.
+
+        Subclasses open their process-wide pooled connections here, or check that the
+        connection can be opened. See :mod:`smarter.apps.llm_client.warmup`.
+
+        :return: True if the connection is ready, otherwise False.
+        :rtype: bool
+        """
+        return True
+
     @property
     @abstractmethod
     def connection_string(self) -> str:
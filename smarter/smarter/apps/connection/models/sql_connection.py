@@ -2,9 +2,11 @@
 
 import io
 import tempfile
+import threading
+import time
 from http import HTTPStatus
 from socket import socket
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 import paramiko
 import requests
@@ -18,6 +20,7 @@ from django.urls import reverse
 from smarter.apps.account.models import (
     MetaDataWithOwnershipModelManager,
 )
+from smarter.apps.connection.exceptions import SmarterConnectionTimeoutError
 from smarter.apps.connection.manifest.models.sql_connection.enum import (
     DbEngines,
     DBMSAuthenticationMethods,
@@ -31,11 +34,14 @@ from smarter.apps.connection.signals import (
     sql_connection_success,
     sql_connection_validated,
 )
+from smarter.apps.connection.utils import SqlResultEncoder
 from smarter.apps.secret.models import Secret
-from smarter.common.exceptions import SmarterValueError
+from smarter.common.conf import smarter_settings
+from smarter.common.exceptions import SmarterConfigurationError, SmarterValueError
 from smarter.common.helpers.logger_helpers import formatted_text
 from smarter.common.utils import to_snake_case
 from smarter.lib import json, logging
+from smarter.lib.django.cancellation import cancel_on_disconnect
 from smarter.lib.django.validators import SmarterValidator
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
@@ -44,6 +50,13 @@ from .connection_base import ConnectionBase
 logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.CONNECTION_LOGGING])
 logger_prefix = formatted_text(f"{__name__}")
 
+_connection_pool = threading.local()
+"""
+Per-thread pool of open database connections, keyed by
+:attr:`SqlConnection.connection_identity`. Django database wrappers may
+only be used by the thread that created them, hence thread-local storage.
+"""
+
 
 class SqlConnection(ConnectionBase):
     """
@@ -124,6 +137,18 @@ class SqlConnection(ConnectionBase):
 
     30 seconds is a reasonable default that balances responsiveness with network latency.
     """
+    DBMS_MAX_RESULT_BYTES = 64 * 1024
+    """
+    The maximum size in bytes of the encoded rows returned by :meth:`execute_query`.
+
+    64 KiB is roughly 16k tokens, which is already a large tool result for an LLM prompt.
+    """
+    DBMS_FETCH_BATCH_SIZE = 100
+    """The number of rows fetched from the database cursor per round trip."""
+    DBMS_LIMIT_CLAUSE_ENGINES = [DbEngines.MYSQL.value, DbEngines.POSTGRES.value, DbEngines.SQLITE.value]
+    """The database engines that support a ``LIMIT`` clause."""
+    DBMS_TIMEOUT_ERRORS = ["maximum statement execution time exceeded", "canceling statement due to statement timeout"]
+    """Fragments of the error messages that MySQL and PostgreSQL raise when a statement timeout expires."""
     DBMS_CHOICES = [
         (DbEngines.MYSQL.value, DbEngines.MYSQL.value),
         (DbEngines.POSTGRES.value, DbEngines.POSTGRES.value),
@@ -436,6 +461,68 @@ class SqlConnection(ConnectionBase):
         }
         return retval
 
+    @property
+    def pooled_connection(self) -> Optional[BaseDatabaseWrapper]:
+        """
+        Return an open database connection from the per-thread connection pool.
+
+        Connections are reused across queries (and across model instances of the same
+        connection) for the life of the worker thread, which avoids paying for a new
+        TCP/TLS/SSH handshake on every plugin call. Unusable connections are replaced
+        transparently. Editing the connection invalidates the pooled entry because
+        :attr:`connection_identity` changes, and the entries of its previous versions
+        are closed when the new one is opened.
+
+        :return: The pooled database connection, or None if a connection could not be established.
+        :rtype: Optional[BaseDatabaseWrapper]
+        """
+        pool: dict[str, BaseDatabaseWrapper] = getattr(_connection_pool, "connections", None) or {}
+        _connection_pool.connections = pool
+        db_wrapper = pool.get(self.connection_identity)
+        if db_wrapper is not None:
+            try:
+                if db_wrapper.is_usable():
+                    return db_wrapper
+            # pylint: disable=W0718
+            except Exception as e:
+                logger.warning(
+                    "%s.pooled_connection() discarding unusable pooled connection: %s", self.formatted_class_name, e
+                )
+            self.release_pooled_connection()
+        db_wrapper = self.get_connection()
+        if db_wrapper is not None:
+            self.release_pooled_connection(all_versions=True)
+            pool[self.connection_identity] = db_wrapper
+        return db_wrapper
+
+    def release_pooled_connection(self, all_versions: bool = False) -> None:
+        """
+        Close and remove this connection's entry from the per-thread connection pool.
+
+        :param all_versions: Also close the entries of previous versions of this connection,
+            which were pooled under a previous :attr:`connection_identity`.
+        :return: None
+        """
+        pool: dict[str, BaseDatabaseWrapper] = getattr(_connection_pool, "connections", None) or {}
+        if all_versions:
+            prefix = f"{self.__class__.__name__}:{self.pk}:"
+            identities = [identity for identity in list(pool) if identity.startswith(prefix)]
+        else:
+            identities = [self.connection_identity]
+        for identity in identities:
+            db_wrapper = pool.pop(identity, None)
+            if db_wrapper is None:
+                continue
+            try:
+                db_wrapper.close()
+            # pylint: disable=W0718
+            except Exception as e:
+                logger.error(
+                    "%s.release_pooled_connection() Failed to close the database connection: %s",
+                    self.formatted_class_name,
+                    e,
+                )
+
     @property
     def connection_string(self) -> str:
         """
@@ -597,6 +684,29 @@ class SqlConnection(ConnectionBase):
             )
             return None
 
+    def warm_up(self) -> bool:
+        """
+        Check that this connection can be opened, ahead of the first query.
+
+        This validates the host, credentials and any SSH tunnel. The connection is closed
+        afterwards rather than pooled, because the pool is per thread, and a connection
+        opened by the warm-up thread would never be used by the threads that serve requests.
+
+        :return: True if the connection could be opened, otherwise False.
+        :rtype: bool
+        """
+        db_wrapper = self.get_connection()
+        if db_wrapper is None:
+            return False
+        try:
+            db_wrapper.ensure_connection()
+            return True
+        except DatabaseError as e:
+            logger.warning("%s.warm_up() %s is not reachable: %s", self.formatted_class_name, self.name, e)
+            return False
+        finally:
+            db_wrapper.close()
+
     def test_connection(self) -> bool:
         """
         Establish a database connection based on the authentication method.
@@ -672,55 +782,190 @@ class SqlConnection(ConnectionBase):
                 logger.error("%s.close() Failed to close the database connection: %s", self.formatted_class_name, e)
             self._connection = None
 
-    def execute_query(self, sql: str, limit: Optional[int] = None) -> Union[str, bool]:
+    def statement_timeout_sql(self, timeout: float) -> Optional[str]:
+        """
+        Return the SQL that sets a per-session statement timeout, if the engine supports one.
+
+        :param timeout: The timeout in seconds.
+        :return: The SQL statement, or None if the database engine has no session statement timeout.
+        :rtype: Optional[str]
+        """
+        milliseconds = max(1, int(timeout * 1000))
+        if self.db_engine == DbEngines.MYSQL.value:
+            return f"SET SESSION max_execution_time = {milliseconds}"
+        if self.db_engine == DbEngines.POSTGRES.value:
+            return f"SET statement_timeout = {milliseconds}"
+        return None
+
+    def query_canceller(self, db_wrapper: BaseDatabaseWrapper) -> Optional[Callable[[], None]]:
+        """
+        Return a callable that cancels the statement currently running on ``db_wrapper``.
+
+        The callable is thread-safe and is invoked from outside of the thread that is
+        running the query, for example when the client disconnects.
+
+        :param db_wrapper: The database connection that is running the query.
+        :return: The cancel callable, or None if the database engine does not support cancellation.
+        :rtype: Optional[Callable[[], None]]
+        """
+        raw_connection = getattr(db_wrapper, "connection", None)
+        if raw_connection is None:
+            return None
+
+        if self.db_engine == DbEngines.POSTGRES.value and hasattr(raw_connection, "cancel"):
+            return raw_connection.cancel
+
+        if self.db_engine == DbEngines.MYSQL.value and hasattr(raw_connection, "thread_id"):
+            thread_id = int(raw_connection.thread_id())
+
+            def kill_query():
+                # KILL QUERY must be issued from a different session than the one running the query.
+                kill_connection = self.get_connection()
+                if kill_connection is None:
+                    return
+                try:
+                    with kill_connection.cursor() as cursor:
+                        cursor.execute(f"KILL QUERY {thread_id}")
+                finally:
+                    kill_connection.close()
+
+            return kill_query
+
+        return None
+
+    def execute_query(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        params: Optional[Union[tuple, list]] = None,
+        timeout: Optional[int] = None,
+    ) -> Union[str, bool]:
         """
         Execute a SQL query and return the results as a JSON string.
 
-        :param sql: The SQL query to execute.
-        :param limit: Optional limit on the number of rows to return.
+        :param sql: The SQL query to execute. When ``params`` is provided this is a
+            parameterized statement that uses ``%s`` bind markers.
+        :param limit: Optional limit on the number of rows to return. Defaults to
+            ``smarter_settings.plugin_max_data_results``.
+        :param params: Optional positional bind parameters for ``sql``. These are passed
+            to the database driver, which handles quoting and escaping.
+        :param timeout: Optional execution deadline in seconds. Defaults to :attr:`timeout`.
         :return: JSON string of query results if successful, otherwise False.
+            See :class:`smarter.apps.connection.utils.SqlResultEncoder` for the format.
+        :raises SmarterConnectionTimeoutError: If the query does not complete within the deadline.
+        :raises SmarterConfigurationError: If the query fails for any other reason.
+        :raises SmarterConnectionUnavailableError: If the connection's circuit breaker is open
+            or it has reached its limit of concurrent executions.
 
         .. warning::
 
-            This method does not perform any SQL injection protection or parameterization.
-            It is the caller's responsibility to ensure that the SQL query is safe and properly formatted.
+            When ``params`` is not provided, this method does not perform any SQL injection
+            protection. It is the caller's responsibility to ensure that the SQL query is
+            safe and properly formatted.
 
-        .. warning::
+        .. note::
 
-            This method does not limit the execution time nor the number of rows returned by the query,
-            unless the ``limit`` parameter is provided. It is the caller's responsibility to ensure that
-            the query is efficient and does not return excessive data.
-        """
+            The deadline is enforced server-side with a per-session statement timeout on
+            MySQL (``max_execution_time``) and PostgreSQL (``statement_timeout``), and
+            client-side while rows are being fetched. If the client disconnects while the
+            query is running, the query is cancelled. See :mod:`smarter.lib.django.cancellation`.
+
+        .. note::
+
+            Rows are streamed from the cursor and encoding stops at the row limit or at
+            ``DBMS_MAX_RESULT_BYTES``, whichever comes first, so worker memory use does not
+            depend on the size of the result set. Truncated results are marked as such.
+
+        .. note::
+
+            Queries run on a pooled connection (see :attr:`pooled_connection`) that
+            remains open after the query completes.
+
+        .. note::
 
-        def query_result_to_json(cursor) -> str:
-            # Get column names from cursor description
-            columns = [col[0] for col in cursor.description]
-            # Fetch all rows
-            rows = cursor.fetchall()
-            # Convert each row to a dict
-            result = [dict(zip(columns, row)) for row in rows]
-            # Convert to JSON string (optional)
-            return json.dumps(result)
+            Queries are guarded by the connection's circuit breaker and bulkhead. See
+            :mod:`smarter.apps.connection.circuit_breaker`.
+        """
 
-        if not isinstance(self.connection, BaseDatabaseWrapper):
+        with self.execution_guard():
+            return self._execute_query(sql, limit=limit, params=params, timeout=timeout)
+
+    def _execute_query(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        params: Optional[Union[tuple, list]] = None,
+        timeout: Optional[int] = None,
+    ) -> Union[str, bool]:
+        """Execute a SQL query. See :meth:`execute_query`."""
+        query_connection = self.pooled_connection
+        if not isinstance(query_connection, BaseDatabaseWrapper):
             return False
-        query_connection = self.connection
+        timeout = timeout or self.timeout or self.DBMS_DEFAULT_TIMEOUT
+        deadline = time.monotonic() + timeout
+        max_rows = limit if limit is not None else smarter_settings.plugin_max_data_results
+        encoder = SqlResultEncoder(
+            max_rows=max_rows,
+            max_bytes=self.DBMS_MAX_RESULT_BYTES,
+            batch_size=self.DBMS_FETCH_BATCH_SIZE,
+            deadline=deadline,
+        )
         sql_connection_query_attempted.send(sender=self.__class__, connection=self, sql=sql, limit=limit)
+        canceller: Optional[Callable[[], None]] = None
+        cancelled = False
+
+        def cancel():
+            nonlocal cancelled
+            cancelled = True
+            if canceller is not None:
+                canceller()
+
         try:
-            if limit is not None:
-                sql = sql.rstrip(";")  # Remove any trailing semicolon
-                sql += f" LIMIT {limit};"
-            with query_connection.cursor() as cursor:
-                cursor.execute(sql)
-                json_str = query_result_to_json(cursor)
+            sql = sql.rstrip().rstrip(";")  # Remove any trailing semicolon
+            if self.db_engine in self.DBMS_LIMIT_CLAUSE_ENGINES:
+                # request one row beyond the limit so that the encoder can detect truncation.
+                if params is not None:
+                    sql += " LIMIT %s"
+                    params = tuple(params) + (max_rows + 1,)
+                else:
+                    sql += f" LIMIT {int(max_rows) + 1}"
+            timeout_sql = self.statement_timeout_sql(timeout)
+            if timeout_sql:
+                with query_connection.cursor() as cursor:
+                    cursor.execute(timeout_sql)
+            canceller = self.query_canceller(query_connection)
+            # chunked_cursor() is a server-side cursor on backends that support one (PostgreSQL),
+            # and a regular cursor elsewhere. Either way, rows are consumed with fetchmany().
+            with cancel_on_disconnect(cancel), query_connection.chunked_cursor() as cursor:
+                cursor.execute(sql, tuple(params) if params is not None else None)
+                json_str = encoder.encode(cursor)
                 sql_connection_query_success.send(sender=self.__class__, connection=self, sql=sql, limit=limit)
                 return json_str
         except (DatabaseError, ImproperlyConfigured) as e:
-            sql_connection_query_failed.send(sender=self.__class__, connection=self, sql=sql, limit=limit, error=str(e))
+            # the connection may be in an unknown state, so don't return it to the pool.
+            self.release_pooled_connection()
+            timed_out = time.monotonic() >= deadline or any(s in str(e).lower() for s in self.DBMS_TIMEOUT_ERRORS)
+            # send_robust(), so that a failing receiver cannot replace the error that is raised below.
+            sql_connection_query_failed.send_robust(
+                sender=self.__class__, connection=self, sql=sql, limit=limit, error=str(e), cancelled=cancelled
+            )
+            if cancelled:
+                logger.warning("%s.execute_query() SQL query cancelled: %s", self.formatted_class_name, e)
+                return False
+            if timed_out:
+                logger.warning(
+                    "%s.execute_query() SQL query exceeded its %s second deadline: %s",
+                    self.formatted_class_name,
+                    timeout,
+                    e,
+                )
+                raise SmarterConnectionTimeoutError(
+                    f"SQL query exceeded its {timeout} second deadline.", connection_name=self.name, timeout=timeout
+                ) from e
             logger.error("%s.execute_query() SQL query execution failed: %s", self.formatted_class_name, e)
-            return False
-        finally:
-            self.close()
+            raise SmarterConfigurationError(
+                f"Remote SQL {self.get_connection_string()} query execution failed {sql}: {e}"
+            ) from e
 
     def test_proxy(self) -> bool:
         """
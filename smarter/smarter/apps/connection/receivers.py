@@ -15,6 +15,7 @@ from smarter.common.mixins.helper_mixin import SmarterReadyState
 from smarter.lib import logging
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
+from .exceptions import SmarterConnectionTimeoutError
 from .models import (
     ApiConnection,
     SqlConnection,
@@ -59,6 +60,10 @@ def handle_api_connection_saved(sender, instance, created, **kwargs):
             formatted_text(prefix + "post_save() ApiConnection() updated"),
             formatted_json(model_to_dict(instance)),
         )
+        # the session identity has changed, so the old session is no longer reachable.
+        instance.close_http_session()
+        # give the updated configuration a fresh start.
+        instance.circuit_breaker.reset()
 
 
 @receiver(post_save, sender=SqlConnection)
@@ -80,6 +85,8 @@ def handle_sql_connection_saved(sender, instance: SqlConnection, created, **kwar
             user_profile,
             formatted_json(model_to_dict(instance)),
         )
+        # give the updated configuration a fresh start.
+        instance.circuit_breaker.reset()
 
 
 def masked_dict(dic: dict) -> dict:
@@ -135,6 +142,7 @@ def handle_sql_connection_failed(sender, connection: SqlConnection, error: str,
         SmarterReadyState.NOT_READY,
         error,
     )
+    connection.circuit_breaker.record_failure()
 
     raise SmarterConfigurationError(
         f"Remote SQL Connection {connection.get_connection_string(masked=not smarter_settings.debug_mode)} failed: {error}"
@@ -165,10 +173,13 @@ def handle_sql_connection_query_success(sender, connection: SqlConnection, sql:
         sql,
         limit,
     )
+    connection.circuit_breaker.record_success()
 
 
 @receiver(sql_connection_query_failed, dispatch_uid="sql_connection_query_failed")
-def handle_sql_connection_query_failed(sender, connection: SqlConnection, sql: str, limit: int, error: str, **kwargs):
+def handle_sql_connection_query_failed(
+    sender, connection: SqlConnection, sql: str, limit: int, error: str, cancelled: bool = False, **kwargs
+):
     """Handle SQL connection query failed signal."""
 
     logger.info(
@@ -179,10 +190,9 @@ def handle_sql_connection_query_failed(sender, connection: SqlConnection, sql: s
         limit,
         error,
     )
-
-    raise SmarterConfigurationError(
-        f"Remote SQL {connection.get_connection_string()} query execution failed {sql}: {error}"
-    )
+    if not cancelled:
+        # a query cancelled because the client disconnected says nothing about the database.
+        connection.circuit_breaker.record_failure()
 
 
 @receiver(api_connection_attempted, dispatch_uid="api_connection_attempted")
@@ -218,6 +228,7 @@ def handle_api_connection_failed(sender, connection: ApiConnection, error: Optio
         connection.get_connection_string(),
         SmarterReadyState.NOT_READY,
     )
+    connection.circuit_breaker.record_failure()
 
 
 @receiver(api_connection_query_attempted, dispatch_uid="api_connection_query_attempted")
@@ -243,6 +254,9 @@ def handle_api_connection_query_success(
         connection.get_connection_string(),
         formatted_json(response.json()) if response else None,
     )
+    if not getattr(response, "from_cache", False):
+        # a cached response says nothing about the health of the API.
+        connection.circuit_breaker.record_success()
 
 
 @receiver(api_connection_query_failed, dispatch_uid="api_connection_query_failed")
@@ -258,6 +272,11 @@ def handle_api_connection_query_failed(
         formatted_json(response.json()) if response else None,
         error,
     )
+    # connection errors are recorded by api_connection_failed. Client errors are the
+    # caller's fault and say nothing about the health of the API.
+    status_code = getattr(response, "status_code", None)
+    if isinstance(error, SmarterConnectionTimeoutError) or (status_code is not None and status_code >= 500):
+        connection.circuit_breaker.record_failure()
 
 
 # ------------------------------------------------------------------------------
@@ -275,6 +294,7 @@ def handle_api_connection_pre_delete(sender, instance, **kwargs):
         formatted_text(prefix + "ApiConnection().pre_delete()"),
         instance,
     )
+    instance.close_http_session()
 
 
 @receiver(pre_delete, sender=SqlConnection)
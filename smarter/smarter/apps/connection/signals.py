@@ -75,11 +75,12 @@ Arguments:
     sql: The SQL query that was executed.
     limit: The limit applied to the query (if any).
     error: The error message associated with the failure.
+    cancelled: True if the query was cancelled because the client disconnected.
 
 Example::
 
     sql_connection_query_failed.send(
-        sender=self.__class__, connection=self, sql=sql, limit=limit, error=str(e)
+        sender=self.__class__, connection=self, sql=sql, limit=limit, error=str(e), cancelled=False
     )
 """
 
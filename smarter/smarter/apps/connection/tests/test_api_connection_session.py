@@ -0,0 +1,61 @@
+"""Test ApiConnection pooled HTTP sessions."""
+
+import time
+
+from urllib3.exceptions import MaxRetryError
+
+from smarter.apps.connection.models import ApiConnection
+from smarter.apps.connection.models.api_connection import (
+    DeadlineRetry,
+    _request_deadline,
+)
+from smarter.common.conf import smarter_settings
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestApiConnectionSession(SmarterTestBase):
+    """Test ApiConnection.http_session and ApiConnection.close_http_session()."""
+
+    def setUp(self):
+        super().setUp()
+        self.connection = ApiConnection(
+            pk=987654321,
+            name="test_api_connection_session",
+            base_url="https://api.example.com/",
+            auth_method="none",
+            proxy_protocol="http",
+            proxy_host="proxy.example.com",
+            proxy_port=3128,
+        )
+
+    def tearDown(self):
+        self.connection.close_http_session()
+        super().tearDown()
+
+    def test_session_is_reused(self):
+        session = self.connection.http_session
+        self.assertIs(session, self.connection.http_session)
+
+        adapter = session.get_adapter("https://api.example.com/")
+        self.assertEqual(adapter._pool_maxsize, smarter_settings.plugin_api_pool_maxsize)  # pylint: disable=W0212
+        self.assertEqual(adapter.max_retries.total, smarter_settings.plugin_api_max_retries)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+        self.assertEqual(session.proxies["https"], "http://proxy.example.com:3128")
+
+    def test_close_http_session(self):
+        session = self.connection.http_session
+        self.connection.close_http_session()
+        self.assertIsNot(session, self.connection.http_session)
+
+    def test_retries_stop_at_the_request_deadline(self):
+        retry = self.connection.http_session.get_adapter("https://api.example.com/").max_retries
+        self.assertIsInstance(retry, DeadlineRetry)
+        error = ConnectionError("connection refused")
+        self.assertIsInstance(retry.increment("GET", "/", error=error), DeadlineRetry)
+
+        token = _request_deadline.set(time.monotonic())
+        try:
+            with self.assertRaises(MaxRetryError):
+                retry.increment("GET", "/", error=error)
+        finally:
+            _request_deadline.reset(token)
@@ -0,0 +1,94 @@
+"""Test the connection circuit breaker and bulkhead."""
+
+import json
+
+from django.core.cache import cache
+
+from smarter.apps.connection.circuit_breaker import (
+    Bulkhead,
+    CircuitBreaker,
+    CircuitState,
+    execution_guard,
+)
+from smarter.apps.connection.exceptions import SmarterConnectionUnavailableError
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestCircuitBreaker(SmarterTestBase):
+    """Test CircuitBreaker state transitions and the Bulkhead."""
+
+    def setUp(self):
+        super().setUp()
+        self.name = f"SqlConnection:{SmarterTestBase.generate_hash_suffix()}"
+        self.breaker = CircuitBreaker(self.name, failure_rate=0.5, min_calls=4, window=60, reset_timeout=30)
+
+    def tearDown(self):
+        self.breaker.reset()
+        super().tearDown()
+
+    def test_opens_on_failure_rate(self):
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertGreater(self.breaker.retry_after, 0)
+
+    def test_min_calls(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_half_open_single_trial(self):
+        self.breaker.open()
+        # simulate the end of the reset timeout.
+        cache.delete(self.breaker._open_key)  # pylint: disable=protected-access
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        cache.delete(self.breaker._open_key)  # pylint: disable=protected-access
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_execution_guard(self):
+        self.breaker.open()
+        with self.assertRaises(SmarterConnectionUnavailableError) as context:
+            with execution_guard(self.name, connection_name="test_connection"):
+                self.fail("the guarded block should not run while the circuit is open")
+        result = json.loads(context.exception.tool_result())
+        self.assertEqual(result["error"], "unavailable")
+        self.assertEqual(result["connection"], "test_connection")
+        self.assertGreater(result["retry_after_seconds"], 0)
+
+    def test_bulkhead_rejection_keeps_the_trial_call(self):
+        self.breaker.open()
+        cache.delete(self.breaker._open_key)  # pylint: disable=protected-access
+        bulkhead = Bulkhead(self.name)
+        for _ in range(bulkhead.max_concurrency):
+            bulkhead.semaphore.acquire()
+        try:
+            with self.assertRaises(SmarterConnectionUnavailableError):
+                with execution_guard(self.name):
+                    self.fail("the guarded block should not run while the bulkhead is full")
+        finally:
+            for _ in range(bulkhead.max_concurrency):
+                bulkhead.semaphore.release()
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_bulkhead(self):
+        bulkhead = Bulkhead(self.name, max_concurrency=1)
+        with bulkhead.acquire() as first:
+            self.assertTrue(first)
+            with bulkhead.acquire() as second:
+                self.assertFalse(second)
+        with bulkhead.acquire() as third:
+            self.assertTrue(third)
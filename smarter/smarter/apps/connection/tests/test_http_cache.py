@@ -0,0 +1,89 @@
+"""Test the ApiConnection HTTP response cache."""
+
+from unittest.mock import MagicMock
+
+from requests.structures import CaseInsensitiveDict
+
+from smarter.apps.connection.http_cache import (
+    ApiResponseCache,
+    CachedHttpResponse,
+    LocalResponseCache,
+    freshness_lifetime,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+def mock_response(status_code: int = 200, content: bytes = b'{"ok": true}', **headers) -> MagicMock:
+    response = MagicMock()
+    response.url = "https://api.example.com/courses"
+    response.status_code = status_code
+    response.content = content
+    response.headers = CaseInsensitiveDict({k.replace("_", "-"): v for k, v in headers.items()})
+    return response
+
+
+class TestApiResponseCache(SmarterTestBase):
+    """Test ApiResponseCache.fetch() and the HTTP freshness rules."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = ApiResponseCache()
+        hash_suffix = SmarterTestBase.generate_hash_suffix()
+        self.connection = MagicMock()
+        self.connection.session_identity = f"ApiConnection:{hash_suffix}"
+        self.url = f"https://api.example.com/courses/{hash_suffix}"
+
+    def test_freshness_lifetime(self):
+        self.assertIsNone(freshness_lifetime({"cache-control": "no-store"}, ttl=60))
+        self.assertEqual(freshness_lifetime({"cache-control": "public, max-age=300", "age": "100"}), 200)
+        self.assertEqual(freshness_lifetime({"cache-control": "max-age=300, s-maxage=30"}), 30)
+        self.assertEqual(freshness_lifetime({"cache-control": "no-cache"}), 0)
+        self.assertEqual(freshness_lifetime({"cache-control": "no-cache"}, ttl=60), 60)
+        self.assertEqual(
+            freshness_lifetime({"date": "Sun, 18 Oct 2026 10:00:00 GMT", "expires": "Sun, 18 Oct 2026 10:05:00 GMT"}),
+            300,
+        )
+        self.assertEqual(freshness_lifetime({}), 0)
+
+    def test_fresh_response_is_served_from_cache(self):
+        self.connection.request_with_deadline.return_value = mock_response(cache_control="max-age=300")
+        first = self.cache.fetch(self.connection, self.url)
+        second = self.cache.fetch(self.connection, self.url)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), {"ok": True})
+        self.assertEqual(self.connection.request_with_deadline.call_count, 1)
+
+    def test_stale_response_is_revalidated(self):
+        self.connection.request_with_deadline.return_value = mock_response(cache_control="no-cache", etag='"v1"')
+        self.cache.fetch(self.connection, self.url)
+
+        self.connection.request_with_deadline.return_value = mock_response(status_code=304, content=b"")
+        revalidated = self.cache.fetch(self.connection, self.url)
+        self.assertTrue(revalidated.from_cache)
+        self.assertEqual(revalidated.json(), {"ok": True})
+        _, kwargs = self.connection.request_with_deadline.call_args
+        self.assertEqual(kwargs["headers"]["If-None-Match"], '"v1"')
+
+    def test_ttl_override(self):
+        self.connection.request_with_deadline.return_value = mock_response()
+        self.cache.fetch(self.connection, self.url, ttl=60)
+        self.assertTrue(self.cache.fetch(self.connection, self.url, ttl=60).from_cache)
+
+        self.cache.fetch(self.connection, self.url, ttl=0)
+        self.assertEqual(self.connection.request_with_deadline.call_count, 2)
+
+    def test_no_store(self):
+        self.connection.request_with_deadline.return_value = mock_response(cache_control="no-store")
+        self.cache.fetch(self.connection, self.url, ttl=60)
+        self.assertFalse(self.cache.fetch(self.connection, self.url, ttl=60).from_cache)
+        self.assertEqual(self.connection.request_with_deadline.call_count, 2)
+
+    def test_local_cache_is_bounded(self):
+        local = LocalResponseCache(max_bytes=100, max_entries=2)
+        for i in range(3):
+            local.set(str(i), CachedHttpResponse(url="u", status_code=200, headers={}, content=b"x" * 10))
+        self.assertEqual(len(local), 2)
+        self.assertIsNone(local.get("0"))
+        local.set("big", CachedHttpResponse(url="u", status_code=200, headers={}, content=b"x" * 101))
+        self.assertIsNone(local.get("big"))
@@ -0,0 +1,52 @@
+"""Test SqlConnection pooled database connections."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from smarter.apps.connection.models import SqlConnection
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestSqlConnectionPool(SmarterTestBase):
+    """Test SqlConnection.pooled_connection and SqlConnection.release_pooled_connection()."""
+
+    def setUp(self):
+        super().setUp()
+        self.connection = SqlConnection(
+            pk=987654321,
+            name="test_sql_connection_pool",
+            db_engine="django.db.backends.mysql",
+            authentication_method="tcpip",
+            hostname="db.example.com",
+            port=3306,
+            database="test",
+            updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+
+    def tearDown(self):
+        self.connection.release_pooled_connection(all_versions=True)
+        super().tearDown()
+
+    def test_connection_is_reused(self):
+        with patch.object(SqlConnection, "get_connection", side_effect=lambda: MagicMock()) as get_connection:
+            db_wrapper = self.connection.pooled_connection
+            self.assertIs(db_wrapper, self.connection.pooled_connection)
+        get_connection.assert_called_once()
+
+    def test_edited_connection_closes_previous_version(self):
+        with patch.object(SqlConnection, "get_connection", side_effect=lambda: MagicMock()):
+            old_wrapper = self.connection.pooled_connection
+            self.connection.updated_at += timedelta(minutes=1)
+            new_wrapper = self.connection.pooled_connection
+        self.assertIsNot(old_wrapper, new_wrapper)
+        old_wrapper.close.assert_called_once()
+        new_wrapper.close.assert_not_called()
+
+    def test_warm_up_does_not_pool_the_connection(self):
+        db_wrapper = MagicMock()
+        with patch.object(SqlConnection, "get_connection", return_value=db_wrapper):
+            self.assertTrue(self.connection.warm_up())
+        db_wrapper.ensure_connection.assert_called_once()
+        db_wrapper.close.assert_called_once()
+        with patch.object(SqlConnection, "get_connection", side_effect=lambda: MagicMock()):
+            self.assertIsNot(self.connection.pooled_connection, db_wrapper)
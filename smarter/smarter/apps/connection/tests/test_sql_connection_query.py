@@ -0,0 +1,77 @@
+"""Test SqlConnection query execution failures."""
+
+from contextlib import nullcontext
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from django.db import DatabaseError
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from smarter.apps.connection.exceptions import SmarterConnectionTimeoutError
+from smarter.apps.connection.models import SqlConnection
+from smarter.apps.connection.signals import sql_connection_query_failed
+from smarter.common.exceptions import SmarterConfigurationError
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestSqlConnectionQuery(SmarterTestBase):
+    """Test how SqlConnection._execute_query() classifies database errors."""
+
+    def setUp(self):
+        super().setUp()
+        self.connection = SqlConnection(
+            pk=987654322,
+            name="test_sql_connection_query",
+            db_engine="django.db.backends.mysql",
+            authentication_method="tcpip",
+            hostname="db.example.com",
+            port=3306,
+            database="test",
+        )
+
+    def db_wrapper(self, error: Exception) -> MagicMock:
+        """Return a database connection whose queries raise ``error``."""
+        db_wrapper = MagicMock(spec=BaseDatabaseWrapper)
+        db_wrapper.connection = None
+        db_wrapper.chunked_cursor.return_value.__enter__.return_value.execute.side_effect = error
+        return db_wrapper
+
+    def execute_query(self, error: Exception):
+        with (
+            patch.object(SqlConnection, "pooled_connection", new_callable=PropertyMock) as pooled_connection,
+            patch.object(SqlConnection, "release_pooled_connection") as release_pooled_connection,
+        ):
+            pooled_connection.return_value = self.db_wrapper(error)
+            try:
+                return self.connection._execute_query("SELECT 1", timeout=30)
+            finally:
+                release_pooled_connection.assert_called_once()
+
+    def test_dbms_timeout_raises_timeout_error(self):
+        receiver = MagicMock(side_effect=RuntimeError("receiver failed"))
+        sql_connection_query_failed.connect(receiver, weak=False)
+        try:
+            with self.assertRaises(SmarterConnectionTimeoutError):
+                self.execute_query(
+                    DatabaseError("Query execution was interrupted, maximum statement execution time exceeded")
+                )
+        finally:
+            sql_connection_query_failed.disconnect(receiver)
+        receiver.assert_called_once()
+
+    def test_other_database_error_raises(self):
+        with patch.object(SqlConnection, "circuit_breaker", new_callable=PropertyMock) as circuit_breaker:
+            with self.assertRaises(SmarterConfigurationError):
+                self.execute_query(DatabaseError("Table 'test.missing' doesn't exist"))
+        circuit_breaker.return_value.record_failure.assert_called_once()
+
+    def test_cancelled_query_is_not_a_failure(self):
+        def cancel_on_disconnect(cancel):
+            cancel()
+            return nullcontext()
+
+        with (
+            patch("smarter.apps.connection.models.sql_connection.cancel_on_disconnect", cancel_on_disconnect),
+            patch.object(SqlConnection, "circuit_breaker", new_callable=PropertyMock) as circuit_breaker,
+        ):
+            self.assertFalse(self.execute_query(DatabaseError("Query execution was interrupted")))
+        circuit_breaker.return_value.record_failure.assert_not_called()
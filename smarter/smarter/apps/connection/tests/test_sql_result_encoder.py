@@ -0,0 +1,55 @@
+"""Test SqlResultEncoder."""
+
+import sqlite3
+import time
+
+from smarter.apps.connection.utils import SqlResultEncoder
+from smarter.lib import json
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestSqlResultEncoder(SmarterTestBase):
+    """Test the streaming, size-bounded SQL result encoder."""
+
+    def setUp(self):
+        super().setUp()
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute("CREATE TABLE courses (course_code TEXT, cost REAL)")
+        self.db.executemany("INSERT INTO courses VALUES (?, ?)", [(f"CS{i:03d}", i * 10.0) for i in range(50)])
+
+    def tearDown(self):
+        self.db.close()
+        super().tearDown()
+
+    def encode(self, max_rows: int, max_bytes: int) -> dict:
+        cursor = self.db.execute("SELECT course_code, cost FROM courses ORDER BY course_code")
+        return json.loads(SqlResultEncoder(max_rows=max_rows, max_bytes=max_bytes, batch_size=7).encode(cursor))
+
+    def test_complete_result(self):
+        result = self.encode(max_rows=100, max_bytes=10000)
+        self.assertEqual(result["columns"], ["course_code", "cost"])
+        self.assertEqual(result["row_count"], 50)
+        self.assertEqual(result["rows"][0], ["CS000", 0.0])
+        self.assertFalse(result["truncated"])
+        self.assertNotIn("note", result)
+
+    def test_row_limit(self):
+        result = self.encode(max_rows=10, max_bytes=10000)
+        self.assertEqual(result["row_count"], 10)
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["truncation_reason"], SqlResultEncoder.TRUNCATED_ROW_LIMIT)
+        self.assertIn("note", result)
+
+    def test_byte_limit(self):
+        result = self.encode(max_rows=100, max_bytes=100)
+        self.assertLess(result["row_count"], 10)
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["truncation_reason"], SqlResultEncoder.TRUNCATED_BYTE_LIMIT)
+
+    def test_deadline(self):
+        cursor = self.db.execute("SELECT course_code, cost FROM courses ORDER BY course_code")
+        encoder = SqlResultEncoder(max_rows=100, max_bytes=10000, batch_size=7, deadline=time.monotonic() - 1)
+        result = json.loads(encoder.encode(cursor))
+        self.assertEqual(result["row_count"], 7)
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["truncation_reason"], SqlResultEncoder.TRUNCATED_TIMEOUT)
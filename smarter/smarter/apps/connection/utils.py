@@ -0,0 +1,119 @@
+"""Connection app utilities."""
+
+import time
+from typing import Any, Optional
+
+from smarter.lib import json
+
+
+class SqlResultEncoder:
+    """
+    Streams rows from a DB-API cursor into a compact, size-bounded JSON document.
+
+    Rows are pulled from the cursor with ``fetchmany()`` and encoded one at a time,
+    so memory use is bounded by ``max_bytes`` and ``batch_size`` rather than by the
+    size of the result set. Encoding stops as soon as either the row limit or the
+    byte budget is reached.
+
+    The output is column-oriented, with column names listed once rather than
+    repeated for every row:
+
+    .. code-block:: json
+
+        {
+            "columns": ["course_code", "cost"],
+            "rows": [["CS101", 500.0], ["CS102", 250.0]],
+            "row_count": 2,
+            "truncated": true,
+            "truncation_reason": "row_limit",
+            "note": "Result truncated to the first 2 rows. Narrow the query arguments to see other rows."
+        }
+
+    The ``truncated`` and ``note`` keys make truncation visible to the LLM, so that it
+    does not mistake a partial result for a complete one.
+
+    :param max_rows: The maximum number of rows to encode.
+    :param max_bytes: The maximum size of the encoded ``rows`` array, in bytes.
+    :param batch_size: The number of rows to request from the cursor per ``fetchmany()`` call.
+    :param deadline: Optional :func:`time.monotonic` timestamp after which no further
+        batches are fetched. Rows encoded so far are returned as a truncated result.
+    """
+
+    TRUNCATED_ROW_LIMIT = "row_limit"
+    TRUNCATED_BYTE_LIMIT = "byte_limit"
+    TRUNCATED_TIMEOUT = "timeout"
+
+    def __init__(self, max_rows: int, max_bytes: int, batch_size: int = 100, deadline: Optional[float] = None):
+        self.max_rows = max(0, max_rows)
+        self.max_bytes = max(0, max_bytes)
+        self.batch_size = max(1, batch_size)
+        self.deadline = deadline
+        self._encoder = json.SmarterJSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def encode_value(self, value: Any) -> str:
+        """Encode a single row as a compact JSON array."""
+        try:
+            return self._encoder.encode(value)
+        except (TypeError, ValueError):
+            return self._encoder.encode(
+                [v if v is None or isinstance(v, (bool, int, float, str)) else str(v) for v in value]
+            )
+
+    def encode(self, cursor) -> str:
+        """
+        Encode the remaining rows of ``cursor``.
+
+        :param cursor: An executed DB-API cursor.
+        :return: The JSON document as a string.
+        :rtype: str
+        """
+        columns = [col[0] for col in cursor.description] if cursor.description else []
+        encoded_rows: list[str] = []
+        encoded_bytes = 0
+        truncation_reason: Optional[str] = None
+
+        while truncation_reason is None:
+            if encoded_rows and self.deadline is not None and time.monotonic() >= self.deadline:
+                truncation_reason = self.TRUNCATED_TIMEOUT
+                break
+            batch = cursor.fetchmany(self.batch_size)
+            if not batch:
+                break
+            for row in batch:
+                if len(encoded_rows) >= self.max_rows:
+                    truncation_reason = self.TRUNCATED_ROW_LIMIT
+                    break
+                encoded_row = self.encode_value(list(row))
+                row_bytes = len(encoded_row.encode("utf-8")) + 1
+                if encoded_bytes + row_bytes > self.max_bytes:
+                    truncation_reason = self.TRUNCATED_BYTE_LIMIT
+                    break
+                encoded_rows.append(encoded_row)
+                encoded_bytes += row_bytes
+
+        parts = [
+            '{"columns":',
+            self._encoder.encode(columns),
+            ',"rows":[',
+            ",".join(encoded_rows),
+            '],"row_count":',
+            str(len(encoded_rows)),
+            ',"truncated":',
+            "true" if truncation_reason else "false",
+        ]
+        if truncation_reason:
+            note = (
+                f"Result truncated to the first {len(encoded_rows)} rows. "
+                "Narrow the query arguments to see other rows."
+            )
+            parts += [
+                ',"truncation_reason":',
+                self._encoder.encode(truncation_reason),
+                ',"note":',
+                self._encoder.encode(note),
+            ]
+        parts.append("}")
+        return "".join(parts)
+
+
+__all__ = ["SqlResultEncoder"]
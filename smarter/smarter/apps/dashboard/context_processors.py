@@ -226,7 +226,7 @@ def base(request: "HttpRequest") -> dict[str, Any]:
         else:
             user = None
 
-    @cache_results()
+    @cache_results(stale_timeout=60)
     @snake_case()
     def get_cached_context(username: Optional[str]) -> dict[str, Any]:
         """
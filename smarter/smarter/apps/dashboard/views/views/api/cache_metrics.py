@@ -0,0 +1,78 @@
+"""
+API view for the ``@cache_results`` metrics.
+
+This module provides a staff-only JSON endpoint that returns the sampled
+per-function metrics of ``@cache_results``: hits, misses, errors, recompute
+time and stored value sizes. It is used to tune cache timeouts and to find
+caches that are never hit. See :mod:`smarter.lib.cache.metrics`.
+
+Classes:
+    CacheMetricsView: Staff-only GET endpoint that returns the cache metrics
+        as a JSON response.
+"""
+
+from http import HTTPStatus
+
+from django.http import JsonResponse
+from django.http.request import HttpRequest
+
+from smarter.common.conf import smarter_settings
+from smarter.lib.cache.metrics import get_metrics
+from smarter.lib.django.views import SmarterAdminWebView
+
+
+# pylint: disable=W0613
+class CacheMetricsView(SmarterAdminWebView):
+    """
+    Staff-only JSON API view that reports the metrics of every function decorated with ``@cache_results``.
+
+    Response shape:
+
+    .. code-block:: json
+
+        {
+            "sample_rate": 0.01,
+            "functions": [
+                {
+                    "name": "smarter.apps.plugin.caching._get_cached_plugins_owned_by_user_profile",
+                    "calls": 1200,
+                    "hits": 1100,
+                    "local_hits": 0,
+                    "misses": 100,
+                    "errors": 0,
+                    "hit_rate": 0.9167,
+                    "compute_ms": 4200,
+                    "avg_compute_ms": 42.0,
+                    "stored": 100,
+                    "stored_bytes": 310000,
+                    "avg_bytes": 3100,
+                    "size_1kb": 0,
+                    "size_10kb": 100,
+                    "size_100kb": 0,
+                    "size_1mb": 0,
+                    "size_over_1mb": 0
+                }
+            ]
+        }
+    """
+
+    @property
+    def formatted_class_name(self) -> str:
+        """Returns the class name in a formatted string along with the name of this view."""
+        class_name = f"{__name__}.{CacheMetricsView.__name__}[{id(self)}]"
+        return self.formatted_text(class_name)
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Handle GET requests to return the cache metrics.
+
+        :param request: The incoming HTTP GET request from the client.
+        :type request: django.http.HttpRequest
+        :returns: A JSON response containing the sample rate and the metrics of each cached function.
+        :rtype: django.http.JsonResponse
+        """
+        retval = {
+            "sample_rate": smarter_settings.cache_metrics_sample_rate,
+            "functions": get_metrics(),
+        }
+        return JsonResponse(retval, status=HTTPStatus.OK)
@@ -2,6 +2,7 @@
 
 from django.urls import path
 
+from smarter.apps.dashboard.views.views.api.cache_metrics import CacheMetricsView
 from smarter.apps.dashboard.views.views.api.my_resources import MyResourcesView
 from smarter.apps.dashboard.views.views.api.service_health import ServiceHealthView
 from smarter.common.utils import to_snake_case
@@ -19,11 +20,13 @@ class DashboardApiReverseNames:
 
     namespace = namespace
 
+    cache_metrics = to_snake_case(CacheMetricsView.__name__)
     my_resources = to_snake_case(MyResourcesView.__name__)
     service_health = to_snake_case(ServiceHealthView.__name__)
 
 
 urlpatterns = [
+    path("cache-metrics/", CacheMetricsView.as_view(), name=DashboardApiReverseNames.cache_metrics),
     path("my-resources/", MyResourcesView.as_view(), name=DashboardApiReverseNames.my_resources),
     path("service-health/", ServiceHealthView.as_view(), name=DashboardApiReverseNames.service_health),
 ]
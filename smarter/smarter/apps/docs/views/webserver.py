@@ -3,10 +3,12 @@
 
 import os
 from datetime import datetime
+from http import HTTPStatus
 
 from django.http import FileResponse, HttpResponse
 from django.views import View
 
+from smarter.apps.llm_client.warmup import warmup
 from smarter.common.conf import smarter_settings
 from smarter.lib.django.views import SmarterWebTxtView, SmarterWebXmlView
 
@@ -47,14 +49,21 @@ class ReadinessView(View):
     """
     View to serve the readiness endpoint.
 
-    Instantiate a LLMClientHelper object to
-    force readiness of platform. This is the most likely collection of Python
-    objects that will be used in the early stages of the application lifecycle.
+    Returns HTTP 503 until this worker has finished warming up the plugins and
+    connections of deployed LLMClients, so that Kubernetes routes traffic only
+    to warm pods. See :mod:`smarter.apps.llm_client.warmup`.
 
-    mcdaniel (aug-2025): squelching this idea for now as the overhead of instantiating
-    LLMClientHelper is not worth the benefit at this stage.
+    mcdaniel (aug-2025): instantiating LLMClientHelper here to force readiness
+    of the platform was squelched, as the overhead is not worth the benefit.
     """
 
     def get(self, request, *args, **kwargs):
-        # LLMClientHelper(request=request)
+        # a no-op under ASGI, where warm-up starts with the worker.
+        warmup.start()
+        if not warmup.is_ready:
+            return HttpResponse(
+                f"warming up: {warmup.report.status}",
+                content_type="text/plain",
+                status=HTTPStatus.SERVICE_UNAVAILABLE,
+            )
         return HttpResponse("OK", content_type="text/plain")
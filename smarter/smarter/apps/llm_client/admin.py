@@ -17,6 +17,7 @@ from .models import (
     LLMClientFunctions,
     LLMClientPlugin,
     LLMClientRequests,
+    LLMClientVectorstore,
 )
 
 logger = logging.getLogger(__name__)
@@ -217,6 +218,32 @@ class LLMClientFunctionsAdmin(SmarterCustomerModelAdmin):
         return LLMClientFunctions.objects.filter(llm_client__in=llm_clients)
 
 
+class LLMClientVectorstoreAdmin(SmarterCustomerModelAdmin):
+    """
+    LLMClientVectorstore model admin.
+
+    Descends from LLMClient, so visibility is
+    determined by the parent LLMClient and role.
+    """
+
+    model = LLMClientVectorstore
+
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+    )
+    list_display = [field.name for field in LLMClientVectorstore._meta.fields]
+
+    def get_queryset(self, request):
+        user = get_resolved_user(request.user)  # type: ignore
+        qs = super().get_queryset(request)
+        if not isinstance(user, User):
+            return qs.none()
+
+        llm_clients = LLMClient.objects.with_ownership_permission_for(user=user)
+        return LLMClientVectorstore.objects.filter(llm_client__in=llm_clients)
+
+
 smarter_restricted_admin_site.register(LLMClient, LLMClientAdmin)
 smarter_restricted_admin_site.register(LLMClientCustomDomain, LLMClientCustomDomainAdmin)
 smarter_restricted_admin_site.register(LLMClientCustomDomainDNS, LLMClientCustomDomainDNSAdmin)
@@ -224,3 +251,4 @@ smarter_restricted_admin_site.register(LLMClientAPIKey, LLMClientAPIKeyAdmin)
 smarter_restricted_admin_site.register(LLMClientPlugin, LLMClientPluginAdmin)
 smarter_restricted_admin_site.register(LLMClientFunctions, LLMClientFunctionsAdmin)
 smarter_restricted_admin_site.register(LLMClientRequests, LLMClientRequestsAdmin)
+smarter_restricted_admin_site.register(LLMClientVectorstore, LLMClientVectorstoreAdmin)
@@ -35,6 +35,7 @@ from django.db import models
 from smarter.apps.account.models.user_profile import UserProfile
 from smarter.lib import logging
 from smarter.lib.cache import cache_results
+from smarter.lib.cache.tags import model_tag
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
 from .models import LLMClient
@@ -46,7 +47,12 @@ logger = logging.getSmarterLogger(
 logger_prefix = logging.formatted_text(__name__)
 
 
-@cache_results()
+def _tags(user_profile_id: int) -> list[str]:
+    """Return the cache tags of the LLMClients of a user profile, see ``smarter.lib.cache.tags``."""
+    return [model_tag(LLMClient), model_tag(UserProfile, user_profile_id)]
+
+
+@cache_results(tags=_tags)
 def _get_cached_llm_clients_owned_by_user_profile(user_profile_id: int) -> models.QuerySet[LLMClient]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
     retval = LLMClient.objects.owned_by(user_profile.user)  # type: ignore
@@ -91,7 +97,7 @@ def invalidate_cached_llm_clients_owned_by_user_profile(user_profile: UserProfil
     _get_cached_llm_clients_owned_by_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_llm_clients_shared_with_user_profile(user_profile_id: int) -> models.QuerySet[LLMClient]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
     retval = LLMClient.objects.shared_with(user_profile.user)  # type: ignore
@@ -135,7 +141,7 @@ def invalidate_cached_llm_clients_shared_with_user_profile(user_profile: UserPro
     _get_cached_llm_clients_shared_with_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_llm_clients_available_to_user_profile(user_profile_id) -> models.QuerySet[LLMClient]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
     retval = LLMClient.objects.with_read_permission_for(user_profile.user)  # type: ignore
@@ -0,0 +1,77 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import smarter.common.mixins.helper_mixin
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm_client", "0002_initial"),
+        ("vectorstore", "0003_vectorstoredocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LLMClientVectorstore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, db_index=True, null=True),
+                ),
+                (
+                    "top_k",
+                    models.PositiveIntegerField(default=5, help_text="The maximum number of chunks to retrieve."),
+                ),
+                (
+                    "max_context_tokens",
+                    models.PositiveIntegerField(
+                        default=1500,
+                        help_text="The maximum number of tokens of retrieved context to add to the prompt.",
+                    ),
+                ),
+                (
+                    "hybrid",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Use hybrid lexical and vector retrieval rather than vector retrieval only.",
+                    ),
+                ),
+                (
+                    "llm_client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="llm_client.llmclient",
+                    ),
+                ),
+                (
+                    "vectorstore_meta",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="vectorstore.vectorstoremeta",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "LLMClient Vectorstores",
+                "unique_together": {("llm_client", "vectorstore_meta")},
+            },
+            bases=(models.Model, smarter.common.mixins.helper_mixin.SmarterHelperMixin),
+        ),
+    ]
@@ -8,6 +8,7 @@ from .llm_client_functions import LLMClientFunctions
 from .llm_client_helper import LLMClientHelper
 from .llm_client_plugin import LLMClientPlugin
 from .llm_client_requests import LLMClientRequests
+from .llm_client_vectorstore import LLMClientVectorstore
 from .utils import get_cached_llm_client_by_request
 
 __all__ = [
@@ -17,6 +18,7 @@ __all__ = [
     "LLMClientFunctions",
     "LLMClientPlugin",
     "LLMClientRequests",
+    "LLMClientVectorstore",
     "LLMClient",
     "LLMClientHelper",
     "get_cached_llm_client_by_request",
@@ -0,0 +1,102 @@
+"""LLMClient vectorstore model for retrieval-augmented prompts."""
+
+from typing import List
+
+from django.db import models
+
+from smarter.apps.vectorstore.models import VectorstoreMeta
+from smarter.lib import logging
+from smarter.lib.cache import cache_results
+from smarter.lib.cache.tags import model_tag
+from smarter.lib.django.models import TimestampedModel
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+from .llm_client import LLMClient
+
+logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.LLM_CLIENT_LOGGING])
+
+
+class LLMClientVectorstore(TimestampedModel):
+    """
+    Attaches a vector database to a LLMClient for retrieval-augmented prompts.
+
+    Before the first request of each prompt, the chat provider queries every
+    vectorstore that is attached to the LLMClient with the user's input, and
+    adds the best matching chunks to the prompt as context, up to a token
+    budget per vectorstore.
+
+    **Model Relationships**
+
+    - Each LLMClientVectorstore is linked to one :class:`LLMClient` instance.
+    - Each LLMClientVectorstore references one :class:`VectorstoreMeta` instance.
+
+    **Usage Example**
+
+    .. code-block:: python
+
+        # attach a vectorstore to an llm_client, with hybrid lexical and vector retrieval
+        LLMClientVectorstore.objects.create(llm_client=my_llm_client, vectorstore_meta=my_vectorstore, hybrid=True)
+
+    **Notes**
+
+    - Uniqueness is enforced for each (llm_client, vectorstore_meta) pair.
+    - See :mod:`smarter.apps.vectorstore.retrieval` for the retrieval stage.
+    """
+
+    # pylint: disable=C0115
+    class Meta:
+        verbose_name_plural = "LLMClient Vectorstores"
+        unique_together = ("llm_client", "vectorstore_meta")
+
+    #: The LLMClient instance that the vectorstore is attached to.
+    llm_client = models.ForeignKey(LLMClient, on_delete=models.CASCADE)
+
+    #: The vector database that is queried for context.
+    vectorstore_meta = models.ForeignKey(VectorstoreMeta, on_delete=models.CASCADE)
+
+    #: The maximum number of chunks to retrieve.
+    top_k = models.PositiveIntegerField(default=5, help_text="The maximum number of chunks to retrieve.")
+
+    #: The maximum number of tokens of retrieved context to add to the prompt.
+    max_context_tokens = models.PositiveIntegerField(
+        default=1500, help_text="The maximum number of tokens of retrieved context to add to the prompt."
+    )
+
+    #: Use hybrid lexical and vector retrieval rather than vector retrieval only.
+    hybrid = models.BooleanField(
+        default=False, help_text="Use hybrid lexical and vector retrieval rather than vector retrieval only."
+    )
+
+    def __str__(self):
+        return f"{self.llm_client} - {self.vectorstore_meta}"
+
+    @classmethod
+    def vectorstores(cls, llm_client: LLMClient) -> List["LLMClientVectorstore"]:
+        """
+        Returns the vectorstores that are attached to the given LLMClient.
+
+        Results are cached, and are invalidated when any LLMClientVectorstore or
+        VectorstoreMeta is saved or deleted, because they are read on every prompt.
+
+        :param llm_client: The LLMClient instance to retrieve vectorstores for.
+        :returns: List of LLMClientVectorstore instances, with their vector databases.
+        :rtype: List[LLMClientVectorstore]
+        """
+        if not llm_client:
+            return []
+        return _get_cached_vectorstores(llm_client.pk)
+
+
+def _tags(llm_client_id: int) -> list[str]:
+    """Return the cache tags of the vectorstores of a LLMClient, see ``smarter.lib.cache.tags``."""
+    return [model_tag(LLMClientVectorstore), model_tag(VectorstoreMeta)]
+
+
+@cache_results(tags=_tags)
+def _get_cached_vectorstores(llm_client_id: int) -> List[LLMClientVectorstore]:
+    return list(LLMClientVectorstore.objects.filter(llm_client_id=llm_client_id).select_related("vectorstore_meta"))
+
+
+__all__ = [
+    "LLMClientVectorstore",
+]
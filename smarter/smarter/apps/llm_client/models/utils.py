@@ -37,7 +37,7 @@ def get_cached_llm_client_by_request(request: HttpRequest) -> Optional[LLMClient
     """
 
     # pylint: disable=W0613
-    @cache_results()
+    @cache_results(local=True, stale_timeout=60, early_expiration=1.0)
     def get_llm_client_by_url(url: str, class_name: str) -> Optional[LLMClient]:
         """
         We use the request URL as the cache key to avoid redundant.
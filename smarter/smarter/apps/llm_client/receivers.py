@@ -3,12 +3,14 @@
 # pylint: disable=W0613,C0115
 from typing import Optional
 
-from django.db.models.signals import post_save, pre_delete
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from smarter.apps.plugin.models import PluginMeta
 from smarter.apps.plugin.signals import plugin_deleting
 from smarter.lib import json, logging
+from smarter.lib.cache.tags import invalidate_tags, model_tag
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 from smarter.lib.manifest.broker import AbstractBroker
 
@@ -20,6 +22,7 @@ from .models import (
     LLMClientFunctions,
     LLMClientPlugin,
     LLMClientRequests,
+    LLMClientVectorstore,
 )
 from .serializers import LLMClientSerializer
 from .signals import (
@@ -155,6 +158,14 @@ def llm_client_plugin_saved(sender, instance: LLMClientPlugin, created: bool, **
         logger.info("%s - updated %s", prefix, instance.plugin_meta.name)
 
 
+@receiver(post_save, sender=LLMClientVectorstore)
+@receiver(post_delete, sender=LLMClientVectorstore)
+def llm_client_vectorstore_changed(sender, instance: LLMClientVectorstore, **kwargs):
+    """Invalidate the cached vectorstores of LLMClients, once the transaction commits."""
+    tag = model_tag(LLMClientVectorstore)
+    transaction.on_commit(lambda: invalidate_tags(tag))
+
+
 @receiver(post_save, sender=LLMClientFunctions)
 def llm_client_functions_saved(sender, instance: LLMClientFunctions, created: bool, **kwargs):
     """Log creation or update of LLMClientFunctions."""
@@ -18,6 +18,7 @@ from .utils import is_taskable
 from .verify_certificate import verify_certificate
 from .verify_custom_domain import verify_custom_domain
 from .verify_domain import verify_domain
+from .warm_up_llm_client import warm_up_llm_client
 
 __all__ = [
     "aggregate_llm_client_history",
@@ -32,6 +33,7 @@ __all__ = [
     "verify_certificate",
     "verify_custom_domain",
     "verify_domain",
+    "warm_up_llm_client",
     "LLMClientCustomDomainExists",
     "LLMClientCustomDomainNotFound",
     "LLMClientTaskError",
@@ -70,6 +70,7 @@ from smarter.workers.celery import app
 
 from .utils import is_taskable
 from .verify_domain import verify_domain
+from .warm_up_llm_client import warm_up_llm_client
 
 logger = logging.getSmarterLogger(
     __name__, any_switches=[SmarterWaffleSwitches.TASK_LOGGING, SmarterWaffleSwitches.LLM_CLIENT_LOGGING]
@@ -98,7 +99,8 @@ def deploy_default_api(llm_client_id: int, with_domain_verification: bool = True
     6. Verifies ingress resources and certificate issuance.
     7. Handles domain verification if requested.
     8. Sends post-deploy and deployment status signals.
-    9. Notifies the account owner by email upon successful deployment.
+    9. Queues a warm-up of the llm_client's plugins and connections.
+    10. Notifies the account owner by email upon successful deployment.
 
     Parameters
     ----------
@@ -213,6 +215,7 @@ def deploy_default_api(llm_client_id: int, with_domain_verification: bool = True
             domain_name,
             task_id,
         )
+        warm_up_llm_client.delay(llm_client.id)
         post_deploy_default_api.send(
             sender=deploy_default_api,
             llm_client_id=llm_client_id,
@@ -366,6 +369,7 @@ def deploy_default_api(llm_client_id: int, with_domain_verification: bool = True
     llm_client.save(asynchronous=True)
     llm_client_deployed.send(sender=deploy_default_api, llm_client=llm_client)
     logger.info("%s LLMClient %s has been deployed to %s task_id: %s", fn_name, llm_client.name, domain_name, task_id)
+    warm_up_llm_client.delay(llm_client.id)
 
     # send an email to the account owner to notify them that the llm_client has been deployed
     subject = f"Your Smarter llm_client {llm_client.url} has been deployed"
@@ -0,0 +1,65 @@
+"""
+Celery task for warming up a deployed llm_client.
+
+Main Tasks
+----------
+
+- warm_up_llm_client(llm_client_id):
+    Hydrates the llm_client's plugins into the shared cache and opens, and so validates, their connections.
+
+Configuration
+-------------
+
+Celery task behavior (queue) is controlled by `smarter_settings`. Warm-up is
+bounded by `smarter_settings.llm_client_warmup_timeout` and is not retried,
+because errors are reported rather than raised.
+
+Usage
+-----
+
+    warm_up_llm_client.delay(llm_client_id)
+
+See :mod:`smarter.apps.llm_client.warmup`.
+"""
+
+from typing import Optional
+
+from smarter.apps.llm_client.models import LLMClient
+from smarter.apps.llm_client.warmup import Warmup
+from smarter.common.conf import smarter_settings
+from smarter.lib import logging
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.workers.celery import app
+
+logger = logging.getSmarterLogger(
+    __name__, any_switches=[SmarterWaffleSwitches.TASK_LOGGING, SmarterWaffleSwitches.LLM_CLIENT_LOGGING]
+)
+logger_prefix = logging.formatted_text(__name__)
+
+
+@app.task(queue=smarter_settings.llm_client_tasks_celery_task_queue)
+def warm_up_llm_client(llm_client_id: int) -> Optional[dict]:
+    """
+    Warm up the plugins and connections of an llm_client.
+
+    Parameters
+    ----------
+    llm_client_id : int
+        The primary key of the LLMClient to warm up.
+
+    Returns
+    -------
+    dict or None
+        The warm-up report, or None if the LLMClient does not exist.
+    """
+    fn_name = logger_prefix + ".warm_up_llm_client()"
+    try:
+        llm_client = LLMClient.objects.get(id=llm_client_id)
+    except LLMClient.DoesNotExist:
+        logger.error("%s LLMClient %s not found. Nothing to do, returning.", fn_name, llm_client_id)
+        return None
+
+    report = Warmup().run(llm_clients=[llm_client])
+    for error in report.errors:
+        logger.warning("%s llm_client %s: %s", fn_name, llm_client.name, error)
+    return report.to_json()
@@ -0,0 +1,65 @@
+"""Test the LLMClient warm-up."""
+
+from unittest.mock import MagicMock, patch
+
+from smarter.apps.llm_client.warmup import Warmup, WarmupStatus
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestWarmup(SmarterTestBase):
+    """Test Warmup.run() and readiness."""
+
+    def mock_plugin(self, name: str, connection=None) -> MagicMock:
+        plugin = MagicMock()
+        plugin.name = name
+        plugin.ready = True
+        plugin.plugin_data.connection = connection
+        return plugin
+
+    def mock_connection(self, identity: str, reachable: bool = True) -> MagicMock:
+        connection = MagicMock()
+        connection.name = identity
+        connection.connection_identity = identity
+        connection.warm_up.return_value = reachable
+        return connection
+
+    def test_run(self):
+        shared = self.mock_connection("SqlConnection:1")
+        unreachable = self.mock_connection("ApiConnection:2", reachable=False)
+        plugins = [
+            self.mock_plugin("a", connection=shared),
+            self.mock_plugin("b", connection=shared),
+            self.mock_plugin("c", connection=unreachable),
+        ]
+        llm_client = MagicMock()
+        llm_client.name = "test_llm_client"
+
+        warmup = Warmup()
+        self.assertFalse(warmup.is_ready)
+        with patch("smarter.apps.llm_client.warmup.LLMClientPlugin.plugins", return_value=plugins):
+            report = warmup.run(llm_clients=[llm_client])
+
+        self.assertTrue(warmup.is_ready)
+        self.assertEqual(report.status, WarmupStatus.READY)
+        self.assertEqual((report.llm_clients, report.plugins, report.connections), (1, 3, 1))
+        shared.warm_up.assert_called_once()
+        self.assertEqual(len(report.errors), 1)
+        self.assertIsNotNone(report.to_json()["duration"])
+
+    def test_errors_do_not_block_readiness(self):
+        llm_client = MagicMock()
+        llm_client.name = "test_llm_client"
+        warmup = Warmup()
+        with patch("smarter.apps.llm_client.warmup.LLMClientPlugin.plugins", side_effect=ValueError("boom")):
+            report = warmup.run(llm_clients=[llm_client])
+        self.assertTrue(warmup.is_ready)
+        self.assertEqual(report.llm_clients, 0)
+        self.assertIn("boom", report.errors[0])
+
+    def test_disabled(self):
+        warmup = Warmup()
+        with patch("smarter.apps.llm_client.warmup.smarter_settings") as settings:
+            settings.llm_client_warmup_enabled = False
+            warmup.start()
+        self.assertEqual(warmup.report.status, WarmupStatus.DISABLED)
+        self.assertTrue(warmup.is_ready)
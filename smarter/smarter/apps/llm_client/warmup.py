@@ -0,0 +1,210 @@
+"""
+Warm-up of deployed LLMClients.
+
+The first prompt that a worker serves after a deploy or pod restart otherwise
+pays for plugin hydration, connection setup, SSH tunnels and cold caches.
+Warm-up does that work ahead of time, for every deployed LLMClient:
+
+- hydrates each plugin from the cache-backed ORM lookups, exactly as a prompt
+  request does, which also populates the shared Redis entries,
+- builds each plugin's tool schema and selector, and its compiled SQL
+  statement or static return data index,
+- checks each plugin's connection, and opens the process-wide HTTP session
+  of API connections. See :meth:`ConnectionBase.warm_up`.
+
+Each web worker runs warm-up in a background thread when it starts, and the
+readiness endpoint reports HTTP 503 until it is complete, so that Kubernetes
+routes traffic only to warm pods. Warm-up is bounded by
+``smarter_settings.llm_client_warmup_timeout`` and never fails: errors are
+logged and reported, and the worker becomes ready regardless.
+
+The ``warm_up_llm_client`` Celery task runs the same steps when an LLMClient
+is deployed, which validates its connections and fills the shared caches.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Optional
+
+from django.db import connections
+
+from smarter.common.conf import smarter_settings
+from smarter.lib import logging
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+from .models import LLMClient, LLMClientPlugin
+
+logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.LLM_CLIENT_LOGGING])
+logger_prefix = logging.formatted_text(__name__)
+
+
+class WarmupStatus:
+    """Warm-up states."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    DISABLED = "disabled"
+
+
+@dataclass
+class WarmupReport:
+    """The outcome of a warm-up run."""
+
+    status: str = WarmupStatus.PENDING
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    llm_clients: int = 0
+    plugins: int = 0
+    connections: int = 0
+    timed_out: bool = False
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Return the duration of the run in seconds, or None if it has not finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round(self.finished_at - self.started_at, 3)
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dict."""
+        return {**asdict(self), "duration": self.duration}
+
+
+class Warmup:
+    """
+    Warms up the plugins and connections of deployed LLMClients.
+
+    One instance per worker process is held in :data:`warmup`.
+    """
+
+    def __init__(self):
+        self.report = WarmupReport()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._warm_connections: set[str] = set()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.report.status}>"
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True once warm-up has finished, or if it is disabled."""
+        return self.report.status in (WarmupStatus.READY, WarmupStatus.DISABLED)
+
+    def start(self) -> None:
+        """Run warm-up in a background thread, once per process."""
+        if not smarter_settings.llm_client_warmup_enabled:
+            self.report.status = WarmupStatus.DISABLED
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name="smarter-warmup", daemon=True)
+            self._thread.start()
+
+    def run(self, llm_clients: Optional[Iterable[LLMClient]] = None) -> WarmupReport:
+        """
+        Warm up ``llm_clients``, or every deployed LLMClient.
+
+        :param llm_clients: The LLMClients to warm up. Defaults to all deployed LLMClients,
+            most recently updated first.
+        :return: The report of this run.
+        :rtype: WarmupReport
+        """
+        report = self.report
+        report.status = WarmupStatus.RUNNING
+        report.started_at = time.time()
+        deadline = time.monotonic() + smarter_settings.llm_client_warmup_timeout
+        try:
+            if llm_clients is None:
+                llm_clients = LLMClient.objects.filter(deployed=True).order_by("-updated_at")
+            for llm_client in llm_clients:
+                if time.monotonic() >= deadline:
+                    report.timed_out = True
+                    break
+                self.warm_up_llm_client(llm_client, deadline=deadline)
+        # pylint: disable=W0718
+        except Exception as e:
+            report.errors.append(str(e))
+            logger.error("%s.run() warm-up failed: %s", logger_prefix, e)
+        finally:
+            report.finished_at = time.time()
+            report.status = WarmupStatus.READY
+            # this thread's Django database connections are not reused.
+            if threading.current_thread() is self._thread:
+                connections.close_all()
+        logger.info(
+            "%s.run() warmed up %s llm_clients, %s plugins and %s connections in %ss with %s errors%s",
+            logger_prefix,
+            report.llm_clients,
+            report.plugins,
+            report.connections,
+            report.duration,
+            len(report.errors),
+            " before timing out" if report.timed_out else "",
+        )
+        return report
+
+    def warm_up_llm_client(self, llm_client: LLMClient, deadline: Optional[float] = None) -> None:
+        """
+        Warm up the plugins and connections of one LLMClient.
+
+        :param llm_client: The LLMClient to warm up.
+        :param deadline: A :func:`time.monotonic` deadline after which remaining plugins are skipped.
+        """
+        report = self.report
+        try:
+            plugins = LLMClientPlugin.plugins(llm_client=llm_client)
+        # pylint: disable=W0718
+        except Exception as e:
+            report.errors.append(f"{llm_client.name}: {e}")
+            logger.warning("%s.warm_up_llm_client() %s: %s", logger_prefix, llm_client.name, e)
+            return
+        report.llm_clients += 1
+        for plugin in plugins:
+            if deadline is not None and time.monotonic() >= deadline:
+                report.timed_out = True
+                return
+            try:
+                if not plugin.ready:
+                    continue
+                # these are built lazily on the first prompt that selects the plugin.
+                _ = plugin.custom_tool
+                _ = plugin.plugin_selector
+                _ = plugin.plugin_prompt
+                plugin_data = plugin.plugin_data
+                for name in ("compiled_statement", "return_data_lookup"):
+                    getattr(plugin_data, name, None)
+                report.plugins += 1
+                connection = getattr(plugin_data, "connection", None)
+                if connection is not None:
+                    self.warm_up_connection(connection)
+            # pylint: disable=W0718
+            except Exception as e:
+                report.errors.append(f"{llm_client.name}/{plugin.name}: {e}")
+                logger.warning("%s.warm_up_llm_client() %s/%s: %s", logger_prefix, llm_client.name, plugin.name, e)
+
+    def warm_up_connection(self, connection) -> None:
+        """
+        Warm up a plugin connection, once per run.
+
+        :param connection: A :class:`ConnectionBase` instance.
+        """
+        identity = connection.connection_identity
+        if identity in self._warm_connections:
+            return
+        self._warm_connections.add(identity)
+        if connection.warm_up():
+            self.report.connections += 1
+        else:
+            self.report.errors.append(f"{connection.name}: connection is not reachable")
+
+
+warmup = Warmup()
+"""This worker process's warm-up state."""
+
+
+__all__ = ["Warmup", "WarmupReport", "WarmupStatus", "warmup"]
@@ -36,6 +36,8 @@ from django.db import models
 from smarter.apps.account.models.user_profile import UserProfile
 from smarter.lib import logging
 from smarter.lib.cache import cache_results
+from smarter.lib.cache.codec import materialize
+from smarter.lib.cache.tags import model_tag
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
 from .models import PluginMeta
@@ -47,10 +49,15 @@ logger = logging.getSmarterLogger(
 logger_prefix = logging.formatted_text(__name__)
 
 
-@cache_results()
+def _tags(user_profile_id: int) -> list[str]:
+    """Return the cache tags of the PluginMetas of a user profile, see ``smarter.lib.cache.tags``."""
+    return [model_tag(PluginMeta), model_tag(UserProfile, user_profile_id)]
+
+
+@cache_results(tags=_tags)
 def _get_cached_plugins_owned_by_user_profile(user_profile_id: int) -> models.QuerySet[PluginMeta]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
-    retval = PluginMeta.objects.owned_by(user_profile.user)  # type: ignore
+    retval = materialize(PluginMeta.objects.owned_by(user_profile.user))  # type: ignore
     logger.debug(
         "%s.post() Fetching and caching PluginMetas owned by user: %s",
         logger_prefix,
@@ -92,10 +99,10 @@ def invalidate_cached_plugins_owned_by_user_profile(user_profile: UserProfile) -
     _get_cached_plugins_owned_by_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_plugins_shared_with_user_profile(user_profile_id: int) -> models.QuerySet[PluginMeta]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
-    retval = PluginMeta.objects.shared_with(user_profile.user)  # type: ignore
+    retval = materialize(PluginMeta.objects.shared_with(user_profile.user))  # type: ignore
     logger.debug(
         "%s.post() Fetching and caching PluginMetas shared with user: %s",
         logger_prefix,
@@ -136,10 +143,10 @@ def invalidate_cached_plugins_shared_with_user_profile(user_profile: UserProfile
     _get_cached_plugins_shared_with_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_plugins_available_to_user_profile(user_profile_id) -> models.QuerySet[PluginMeta]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
-    retval = PluginMeta.objects.with_read_permission_for(user_profile.user)  # type: ignore
+    retval = materialize(PluginMeta.objects.with_read_permission_for(user_profile.user))  # type: ignore
     logger.debug(
         "%s.post() Fetching and caching PluginMetas available to user: %s",
         logger_prefix,
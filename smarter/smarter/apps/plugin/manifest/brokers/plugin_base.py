@@ -829,6 +829,9 @@ class SAMPluginBaseBroker(AbstractBroker):
             model=self.plugin_prompt_orm.model,
             temperature=self.plugin_prompt_orm.temperature,
             maxTokens=self.plugin_prompt_orm.max_completion_tokens,
+            responseMaxTokens=self.plugin_prompt_orm.response_max_tokens,
+            responseStrategy=self.plugin_prompt_orm.response_strategy,
+            responseColumns=self.plugin_prompt_orm.response_columns,
         )
         return plugin_prompt
 
@@ -38,6 +38,22 @@ class SAMPluginCommonSpecSelectorKeyDirectiveValues(SmarterEnumAbstract):
     LLM = "llm"
 
 
+class SAMPluginCommonSpecPromptResponseStrategyValues(SmarterEnumAbstract):
+    """Smarter API Plugin Spec Prompt responseStrategy values enumeration."""
+
+    # keep as many leading rows as fit in the token budget
+    TRUNCATE = "truncate"
+
+    # keep only the configured responseColumns, then truncate
+    PROJECT = "project"
+
+    # re-encode rows as a compact columns/rows table, then truncate
+    TABULAR = "tabular"
+
+    # replace the rows with per-column statistics and a sample of rows
+    SUMMARIZE = "summarize"
+
+
 ###############################################################################
 # Enums for manifest keys in error handlers and other on-screen messages
 ###############################################################################
@@ -81,6 +97,9 @@ class SAMPluginCommonSpecPromptKeys(SmarterEnumAbstract):
     MODEL = "model"
     TEMPERATURE = "temperature"
     MAXTOKENS = "maxTokens"
+    RESPONSEMAXTOKENS = "responseMaxTokens"
+    RESPONSESTRATEGY = "responseStrategy"
+    RESPONSECOLUMNS = "responseColumns"
 
 
 class SAMStaticPluginSpecDataKeys(SmarterEnumAbstract):
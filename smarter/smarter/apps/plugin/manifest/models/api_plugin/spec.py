@@ -67,6 +67,16 @@ class ApiData(SmarterBasePydanticModel):
         gt=1,
         description="The maximum number of records to return from the API. Default is 100.",
     )
+    timeout: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="The total deadline for the API request in seconds. Overrides the ApiConnection timeout when set.",
+    )
+    cacheTtl: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="How long to cache GET responses in seconds. Overrides the API's Cache-Control and Expires headers when set. 0 disables caching.",
+    )
 
     @field_validator("endpoint")
     def validate_endpoint(cls, v):
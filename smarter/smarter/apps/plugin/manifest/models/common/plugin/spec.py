@@ -8,6 +8,7 @@ from pydantic import Field, field_validator, model_validator
 
 from smarter.apps.plugin.manifest.enum import (
     SAMPluginCommonSpecPromptKeys,
+    SAMPluginCommonSpecPromptResponseStrategyValues,
     SAMPluginCommonSpecSelectorKeyDirectiveValues,
     SAMPluginCommonSpecSelectorKeys,
 )
@@ -148,6 +149,31 @@ class SAMPluginCommonSpecPrompt(SmarterBasePydanticModel):
             "The maximum number of tokens the LLM should generate in the prompt response. "
         ),
     )
+    responseMaxTokens: Optional[int] = Field(
+        None,
+        gt=0,
+        description=(
+            f"{class_identifier}.responseMaxTokens[int]. Optional. "
+            f"The token budget for a single {MANIFEST_KIND} result that is passed back to the LLM. "
+            "Larger results are shaped with responseStrategy. Defaults to the plugin_response_max_tokens setting."
+        ),
+    )
+    responseStrategy: Optional[str] = Field(
+        None,
+        description=(
+            f"{class_identifier}.responseStrategy[str]. Optional. "
+            f"How to shape a {MANIFEST_KIND} result that exceeds responseMaxTokens. "
+            f"Must be one of: {SAMPluginCommonSpecPromptResponseStrategyValues.all()}. "
+            "Defaults to the plugin_response_strategy setting."
+        ),
+    )
+    responseColumns: Optional[List[str]] = Field(
+        None,
+        description=(
+            f"{class_identifier}.responseColumns[list]. Optional. "
+            "The columns or keys to keep from each result row when responseStrategy is 'project'."
+        ),
+    )
 
     @field_validator("provider")
     def validate_provider(cls, v) -> str:
@@ -176,6 +202,15 @@ class SAMPluginCommonSpecPrompt(SmarterBasePydanticModel):
 
         return v
 
+    @field_validator("responseStrategy")
+    def validate_response_strategy(cls, v) -> Optional[str]:
+        if v is None or v in SAMPluginCommonSpecPromptResponseStrategyValues.all():
+            return v
+        err_desc_me_name = SAMPluginCommonSpecPromptKeys.RESPONSESTRATEGY.value
+        raise SAMValidationError(
+            f"Invalid value found in {err_desc_me_name}: '{v}'. Must be one of {SAMPluginCommonSpecPromptResponseStrategyValues.all()}"
+        )
+
     @field_validator("model")
     def validate_model(cls, v) -> str:
         if v is None:
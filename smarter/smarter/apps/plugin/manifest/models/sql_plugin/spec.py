@@ -43,6 +43,16 @@ class SqlData(SmarterBasePydanticModel):
         gt=0,
         description="The maximum number of rows to return from the query. Must be a non-negative integer.",
     )
+    timeout: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="The execution deadline for the query in seconds. Overrides the SqlConnection timeout when set.",
+    )
+    cacheTtl: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="How long to cache query results in seconds. Defaults to the plugin_result_cache_ttl setting. 0 disables caching.",
+    )
 
 
 class SAMSqlPluginSpec(SAMPluginCommonSpec):
@@ -0,0 +1,35 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 09:14
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plugin", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plugindataapi",
+            name="timeout",
+            field=models.IntegerField(
+                blank=True,
+                help_text="The total deadline for the API request in seconds. Overrides the connection timeout when set.",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="plugindatasql",
+            name="timeout",
+            field=models.IntegerField(
+                blank=True,
+                help_text="The execution deadline for the query in seconds. Overrides the connection timeout when set.",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
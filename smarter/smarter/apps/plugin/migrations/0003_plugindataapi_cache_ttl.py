@@ -0,0 +1,25 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 11:02
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plugin", "0002_plugindataapi_timeout_plugindatasql_timeout"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plugindataapi",
+            name="cache_ttl",
+            field=models.IntegerField(
+                blank=True,
+                help_text="How long to cache GET responses in seconds. Overrides the API's Cache-Control and Expires headers when set. 0 disables caching.",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(0)],
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+def stamp_return_data_version(apps, schema_editor):
+    from smarter.apps.plugin.static_index import static_data_version
+
+    PluginDataStatic = apps.get_model("plugin", "PluginDataStatic")
+    for plugin_data in PluginDataStatic.objects.all().iterator():
+        plugin_data.return_data_version = static_data_version(plugin_data.static_data)
+        plugin_data.save(update_fields=["return_data_version"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plugin", "0003_plugindataapi_cache_ttl"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plugindatastatic",
+            name="return_data_version",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="sha256 of the static data. Maintained by save().",
+                max_length=64,
+            ),
+        ),
+        migrations.RunPython(stamp_return_data_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 13:25
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plugin", "0004_plugindatastatic_return_data_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pluginprompt",
+            name="response_columns",
+            field=models.JSONField(
+                blank=True,
+                help_text="The columns or keys to keep from each result row when response_strategy is 'project'.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="pluginprompt",
+            name="response_max_tokens",
+            field=models.IntegerField(
+                blank=True,
+                help_text="The token budget for a single plugin result that is passed back to the LLM. Defaults to the plugin_response_max_tokens setting.",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="pluginprompt",
+            name="response_strategy",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("truncate", "truncate"),
+                    ("project", "project"),
+                    ("tabular", "tabular"),
+                    ("summarize", "summarize"),
+                ],
+                help_text="How to shape a plugin result that exceeds response_max_tokens. Defaults to the plugin_response_strategy setting.",
+                max_length=16,
+                null=True,
+            ),
+        ),
+    ]
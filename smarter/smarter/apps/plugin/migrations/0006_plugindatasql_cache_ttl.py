@@ -0,0 +1,25 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 14:10
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plugin", "0005_pluginprompt_response_shaping"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plugindatasql",
+            name="cache_ttl",
+            field=models.IntegerField(
+                blank=True,
+                help_text="How long to cache query results in seconds. Defaults to the plugin_result_cache_ttl setting. 0 disables caching.",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(0)],
+            ),
+        ),
+    ]
@@ -1,8 +1,8 @@
 """PluginDataApi model for storing API-based plugin data configuration."""
 
 import re
-from typing import Optional, Union
-from urllib.parse import urljoin
+from typing import Any, Optional, Union
+from urllib.parse import quote, urljoin
 
 import requests
 from django.core.validators import MinValueValidator
@@ -10,7 +10,15 @@ from django.db import models
 from pydantic import ValidationError
 
 from smarter.apps.account.models.budget import charge_authorization
+from smarter.apps.connection.exceptions import SmarterConnectionTimeoutError
+from smarter.apps.connection.http_cache import api_response_cache
 from smarter.apps.connection.models import ApiConnection
+from smarter.apps.connection.signals import (
+    api_connection_failed,
+    api_connection_query_attempted,
+    api_connection_query_failed,
+    api_connection_query_success,
+)
 from smarter.apps.plugin.manifest.models.common import (
     RequestHeader,
     TestValue,
@@ -124,6 +132,18 @@ class PluginDataApi(PluginDataBase):
         blank=True,
         null=True,
     )
+    timeout = models.IntegerField(
+        help_text="The total deadline for the API request in seconds. Overrides the connection timeout when set.",
+        validators=[MinValueValidator(1)],
+        blank=True,
+        null=True,
+    )
+    cache_ttl = models.IntegerField(
+        help_text="How long to cache GET responses in seconds. Overrides the API's Cache-Control and Expires headers when set. 0 disables caching.",
+        validators=[MinValueValidator(0)],
+        blank=True,
+        null=True,
+    )
 
     @property
     def url(self) -> str:
@@ -138,35 +158,155 @@ class PluginDataApi(PluginDataBase):
             "body": self.body,
         }
 
-    def prepare_request(self, params: Optional[dict]) -> dict:
-        """Prepare the API request by merging parameters, headers, and body."""
+    @property
+    def request_headers(self) -> dict[str, str]:
+        """Return ``headers`` as a dict of header names and values."""
+        if isinstance(self.headers, dict):
+            return {str(name): str(value) for name, value in self.headers.items()}
+        return {
+            str(header["name"]): str(header.get("value", ""))
+            for header in self.headers or []  # type: ignore  # pylint: disable=not-an-iterable
+            if isinstance(header, dict) and "name" in header
+        }
+
+    @property
+    def request_url_params(self) -> dict[str, str]:
+        """Return ``url_params`` as a dict of query parameter names and values."""
+        if isinstance(self.url_params, dict):
+            return {str(key): str(value) for key, value in self.url_params.items()}
+        return {
+            str(url_param["key"]): str(url_param.get("value", ""))
+            for url_param in self.url_params or []  # type: ignore  # pylint: disable=not-an-iterable
+            if isinstance(url_param, dict) and "key" in url_param
+        }
+
+    def resolve_parameters(self, params: Optional[Union[dict, list]] = None) -> dict[str, Any]:
+        """
+        Validate ``params`` against the parameter definitions.
+
+        Missing arguments fall back to the parameter's declared default.
+
+        :param params: The function call arguments, as a dict, or as a list of
+            ``{"name": ..., "value": ...}`` dicts in the ``test_values`` format.
+        :return: The arguments, with defaults applied and unset arguments removed.
+        :raises SmarterValueError: If an argument is not defined in ``parameters``, a
+            required argument is missing, or a value is not one of the declared enum values.
+        """
+        if isinstance(params, list):
+            params = {tv["name"]: tv.get("value") for tv in params if isinstance(tv, dict) and "name" in tv}
         params = params or {}
+        parameters = self.parameters or {}
+        properties: dict[str, Any] = parameters.get("properties", {})
+        required: list[str] = parameters.get("required", [])
+
+        unknown = [key for key in params if key not in properties]
+        if unknown:
+            raise SmarterValueError(f"Arguments {unknown} are not defined in parameters.")
+
+        values: dict[str, Any] = {}
+        for name, definition in properties.items():
+            value = params.get(name, definition.get("default"))
+            if value is None:
+                if name in required:
+                    raise SmarterValueError(f"Parameter '{name}' is required.")
+                continue
+            enum = definition.get("enum")
+            if enum and str(value) not in [str(v) for v in enum]:
+                raise SmarterValueError(f"Parameter '{name}' value {value!r} must be one of {enum}.")
+            values[name] = value
+        return values
+
+    def prepare_request(self, params: Optional[Union[dict, list]]) -> dict:
+        """
+        Prepare the API request by merging parameters, headers, and body.
+
+        Arguments that appear as ``{placeholder}`` in ``endpoint`` are substituted into the
+        path. All other arguments are sent as query parameters, along with ``url_params``.
+
+        :raises SmarterValueError: If ``params`` is not valid. See :meth:`resolve_parameters`.
+        """
         self.validate_url_params()
+        endpoint = self.endpoint
+        query = self.request_url_params
+        for name, value in self.resolve_parameters(params).items():
+            placeholder = "{" + name + "}"
+            if placeholder in endpoint:
+                endpoint = endpoint.replace(placeholder, quote(str(value), safe=""))
+            else:
+                query[name] = value
 
         request_data = {
-            "url": f"{self.connection.base_url}{self.endpoint}",
-            "headers": self.headers or {},
-            "params": params,
+            "url": f"{self.connection.base_url}{endpoint}",
+            "headers": self.request_headers,
+            "params": query,
             "json": self.body or {},
         }
         return request_data
 
-    def execute_request(self, params: Optional[dict]) -> Union[dict, bool]:
-        """Execute the API request and return the results."""
+    def execute_request(self, params: Optional[Union[dict, list]]) -> Union[dict, list, bool]:
+        """
+        Execute the API request and return the results.
+
+        ``GET`` requests are answered from the HTTP response cache when possible. See
+        :mod:`smarter.apps.connection.http_cache` and :attr:`cache_ttl`. If :attr:`limit`
+        is set, list results are truncated to that many items.
+
+        :raises SmarterValueError: If ``params`` is not valid. See :meth:`resolve_parameters`.
+        :raises SmarterConnectionTimeoutError: If the request does not complete within
+            :attr:`timeout`, or the connection timeout if this is not set.
+        :raises SmarterConnectionUnavailableError: If the connection's circuit breaker is open
+            or it has reached its limit of concurrent executions.
+        """
         request_data = self.prepare_request(params)
+        method = self.method or SmarterHttpMethods.GET
+        connection = self.connection
+        sender = connection.__class__
+        response = None
         try:
-            response = requests.get(**request_data, timeout=self.connection.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            api_connection_query_attempted.send(sender=sender, connection=connection)
+            if method == SmarterHttpMethods.GET:
+                response = api_response_cache.fetch(
+                    connection,
+                    request_data["url"],
+                    params=request_data["params"],
+                    headers=request_data["headers"],
+                    ttl=self.cache_ttl,
+                    timeout=self.timeout,
+                )
+            else:
+                response = connection.request_with_deadline(method, **request_data, timeout=self.timeout)
+            if not response.ok:
+                logger.error(
+                    "%s.execute_request() API request to %s failed with status %s",
+                    self.formatted_class_name,
+                    request_data["url"],
+                    response.status_code,
+                )
+                api_connection_query_failed.send(sender=sender, connection=connection, response=response, error=None)
+                return False
+            retval = response.json()
+            api_connection_query_success.send(sender=sender, connection=connection, response=response)
+        except SmarterConnectionTimeoutError as e:
+            api_connection_query_failed.send(sender=sender, connection=connection, response=response, error=e)
+            raise
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            logger.error("%s.execute_request() API request failed: %s", self.formatted_class_name, e)
+            api_connection_query_failed.send(sender=sender, connection=connection, response=response, error=e)
+            api_connection_failed.send(sender=sender, connection=connection, response=response, error=e)
+            return False
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error("%s.execute_request() API request failed: %s", self.formatted_class_name, e)
+            api_connection_query_failed.send(sender=sender, connection=connection, response=response, error=e)
             return False
+        if self.limit and isinstance(retval, list):
+            retval = retval[: self.limit]
+        return retval
 
-    def test(self) -> Union[dict, bool]:
+    def test(self) -> Union[dict, list, bool]:
         """Test the API request using the test_values in the record."""
         return self.execute_request(self.test_values)
 
-    def sanitized_return_data(self, params: Optional[dict] = None) -> Union[dict, bool]:
+    def sanitized_return_data(self, params: Optional[dict] = None) -> Union[dict, list, bool]:
         """Return a dict by executing the API request with the provided params."""
         logger.info("%s.sanitized_return_data called. - %s", self.formatted_class_name, params)
         return self.execute_request(params)
@@ -1,7 +1,10 @@
 """PluginDataSql model for storing SQL-based plugin data configuration."""
 
+import hashlib
 import re
-from typing import Optional, Union
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Union
 
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -12,7 +15,7 @@ from smarter.apps.connection.models import SqlConnection
 from smarter.apps.plugin.manifest.models.common import TestValue
 from smarter.common.exceptions import SmarterValueError
 from smarter.common.helpers.logger_helpers import formatted_text
-from smarter.lib import logging
+from smarter.lib import json, logging
 from smarter.lib.cache import cache_results
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
@@ -22,6 +25,64 @@ from .plugin_meta import PluginMeta
 logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.PLUGIN_LOGGING])
 logger_prefix = formatted_text(f"{__name__}")
 
+LRU_CACHE_MAXSIZE = 256
+SQL_PLACEHOLDER_PATTERN = re.compile(r"(?P<quote>['\"]?)\{(?P<name>\w+)\}(?P=quote)")
+"""
+Matches ``{name}`` placeholders in a SQL template, including an optional pair of
+enclosing quotes (``'{name}'``), which are redundant once the value is sent as a
+bind parameter.
+"""
+
+
+@dataclass(frozen=True)
+class CompiledSqlStatement:
+    """
+    A SQL plugin template compiled into a driver-parameterized statement.
+
+    ``sql`` uses the ``%s`` paramstyle that Django's database cursors accept for
+    every supported backend, and ``parameter_names`` lists the plugin parameter
+    that feeds each ``%s``, in positional order. A name appears once for every
+    occurrence of its placeholder in the template.
+    """
+
+    sql: str
+    parameter_names: tuple[str, ...]
+
+    @property
+    def fingerprint(self) -> str:
+        """A short, stable hash of the compiled statement text."""
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()[:32]
+
+    def bind(self, values: dict[str, Any]) -> tuple[Any, ...]:
+        """Return the positional bind parameters for ``values``."""
+        return tuple(values.get(name) for name in self.parameter_names)
+
+
+@lru_cache(maxsize=LRU_CACHE_MAXSIZE)
+def compile_sql_template(sql_query: str) -> CompiledSqlStatement:
+    """
+    Compile a SQL plugin template into a :class:`CompiledSqlStatement`.
+
+    Literal ``%`` characters are escaped so that they survive driver-side
+    parameter substitution, and each ``{name}`` placeholder (with or without
+    enclosing quotes) is replaced by a ``%s`` bind marker. Compilation is pure
+    and is cached per process, so each distinct template is compiled once.
+
+    :param sql_query: The SQL template, as stored in ``PluginDataSql.sql_query``.
+    :return: The compiled statement.
+    :rtype: CompiledSqlStatement
+    """
+    sql = sql_query.strip().replace("\n", " ").rstrip(";").rstrip()
+    sql = sql.replace("%", "%%")
+    parameter_names: list[str] = []
+
+    def repl(match: re.Match) -> str:
+        parameter_names.append(match.group("name"))
+        return "%s"
+
+    sql = SQL_PLACEHOLDER_PATTERN.sub(repl, sql)
+    return CompiledSqlStatement(sql=sql, parameter_names=tuple(parameter_names))
+
 
 class PluginDataSql(PluginDataBase):
     """
@@ -79,6 +140,39 @@ class PluginDataSql(PluginDataBase):
         blank=True,
         null=True,
     )
+    timeout = models.IntegerField(
+        help_text="The execution deadline for the query in seconds. Overrides the connection timeout when set.",
+        validators=[MinValueValidator(1)],
+        blank=True,
+        null=True,
+    )
+    cache_ttl = models.IntegerField(
+        help_text="How long to cache query results in seconds. Defaults to the plugin_result_cache_ttl setting. 0 disables caching.",
+        validators=[MinValueValidator(0)],
+        blank=True,
+        null=True,
+    )
+
+    @property
+    def data_version(self) -> str:
+        """
+        Identifies this version of the plugin data, for use in result cache keys.
+
+        :return: The class name, primary key and last-modified time.
+        :rtype: str
+        """
+        updated_at = self.updated_at.isoformat() if self.updated_at else None
+        return f"{self.__class__.__name__}:{self.pk}:{updated_at}"
+
+    @property
+    def compiled_statement(self) -> CompiledSqlStatement:
+        """
+        The driver-parameterized form of ``sql_query``.
+
+        :return: The compiled statement for this plugin's SQL template.
+        :rtype: CompiledSqlStatement
+        """
+        return compile_sql_template(self.sql_query)
 
     def data(self, params: Optional[dict] = None) -> dict:
         return {
@@ -173,6 +267,7 @@ class PluginDataSql(PluginDataBase):
         self.validate_test_values()
         self.validate_all_parameters_in_test_values()
         self.validate_all_placeholders_in_parameters()
+        compile_sql_template(self.sql_query)
 
         return True
 
@@ -197,10 +292,89 @@ class PluginDataSql(PluginDataBase):
 
         return sql
 
-    def execute_query(self, params: Optional[dict]) -> Union[str, bool]:
-        """Execute the SQL query and return the results."""
-        sql = self.prepare_sql(params)
-        return self.connection.execute_query(sql, self.limit)
+    def coerce_parameter(self, name: str, value: Any) -> Any:
+        """
+        Cast a single argument to the type declared for it in ``parameters``.
+
+        :param name: The parameter name.
+        :param value: The raw argument value, typically as produced by the LLM.
+        :return: The value as a Python type that the database driver can bind.
+        :raises SmarterValueError: If the parameter is undefined, or the value cannot be
+            cast to the declared type or is not one of the declared enum values.
+        """
+        properties = (self.parameters or {}).get("properties", {})
+        if name not in properties:
+            raise SmarterValueError(f"Parameter '{name}' is not defined in parameters.")
+        if value is None:
+            return None
+        definition = properties[name]
+        data_type = definition.get("type")
+        try:
+            if data_type == self.DataTypes.STR:
+                value = str(value)
+            elif data_type == self.DataTypes.NUMBER:
+                if isinstance(value, bool):
+                    raise ValueError("boolean is not a number")
+                value = float(value)
+            elif data_type == self.DataTypes.INT:
+                if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                    raise ValueError("not an integer")
+                value = int(value)
+            elif data_type in (self.DataTypes.BOOL, "boolean"):
+                if isinstance(value, str):
+                    if value.strip().lower() not in ("true", "false", "1", "0"):
+                        raise ValueError("not a boolean")
+                    value = value.strip().lower() in ("true", "1")
+                else:
+                    value = bool(value)
+            elif data_type in (self.DataTypes.OBJECT, self.DataTypes.ARRAY):
+                value = value if isinstance(value, str) else json.dumps(value)
+            elif data_type == self.DataTypes.NULL:
+                value = None
+        except (TypeError, ValueError) as e:
+            raise SmarterValueError(f"Parameter '{name}' value {value!r} is not a valid {data_type}: {e}") from e
+
+        enum = definition.get("enum")
+        if enum and value is not None and str(value) not in [str(v) for v in enum]:
+            raise SmarterValueError(f"Parameter '{name}' value {value!r} must be one of {enum}.")
+        return value
+
+    def bind_parameters(self, params: Optional[Union[dict, list]] = None) -> tuple[Any, ...]:
+        """
+        Validate ``params`` against the parameter definitions and return the
+        positional bind parameters for :attr:`compiled_statement`.
+
+        Missing arguments fall back to the parameter's declared default.
+
+        :param params: A dict of argument values, or a list of ``{"name": ..., "value": ...}``
+            dicts in the format of ``test_values``.
+        :return: A tuple of typed bind parameters.
+        :raises SmarterValueError: If an argument is undefined, invalid, or a required argument is missing.
+        """
+        if isinstance(params, list):
+            params = {tv["name"]: tv.get("value") for tv in params if isinstance(tv, dict) and "name" in tv}
+        params = params or {}
+        parameters = self.parameters or {}
+        properties: dict[str, Any] = parameters.get("properties", {})
+        required: list[str] = parameters.get("required", [])
+
+        unknown = [key for key in params if key not in properties]
+        if unknown:
+            raise SmarterValueError(f"Arguments {unknown} are not defined in parameters.")
+
+        values: dict[str, Any] = {}
+        for name, definition in properties.items():
+            value = params.get(name, definition.get("default"))
+            if value is None and name in required:
+                raise SmarterValueError(f"Parameter '{name}' is required.")
+            values[name] = self.coerce_parameter(name, value)
+        return self.compiled_statement.bind(values)
+
+    def execute_query(self, params: Optional[Union[dict, list]]) -> Union[str, bool]:
+        """Execute the SQL query as a parameterized statement and return the results."""
+        return self.connection.execute_query(
+            self.compiled_statement.sql, self.limit, params=self.bind_parameters(params), timeout=self.timeout
+        )
 
     def test(self) -> Union[str, bool]:
         """Test the SQL query using the test_values in the record."""
@@ -18,6 +18,12 @@ from smarter.lib.django.models import (
 )
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
+from ..static_index import (
+    StaticReturnDataIndex,
+    compile_static_data,
+    get_static_return_data_index,
+    static_data_version,
+)
 from .plugin_data_base import PluginDataBase
 from .plugin_meta import PluginMeta
 
@@ -65,6 +71,54 @@ class PluginDataStatic(PluginDataBase):
     )
     """The JSON data that this plugin returns to OpenAI API when invoked by the user prompt."""
 
+    return_data_version = models.CharField(
+        help_text="sha256 of the static data. Maintained by save().",
+        max_length=64,
+        default="",
+        blank=True,
+        editable=False,
+    )
+    """sha256 of the static data, which keys its compiled lookup table in the in-process registry."""
+
+    def compile_return_data(self) -> dict:
+        """
+        Compile ``static_data`` into a flat ``{inquiry_type: value}`` table of pre-parsed values.
+
+        :return: The compiled lookup table.
+        :rtype: dict
+        :raises SmarterValueError: If ``static_data`` is not a dict or list.
+        """
+        try:
+            return compile_static_data(self.static_data, max_results=smarter_settings.plugin_max_data_results)
+        except ValueError as e:
+            raise SmarterValueError(str(e)) from e
+
+    @property
+    def return_data_lookup(self) -> StaticReturnDataIndex:
+        """
+        Return the immutable, pre-parsed lookup table for this plugin's static data.
+
+        The registry is checked by ``return_data_version`` first, so the static data is
+        compiled once per version and process, and the index is shared by every instance
+        with the same version.
+
+        :return: The lookup table.
+        :rtype: StaticReturnDataIndex
+        :raises SmarterValueError: If ``static_data`` is not a dict or list.
+        """
+        version = self.return_data_version or static_data_version(self.static_data)
+        return get_static_return_data_index(version, self.compile_return_data)
+
+    def save(self, *args, **kwargs):
+        """Stamp the version of the static data before saving."""
+        self.return_data_version = static_data_version(self.static_data)
+        # compiling validates the static data, and registers its index in this process.
+        get_static_return_data_index(self.return_data_version, self.compile_return_data)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "static_data" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "return_data_version"}
+        super().save(*args, **kwargs)
+
     def sanitized_return_data(self, params: Optional[dict] = None) -> Optional[Union[dict, list]]:
         """
         Return the static data for this plugin, either as a dictionary or a list.
@@ -5,6 +5,9 @@ from typing import Union
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from smarter.apps.plugin.manifest.enum import (
+    SAMPluginCommonSpecPromptResponseStrategyValues,
+)
 from smarter.common.conf import settings_defaults
 from smarter.lib import logging
 from smarter.lib.cache import cache_results
@@ -59,6 +62,24 @@ class PluginPrompt(TimestampedModel):
         default=settings_defaults.LLM_DEFAULT_MAX_TOKENS,
         validators=[MinValueValidator(0), MaxValueValidator(8192)],
     )
+    response_max_tokens = models.IntegerField(
+        help_text="The token budget for a single plugin result that is passed back to the LLM. Defaults to the plugin_response_max_tokens setting.",
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(1)],
+    )
+    response_strategy = models.CharField(
+        help_text="How to shape a plugin result that exceeds response_max_tokens. Defaults to the plugin_response_strategy setting.",
+        max_length=16,
+        null=True,
+        blank=True,
+        choices=[(strategy, strategy) for strategy in SAMPluginCommonSpecPromptResponseStrategyValues.all()],
+    )
+    response_columns = models.JSONField(
+        help_text="The columns or keys to keep from each result row when response_strategy is 'project'.",
+        null=True,
+        blank=True,
+    )
 
     def __str__(self) -> str:
         return str(self.plugin.name)
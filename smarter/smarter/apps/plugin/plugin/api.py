@@ -35,6 +35,10 @@ from typing import Any, Optional, Type, Union
 
 from django.core.exceptions import MultipleObjectsReturned
 
+from smarter.apps.connection.exceptions import (
+    SmarterConnectionTimeoutError,
+    SmarterConnectionUnavailableError,
+)
 from smarter.apps.connection.models import ApiConnection
 from smarter.apps.plugin.manifest.enum import (
     SAMPluginCommonMetadataClass,
@@ -69,7 +73,7 @@ from smarter.apps.plugin.serializers import PluginApiSerializer
 from smarter.common.api import SmarterApiVersions
 from smarter.common.conf import settings_defaults
 from smarter.common.const import SMARTER_ADMIN_USERNAME
-from smarter.common.exceptions import SmarterConfigurationError
+from smarter.common.exceptions import SmarterConfigurationError, SmarterValueError
 from smarter.common.utils import to_snake_case
 from smarter.lib import json
 from smarter.lib.django import waffle
@@ -697,38 +701,99 @@ class ApiPlugin(PluginBase):
         super().create()
 
     def tool_call_fetch_plugin_response(
-        self, function_args: Union[dict[str, Any], list]
+        self, function_args: Union[dict[str, Any], list, str]
     ) -> Optional[Union[dict, list, str]]:
         """
-        Fetch information from a Plugin object.
+        Fetch information from the remote API for an LLM tool call.
 
-        :param function_args: The function arguments to pass to the plugin.
-        :type function_args: dict[str, Any]
-        :return: The response from the plugin.
-        :rtype: Optional[str]
-        :raises NotImplementedError: If the method is not implemented in a subclass.
+        This method processes the arguments received from an OpenAI function call,
+        validates them against the plugin's parameter definitions, sends the request
+        on the connection's pooled HTTP session, and returns the result. ``GET`` responses
+        are served from the HTTP response cache when they are still fresh, and are
+        revalidated with the remote API when they are not. See
+        :mod:`smarter.apps.connection.http_cache`.
+
+        See the OpenAI documentation:
+        https://platform.openai.com/docs/assistants/tools/function-calling/quickstart
+
+        :param function_args: Arguments for the function call, as a dict, list, or JSON string.
+        :return: The API response, a structured timeout result if the API did not respond
+            in time, or an empty string if the request failed.
+        :raises SmarterApiPluginError: If plugin data or the API connection is invalid, or arguments are malformed.
         """
-        raise NotImplementedError("tool_call_fetch_plugin_response() must be implemented in a subclass of PluginBase.")
+        logger.debug("%s.tool_call_fetch_plugin_response() called.", self.formatted_class_name)
+
+        if not self.plugin_data:
+            raise SmarterApiPluginError(
+                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} plugin data is not available."
+            )
+        if not isinstance(self.plugin_data.connection, ApiConnection):
+            raise SmarterApiPluginError(
+                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} plugin data ApiConnection is not a valid ApiConnection instance."
+            )
+
+        function_args = function_args or []
+        if isinstance(function_args, str):
+            try:
+                function_args = json.loads(function_args)
+            except json.JSONDecodeError as e:
+                raise SmarterApiPluginError(
+                    f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} function_args is not a valid JSON string. Error: {e}"
+                ) from e
+        if isinstance(function_args, dict):
+            function_args = [function_args]
+
+        if not isinstance(function_args, list):
+            raise SmarterApiPluginError(
+                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} function_args must be a dict or a JSON string."
+            )
+
+        # combine the list of dictionaries into a single dictionary
+        params = {}
+        for d in function_args:
+            params.update(d)
+
+        try:
+            retval = self.plugin_data.execute_request(params)
+        except SmarterValueError as e:
+            raise SmarterApiPluginError(
+                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} invalid function_args {params}: {e}"
+            ) from e
+        except (SmarterConnectionTimeoutError, SmarterConnectionUnavailableError) as e:
+            logger.warning("%s.tool_call_fetch_plugin_response() %s: %s", self.formatted_class_name, self.name, e)
+            return e.tool_result()
+
+        if retval is False:
+            logger.warning(
+                "%s.tool_call_fetch_plugin_response() API request failed. Returning empty string.",
+                self.formatted_class_name,
+            )
+            return ""
+        if isinstance(retval, list) and len(retval) > MAX_API_RESULTS:
+            retval = retval[:MAX_API_RESULTS]
+        return retval
 
-    # pylint: disable=W0613
     def apply(self, function_args: dict[str, Any]) -> Optional[str]:
         """
         Apply the plugin to the function arguments.
 
         :param function_args: The function arguments to pass to the plugin.
         :type function_args: dict[str, Any]
-        :return: The response from the plugin.
+        :return: The response from the plugin, as a JSON string.
         :rtype: Optional[str]
+        :raises SmarterApiPluginError: If the user is not an account admin, or the request is invalid.
         :raises SmarterConfigurationError: If the plugin is not ready.
-        :raises NotImplementedError: If the method is not implemented in a subclass.
         """
         if not self.user or not self.user.is_staff:
-            raise SmarterApiPluginError("Only account admins can apply static plugins.")
+            raise SmarterApiPluginError("Only account admins can apply api plugins.")
 
         if not self.ready:
             raise SmarterConfigurationError(f"{self.name} PluginDataApi.apply() error: Plugin is not ready.")
 
-        raise NotImplementedError("apply() must be implemented in a subclass of PluginBase.")
+        retval = self.tool_call_fetch_plugin_response(function_args)
+        if retval is None or isinstance(retval, str):
+            return retval
+        return json.dumps(retval)
 
     def to_json(self, version: str = "v1") -> Optional[dict[str, Any]]:
         """
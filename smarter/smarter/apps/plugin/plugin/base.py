@@ -993,6 +993,9 @@ class PluginBase(ABC, AccountMixin):
                     model=self.manifest.spec.prompt.model,
                     temperature=self.manifest.spec.prompt.temperature,
                     max_completion_tokens=self.manifest.spec.prompt.maxTokens,
+                    response_max_tokens=self.manifest.spec.prompt.responseMaxTokens,
+                    response_strategy=self.manifest.spec.prompt.responseStrategy,
+                    response_columns=self.manifest.spec.prompt.responseColumns,
                 )
                 logger.warning(
                     "%s.plugin_prompt() PluginPrompt did not exist for plugin %s %s %s. Created from manifest.",
@@ -1038,6 +1041,15 @@ class PluginBase(ABC, AccountMixin):
                     "max_completion_tokens": (
                         self.manifest.spec.prompt.maxTokens if self.manifest and self.manifest.spec else None
                     ),
+                    "response_max_tokens": (
+                        self.manifest.spec.prompt.responseMaxTokens if self.manifest and self.manifest.spec else None
+                    ),
+                    "response_strategy": (
+                        self.manifest.spec.prompt.responseStrategy if self.manifest and self.manifest.spec else None
+                    ),
+                    "response_columns": (
+                        self.manifest.spec.prompt.responseColumns if self.manifest and self.manifest.spec else None
+                    ),
                 }
         return self._plugin_prompt_django_model
 
@@ -30,12 +30,15 @@ A PLugin that uses a remote SQL database server to retrieve its return data.
 """
 
 import logging
-import re
 from datetime import datetime
 from typing import Any, Optional, Type, Union
 
 from django.core.exceptions import MultipleObjectsReturned
 
+from smarter.apps.connection.exceptions import (
+    SmarterConnectionTimeoutError,
+    SmarterConnectionUnavailableError,
+)
 from smarter.apps.connection.models import SqlConnection
 from smarter.apps.plugin.manifest.enum import (
     SAMPluginCommonMetadataClass,
@@ -61,14 +64,14 @@ from smarter.apps.plugin.manifest.models.sql_plugin.spec import (
     TestValue,
 )
 from smarter.apps.plugin.models import PluginDataSql, PluginMeta
+from smarter.apps.plugin.result_cache import PluginResultCache
 from smarter.apps.plugin.serializers import PluginSqlSerializer
 from smarter.common.api import SmarterApiVersions
 from smarter.common.conf import settings_defaults
 from smarter.common.const import SMARTER_ADMIN_USERNAME
-from smarter.common.exceptions import SmarterConfigurationError
+from smarter.common.exceptions import SmarterConfigurationError, SmarterValueError
 from smarter.common.utils import to_snake_case
 from smarter.lib import json
-from smarter.lib.cache import cache_results
 from smarter.lib.django import waffle
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 from smarter.lib.logging import WaffleSwitchedLoggerWrapper
@@ -104,7 +107,7 @@ class SqlPlugin(PluginBase):
 
         - Accepts plugin configuration via manifest or ORM model.
         - Validates and recasts parameter definitions to conform to OpenAI function calling schema.
-        - Interpolates user-provided arguments into SQL queries, with basic escaping for safety.
+        - Compiles the SQL template once into a parameterized statement and binds typed, validated arguments.
         - Executes queries using a remote SQL connection and returns results in JSON format.
         - Handles errors related to configuration, connection, and query execution.
         - Provides example manifest generation for testing and documentation.
@@ -118,7 +121,7 @@ class SqlPlugin(PluginBase):
 
     .. note::
 
-        - SQL queries are interpolated using simple string replacement; ensure queries are safe and parameterized.
+        - Placeholders such as ``{name}`` in the SQL template are sent to the database as bind parameters.
         - The maximum query length is limited to prevent excessive database load.
         - Logging is controlled via feature switches and log level settings.
 
@@ -699,7 +702,8 @@ class SqlPlugin(PluginBase):
         Fetch information from a Plugin object in response to an OpenAI API tool call.
 
         This method processes the arguments received from an OpenAI function call,
-        interpolates them into the SQL query, executes the query, and returns the result.
+        validates and types them against the plugin's parameter definitions, binds them
+        to the compiled SQL statement, executes it on a pooled connection, and returns the result.
 
         See the OpenAI documentation:
         https://platform.openai.com/docs/assistants/tools/function-calling/quickstart
@@ -725,21 +729,6 @@ class SqlPlugin(PluginBase):
         """
         logger.debug("%s.tool_call_fetch_plugin_response() called.", self.formatted_class_name)
 
-        def sql_value(val):
-            if val is None:
-                return "NULL"
-            if isinstance(val, str):
-                # Escape single quotes for SQL
-                return "'" + val.replace("'", "''") + "'"
-            return str(val)
-
-        def interpolate(sql, params):
-            def repl(match):
-                key = match.group(1)
-                return sql_value(params.get(key))
-
-            return re.sub(r"\{(\w+)\}", repl, sql)
-
         if not self.plugin_data:
             raise SmarterSqlPluginError(
                 f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} plugin data is not available."
@@ -771,66 +760,63 @@ class SqlPlugin(PluginBase):
         for d in function_args:
             params.update(d)
 
-        # example sql query:
+        if not isinstance(self.plugin_data.sql_query, str):
+            raise SmarterSqlPluginError(
+                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} sql_query must be a string."
+            )
+
+        # example sql query template:
         # SELECT c.course_code, c.course_name, c.description, prerequisite.course_code AS prerequisite_course_code
         # FROM courses c
         #      LEFT JOIN courses prerequisite ON c.prerequisite_id = prerequisite.course_id
         # WHERE ((description LIKE '%' || {description}) OR ({description} IS NULL))
         #   AND (c.cost <= {max_cost} OR {max_cost} IS NULL)
         # ORDER BY c.prerequisite_id;
-        sql = self.plugin_data.sql_query
-        if not isinstance(sql, str):
+        #
+        # The template is compiled once per process into a statement with %s bind markers,
+        # and the function_args are validated and typed against the plugin's parameter
+        # definitions. The database driver takes care of quoting and escaping.
+        statement = self.plugin_data.compiled_statement
+        try:
+            bind_params = self.plugin_data.bind_parameters(params)
+        except SmarterValueError as e:
             raise SmarterSqlPluginError(
-                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} sql_query must be a string."
-            )
-
-        # function_args example: [{"description":"AI"}]
-        # iterate the list and replace the placeholders in the SQL query
-        # for arg in function_args:
-        #     if not isinstance(arg, dict):
-        #         raise SmarterSqlPluginError(
-        #             f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} function_args must be a list of dictionaries."
-        #         )
-        #     for key, value in arg.items():
-        #         if not isinstance(key, str):
-        #             raise SmarterSqlPluginError(
-        #                 f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} function_args keys must be strings."
-        #             )
-        #         sql = sql.replace(f"{{{key}}}", str(value))
-
-        sql = interpolate(sql, params)
-        sql = sql.strip()
-        sql = sql.replace("\n", " ")
-        sql = re.sub(r"\\.", "", sql)
-        if not sql.endswith(";"):
-            sql += ";"
+                f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} invalid function_args {params}: {e}"
+            ) from e
+        limit = (
+            self.plugin_data.limit
+            if self.plugin_data.limit and self.plugin_data.limit < MAX_SQL_QUERY_LENGTH
+            else MAX_SQL_QUERY_LENGTH
+        )
 
         logger.debug(
-            "%s.tool_call_fetch_plugin_response() executing remote SQL query: %s", self.formatted_class_name, sql
+            "%s.tool_call_fetch_plugin_response() executing remote SQL statement: %s params: %s",
+            self.formatted_class_name,
+            statement.sql,
+            bind_params,
         )
 
-        @cache_results()
-        def get_cached_query_result(sql: str) -> Any:
-            if not self.plugin_data:
-                raise SmarterSqlPluginError(
-                    f"{self.formatted_class_name}.tool_call_fetch_plugin_response() error: {self.name} plugin data is not available."
-                )
-            retval = sql_connection.execute_query(
-                sql=sql,
-                limit=(
-                    self.plugin_data.limit
-                    if self.plugin_data.limit and self.plugin_data.limit < MAX_SQL_QUERY_LENGTH
-                    else MAX_SQL_QUERY_LENGTH
-                ),
-            )
-            logger.debug(
-                "%s.tool_call_fetch_plugin_response() fetched and cached SQL query result for query: %s",
-                self.formatted_class_name,
-                sql,
+        # results are cached per plugin version, connection version and arguments,
+        # and are invalidated when the plugin is updated or deleted.
+        result_cache = PluginResultCache(self.id)  # type: ignore[arg-type]
+        cache_key = result_cache.key(
+            plugin_version=self.plugin_data.data_version,
+            connection_version=sql_connection.connection_identity,
+            statement=f"{statement.sql}\nLIMIT {limit}",
+            arguments=list(bind_params),
+        )
+
+        def execute_query() -> Any:
+            return sql_connection.execute_query(
+                sql=statement.sql, limit=limit, params=bind_params, timeout=self.plugin_data.timeout
             )
-            return retval
 
-        retval = get_cached_query_result(sql)
+        try:
+            retval = result_cache.get_or_set(cache_key, execute_query, ttl=self.plugin_data.cache_ttl)
+        except (SmarterConnectionTimeoutError, SmarterConnectionUnavailableError) as e:
+            # raised from inside the cached function, so these are never cached.
+            logger.warning("%s.tool_call_fetch_plugin_response() %s: %s", self.formatted_class_name, self.name, e)
+            return e.tool_result()
 
         if not retval:
             logger.warning(
@@ -49,6 +49,7 @@ from smarter.apps.plugin.serializers import PluginStaticSerializer
 from smarter.apps.plugin.signals import plugin_called, plugin_responded
 from smarter.common.api import SmarterApiVersions
 from smarter.common.conf import settings_defaults
+from smarter.common.exceptions import SmarterValueError
 from smarter.lib import json
 from smarter.lib.django import waffle
 from smarter.lib.django.waffle import SmarterWaffleSwitches
@@ -517,7 +518,8 @@ class StaticPlugin(PluginBase):
         - Ensures that the ``inquiry_type`` argument is present and is a string.
         - Verifies that the plugin is in a ready state and that plugin data is available.
         - Emits signals when the plugin is called and when it responds.
-        - Looks up the value for the given inquiry type in the plugin's static data.
+        - Looks up the value for the given inquiry type in the plugin's pre-parsed return data index,
+          falling back to a normalized, then fuzzy, match on the index keys.
         - Serializes the result to a JSON string before returning.
         - Raises detailed errors if any step fails, including missing inquiry types, serialization issues, or invalid data.
 
@@ -565,53 +567,32 @@ class StaticPlugin(PluginBase):
         )
 
         try:
-            return_data = self.plugin_data.sanitized_return_data(self.params)
-            if not isinstance(return_data, dict):
-                raise SmarterPluginError(
-                    f"Plugin {self.name} return data is not a dictionary.",
-                )
-
-            try:
-                retval = return_data[inquiry_type]
-            except KeyError as e:
-                raise SmarterPluginError(
-                    f"Plugin {self.name} does not have a return value for inquiry_type: {inquiry_type}. Available keys are: {list(return_data.keys())} from return_data {json.dumps(return_data)}.",
-                ) from e
-
-            if retval is None:
-                raise SmarterPluginError(
-                    f"Plugin {self.name} return value for inquiry_type: {inquiry_type} is None.",
-                )
-
-            # try:
-            #     retval = json.dumps(retval)
-            # except (TypeError, ValueError) as e:
-            #     raise SmarterPluginError(
-            #         f"Plugin {self.name} return value for inquiry_type: {inquiry_type} could not be serialized to JSON: {e}.",
-            #     ) from e
-
-            if isinstance(retval, str):
-                try:
-                    retval = json.loads(retval)
-                except json.JSONDecodeError:
-                    # it's just a string, not json
-                    pass
-            if not isinstance(retval, (dict, list, str)):
-                raise SmarterPluginError(
-                    f"Plugin {self.name} return value for inquiry_type: {inquiry_type} is not a str, dict or list. Expected a str, dict or list, got {type(retval)}.",
-                )
-            plugin_responded.send(
-                sender=self.tool_call_fetch_plugin_response,
-                plugin=self,
-                inquiry_type=inquiry_type,
-                response=retval,
-            )
-            return retval
-        except KeyError as e:
+            # compiled and parsed once per version of the static data, and shared in-process.
+            return_data = self.plugin_data.return_data_lookup
+        except SmarterValueError as e:
             raise SmarterPluginError(
-                f"Plugin {self.name} does not have a return value for inquiry_type: {inquiry_type}.",
+                f"Plugin {self.name} return data is not a dictionary or list: {e}",
             ) from e
-        except json.JSONDecodeError as e:
+
+        key, retval = return_data.lookup(inquiry_type)
+        if key is None:
             raise SmarterPluginError(
-                f"Plugin {self.name} contains Json data that could not be decoded: {e}.",
-            ) from e
+                f"Plugin {self.name} does not have a return value for inquiry_type: {inquiry_type}. Available keys are: {return_data.keys()}.",
+            )
+
+        if retval is None:
+            raise SmarterPluginError(
+                f"Plugin {self.name} return value for inquiry_type: {key} is None.",
+            )
+
+        if not isinstance(retval, (dict, list, str)):
+            raise SmarterPluginError(
+                f"Plugin {self.name} return value for inquiry_type: {key} is not a str, dict or list. Expected a str, dict or list, got {type(retval)}.",
+            )
+        plugin_responded.send(
+            sender=self.tool_call_fetch_plugin_response,
+            plugin=self,
+            inquiry_type=inquiry_type,
+            response=retval,
+        )
+        return retval
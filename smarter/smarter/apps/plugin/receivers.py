@@ -22,6 +22,7 @@ from .models import (
     PluginSelectorHistory,
 )
 from .plugin.static import PluginBase
+from .result_cache import PluginResultCache
 from .signals import (
     broker_ready,
     plugin_called,
@@ -72,6 +73,8 @@ def handle_plugin_updated(sender, plugin: PluginBase, **kwargs):
         plugin.name,
         formatted_json(plugin.data) if plugin.data else None,
     )
+    if plugin.id:
+        PluginResultCache(plugin.id).invalidate()
 
 
 @receiver(plugin_deleting, dispatch_uid=prefix + ".plugin_deleting")
@@ -82,6 +85,9 @@ def handle_plugin_deleting(sender, plugin, plugin_meta: PluginMeta, **kwargs):
         formatted_text("smarter.apps.plugin.receivers.plugin_deleting"),
         plugin_meta.name,
     )
+    result_cache = PluginResultCache(plugin_meta.id)  # type: ignore[arg-type]
+    result_cache.invalidate()
+    result_cache.reset_stats()
 
 
 @receiver(plugin_deleted, dispatch_uid="plugin_deleted")
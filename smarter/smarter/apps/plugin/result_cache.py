@@ -0,0 +1,155 @@
+"""
+Plugin result cache.
+
+Caches the results of plugin tool calls in the Django cache (Redis) so that
+repeated calls with the same arguments do not hit the customer's database
+again. Cache keys are built from:
+
+- the plugin id and a per-plugin generation counter,
+- the plugin data version (its primary key and ``updated_at``),
+- the connection version (:attr:`ConnectionBase.connection_identity`),
+- the compiled statement and its normalized arguments.
+
+Editing a plugin or its connection therefore changes the key, and
+:meth:`PluginResultCache.invalidate` bumps the generation so that every
+result cached for a plugin becomes unreachable at once. Orphaned entries
+expire with their TTL. Invalidation is wired to the ``plugin_updated`` and
+``plugin_deleting`` signals in :mod:`smarter.apps.plugin.receivers`.
+
+Hits and misses are counted per plugin. See :meth:`PluginResultCache.stats`.
+"""
+
+import hashlib
+from typing import Any, Callable, Optional
+
+from smarter.common.conf import smarter_settings
+from smarter.lib import json, logging
+from smarter.lib.cache import lazy_cache as cache
+from smarter.lib.cache.cache_sentinel import CACHE_MISS_SENTINEL
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.CACHE_LOGGING])
+
+CACHE_PREFIX = "smarter.plugin.result_cache."
+
+
+def normalize_arguments(arguments: Any) -> str:
+    """
+    Return a canonical JSON encoding of tool call arguments.
+
+    Dict keys are sorted, so that ``{"a": 1, "b": 2}`` and ``{"b": 2, "a": 1}``
+    produce the same cache key.
+
+    :param arguments: The validated and typed arguments.
+    :return: A compact JSON string.
+    :rtype: str
+    """
+    return json.SmarterJSONEncoder(sort_keys=True, separators=(",", ":"), default=str).encode(arguments)
+
+
+class PluginResultCache:
+    """
+    The result cache of a single plugin.
+
+    :param plugin_id: The :class:`PluginMeta` id.
+    """
+
+    def __init__(self, plugin_id: int):
+        self.plugin_id = plugin_id
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} plugin={self.plugin_id}>"
+
+    def _key(self, suffix: str) -> str:
+        return f"{CACHE_PREFIX}{self.plugin_id}.{suffix}"
+
+    @property
+    def generation(self) -> int:
+        """Return the current generation. Results cached under earlier generations are unreachable."""
+        return cache.get(self._key("generation")) or 0
+
+    def key(self, plugin_version: str, connection_version: str, statement: str, arguments: Any) -> str:
+        """
+        Return the cache key for one plugin call.
+
+        :param plugin_version: Identifies the plugin data, e.g. ``"PluginDataSql:7:2026-10-18T10:00:00"``.
+        :param connection_version: Identifies the connection. See :attr:`ConnectionBase.connection_identity`.
+        :param statement: The statement or request that is executed.
+        :param arguments: The validated and typed arguments.
+        :return: The cache key.
+        :rtype: str
+        """
+        key_data = "\n".join([plugin_version, connection_version, statement, normalize_arguments(arguments)])
+        digest = hashlib.sha256(key_data.encode("utf-8")).hexdigest()[:32]
+        return self._key(f"{self.generation}.{digest}")
+
+    def get_or_set(self, key: str, func: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+        """
+        Return the cached result for ``key``, calling ``func`` to compute it on a miss.
+
+        Falsy results are returned but not cached, so that a failed call is retried.
+
+        :param key: A key from :meth:`key`.
+        :param func: Computes the result.
+        :param ttl: The lifetime in seconds. Defaults to ``plugin_result_cache_ttl``. ``0`` disables caching.
+        :return: The result.
+        """
+        ttl = smarter_settings.plugin_result_cache_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return func()
+        retval = cache.get(key, CACHE_MISS_SENTINEL)
+        if retval is not CACHE_MISS_SENTINEL:
+            self._increment("hits")
+            logger.debug("%s.get_or_set() hit %s", self, key)
+            return retval
+        self._increment("misses")
+        retval = func()
+        if retval:
+            cache.set(key, retval, timeout=ttl)
+            logger.debug("%s.get_or_set() cached %s for %s seconds", self, key, ttl)
+        return retval
+
+    def invalidate(self) -> None:
+        """Make every result cached for this plugin unreachable."""
+        key = self._key("generation")
+        cache.add(key, 0, timeout=None)
+        try:
+            generation = cache.incr(key)
+        except ValueError:
+            # evicted between add() and incr().
+            generation = 1
+            cache.set(key, generation, timeout=None)
+        logger.info("%s.invalidate() advanced to generation %s", self, generation)
+
+    def _increment(self, suffix: str) -> None:
+        key = self._key(suffix)
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return hit-rate statistics for this plugin.
+
+        :return: A dict with ``hits``, ``misses``, ``hit_rate`` and ``generation``.
+        :rtype: dict
+        """
+        values = cache.get_many([self._key("hits"), self._key("misses"), self._key("generation")])
+        hits = values.get(self._key("hits")) or 0
+        misses = values.get(self._key("misses")) or 0
+        return {
+            "plugin_id": self.plugin_id,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            "generation": values.get(self._key("generation")) or 0,
+        }
+
+    def reset_stats(self) -> None:
+        """Clear the hit-rate statistics for this plugin."""
+        cache.delete_many([self._key("hits"), self._key("misses")])
+
+
+__all__ = ["PluginResultCache", "normalize_arguments"]
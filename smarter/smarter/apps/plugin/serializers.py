@@ -205,7 +205,16 @@ class PluginPromptSerializer(SmarterCamelCaseSerializer):
     # pylint: disable=missing-class-docstring
     class Meta:
         model = PluginPrompt
-        fields = ["provider", "system_role", "model", "temperature", "max_tokens"]
+        fields = [
+            "provider",
+            "system_role",
+            "model",
+            "temperature",
+            "max_tokens",
+            "response_max_tokens",
+            "response_strategy",
+            "response_columns",
+        ]
 
 
 class PluginStaticSerializer(SmarterCamelCaseSerializer):
@@ -271,6 +280,10 @@ class PluginSqlSerializer(SmarterCamelCaseSerializer):
     :type test_values: dict or list
     :param limit: The maximum number of results to return.
     :type limit: int
+    :param timeout: The execution deadline in seconds. Overrides the connection timeout when set.
+    :type timeout: int
+    :param cache_ttl: How long to cache query results in seconds. 0 disables caching.
+    :type cache_ttl: int
 
     :return: Serialized SQL plugin configuration.
     :rtype: dict
@@ -300,7 +313,9 @@ class PluginSqlSerializer(SmarterCamelCaseSerializer):
         #   "parameters": {...},
         #   "sqlQuery": "...",
         #   "testValues": {...},
-        #   "limit": ...
+        #   "limit": ...,
+        #   "timeout": ...,
+        #   "cacheTtl": ...
         # }
 
     """
@@ -322,6 +337,8 @@ class PluginSqlSerializer(SmarterCamelCaseSerializer):
             "sql_query",
             "test_values",
             "limit",
+            "timeout",
+            "cache_ttl",
         ]
 
 
@@ -347,6 +364,10 @@ class PluginApiSerializer(SmarterCamelCaseSerializer):
     :type body: dict or str
     :param limit: The maximum number of results to return.
     :type limit: int
+    :param timeout: The execution deadline in seconds. Overrides the connection timeout when set.
+    :type timeout: int
+    :param cache_ttl: How long to cache GET responses in seconds. Overrides the API's caching headers when set.
+    :type cache_ttl: int
 
     :return: Serialized API plugin configuration.
     :rtype: dict
@@ -377,7 +398,9 @@ class PluginApiSerializer(SmarterCamelCaseSerializer):
         #   "urlParams": {...},
         #   "headers": {...},
         #   "body": {...},
-        #   "limit": ...
+        #   "limit": ...,
+        #   "timeout": ...,
+        #   "cacheTtl": ...
         # }
     """
 
@@ -399,6 +422,8 @@ class PluginApiSerializer(SmarterCamelCaseSerializer):
             "headers",
             "body",
             "limit",
+            "timeout",
+            "cache_ttl",
         ]
 
 
@@ -0,0 +1,232 @@
+"""
+Pre-parsed lookup tables for StaticPlugin return data.
+
+A static plugin answers a tool call by looking up ``inquiry_type`` in its
+``static_data``. Rather than re-reading, truncating and ``json.loads``-ing
+that data on every call, :class:`PluginDataStatic` stamps a version hash of
+the data when it is saved, and the data is compiled once per version and
+process into a flat ``{key: value}`` table whose string values have already
+been parsed.
+
+The compiled table is wrapped in a :class:`StaticReturnDataIndex`, an
+immutable object held in a small in-process registry keyed by the version
+hash. Every StaticPlugin instance for the same data therefore shares a single
+index, and a lookup is a dictionary access.
+
+Lookups fall back to fuzzy matching so that an LLM that asks for
+``"Course Catalog"`` or ``"course-catalogue"`` still finds ``"course_catalog"``:
+
+1. the exact key,
+2. the key after normalization (case, whitespace and punctuation ignored),
+3. the closest normalized key according to :func:`difflib.get_close_matches`.
+"""
+
+import difflib
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional, Union
+
+from smarter.lib import json, logging
+from smarter.lib.django.models import list_of_dicts_to_dict
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.PLUGIN_LOGGING])
+
+FUZZY_MATCH_CUTOFF = 0.8
+"""Minimum :class:`difflib.SequenceMatcher` ratio for a fuzzy ``inquiry_type`` match."""
+
+MAX_CACHED_INDEXES = 512
+"""Maximum number of compiled indexes held in the in-process registry."""
+
+_NORMALIZE_PATTERN = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_inquiry_type(key: Any) -> str:
+    """
+    Normalize an ``inquiry_type`` key for fuzzy matching.
+
+    :param key: The key to normalize.
+    :return: The lower-cased key with everything other than letters and digits removed.
+    :rtype: str
+
+    **Example:**
+
+    .. code-block:: python
+
+        normalize_inquiry_type("Course Catalog")  # 'coursecatalog'
+        normalize_inquiry_type("course_catalog")  # 'coursecatalog'
+    """
+    return _NORMALIZE_PATTERN.sub("", str(key).lower())
+
+
+def static_data_version(static_data: Union[dict, list, None]) -> str:
+    """
+    Return a version hash of the static data.
+
+    The hash is computed over a canonical JSON encoding, so it does not depend on key order.
+
+    :param static_data: The plugin's static data.
+    :return: A hex-encoded sha256 digest.
+    :rtype: str
+    """
+    canonical = json.dumps(static_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def parse_return_value(value: Any) -> Any:
+    """
+    Parse a return value once, at compile time.
+
+    Strings that contain JSON are decoded. Any other string is returned as-is.
+
+    :param value: A value from the static data.
+    :return: The parsed value.
+    """
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            # it's just a string, not json
+            return value
+    return value
+
+
+def compile_static_data(static_data: Union[dict, list, None], max_results: int) -> dict:
+    """
+    Compile static data into a flat lookup table of pre-parsed values.
+
+    - A dict is used as-is.
+    - A list of dicts is truncated to ``max_results`` items and converted with :func:`list_of_dicts_to_dict`.
+
+    :param static_data: The plugin's static data.
+    :param max_results: The maximum number of list items to keep.
+    :return: A dict mapping each ``inquiry_type`` to its parsed value.
+    :rtype: dict
+    :raises ValueError: If ``static_data`` is neither a dict, a list nor None.
+    """
+    if static_data is None:
+        return {}
+    if isinstance(static_data, list):
+        static_data = list_of_dicts_to_dict(data=static_data[:max_results]) or {}
+    if not isinstance(static_data, dict):
+        raise ValueError(f"static_data must be a dict or a list or None, got {type(static_data)}")
+    return {str(key): parse_return_value(value) for key, value in static_data.items()}
+
+
+class StaticReturnDataIndex:
+    """
+    An immutable, pre-parsed lookup table for one version of a plugin's static data.
+
+    Values are shared by every caller and must be treated as read-only.
+
+    :param version: The version hash of the source static data.
+    :param entries: The compiled ``{inquiry_type: value}`` table.
+    """
+
+    __slots__ = ("version", "entries", "_normalized", "_normalized_keys")
+
+    version: str
+    entries: Mapping[str, Any]
+
+    def __init__(self, version: str, entries: dict):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "entries", MappingProxyType(dict(entries)))
+        normalized: dict[str, str] = {}
+        for key in entries:
+            # the first of several keys that normalize alike wins.
+            normalized.setdefault(normalize_inquiry_type(key), key)
+        object.__setattr__(self, "_normalized", MappingProxyType(normalized))
+        object.__setattr__(self, "_normalized_keys", tuple(normalized))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.entries
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.version[:12]} keys={len(self.entries)}>"
+
+    def keys(self) -> list[str]:
+        """Return the ``inquiry_type`` keys of this index."""
+        return list(self.entries)
+
+    def resolve_key(self, inquiry_type: str) -> Optional[str]:
+        """
+        Return the key that best matches ``inquiry_type``.
+
+        :param inquiry_type: The requested key.
+        :return: The exact, normalized or closest fuzzy match, or None.
+        :rtype: Optional[str]
+        """
+        if inquiry_type in self.entries:
+            return inquiry_type
+        normalized = normalize_inquiry_type(inquiry_type)
+        if not normalized:
+            return None
+        key = self._normalized.get(normalized)
+        if key is not None:
+            return key
+        matches = difflib.get_close_matches(normalized, self._normalized_keys, n=1, cutoff=FUZZY_MATCH_CUTOFF)
+        return self._normalized[matches[0]] if matches else None
+
+    def lookup(self, inquiry_type: str) -> tuple[Optional[str], Any]:
+        """
+        Look up the value for ``inquiry_type``.
+
+        :param inquiry_type: The requested key.
+        :return: A ``(matched_key, value)`` tuple. ``matched_key`` is None when nothing matched.
+        :rtype: tuple[Optional[str], Any]
+        """
+        key = self.resolve_key(inquiry_type)
+        if key is None:
+            return None, None
+        if key != inquiry_type:
+            logger.debug("%s.lookup() matched inquiry_type %s to key %s", self.__class__.__name__, inquiry_type, key)
+        return key, self.entries[key]
+
+
+_indexes: "OrderedDict[str, StaticReturnDataIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_static_return_data_index(version: str, compile_entries: Callable[[], dict]) -> StaticReturnDataIndex:
+    """
+    Return the shared :class:`StaticReturnDataIndex` for ``version``.
+
+    The index is built on first use and then served from a bounded, in-process
+    LRU registry keyed by the version hash.
+
+    :param version: The version hash of the static data.
+    :param compile_entries: Returns the compiled lookup table. Called only on a registry miss.
+    :return: The index for this version.
+    :rtype: StaticReturnDataIndex
+    """
+    with _indexes_lock:
+        index = _indexes.get(version)
+        if index is not None:
+            _indexes.move_to_end(version)
+            return index
+    index = StaticReturnDataIndex(version=version, entries=compile_entries())
+    with _indexes_lock:
+        _indexes[version] = index
+        _indexes.move_to_end(version)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+__all__ = [
+    "StaticReturnDataIndex",
+    "compile_static_data",
+    "get_static_return_data_index",
+    "normalize_inquiry_type",
+    "parse_return_value",
+    "static_data_version",
+]
@@ -0,0 +1,45 @@
+"""Test PluginDataApi request preparation."""
+
+from smarter.apps.connection.models import ApiConnection
+from smarter.apps.plugin.models import PluginDataApi
+from smarter.common.exceptions import SmarterValueError
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestPluginDataApiPrepareRequest(SmarterTestBase):
+    """Test PluginDataApi.resolve_parameters() and PluginDataApi.prepare_request()."""
+
+    parameters = {
+        "type": "object",
+        "properties": {
+            "course_code": {"type": "string"},
+            "description": {"type": "string", "enum": ["AI", "web"]},
+            "max_cost": {"type": "string", "default": "500"},
+        },
+        "required": ["course_code"],
+        "additionalProperties": False,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.plugin_data = PluginDataApi(
+            connection=ApiConnection(base_url="https://api.example.com"),
+            endpoint="/courses/{course_code}/",
+            parameters=self.parameters,
+            headers=[{"name": "Accept", "value": "application/json"}],
+            url_params=[{"key": "format", "value": "json"}],
+        )
+
+    def test_prepare_request(self):
+        request_data = self.plugin_data.prepare_request({"course_code": "CS 101", "description": "AI"})
+        self.assertEqual(request_data["url"], "https://api.example.com/courses/CS%20101/")
+        self.assertEqual(request_data["params"], {"format": "json", "description": "AI", "max_cost": "500"})
+        self.assertEqual(request_data["headers"], {"Accept": "application/json"})
+
+    def test_resolve_parameters_validation(self):
+        with self.assertRaises(SmarterValueError):
+            self.plugin_data.resolve_parameters({"description": "AI"})
+        with self.assertRaises(SmarterValueError):
+            self.plugin_data.resolve_parameters({"course_code": "CS101", "description": "mobile"})
+        with self.assertRaises(SmarterValueError):
+            self.plugin_data.resolve_parameters({"course_code": "CS101", "unknown": "x"})
@@ -0,0 +1,51 @@
+"""Test PluginDataSql statement compilation and parameter binding."""
+
+from smarter.apps.plugin.models import PluginDataSql
+from smarter.apps.plugin.models.plugin_data_sql import compile_sql_template
+from smarter.common.exceptions import SmarterValueError
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestPluginDataSqlCompiledStatement(SmarterTestBase):
+    """Test compile_sql_template() and PluginDataSql.bind_parameters()."""
+
+    sql_query = (
+        "SELECT * FROM courses c\n"
+        "WHERE ((c.description LIKE CONCAT('%', {description}, '%')) OR ({description} IS NULL))\n"
+        "AND (c.cost <= {max_cost} OR {max_cost} IS NULL) AND c.code = '{code}';"
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "description": {"type": "string", "enum": ["AI", "web"]},
+            "max_cost": {"type": "number"},
+            "code": {"type": "string", "default": "CS101"},
+        },
+        "required": ["max_cost"],
+        "additionalProperties": False,
+    }
+
+    def test_compile_sql_template(self):
+        statement = compile_sql_template(self.sql_query)
+        self.assertNotIn("{", statement.sql)
+        self.assertNotIn("'%s'", statement.sql)
+        self.assertIn("CONCAT('%%', %s, '%%')", statement.sql)
+        self.assertFalse(statement.sql.endswith(";"))
+        self.assertEqual(statement.parameter_names, ("description", "description", "max_cost", "max_cost", "code"))
+        self.assertIs(statement, compile_sql_template(self.sql_query))
+
+    def test_bind_parameters(self):
+        plugin_data = PluginDataSql(sql_query=self.sql_query, parameters=self.parameters)
+        params = plugin_data.bind_parameters({"description": "AI", "max_cost": "500"})
+        self.assertEqual(params, ("AI", "AI", 500.0, 500.0, "CS101"))
+
+    def test_bind_parameters_validation(self):
+        plugin_data = PluginDataSql(sql_query=self.sql_query, parameters=self.parameters)
+        with self.assertRaises(SmarterValueError):
+            plugin_data.bind_parameters({"description": "AI"})
+        with self.assertRaises(SmarterValueError):
+            plugin_data.bind_parameters({"max_cost": "not a number"})
+        with self.assertRaises(SmarterValueError):
+            plugin_data.bind_parameters({"max_cost": 1, "description": "mobile"})
+        with self.assertRaises(SmarterValueError):
+            plugin_data.bind_parameters({"max_cost": 1, "unknown": "x"})
@@ -0,0 +1,60 @@
+"""Test the plugin result cache."""
+
+from smarter.apps.plugin.result_cache import PluginResultCache, normalize_arguments
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestPluginResultCache(SmarterTestBase):
+    """Test PluginResultCache keys, invalidation and statistics."""
+
+    def setUp(self):
+        super().setUp()
+        self.plugin_id = abs(hash(SmarterTestBase.generate_hash_suffix()))
+        self.cache = PluginResultCache(self.plugin_id)
+        self.calls = 0
+
+    def tearDown(self):
+        self.cache.invalidate()
+        self.cache.reset_stats()
+        super().tearDown()
+
+    def execute(self) -> str:
+        self.calls += 1
+        return f'[{{"call": {self.calls}}}]'
+
+    def key(self, plugin_version: str = "PluginDataSql:1:v1", connection_version: str = "SqlConnection:1:v1"):
+        return self.cache.key(plugin_version, connection_version, "SELECT * FROM courses WHERE cost <= %s", [100])
+
+    def test_normalize_arguments(self):
+        self.assertEqual(normalize_arguments({"b": 2, "a": 1}), normalize_arguments({"a": 1, "b": 2}))
+
+    def test_get_or_set(self):
+        first = self.cache.get_or_set(self.key(), self.execute, ttl=60)
+        self.assertEqual(self.cache.get_or_set(self.key(), self.execute, ttl=60), first)
+        self.assertEqual(self.calls, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5))
+
+        self.cache.get_or_set(self.key(), self.execute, ttl=0)
+        self.assertEqual(self.calls, 2)
+
+    def test_versions_change_the_key(self):
+        self.assertNotEqual(self.key(), self.key(plugin_version="PluginDataSql:1:v2"))
+        self.assertNotEqual(self.key(), self.key(connection_version="SqlConnection:2:v1"))
+        self.assertNotEqual(
+            self.key(),
+            PluginResultCache(self.plugin_id + 1).key(
+                "PluginDataSql:1:v1", "SqlConnection:1:v1", "SELECT * FROM courses WHERE cost <= %s", [100]
+            ),
+        )
+
+    def test_invalidate(self):
+        self.cache.get_or_set(self.key(), self.execute, ttl=60)
+        self.cache.invalidate()
+        self.cache.get_or_set(self.key(), self.execute, ttl=60)
+        self.assertEqual(self.calls, 2)
+
+    def test_falsy_results_are_not_cached(self):
+        self.cache.get_or_set(self.key(), lambda: False, ttl=60)
+        self.cache.get_or_set(self.key(), self.execute, ttl=60)
+        self.assertEqual(self.calls, 1)
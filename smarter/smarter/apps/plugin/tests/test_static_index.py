@@ -0,0 +1,57 @@
+"""Test the pre-parsed StaticPlugin return data index."""
+
+from smarter.apps.plugin.static_index import (
+    StaticReturnDataIndex,
+    compile_static_data,
+    get_static_return_data_index,
+    static_data_version,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestStaticReturnDataIndex(SmarterTestBase):
+    """Test compile_static_data() and StaticReturnDataIndex lookups."""
+
+    static_data = {
+        "course_catalog": '{"courses": ["CS101", "CS102"]}',
+        "office_hours": "9am to 5pm",
+        "contact": {"email": "help@example.com"},
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.version = static_data_version(self.static_data)
+        self.index = StaticReturnDataIndex(self.version, compile_static_data(self.static_data, max_results=50))
+
+    def test_values_are_parsed_once(self):
+        self.assertEqual(self.index.entries["course_catalog"], {"courses": ["CS101", "CS102"]})
+        self.assertEqual(self.index.entries["office_hours"], "9am to 5pm")
+
+    def test_fuzzy_lookup(self):
+        self.assertEqual(self.index.lookup("contact")[0], "contact")
+        self.assertEqual(self.index.lookup("Course Catalog")[0], "course_catalog")
+        self.assertEqual(self.index.lookup("office-hour")[0], "office_hours")
+        self.assertEqual(self.index.lookup("weather"), (None, None))
+
+    def test_immutable(self):
+        with self.assertRaises(TypeError):
+            self.index.entries["contact"] = "x"  # type: ignore[index]
+        with self.assertRaises(AttributeError):
+            self.index.version = "x"
+
+    def test_version_and_registry(self):
+        reordered = dict(reversed(list(self.static_data.items())))
+        self.assertEqual(static_data_version(reordered), self.version)
+        self.assertNotEqual(static_data_version({**self.static_data, "contact": "none"}), self.version)
+
+        index = get_static_return_data_index(
+            self.version, lambda: compile_static_data(self.static_data, max_results=50)
+        )
+        # a registry hit does not compile the static data again.
+        self.assertIs(get_static_return_data_index(self.version, lambda: self.fail("compiled twice")), index)
+
+    def test_list_of_dicts(self):
+        entries = compile_static_data([{"name": "Alice"}, {"name": "Bob"}, {"name": "Carol"}], max_results=2)
+        self.assertEqual(entries, {"Alice": "Alice", "Bob": "Bob"})
+        with self.assertRaises(ValueError):
+            compile_static_data("not a dict", max_results=2)  # type: ignore[arg-type]
@@ -2,7 +2,7 @@
 Embedding Service Interface
 """
 
-from abc import ABC, abstractmethod
+from abc import ABC
 from typing import List, Optional, Type
 
 from langchain_core.embeddings import Embeddings
@@ -10,6 +10,10 @@ from langchain_openai import OpenAIEmbeddings
 from pydantic import SecretStr
 
 from smarter.apps.provider.models import ProviderModel
+from smarter.apps.provider.services.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+)
 from smarter.apps.secret.models import Secret
 from smarter.common.exceptions import SmarterValueError
 from smarter.common.mixins import SmarterHelperMixin
@@ -24,6 +28,7 @@ class SmarterEmbeddingServiceInterface(ABC, SmarterHelperMixin):
 
     _EmbeddingsClass: Type[Embeddings] = Embeddings
     _embeddings: Optional[Embeddings] = None
+    _cached_embeddings: Optional[CachedEmbeddings] = None
     _api_key: Optional[SecretStr] = None
 
     def __init__(self, provider_model: ProviderModel):
@@ -52,10 +57,27 @@ class SmarterEmbeddingServiceInterface(ABC, SmarterHelperMixin):
         """Get the OpenAI embeddings instance."""
         raise NotImplementedError("The 'embeddings' property must be implemented by subclasses.")
 
-    @abstractmethod
+    @property
+    def embedding_model(self) -> str:
+        """Identifies the embedding model, its provider and its dimensions in the embedding cache."""
+        model = getattr(self.embeddings, "model", None) or self.provider_model.name
+        dimensions = getattr(self.embeddings, "dimensions", None) or ""
+        return f"{self.provider_model.provider.name}:{model}:{dimensions}"
+
+    @property
+    def cached_embeddings(self) -> CachedEmbeddings:
+        """Get the embeddings, backed by the embedding cache."""
+        if self._cached_embeddings is None:
+            self._cached_embeddings = CachedEmbeddings(self.embeddings, EmbeddingCache(self.embedding_model))
+        return self._cached_embeddings
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
-        raise NotImplementedError("The 'embed' method must be implemented by subclasses.")
+        """Generate embeddings for a list of texts, reusing cached embeddings of unchanged texts."""
+        return self.cached_embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Generate the embedding of a query, reusing the cached embedding of a repeated query."""
+        return self.cached_embeddings.embed_query(text)
 
 
 class SmarterOpenAICompatibleEmbeddingService(SmarterEmbeddingServiceInterface):
@@ -77,6 +99,3 @@ class SmarterOpenAICompatibleEmbeddingService(SmarterEmbeddingServiceInterface):
                 api_key=self.api_key,
             )
         return self._embeddings
-
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return self.embeddings.embed_documents(texts)
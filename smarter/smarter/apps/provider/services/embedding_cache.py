@@ -0,0 +1,155 @@
+"""
+Content-addressed embedding cache.
+
+Caches embedding vectors in the Django cache (Redis) so that chunks which
+were embedded before, by any vectorstore, and repeated user questions are not
+sent to the embeddings provider again. Cache keys are built from:
+
+- the embedding model, e.g. ``"openai:text-embedding-3-small:1536"``,
+- the sha256 hash of the normalized text.
+
+Text is normalized to Unicode NFC with runs of whitespace collapsed, so that
+chunks that differ only in layout share a vector. Vectors are stored as
+float16 bytes, about a quarter of the size of a pickled list of floats, and
+every vector that is returned, cached or not, is decoded from the same
+float16 bytes so that identical texts always get identical vectors.
+
+Entries expire after ``smarter_settings.vectorstore_embedding_cache_ttl``
+seconds. When Redis is configured with an ``allkeys-lru`` maxmemory policy,
+least recently used entries are evicted first.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Callable, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from smarter.common.conf import smarter_settings
+from smarter.lib import logging
+from smarter.lib.cache import lazy_cache as cache
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+
+logger = logging.getSmarterLogger(__name__, any_switches=[SmarterWaffleSwitches.CACHE_LOGGING])
+
+CACHE_PREFIX = "smarter.provider.embedding_cache."
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Return the canonical form of ``text`` for cache keys.
+
+    :param text: The text to embed.
+    :return: ``text`` in Unicode NFC, stripped and with runs of whitespace collapsed to a single space.
+    :rtype: str
+    """
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def encode_vector(vector: List[float]) -> bytes:
+    """Return ``vector`` as float16 bytes."""
+    return np.asarray(vector, dtype=np.float16).tobytes()
+
+
+def decode_vector(data: bytes) -> List[float]:
+    """Return the vector of float16 bytes ``data``."""
+    return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+
+
+class EmbeddingCache:
+    """
+    The embedding cache of a single embedding model.
+
+    :param model: Identifies the embedding model, its provider and its dimensions.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.namespace = hashlib.sha256(model.encode("utf-8")).hexdigest()[:16]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} model={self.model}>"
+
+    @property
+    def ttl(self) -> int:
+        """The lifetime in seconds of cached vectors. ``0`` disables caching."""
+        return smarter_settings.vectorstore_embedding_cache_ttl
+
+    def key(self, text: str) -> str:
+        """
+        Return the cache key for the vector of ``text``.
+
+        :param text: The text to embed.
+        :return: The cache key.
+        :rtype: str
+        """
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{CACHE_PREFIX}{self.namespace}.{digest}"
+
+    def embed(self, texts: List[str], func: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        """
+        Return one vector per text, calling ``func`` only for texts that are not cached.
+
+        Texts with the same normalized form are embedded once.
+
+        :param texts: The texts to embed.
+        :param func: Returns one vector per text of a list of texts.
+        :return: One vector per text, in the order of ``texts``.
+        :rtype: list[list[float]]
+        """
+        if not texts:
+            return []
+        if self.ttl <= 0:
+            return func(texts)
+
+        keys = [self.key(text) for text in texts]
+        cached = cache.get_many(list(set(keys)))
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = func(list(missing.values()))
+            computed = {key: encode_vector(vector) for key, vector in zip(missing, vectors)}
+            cache.set_many(computed, timeout=self.ttl)
+            cached.update(computed)
+        logger.debug("%s.embed() %d texts, %d embedded", self, len(texts), len(missing))
+        return [decode_vector(cached[key]) for key in keys]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain embeddings that look up vectors in an :class:`EmbeddingCache` before calling ``embeddings``.
+
+    Query vectors are cached apart from document vectors, because some
+    providers embed queries differently.
+
+    :param embeddings: The provider's embeddings.
+    :param embedding_cache: The cache of the provider's embedding model.
+    """
+
+    def __init__(self, embeddings: Embeddings, embedding_cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.embedding_cache = embedding_cache
+        self.query_cache = EmbeddingCache(f"{embedding_cache.model}:query")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedding_cache.embed(texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.query_cache.embed([text], lambda texts: [self.embeddings.embed_query(texts[0])])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several query texts with one request for the texts that are not cached.
+
+        The texts are embedded with ``embed_documents``, which returns the same
+        vectors as ``embed_query`` for the OpenAI-compatible providers.
+        """
+        return self.query_cache.embed(texts, self.embeddings.embed_documents)
+
+
+__all__ = ["CachedEmbeddings", "EmbeddingCache", "normalize_text"]
@@ -2,7 +2,7 @@
 
 import logging
 from functools import cached_property
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_message_tool_call import (
@@ -47,6 +47,10 @@ from smarter.lib.logging import WaffleSwitchedLoggerWrapper
 
 from .internal_keys import _InternalKeys
 from .mixins import ChatDbMixin
+from .response_shaping import ToolResponseBudget
+
+if TYPE_CHECKING:
+    from smarter.apps.vectorstore.retrieval import ContextRetriever, RetrievedChunk
 
 
 # pylint: disable=W0613
@@ -110,6 +114,7 @@ class SmarterChatProviderBase(ChatDbMixin):
         "temperature",
         "max_completion_tokens",
         "input_text",
+        "retrieved_context",
         "completion_tokens",
         "prompt_tokens",
         "total_tokens",
@@ -121,6 +126,7 @@ class SmarterChatProviderBase(ChatDbMixin):
         "second_iteration",
         "second_response",
         "serialized_tool_calls",
+        "tool_response_budgets",
         "tools",
         "available_functions",
     )
@@ -145,6 +151,7 @@ class SmarterChatProviderBase(ChatDbMixin):
     temperature: Optional[float]
     max_completion_tokens: Optional[int]
     input_text: Optional[str]
+    retrieved_context: Optional[str]
 
     completion_tokens: Optional[int]
     prompt_tokens: Optional[int]
@@ -158,6 +165,7 @@ class SmarterChatProviderBase(ChatDbMixin):
     second_response: Optional[ChatCompletion]
     second_iteration: Optional[dict[str, Any]]
     serialized_tool_calls: Optional[list[dict[str, Any]]]
+    tool_response_budgets: dict[str, tuple[ToolResponseBudget, dict[str, Any]]]
 
     # built-in tools that we make available to all providers
     tools: Optional[list[dict[str, Any]]]
@@ -228,6 +236,7 @@ class SmarterChatProviderBase(ChatDbMixin):
         self.temperature = None
         self.max_completion_tokens = None
         self.input_text = None
+        self.retrieved_context = None
 
         self.completion_tokens = None
         self.prompt_tokens = None
@@ -250,6 +259,7 @@ class SmarterChatProviderBase(ChatDbMixin):
 
         # initializations
         self.serialized_tool_calls = None
+        self.tool_response_budgets = {}
         self._chat = kwargs.get("prompt")
         self._provider_name = provider_name
         self._base_url = base_url
@@ -628,6 +638,47 @@ class SmarterChatProviderBase(ChatDbMixin):
         content = f"Smarter selected this plugin: {plugin}"
         self.append_message(role=OpenAIMessageKeys.SMARTER_MESSAGE_KEY, content=content)
 
+    def context_retriever(self) -> Optional["ContextRetriever"]:
+        """
+        Return a context retriever for the vectorstores that are attached to the LLMClient of the prompt.
+
+        :returns: The retriever, or None if the LLMClient has no vectorstores.
+        :rtype: Optional[ContextRetriever]
+        """
+        # pylint: disable=import-outside-toplevel
+        from smarter.apps.llm_client.models import LLMClientVectorstore
+        from smarter.apps.vectorstore.retrieval import ContextRetriever
+
+        llm_client = self.prompt.llm_client if self.prompt else None
+        attachments = LLMClientVectorstore.vectorstores(llm_client)  # type: ignore[arg-type]
+        if not attachments:
+            return None
+        return ContextRetriever(attachments, model=self.model) or None
+
+    def handle_context_retrieved(self, chunks: list["RetrievedChunk"]) -> None:
+        """
+        Add the retrieved chunks to the first request as context.
+
+        The context is sent as a system message before the user's input, and is
+        not added to the persisted message thread. A Smarter UI message lists the
+        sources of the chunks.
+
+        :param chunks: The chunks that were retrieved for the user's input.
+        :type chunks: list[RetrievedChunk]
+        :returns: None
+        :rtype: None
+        """
+        # pylint: disable=import-outside-toplevel
+        from smarter.apps.vectorstore.retrieval import format_context
+
+        if not chunks:
+            self.retrieved_context = None
+            return
+        self.retrieved_context = format_context(chunks)
+        citations = ", ".join(dict.fromkeys(chunk.citation for chunk in chunks))
+        content = f"Smarter added {len(chunks)} retrieved passages to the prompt: {citations}"
+        self.append_message(role=OpenAIMessageKeys.SMARTER_MESSAGE_KEY, content=content)
+
     def append_message_tool_called(self, tool_call: ChatCompletionMessageToolCallUnion) -> None:
         """
         Append a message indicating that a tool was called.
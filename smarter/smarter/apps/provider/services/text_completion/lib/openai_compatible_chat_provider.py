@@ -6,6 +6,7 @@ import logging
 import re
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from typing import Any, Optional, Union
 
@@ -75,6 +76,7 @@ from smarter.lib.logging import WaffleSwitchedLoggerWrapper
 from .chat_provider_base import SmarterChatProviderBase
 from .exception_map import EXCEPTION_MAP
 from .internal_keys import _InternalKeys
+from .response_shaping import ToolResponseBudget, shape_tool_response
 
 
 # pylint: disable=W0613
@@ -201,6 +203,20 @@ class OpenAISmarterClient(SmarterChatProviderBase):
             if _InternalKeys.SMARTER_IS_NEW in message_copy:
                 del message_copy[_InternalKeys.SMARTER_IS_NEW]
             retval.append(message_copy)
+
+        # retrieved vectorstore context goes immediately before the user's latest message.
+        # it is not part of self.messages, so it is not persisted with the message thread.
+        if self.retrieved_context:
+            context = {
+                OpenAIMessageKeys.MESSAGE_ROLE_KEY: OpenAIMessageKeys.SYSTEM_MESSAGE_KEY,
+                OpenAIMessageKeys.MESSAGE_CONTENT_KEY: self.retrieved_context,
+            }
+            roles = [message[OpenAIMessageKeys.MESSAGE_ROLE_KEY] for message in retval]
+            if OpenAIMessageKeys.USER_MESSAGE_KEY in roles:
+                position = len(roles) - 1 - roles[::-1].index(OpenAIMessageKeys.USER_MESSAGE_KEY)
+            else:
+                position = len(retval)
+            retval.insert(position, context)
         return retval
 
     @property
@@ -317,6 +333,45 @@ class OpenAISmarterClient(SmarterChatProviderBase):
             data=self.first_iteration[_InternalKeys.REQUEST_KEY],
         )
 
+    def shape_tool_responses(self) -> None:
+        """
+        Shape the tool results of this iteration to fit their token budgets.
+
+        This runs after all tool calls have been processed and before the second
+        request is prepared. Each tool message is measured in tokens, and results
+        that exceed the plugin's ``responseMaxTokens`` are reshaped with its
+        ``responseStrategy``, so that the size of the second request does not
+        depend on how much data a plugin returned.
+
+        :returns: None
+        :rtype: None
+        """
+        logger.debug("%s.shape_tool_responses() called.", self.formatted_class_name)
+        if not isinstance(self.messages, list):
+            raise SmarterValueError(f"{self.formatted_class_name}: messages must be a list, got {type(self.messages)}")
+        for message in self.messages:
+            if message.get(OpenAIMessageKeys.MESSAGE_ROLE_KEY) != OpenAIMessageKeys.TOOL_MESSAGE_KEY:
+                continue
+            tool_call_id = message.get(OpenAIMessageKeys.TOOL_CALL_ID)
+            if tool_call_id not in self.tool_response_budgets:
+                continue
+            budget, serialized_tool_call = self.tool_response_budgets.pop(tool_call_id)
+            content = message.get(OpenAIMessageKeys.MESSAGE_CONTENT_KEY)
+            if not isinstance(content, str):
+                continue
+            shaped = shape_tool_response(content, budget=budget, model=self.model)
+            serialized_tool_call["response_shaping"] = shaped.to_json()
+            if shaped.shaped:
+                logger.info(
+                    "%s.shape_tool_responses() %s result shaped with %s from %s to %s tokens.",
+                    self.formatted_class_name,
+                    message.get(OpenAIMessageKeys.MESSAGE_NAME_KEY),
+                    shaped.strategy,
+                    shaped.original_tokens,
+                    shaped.tokens,
+                )
+                message[OpenAIMessageKeys.MESSAGE_CONTENT_KEY] = shaped.content
+
     def prep_second_request(self):
         """
         Prepare the second request for the prompt completion.
@@ -662,11 +717,28 @@ class OpenAISmarterClient(SmarterChatProviderBase):
                 f"{self.formatted_class_name}: serialized_tool_calls must be a list, got {type(self.serialized_tool_calls)}"
             )
         self.serialized_tool_calls.append(serialized_tool_call)
+        self.tool_response_budgets[tool_call.id] = (
+            ToolResponseBudget.from_plugin_prompt(plugin.plugin_prompt) if plugin else ToolResponseBudget.default(),
+            serialized_tool_call,
+        )
         self.handle_tool_called(function_name=function_name, function_args=function_args)
         llm_tool_responded.send(
             sender=self.process_tool_call, tool_call=tool_call.model_dump(), tool_response=function_response
         )
 
+    def select_plugins(self) -> None:
+        """
+        Add the plugins that are selected by the user's input to the prompt.
+
+        :returns: None
+        :rtype: None
+        """
+        if not self.plugins:
+            return
+        for plugin in self.plugins:
+            if plugin.selected(user=self.user_profile.user, input_text=self.input_text, messages=self.messages):
+                self.handle_plugin_selected(plugin=plugin)
+
     def handle_plugin_selected(self, plugin: PluginBase) -> None:
         """
         Handle a plugin being selected.
@@ -888,6 +960,7 @@ class OpenAISmarterClient(SmarterChatProviderBase):
         self.data = data  # type: ignore[assignment]
         self.plugins = plugins
         self.functions = functions
+        self.retrieved_context = None
 
         prompt_started.send(sender=self.handler, prompt=self.prompt, data=self.data)
         self.iteration = 1
@@ -927,11 +1000,16 @@ class OpenAISmarterClient(SmarterChatProviderBase):
                 # and a user_profile message.
                 self.messages = self.get_message_thread(data=self.data)
 
-            # add plugins to the prompt if any are selected
-            if self.plugins:
-                for plugin in self.plugins:
-                    if plugin.selected(user=self.user_profile.user, input_text=self.input_text, messages=self.messages):
-                        self.handle_plugin_selected(plugin=plugin)
+            # retrieve context from the llm_client's vectorstores, if any, in a
+            # worker thread while plugins are selected.
+            retriever = self.context_retriever()
+            if retriever:
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-retrieval") as executor:
+                    retrieval = executor.submit(retriever.retrieve, self.input_text)
+                    self.select_plugins()
+                    self.handle_context_retrieved(retrieval.result())
+            else:
+                self.select_plugins()
 
             # add all functions that are included in the llm_client definition
             if self.functions:
@@ -988,6 +1066,7 @@ class OpenAISmarterClient(SmarterChatProviderBase):
                 for tool_call in tool_calls:
                     self.process_tool_call(tool_call)
 
+                self.shape_tool_responses()
                 self.prep_second_request()
 
                 if not isinstance(self.model, str):
@@ -0,0 +1,376 @@
+"""
+Token-budgeted shaping of tool and plugin results.
+
+Tool results are appended to the message thread verbatim and then sent back to
+the LLM in the second prompt completion request, so one large SQL, API or
+static plugin result can make that request slow, expensive, or push it over
+the model's context window. This module measures each result in tokens and,
+when it exceeds its budget, reshapes it with one of the
+:class:`SAMPluginCommonSpecPromptResponseStrategyValues` strategies:
+
+- ``truncate``: keep as many leading rows as fit.
+- ``project``: keep only the configured columns of each row, then truncate.
+- ``tabular``: re-encode a list of objects as a compact ``columns`` / ``rows``
+  table, which drops the repeated keys, then truncate.
+- ``summarize``: replace the rows with per-column statistics and as many
+  sample rows as fit.
+
+Results without rows (plain text, or JSON that has no list of records) are
+truncated at a token boundary. A shaped result is always marked with
+``"truncated": true``, a ``truncation_reason`` and a human readable ``note``,
+using the same keys as :class:`smarter.apps.connection.utils.SqlResultEncoder`,
+so the LLM can tell the user that it is looking at part of the data.
+"""
+
+import logging
+import statistics
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+import tiktoken
+
+from smarter.apps.plugin.manifest.enum import (
+    SAMPluginCommonSpecPromptResponseStrategyValues,
+)
+from smarter.apps.plugin.models import PluginPrompt
+from smarter.common.conf import smarter_settings
+from smarter.lib import json
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+
+# pylint: disable=W0613
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.PROMPT_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+Strategies = SAMPluginCommonSpecPromptResponseStrategyValues
+
+TRUNCATED_TOKEN_BUDGET = "token_budget"
+"""``truncation_reason`` of a result that was shaped to fit its token budget."""
+
+CHARS_PER_TOKEN = 4
+"""Token estimate used when no tokenizer is available for the model."""
+
+DEFAULT_ENCODING = "o200k_base"
+SUMMARY_EXAMPLE_VALUES = 3
+
+_encoder = json.SmarterJSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+@lru_cache(maxsize=32)
+def get_encoding(model: Optional[str]) -> Optional[tiktoken.Encoding]:
+    """
+    Return the tiktoken encoding for ``model``.
+
+    Models that tiktoken does not know, such as those of other OpenAI-compatible
+    vendors, use ``o200k_base``. Returns None when no encoding can be loaded, in
+    which case token counts are estimated.
+    """
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    # pylint: disable=W0718
+    except Exception as e:
+        # encodings are downloaded on first use, which can fail in a sandboxed worker.
+        logger.warning("%s.get_encoding() could not load a tokenizer for %s: %s", __name__, model, e)
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Return the number of tokens in ``text``.
+
+    :param text: The text to measure.
+    :param model: The LLM model, used to select the tokenizer.
+    :return: The exact token count, or an estimate when no tokenizer is available.
+    :rtype: int
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def fits(text: str, max_tokens: int, model: Optional[str] = None) -> bool:
+    """
+    Return True if ``text`` is no more than ``max_tokens`` tokens long.
+
+    A token is at least one byte, so short texts are accepted without tokenizing them.
+    """
+    if len(text.encode("utf-8")) <= max_tokens:
+        return True
+    return count_tokens(text, model) <= max_tokens
+
+
+def truncate_text(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """
+    Truncate ``text`` to ``max_tokens`` tokens, including a truncation marker.
+
+    :param text: The text to truncate.
+    :param max_tokens: The token budget.
+    :param model: The LLM model, used to select the tokenizer.
+    :return: The truncated text.
+    :rtype: str
+    """
+    marker = f"\n\n[truncated: this result exceeded its {max_tokens}-token budget]"
+    # one token of slack, since tokens can merge across the join.
+    keep = max(max_tokens - count_tokens(marker, model) - 1, 0)
+    encoding = get_encoding(model)
+    if encoding is None:
+        return text[: keep * CHARS_PER_TOKEN] + marker
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]) + marker
+
+
+@dataclass(frozen=True)
+class ToolResponseBudget:
+    """
+    The token budget and shaping strategy for one tool result.
+
+    :param max_tokens: The maximum number of tokens the result may occupy.
+    :param strategy: One of :class:`SAMPluginCommonSpecPromptResponseStrategyValues`.
+    :param columns: The columns to keep for the ``project`` strategy.
+    """
+
+    max_tokens: int
+    strategy: str
+    columns: Optional[tuple[str, ...]] = None
+
+    @classmethod
+    def default(cls) -> "ToolResponseBudget":
+        """Return the budget from the ``plugin_response_*`` settings."""
+        return cls(
+            max_tokens=smarter_settings.plugin_response_max_tokens,
+            strategy=smarter_settings.plugin_response_strategy,
+        )
+
+    @classmethod
+    def from_plugin_prompt(cls, plugin_prompt: Optional[PluginPrompt]) -> "ToolResponseBudget":
+        """Return the budget for a plugin, falling back to the settings for anything it does not set."""
+        if plugin_prompt is None:
+            return cls.default()
+        return cls(
+            max_tokens=plugin_prompt.response_max_tokens or smarter_settings.plugin_response_max_tokens,
+            strategy=plugin_prompt.response_strategy or smarter_settings.plugin_response_strategy,
+            columns=tuple(plugin_prompt.response_columns) if plugin_prompt.response_columns else None,
+        )
+
+
+@dataclass(frozen=True)
+class ShapedToolResponse:
+    """The result of :func:`shape_tool_response`."""
+
+    content: str
+    shaped: bool
+    strategy: Optional[str]
+    original_tokens: int
+    tokens: int
+
+    def to_json(self) -> dict[str, Any]:
+        """Return a summary that is suitable for logging and response metadata."""
+        return {
+            "shaped": self.shaped,
+            "strategy": self.strategy,
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+        }
+
+
+class _Table:
+    """
+    The rows of a JSON tool result, plus everything around them.
+
+    ``rows`` are either dicts or, when ``columns`` is set, lists of values.
+    ``metadata`` holds the other keys of the enclosing object, if any.
+    """
+
+    def __init__(self, rows: list, columns: Optional[list[str]] = None, metadata: Optional[dict] = None):
+        self.rows = rows
+        self.columns = columns
+        self.metadata = metadata or {}
+
+    @classmethod
+    def from_json(cls, data: Any) -> Optional["_Table"]:
+        """Find the rows in a decoded tool result, or return None if it has none."""
+        if isinstance(data, list):
+            return cls(rows=data)
+        if not isinstance(data, dict):
+            return None
+        if isinstance(data.get("rows"), list) and isinstance(data.get("columns"), list):
+            # SqlResultEncoder output
+            metadata = {k: v for k, v in data.items() if k not in ("rows", "columns")}
+            return cls(rows=data["rows"], columns=[str(c) for c in data["columns"]], metadata=metadata)
+        list_keys = [k for k, v in data.items() if isinstance(v, list) and v]
+        if not list_keys:
+            return None
+        # the largest list is the payload, e.g. {"count": 2, "results": [...]}
+        key = max(list_keys, key=lambda k: len(data[k]))
+        return cls(rows=data[key], metadata={"rows_key": key, **{k: v for k, v in data.items() if k != key}})
+
+    def project(self, columns: tuple[str, ...]) -> "_Table":
+        """Keep only ``columns`` of each row."""
+        if self.columns is not None:
+            indexes = [i for i, c in enumerate(self.columns) if c in columns]
+            rows = [[row[i] for i in indexes] for row in self.rows if isinstance(row, list)]
+            return _Table(rows=rows, columns=[self.columns[i] for i in indexes], metadata=self.metadata)
+        rows = [{k: v for k, v in row.items() if k in columns} if isinstance(row, dict) else row for row in self.rows]
+        return _Table(rows=rows, metadata=self.metadata)
+
+    def tabular(self) -> "_Table":
+        """Re-encode a list of objects as a list of value lists, with the keys listed once."""
+        if self.columns is not None or not all(isinstance(row, dict) for row in self.rows):
+            return self
+        columns: dict[str, None] = {}
+        for row in self.rows:
+            columns.update(dict.fromkeys(row))
+        rows = [[row.get(c) for c in columns] for row in self.rows]
+        return _Table(rows=rows, columns=list(columns), metadata=self.metadata)
+
+    def column_values(self) -> dict[str, list]:
+        """Return the values of each column."""
+        values: dict[str, list] = {}
+        for row in self.rows:
+            if isinstance(row, list) and self.columns is not None:
+                items = zip(self.columns, row)
+            elif isinstance(row, dict):
+                items = row.items()
+            else:
+                continue
+            for column, value in items:
+                values.setdefault(str(column), []).append(value)
+        return values
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-column statistics of all rows."""
+        retval: dict[str, Any] = {}
+        for column, values in self.column_values().items():
+            present = [v for v in values if v is not None]
+            numbers = [v for v in present if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            stats: dict[str, Any] = {"count": len(present)}
+            if numbers and len(numbers) == len(present):
+                stats.update(min=min(numbers), max=max(numbers), mean=round(statistics.fmean(numbers), 4))
+            else:
+                distinct = list(
+                    dict.fromkeys(_encoder.encode(v) if isinstance(v, (dict, list)) else v for v in present)
+                )
+                stats.update(distinct=len(distinct), examples=distinct[:SUMMARY_EXAMPLE_VALUES])
+            retval[column] = stats
+        return retval
+
+    def render(self, n: int, extra: Optional[dict] = None) -> dict[str, Any]:
+        """Return the first ``n`` rows, with metadata and truncation markers."""
+        metadata = dict(self.metadata)
+        rows_key = metadata.pop("rows_key", "rows")
+        retval: dict[str, Any] = metadata
+        if self.columns is not None:
+            retval["columns"] = self.columns
+        retval[rows_key] = self.rows[:n]
+        retval.update(extra or {})
+        return retval
+
+
+def shape_tool_response(content: str, budget: ToolResponseBudget, model: Optional[str] = None) -> ShapedToolResponse:
+    """
+    Shape a tool result so that it fits ``budget``.
+
+    :param content: The tool result, as sent to the LLM.
+    :param budget: The token budget and strategy for this result.
+    :param model: The LLM model, used to select the tokenizer.
+    :return: The shaped result. ``content`` is returned unchanged when it already fits.
+    :rtype: ShapedToolResponse
+    """
+    original_tokens = count_tokens(content, model)
+    if original_tokens <= budget.max_tokens:
+        return ShapedToolResponse(
+            content, shaped=False, strategy=None, original_tokens=original_tokens, tokens=original_tokens
+        )
+
+    try:
+        table = _Table.from_json(json.loads(content))
+    except (json.JSONDecodeError, TypeError):
+        table = None
+
+    strategy = budget.strategy
+    if table is None or not table.rows:
+        strategy = Strategies.TRUNCATE.value
+        shaped = truncate_text(content, budget.max_tokens, model)
+    else:
+        shaped = _shape_table(table, budget, model, original_tokens)
+
+    return ShapedToolResponse(
+        content=shaped,
+        shaped=True,
+        strategy=strategy,
+        original_tokens=original_tokens,
+        tokens=count_tokens(shaped, model),
+    )
+
+
+def _shape_table(table: _Table, budget: ToolResponseBudget, model: Optional[str], original_tokens: int) -> str:
+    total = len(table.rows)
+    summary = None
+    if budget.strategy == Strategies.PROJECT.value and budget.columns:
+        table = table.project(budget.columns)
+    elif budget.strategy == Strategies.TABULAR.value:
+        table = table.tabular()
+    elif budget.strategy == Strategies.SUMMARIZE.value:
+        summary = table.summary()
+
+    def render(n: int) -> str:
+        if summary is not None:
+            note = (
+                f"This result had {total} rows and {original_tokens} tokens, more than its {budget.max_tokens}-token "
+                f"budget. column_summary describes all {total} rows. sample_rows shows the first {n}."
+            )
+            data = {
+                "row_count": total,
+                "column_summary": summary,
+                **({"columns": table.columns} if table.columns is not None else {}),
+                "sample_rows": table.rows[:n],
+            }
+        else:
+            note = (
+                f"This result had {total} rows and {original_tokens} tokens, more than its {budget.max_tokens}-token "
+                f"budget. Only the first {n} rows are shown."
+            )
+            data = table.render(n, extra={"row_count": n})
+        data.update(
+            total_row_count=total,
+            truncated=True,
+            truncation_reason=TRUNCATED_TOKEN_BUDGET,
+            note=note,
+        )
+        return _encoder.encode(data)
+
+    # binary search for the largest number of rows that fits.
+    low, high = 0, total
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(render(mid), budget.max_tokens, model):
+            low = mid
+        else:
+            high = mid - 1
+    shaped = render(low)
+    if low == 0 and not fits(shaped, budget.max_tokens, model):
+        # the metadata or summary alone is too large.
+        return truncate_text(shaped, budget.max_tokens, model)
+    return shaped
+
+
+__all__ = [
+    "ShapedToolResponse",
+    "ToolResponseBudget",
+    "count_tokens",
+    "shape_tool_response",
+    "truncate_text",
+]
@@ -0,0 +1,69 @@
+"""Test the content-addressed embedding cache."""
+
+from unittest.mock import patch
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from smarter.apps.provider.services.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    normalize_text,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that record the texts they embed."""
+
+    calls: list
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return super().embed_query(text)
+
+
+class TestEmbeddingCache(SmarterTestBase):
+    """Test EmbeddingCache and CachedEmbeddings."""
+
+    def setUp(self):
+        super().setUp()
+        self.embeddings = CountingEmbeddings(size=8, calls=[])
+        self.cached_embeddings = CachedEmbeddings(self.embeddings, EmbeddingCache(f"test:fake:8:{self.hash_suffix}"))
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("  a\n\tb  c "), "a b c")
+        self.assertEqual(normalize_text("café"), "café")
+
+    def test_embed_documents(self):
+        vectors = self.cached_embeddings.embed_documents(["alpha", "beta", "alpha "])
+        self.assertEqual(self.embeddings.calls, [["alpha", "beta"]])
+        self.assertEqual(vectors[0], vectors[2])
+
+        again = self.cached_embeddings.embed_documents(["gamma", "beta", "alpha"])
+        self.assertEqual(self.embeddings.calls[-1], ["gamma"])
+        self.assertEqual(again[1], vectors[1])
+        self.assertEqual(again[2], vectors[0])
+
+    def test_float16_precision(self):
+        expected = self.embeddings.embed_documents(["alpha"])[0]
+        vector = self.cached_embeddings.embed_documents(["alpha"])[0]
+        self.assertEqual(len(vector), 8)
+        for a, b in zip(vector, expected):
+            self.assertAlmostEqual(a, b, delta=1e-2)
+
+    def test_embed_query(self):
+        first = self.cached_embeddings.embed_query("what is smarter?")
+        second = self.cached_embeddings.embed_query("what is  smarter?")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.embeddings.calls), 1)
+
+    def test_disabled(self):
+        with patch("smarter.apps.provider.services.embedding_cache.smarter_settings") as smarter_settings:
+            smarter_settings.vectorstore_embedding_cache_ttl = 0
+            self.cached_embeddings.embed_documents(["alpha"])
+            self.cached_embeddings.embed_documents(["alpha"])
+        self.assertEqual(len(self.embeddings.calls), 2)
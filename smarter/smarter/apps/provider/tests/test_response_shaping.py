@@ -0,0 +1,67 @@
+"""Test token-budgeted tool response shaping."""
+
+from smarter.apps.provider.services.text_completion.lib.response_shaping import (
+    TRUNCATED_TOKEN_BUDGET,
+    ToolResponseBudget,
+    count_tokens,
+    shape_tool_response,
+)
+from smarter.lib import json
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestResponseShaping(SmarterTestBase):
+    """Test shape_tool_response() strategies."""
+
+    model = "gpt-4o-mini"
+
+    def setUp(self):
+        super().setUp()
+        self.rows = [
+            {"course_code": f"CS{i:03d}", "description": f"Introduction to topic number {i}", "cost": i * 10}
+            for i in range(200)
+        ]
+        self.content = json.dumps(self.rows)
+
+    def shape(self, strategy: str, max_tokens: int = 300, columns=None) -> dict:
+        budget = ToolResponseBudget(max_tokens=max_tokens, strategy=strategy, columns=columns)
+        shaped = shape_tool_response(self.content, budget=budget, model=self.model)
+        self.assertTrue(shaped.shaped)
+        self.assertLessEqual(count_tokens(shaped.content, self.model), max_tokens)
+        self.assertLess(shaped.tokens, shaped.original_tokens)
+        result = json.loads(shaped.content)
+        self.assertTrue(result["truncated"])
+        self.assertEqual(result["truncation_reason"], TRUNCATED_TOKEN_BUDGET)
+        self.assertEqual(result["total_row_count"], len(self.rows))
+        return result
+
+    def test_fits(self):
+        budget = ToolResponseBudget(max_tokens=100000, strategy="truncate")
+        shaped = shape_tool_response(self.content, budget=budget, model=self.model)
+        self.assertFalse(shaped.shaped)
+        self.assertEqual(shaped.content, self.content)
+
+    def test_truncate(self):
+        result = self.shape("truncate")
+        self.assertGreater(result["row_count"], 0)
+        self.assertEqual(result["rows"], self.rows[: result["row_count"]])
+
+    def test_project_and_tabular(self):
+        projected = self.shape("project", columns=("course_code",))
+        self.assertEqual(projected["rows"][0], {"course_code": "CS000"})
+        tabular = self.shape("tabular")
+        self.assertEqual(tabular["columns"], ["course_code", "description", "cost"])
+        self.assertEqual(tabular["rows"][0], ["CS000", "Introduction to topic number 0", 0])
+        self.assertGreater(projected["row_count"], tabular["row_count"])
+
+    def test_summarize(self):
+        result = self.shape("summarize", max_tokens=400)
+        self.assertEqual(result["column_summary"]["cost"]["max"], 1990)
+        self.assertEqual(result["column_summary"]["course_code"]["distinct"], len(self.rows))
+
+    def test_plain_text(self):
+        budget = ToolResponseBudget(max_tokens=50, strategy="tabular")
+        shaped = shape_tool_response("lorem ipsum " * 500, budget=budget, model=self.model)
+        self.assertEqual(shaped.strategy, "truncate")
+        self.assertIn("[truncated:", shaped.content)
+        self.assertLessEqual(count_tokens(shaped.content, self.model), 50)
@@ -36,6 +36,7 @@ from django.db import models
 from smarter.apps.account.models.user_profile import UserProfile
 from smarter.lib import logging
 from smarter.lib.cache import cache_results
+from smarter.lib.cache.tags import model_tag
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
 from .models import Secret
@@ -47,7 +48,12 @@ logger = logging.getSmarterLogger(
 logger_prefix = logging.formatted_text(__name__)
 
 
-@cache_results()
+def _tags(user_profile_id: int) -> list[str]:
+    """Return the cache tags of the Secrets of a user profile, see ``smarter.lib.cache.tags``."""
+    return [model_tag(Secret), model_tag(UserProfile, user_profile_id)]
+
+
+@cache_results(tags=_tags)
 def _get_cached_secrets_owned_by_user_profile(user_profile_id: int) -> models.QuerySet[Secret]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
     retval = Secret.objects.owned_by(user_profile.user)  # type: ignore
@@ -92,7 +98,7 @@ def invalidate_cached_secrets_owned_by_user_profile(user_profile: UserProfile) -
     _get_cached_secrets_owned_by_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_secrets_shared_with_user_profile(user_profile_id: int) -> models.QuerySet[Secret]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
     retval = Secret.objects.shared_with(user_profile.user)  # type: ignore
@@ -136,7 +142,7 @@ def invalidate_cached_secrets_shared_with_user_profile(user_profile: UserProfile
     _get_cached_secrets_shared_with_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_secrets_available_to_user_profile(user_profile_id) -> models.QuerySet[Secret]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
     retval = Secret.objects.with_read_permission_for(user_profile.user)  # type: ignore
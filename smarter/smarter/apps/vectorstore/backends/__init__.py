@@ -17,6 +17,7 @@ from smarter.lib.logging import WaffleSwitchedLoggerWrapper
 
 # Smarter VectorStore backends
 from .base import SmarterVectorstoreBackend
+from .local import LocalBackend
 from .pinecone import PineconeBackend
 from .qdrant import QdrantBackend
 from .weaviate import WeaviateBackend
@@ -74,6 +75,7 @@ class Backends:
         SmarterVectorStoreBackends.QDRANT.value: QdrantBackend,
         SmarterVectorStoreBackends.WEAVIATE.value: WeaviateBackend,
         SmarterVectorStoreBackends.PINECONE.value: PineconeBackend,
+        SmarterVectorStoreBackends.LOCAL.value: LocalBackend,
     }
 
     @classmethod
@@ -166,4 +168,4 @@ if not all(item in SmarterVectorStoreBackends.all() for item in Backends.all_bac
     )
 
 
-__all__ = ["Backends", "QdrantBackend", "WeaviateBackend", "PineconeBackend"]
+__all__ = ["Backends", "QdrantBackend", "WeaviateBackend", "PineconeBackend", "LocalBackend"]
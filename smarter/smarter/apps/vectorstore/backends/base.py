@@ -8,10 +8,14 @@ inherit from this class and provide concrete implementations for these methods
 based on the specific vector store being used (e.g., Pinecone, Weaviate, etc.).
 """
 
+import hashlib
 import logging
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Sequence, Union
 
+from django.core.exceptions import ObjectDoesNotExist
 from langchain_core.documents import Document
 from langchain_core.embeddings.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
@@ -43,6 +47,26 @@ class VectorStoreBackendConnectionError(SmarterException):
     """Exception raised when there is an error with the vector store backend connection."""
 
 
+def point_id(document: Document) -> str:
+    """
+    Return a stable id for a document in a vector store.
+
+    Ids are derived from the document id, or else from its source and content,
+    so that loading the same document again overwrites it rather than
+    duplicating it.
+
+    :param document: The document.
+    :returns: A UUID string.
+    :rtype: str
+    """
+    if document.id:
+        name = str(document.id)
+    else:
+        source = str(document.metadata.get("source", ""))
+        name = source + ":" + hashlib.sha256(document.page_content.encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
 class VectorStoreBackendConnection(SmarterHelperMixin):
     """Represents a connection to a vector store backend."""
 
@@ -86,10 +110,14 @@ class SmarterVectorstoreBackend(ABC, SmarterHelperMixin):
         Provision a new vector database in the backend.
     delete()
         Delete the vector database from the backend.
+    delete_documents(ids)
+        Delete documents from the vector store by point id.
     upsert(vectors)
         Upsert vectors into the vector database in the backend.
     query(query_vector, top_k=10)
         Query the vector database in the backend.
+    query_batch(query_vectors, top_k=10)
+        Query the vector database for several query vectors or texts at once.
     connect()
         Establish a connection to the vector database in the backend.
     disconnect()
@@ -113,6 +141,9 @@ class SmarterVectorstoreBackend(ABC, SmarterHelperMixin):
         Check if the backend is ready for operations.
     """
 
+    QUERY_CONCURRENCY = 8
+    """The maximum number of concurrent queries of :meth:`query_batch`, for backends without multi-query requests."""
+
     # Internal state variables for lazy initialization
     _connection: Optional[VectorStoreBackendConnection] = None
     _embeddings: Optional[Embeddings] = None
@@ -176,6 +207,59 @@ class SmarterVectorstoreBackend(ABC, SmarterHelperMixin):
         """Check if the backend is ready for operations."""
         return super().ready and self.is_connected
 
+    @property
+    def index_model_metric(self) -> str:
+        """The lower case ``indexModel.metric`` of the vector database. Defaults to cosine."""
+        return str(getattr(self._related("index_model_interface"), "metric", None) or "cosine").lower()
+
+    @property
+    def index_model_dimension(self) -> int:
+        """
+        The number of vector dimensions.
+
+        Taken from ``indexModel.dimension`` or ``embeddings.dimensions``, or else
+        measured from the embeddings.
+        """
+        dimension = getattr(self._related("index_model_interface"), "dimension", None) or getattr(
+            self._related("embeddings_interface"), "dimensions", None
+        )
+        if dimension:
+            return int(dimension)
+        return len(self.embeddings.embed_query(self.db.name))
+
+    @property
+    def embeddings_provider(self) -> Optional[Any]:
+        """The :class:`Provider` of the embeddings configuration, if any."""
+        return getattr(self._related("embeddings_interface"), "provider", None)
+
+    @property
+    def embeddings_chunk_size(self) -> Optional[int]:
+        """The maximum number of texts per embedding request of the embeddings configuration, if any."""
+        return getattr(self._related("embeddings_interface"), "chunk_size", None) or None
+
+    def _related(self, related_name: str) -> Optional[Any]:
+        """Return the optional one-to-one configuration ``related_name`` of :attr:`db`, or None."""
+        try:
+            return getattr(self.db, related_name, None)
+        except ObjectDoesNotExist:
+            return None
+
+    def vectorize(self, documents: list[Document], embeddings: Optional[list[Any]] = None) -> list[Any]:
+        """
+        Return the embedding vectors of ``documents``.
+
+        :param documents: The documents.
+        :param embeddings: Precomputed embedding vectors, which are returned as is.
+        :returns: One embedding vector per document, computed with :attr:`embeddings` if
+            ``embeddings`` is not provided.
+        :raises VectorStoreBackendError: If the number of embeddings and documents differ.
+        """
+        if embeddings:
+            if len(embeddings) != len(documents):
+                raise VectorStoreBackendError(f"Got {len(embeddings)} embeddings for {len(documents)} documents.")
+            return embeddings
+        return self.embeddings.embed_documents([document.page_content for document in documents])
+
     ###########################################################################
     # Abstract methods that must be implemented by all backends
     ###########################################################################
@@ -199,6 +283,11 @@ class SmarterVectorstoreBackend(ABC, SmarterHelperMixin):
         """Delete the vector database from the backend."""
         raise NotImplementedError("Delete method not implemented for this backend")
 
+    @abstractmethod
+    def delete_documents(self, ids: list[str]) -> int:
+        """Delete documents from the vector store by point id. See :func:`point_id`."""
+        raise NotImplementedError("Delete documents method not implemented for this backend")
+
     @abstractmethod
     def disconnect(self) -> None:
         """Disconnect from the vector database in the backend."""
@@ -210,6 +299,51 @@ class SmarterVectorstoreBackend(ABC, SmarterHelperMixin):
         raise NotImplementedError("Initialize method not implemented for this backend")
 
     @abstractmethod
-    def query(self, query_vector: Any, top_k: int = 10):
-        """Query the vector database in the backend."""
-        raise NotImplementedError("Query method not implemented for this backend")
+    def query(self, query_vector: Any, top_k: int = 10) -> list[tuple[Document, float]]:
+        """
+        Query the vector database in the backend.
+
+        :raises VectorStoreBackendError: If the backend cannot be queried.
+        """
+        raise VectorStoreBackendError(f"{self.__class__.__name__} does not support queries.")
+
+    def embed_queries(self, queries: Sequence[Union[str, list[float]]]) -> list[list[float]]:
+        """
+        Return the query vector of each query, embedding the query texts with one batch request.
+
+        :param queries: Query vectors, or query texts to vectorize with :attr:`embeddings`.
+        :returns: One query vector per query, in order.
+        """
+        texts = {i: query for i, query in enumerate(queries) if isinstance(query, str)}
+        if not texts:
+            return [list(query) for query in queries]  # type: ignore[arg-type]
+        # query and document embeddings are the same for the OpenAI-compatible providers
+        embed = getattr(self.embeddings, "embed_queries", None) or self.embeddings.embed_documents
+        vectors = dict(zip(texts, embed(list(texts.values()))))
+        return [vectors[i] if i in vectors else list(query) for i, query in enumerate(queries)]  # type: ignore[arg-type]
+
+    def query_batch(
+        self, query_vectors: Sequence[Union[str, list[float]]], top_k: int = 10, **kwargs
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Query the vector database for several query vectors or texts at once.
+
+        Query texts are embedded with one batch request. Backends that support
+        multi-query requests override this method to query in one round trip; by
+        default, the queries are sent concurrently, up to :attr:`QUERY_CONCURRENCY`
+        at a time.
+
+        :param query_vectors: Query vectors, or query texts to vectorize with :attr:`embeddings`.
+        :param top_k: The maximum number of results per query.
+        :param kwargs: Passed to :meth:`query`, e.g. ``filters``.
+        :returns: The matching documents and their scores, best first, for each query in order.
+        :raises VectorStoreBackendError: If the backend cannot be queried.
+        """
+        if not query_vectors:
+            return []
+        vectors = self.embed_queries(query_vectors)
+        if len(vectors) == 1:
+            return [self.query(vectors[0], top_k, **kwargs)]
+        workers = min(self.QUERY_CONCURRENCY, len(vectors))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vectorstore-query") as executor:
+            return list(executor.map(lambda vector: self.query(vector, top_k, **kwargs), vectors))
@@ -0,0 +1,1006 @@
+"""
+Backend implementation for the local vectorstore.
+
+The local vectorstore runs inside the Smarter process, with no external
+service, and suits vectorstores of up to some tens of thousands of
+documents. Each vectorstore is a directory under
+``smarter_settings.vectorstore_local_path`` that holds:
+
+- ``vectors.bin``: the vectors, one fixed-size row per slot, quantized to
+  float16, or to int8 with a per-vector scale in ``scales.bin``. See
+  ``smarter_settings.vectorstore_local_quantization``.
+- ``norms.bin``: the vector norms, for euclidean distance.
+- ``centroids.npy`` and ``lists.bin``: an inverted file (IVF) index, trained
+  once a vectorstore holds :attr:`LocalIndex.IVF_MIN_VECTORS` vectors, and
+  retrained when it has grown by :attr:`LocalIndex.IVF_RETRAIN_GROWTH`.
+- ``documents.sqlite3``: a sidecar SQLite database with the text and
+  metadata of each document, which also evaluates metadata filters.
+- ``index.json``: the configuration of the vectorstore, and the number of
+  slots in the arrays. It is written last, and so marks a completed write.
+
+Each vector keeps its slot for as long as it exists, so that the slot
+numbers in the documents database are stable. Writes append new vectors
+to the arrays, or write them in place, rather than rewriting the arrays.
+Removed vectors are tombstoned in the documents database, and their slots
+are reused by later writes.
+
+Each worker memory-maps the arrays on first use, and scores them a block
+of rows at a time, so that it never holds a float32 copy of the whole
+index. Workers reload the arrays when ``index.json`` changes. Writes are
+serialized across processes by a lock file.
+"""
+
+import fcntl
+import logging
+import math
+import os
+import shutil
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from typing import Any, Iterator, Optional, Sequence, Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from smarter.apps.vectorstore.enum import SmarterVectorStoreBackends
+from smarter.apps.vectorstore.models import VectorstoreMeta
+from smarter.apps.vectorstore.signals import load_failed, load_started, load_success
+from smarter.common.conf import smarter_settings
+from smarter.lib import json
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+from .base import (
+    SmarterVectorstoreBackend,
+    VectorStoreBackendConnection,
+    VectorStoreBackendConnectionError,
+    VectorStoreBackendError,
+    point_id,
+)
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+LOCAL_METRICS: dict[str, str] = {
+    "cosine": "cosine",
+    "dotproduct": "dotproduct",
+    "dot_product": "dotproduct",
+    "dot": "dotproduct",
+    "euclidean": "euclidean",
+    "euclid": "euclidean",
+}
+"""Maps the ``indexModel.metric`` values of a manifest to the metrics of :class:`LocalIndex`."""
+
+
+def quantize(vectors: np.ndarray, quantization: str) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantize float32 vectors.
+
+    :param vectors: A (n, dimension) float32 array.
+    :param quantization: ``float16`` or ``int8``.
+    :returns: The quantized vectors, and for int8 the per-vector scales.
+    """
+    if quantization == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        data = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return data, scales.astype(np.float32)
+    return vectors.astype(np.float16), None
+
+
+def dequantize(data: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """Return quantized vectors as a float32 array."""
+    vectors = np.asarray(data, dtype=np.float32)
+    if scales is not None:
+        vectors = vectors * scales[:, None]
+    return vectors
+
+
+def kmeans(vectors: np.ndarray, nlist: int, iterations: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster vectors with Lloyd's k-means.
+
+    :returns: The (nlist, dimension) centroids, and the centroid of each vector.
+    """
+    rng = np.random.default_rng(0)
+    centroids = vectors[rng.choice(len(vectors), size=nlist, replace=False)].copy()
+    assignments = np.zeros(len(vectors), dtype=np.int32)
+    for _ in range(iterations):
+        assignments = nearest_centroids(vectors, centroids, 1)[:, 0]
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=nlist)
+        nonempty = counts > 0
+        centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+    return centroids, assignments
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, n: int) -> np.ndarray:
+    """Return the indices of the ``n`` centroids nearest to each vector, by euclidean distance."""
+    distances = (centroids * centroids).sum(axis=1)[None, :] - 2.0 * (np.atleast_2d(vectors) @ centroids.T)
+    if n >= centroids.shape[0]:
+        return np.argsort(distances, axis=1).astype(np.int32)
+    return np.argpartition(distances, n - 1, axis=1)[:, :n].astype(np.int32)
+
+
+class LocalIndex:
+    """
+    A vector index stored in a directory. See :mod:`smarter.apps.vectorstore.backends.local`.
+
+    Instances are shared by the threads of a process. Use :func:`get_local_index`.
+
+    :param path: The directory of the index.
+    """
+
+    MANIFEST_FILE = "index.json"
+    VECTORS_FILE = "vectors.bin"
+    SCALES_FILE = "scales.bin"
+    NORMS_FILE = "norms.bin"
+    CENTROIDS_FILE = "centroids.npy"
+    LISTS_FILE = "lists.bin"
+    DOCUMENTS_FILE = "documents.sqlite3"
+    LOCK_FILE = ".lock"
+
+    IVF_MIN_VECTORS = 10_000
+    """The number of vectors at which searches switch from exact to IVF."""
+    IVF_RETRAIN_GROWTH = 2.0
+    """The factor by which the number of vectors grows before the IVF centroids are retrained."""
+    IVF_TRAINING_ITERATIONS = 10
+    IVF_TRAINING_SAMPLE = 256
+    """The number of vectors per IVF list that the centroids are trained on."""
+    IVF_PROBE_RATIO = 0.125
+    """The fraction of IVF lists that a search probes."""
+    SCORE_BLOCK_ROWS = 4096
+    """The number of vectors that are converted to float32 at a time while scoring."""
+    SQL_BATCH_SIZE = 500
+    """The maximum number of parameters of an SQL ``IN`` clause."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded_version: Optional[tuple[int, int]] = None
+        self._config: dict[str, Any] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._live_rows: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._list_rows: Optional[np.ndarray] = None
+        self._readers = threading.local()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path}>"
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @property
+    def exists(self) -> bool:
+        """True if the index has been created."""
+        return os.path.isfile(self._file(self.MANIFEST_FILE))
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """The configuration of the index: dimension, metric, quantization, count, slots and nlist."""
+        self.load()
+        return self._config
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._file(self.LOCK_FILE), "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _documents(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._file(self.DOCUMENTS_FILE), timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "idx INTEGER PRIMARY KEY, point_id TEXT NOT NULL UNIQUE, page_content TEXT NOT NULL, "
+            "metadata TEXT NOT NULL, deleted INTEGER NOT NULL DEFAULT 0)"
+        )
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read connection to the documents, which is reopened when the index is reloaded."""
+        if getattr(self._readers, "version", None) != self._loaded_version:
+            connection = getattr(self._readers, "connection", None)
+            if connection is not None:
+                connection.close()
+            self._readers.connection = sqlite3.connect(self._file(self.DOCUMENTS_FILE), timeout=30)
+            self._readers.version = self._loaded_version
+        return self._readers.connection
+
+    def _read_config(self) -> dict[str, Any]:
+        with open(self._file(self.MANIFEST_FILE), encoding="utf-8") as f:
+            return json.loads(f.read())
+
+    def _save_config(self, config: dict[str, Any]) -> None:
+        tmp_path = self._file(self.MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(config))
+        os.replace(tmp_path, self._file(self.MANIFEST_FILE))
+
+    def _row_format(self, name: str, config: dict[str, Any]) -> tuple[np.dtype, tuple[int, ...]]:
+        """Return the dtype and the shape of the rows of an array file."""
+        if name == self.VECTORS_FILE:
+            return np.dtype(np.int8 if config["quantization"] == "int8" else np.float16), (config["dimension"],)
+        if name == self.LISTS_FILE:
+            return np.dtype(np.int32), ()
+        return np.dtype(np.float32), ()
+
+    def _map_array(self, name: str, config: dict[str, Any]) -> Optional[np.ndarray]:
+        """Memory-map the rows of the ``slots`` of an array file, or return None if it does not exist."""
+        path = self._file(name)
+        if not os.path.exists(path):
+            return None
+        dtype, shape = self._row_format(name, config)
+        if config["slots"] == 0:
+            return np.empty((0, *shape), dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(config["slots"], *shape))
+
+    def _write_rows(self, name: str, config: dict[str, Any], slots: np.ndarray, rows: np.ndarray) -> None:
+        """
+        Write the rows of ``slots`` of an array file in place, growing it as needed.
+
+        Rows of a slot that appears more than once are written in order, so the last one wins.
+        """
+        dtype, shape = self._row_format(name, config)
+        rows = np.ascontiguousarray(rows, dtype=dtype).reshape(len(slots), *shape)
+        row_bytes = dtype.itemsize * math.prod(shape)
+        order = np.argsort(slots, kind="stable")
+        path = self._file(name)
+        with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+            start = 0
+            # write each run of consecutive slots, such as the appended ones, with one call.
+            for end in range(1, len(order) + 1):
+                if end == len(order) or slots[order[end]] != slots[order[end - 1]] + 1:
+                    f.seek(int(slots[order[start]]) * row_bytes)
+                    f.write(rows[order[start:end]].tobytes())
+                    start = end
+
+    def _replace_rows(self, name: str, config: dict[str, Any], rows: np.ndarray) -> None:
+        """Replace an array file, so that processes that mapped the previous file keep reading it."""
+        dtype, _ = self._row_format(name, config)
+        tmp_path = self._file(name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(np.ascontiguousarray(rows, dtype=dtype).tobytes())
+        os.replace(tmp_path, self._file(name))
+
+    def _save_array(self, name: str, array: np.ndarray) -> None:
+        path = self._file(name)
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, array)
+        os.replace(tmp_path, path)
+
+    def create(self, dimension: int, metric: str, quantization: str) -> None:
+        """
+        Create the index, if it does not already exist.
+
+        :param dimension: The number of vector dimensions.
+        :param metric: ``cosine``, ``dotproduct`` or ``euclidean``.
+        :param quantization: ``float16`` or ``int8``.
+        """
+        if metric not in LOCAL_METRICS.values():
+            raise ValueError(f"Unsupported metric: {metric}")
+        with self._write_lock():
+            if self.exists:
+                return
+            for name in [self.VECTORS_FILE, self.NORMS_FILE] + ([self.SCALES_FILE] if quantization == "int8" else []):
+                with open(self._file(name), "wb"):
+                    pass
+            with closing(self._documents()) as documents:
+                documents.commit()
+            self._save_config(
+                {
+                    "dimension": dimension,
+                    "metric": metric,
+                    "quantization": quantization,
+                    "count": 0,
+                    "slots": 0,
+                    "nlist": 0,
+                    "trained": 0,
+                }
+            )
+
+    def drop(self) -> None:
+        """Delete the index and its files."""
+        with self._lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._loaded_version = None
+            self._config = {}
+            self._vectors = self._scales = self._norms = self._live_rows = None
+            self._centroids = self._offsets = self._list_rows = None
+
+    def load(self) -> bool:
+        """
+        Load the index, or reload it if it has changed since it was loaded.
+
+        The vectors are memory-mapped rather than read, so that the processes
+        that load an index share one copy of it in the page cache.
+
+        :returns: True if the index exists.
+        """
+        try:
+            stat = os.stat(self._file(self.MANIFEST_FILE))
+        except FileNotFoundError:
+            return False
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version == self._loaded_version:
+            return True
+        with self._lock:
+            if version == self._loaded_version:
+                return True
+            config = self._read_config()
+            slots = config["slots"]
+            vectors = self._map_array(self.VECTORS_FILE, config)
+            scales = self._map_array(self.SCALES_FILE, config)
+            norms = np.array(self._map_array(self.NORMS_FILE, config))
+            live = np.ones(slots, dtype=bool)
+            with closing(sqlite3.connect(self._file(self.DOCUMENTS_FILE), timeout=30)) as documents:
+                dead = [row[0] for row in documents.execute("SELECT idx FROM documents WHERE deleted = 1")]
+            live[[row for row in dead if row < slots]] = False
+            live_rows = None if live.all() else np.flatnonzero(live)
+
+            centroids = offsets = list_rows = None
+            if config["nlist"]:
+                centroids = np.load(self._file(self.CENTROIDS_FILE))
+                lists = np.array(self._map_array(self.LISTS_FILE, config))
+                # the live rows of each IVF list, in ascending order, so that probing a list is a slice.
+                list_rows = np.argsort(lists, kind="stable")
+                list_rows = list_rows[live[list_rows]]
+                offsets = np.concatenate([[0], np.cumsum(np.bincount(lists[live], minlength=len(centroids)))])
+
+            self._config = config
+            self._vectors = vectors
+            self._scales = None if scales is None else np.array(scales)
+            self._norms = norms
+            self._live_rows = live_rows
+            self._centroids = centroids
+            self._offsets = offsets
+            self._list_rows = list_rows
+            self._loaded_version = version
+            logger.debug("%s.load() loaded %s vectors in %s slots", self, config["count"], slots)
+        return True
+
+    def upsert(
+        self,
+        ids: list[str],
+        vectors: np.ndarray,
+        contents: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """
+        Insert or replace vectors and their documents.
+
+        Replaced vectors are written in place, and new vectors are written to
+        the slots of removed vectors, or appended.
+
+        :param ids: The point id of each vector. Existing ids are replaced.
+        :param vectors: A (n, dimension) array.
+        :param contents: The document text of each vector.
+        :param metadatas: The document metadata of each vector.
+        """
+        with self._write_lock():
+            config = self._read_config()
+            vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+            if vectors.shape[1] != config["dimension"]:
+                raise ValueError(f"Expected vectors of dimension {config['dimension']}, got {vectors.shape[1]}.")
+            if config["metric"] == "cosine":
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors = vectors / np.where(norms == 0, 1.0, norms)
+            data, scales = quantize(vectors, config["quantization"])
+
+            with closing(self._documents()) as documents:
+                rows: dict[str, int] = {}
+                unique_ids = list(dict.fromkeys(ids))
+                for i in range(0, len(unique_ids), self.SQL_BATCH_SIZE):
+                    chunk = unique_ids[i : i + self.SQL_BATCH_SIZE]
+                    query = f"SELECT point_id, idx FROM documents WHERE point_id IN ({','.join('?' * len(chunk))})"
+                    rows.update(documents.execute(query, chunk).fetchall())
+                reused = set(rows.values())
+                free = iter(
+                    [
+                        row[0]
+                        for row in documents.execute("SELECT idx FROM documents WHERE deleted = 1 ORDER BY idx")
+                        if row[0] not in reused
+                    ]
+                )
+                slots = np.empty(len(ids), dtype=np.int64)
+                for i, pid in enumerate(ids):
+                    if pid not in rows:
+                        slot = next(free, None)
+                        if slot is None:
+                            slot = config["slots"]
+                            config["slots"] += 1
+                        rows[pid] = slot
+                    slots[i] = rows[pid]
+
+                self._write_rows(self.VECTORS_FILE, config, slots, data)
+                if scales is not None:
+                    self._write_rows(self.SCALES_FILE, config, slots, scales)
+                self._write_rows(self.NORMS_FILE, config, slots, np.linalg.norm(dequantize(data, scales), axis=1))
+                documents.executemany(
+                    "INSERT INTO documents (idx, point_id, page_content, metadata, deleted) VALUES (?, ?, ?, ?, 0) "
+                    "ON CONFLICT(idx) DO UPDATE SET point_id = excluded.point_id, "
+                    "page_content = excluded.page_content, metadata = excluded.metadata, deleted = 0",
+                    [
+                        (rows[pid], pid, content, json.SmarterJSONEncoder(default=str).encode(metadata))
+                        for pid, content, metadata in zip(ids, contents, metadatas)
+                    ],
+                )
+                config["count"] = documents.execute("SELECT COUNT(*) FROM documents WHERE deleted = 0").fetchone()[0]
+                if config["count"] >= self.IVF_MIN_VECTORS and (
+                    not config["nlist"] or config["count"] >= config["trained"] * self.IVF_RETRAIN_GROWTH
+                ):
+                    self._train_ivf(config, documents)
+                elif config["nlist"]:
+                    centroids = np.load(self._file(self.CENTROIDS_FILE))
+                    lists = nearest_centroids(dequantize(data, scales), centroids, 1)[:, 0]
+                    self._write_rows(self.LISTS_FILE, config, slots, lists)
+                documents.commit()
+            self._save_config(config)
+
+    def remove(self, ids: list[str]) -> int:
+        """
+        Remove vectors and their documents. Unknown ids are ignored.
+
+        The documents are tombstoned rather than deleted, so that the slots of
+        the other vectors never change, and their slots are reused by later
+        writes.
+
+        :param ids: The point ids to remove.
+        :returns: The number of vectors removed.
+        """
+        with self._write_lock():
+            config = self._read_config()
+            with closing(self._documents()) as documents:
+                removed: list[int] = []
+                unique_ids = list(dict.fromkeys(ids))
+                for i in range(0, len(unique_ids), self.SQL_BATCH_SIZE):
+                    chunk = unique_ids[i : i + self.SQL_BATCH_SIZE]
+                    query = (
+                        f"SELECT idx FROM documents WHERE deleted = 0 AND point_id IN ({','.join('?' * len(chunk))})"
+                    )
+                    removed.extend(row[0] for row in documents.execute(query, chunk))
+                if not removed:
+                    return 0
+                documents.executemany(
+                    "UPDATE documents SET deleted = 1, page_content = '', metadata = '{}' WHERE idx = ?",
+                    [(row,) for row in removed],
+                )
+                config["count"] = documents.execute("SELECT COUNT(*) FROM documents WHERE deleted = 0").fetchone()[0]
+                documents.commit()
+            self._save_config(config)
+        logger.debug("%s.remove() removed %s vectors", self, len(removed))
+        return len(removed)
+
+    def _train_ivf(self, config: dict[str, Any], documents: sqlite3.Connection) -> None:
+        """Train the IVF centroids on a sample of the live vectors, and assign every slot to its nearest centroid."""
+        live = np.array([row[0] for row in documents.execute("SELECT idx FROM documents WHERE deleted = 0")])
+        nlist = int(math.sqrt(len(live)))
+        sample_size = min(len(live), nlist * self.IVF_TRAINING_SAMPLE)
+        sample = np.sort(np.random.default_rng(0).choice(live, size=sample_size, replace=False))
+        vectors = self._map_array(self.VECTORS_FILE, config)
+        scales = self._map_array(self.SCALES_FILE, config)
+        centroids, _ = kmeans(
+            dequantize(vectors[sample], None if scales is None else scales[sample]),  # type: ignore[index]
+            nlist,
+            self.IVF_TRAINING_ITERATIONS,
+        )
+        lists = np.empty(config["slots"], dtype=np.int32)
+        for start in range(0, config["slots"], self.SCORE_BLOCK_ROWS):
+            end = start + self.SCORE_BLOCK_ROWS
+            block = dequantize(vectors[start:end], None if scales is None else scales[start:end])  # type: ignore[index]
+            lists[start:end] = nearest_centroids(block, centroids, 1)[:, 0]
+        self._save_array(self.CENTROIDS_FILE, centroids)
+        self._replace_rows(self.LISTS_FILE, config, lists)
+        config.update(nlist=nlist, trained=len(live))
+        logger.debug("%s._train_ivf() trained %s IVF lists on %s vectors", self, nlist, sample_size)
+
+    def _filter_rows(self, filters: dict[str, Any]) -> np.ndarray:
+        """Return the rows whose document metadata matches ``filters``."""
+        clauses: list[str] = ["deleted = 0"]
+        params: list[Any] = []
+        for key, value in filters.items():
+            path = '$."' + str(key).replace('"', '\\"') + '"'
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"json_extract(metadata, ?) IN ({','.join('?' * len(values))})")
+                params.extend([path, *values])
+            else:
+                clauses.append("json_extract(metadata, ?) = ?")
+                params.extend([path, value])
+        query = "SELECT idx FROM documents WHERE " + " AND ".join(clauses) + " ORDER BY idx"
+        return np.array([row[0] for row in self._reader().execute(query, params)], dtype=np.int64)
+
+    def _dot(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Return the dot products of each query with the vectors of ``rows``, or of all slots.
+
+        The memory-mapped vectors are converted to float32 a block of rows at a
+        time, and int8 scales are applied to the dot products.
+        """
+        vectors, scales = self._vectors, self._scales
+        count = len(vectors) if rows is None else len(rows)  # type: ignore[arg-type]
+        scores = np.empty((len(queries), count), dtype=np.float32)
+        for start in range(0, count, self.SCORE_BLOCK_ROWS):
+            end = min(start + self.SCORE_BLOCK_ROWS, count)
+            block = slice(start, end) if rows is None else rows[start:end]
+            block_scores = queries @ np.asarray(vectors[block], dtype=np.float32).T  # type: ignore[index]
+            if scales is not None:
+                block_scores *= scales[block]
+            scores[:, start:end] = block_scores
+        return scores
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        top_k: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[tuple[str, str, dict[str, Any], float]]:
+        """
+        Return the vectors nearest to ``query_vector``.
+
+        Scores are similarities for cosine and dotproduct, higher is better, and
+        distances for euclidean, lower is better.
+
+        :param query_vector: The query vector.
+        :param top_k: The maximum number of results.
+        :param filters: Document metadata values that results must match. A list value matches any of its items.
+        :param score_threshold: The minimum similarity, or maximum distance, of results.
+        :returns: The point id, text, metadata and score of each result, best first.
+        """
+        return self.search_batch(
+            np.asarray(query_vector, dtype=np.float32).reshape(1, -1), top_k, filters, score_threshold
+        )[0]
+
+    def search_batch(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[list[tuple[str, str, dict[str, Any], float]]]:
+        """
+        Return the vectors nearest to each row of ``query_vectors``.
+
+        Without filters or IVF partitions, all queries are scored together, with
+        one matrix product per block of vectors. The documents of all results are
+        read with one SQL query.
+
+        :param query_vectors: The query vectors, one per row.
+        :param top_k: The maximum number of results per query.
+        :param filters: Document metadata values that results must match. A list value matches any of its items.
+        :param score_threshold: The minimum similarity, or maximum distance, of results.
+        :returns: The point id, text, metadata and score of each result, best first, for each query.
+        """
+        if not self.load():
+            raise ValueError(f"{self} does not exist.")
+        vectors, centroids = self._vectors, self._centroids
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        queries = queries.reshape(len(queries), -1)
+        if vectors is None or self._norms is None or not self._config["count"]:
+            return [[] for _ in queries]
+        if queries.shape[1] != vectors.shape[1]:
+            raise ValueError(f"Expected a query vector of dimension {vectors.shape[1]}, got {queries.shape[1]}.")
+        if self._config["metric"] == "cosine":
+            query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(query_norms == 0, 1.0, query_norms)
+
+        # the rows and scores of the best vectors of each query
+        ranked: list[tuple[np.ndarray, np.ndarray]] = []
+        if not filters and centroids is None:
+            score_matrix = self._dot(queries, self._live_rows)
+            for query, scores in zip(queries, score_matrix):
+                ranked.append(self._rank(query, scores, self._live_rows, top_k, score_threshold))
+        else:
+            for query in queries:
+                scores, rows = self._score(query, filters)
+                ranked.append(self._rank(query, scores, rows, top_k, score_threshold))
+
+        all_rows = sorted({int(row) for rows, _ in ranked for row in rows})
+        found = self._read_documents(all_rows)
+        results = []
+        for rows, scores in ranked:
+            results.append([(*found[int(row)], float(score)) for row, score in zip(rows, scores) if int(row) in found])
+        return results
+
+    def _score(self, query: np.ndarray, filters: Optional[dict[str, Any]]) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Return the scores of the candidate vectors of a normalized query.
+
+        :returns: The scores, and the rows of the candidates, or None for all rows.
+        """
+        centroids, offsets, list_rows = self._centroids, self._offsets, self._list_rows
+        if filters:
+            rows = self._filter_rows(filters)
+            rows = rows[rows < len(self._vectors)]  # type: ignore[arg-type]
+        elif centroids is not None and offsets is not None and list_rows is not None:
+            nprobe = max(1, math.ceil(len(centroids) * self.IVF_PROBE_RATIO))
+            probes = nearest_centroids(query, centroids, nprobe)[0]
+            rows = np.sort(np.concatenate([list_rows[offsets[i] : offsets[i + 1]] for i in probes]))
+        else:
+            rows = self._live_rows
+        return self._dot(query[None, :], rows)[0], rows
+
+    def _rank(
+        self,
+        query: np.ndarray,
+        scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        top_k: int,
+        score_threshold: Optional[float],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the rows and final scores of the ``top_k`` best candidates, best first."""
+        if len(scores) == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        metric = self._config["metric"]
+        if metric == "euclidean":
+            candidate_norms = self._norms if rows is None else self._norms[rows]  # type: ignore[index]
+            scores = np.sqrt(np.maximum(candidate_norms**2 + float(query @ query) - 2.0 * scores, 0.0))
+            ranking = scores
+        else:
+            ranking = -scores
+        k = min(top_k, len(scores))
+        best = np.argpartition(ranking, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        best = best[np.argsort(ranking[best], kind="stable")]
+        if score_threshold is not None:
+            keep = scores[best] <= score_threshold if metric == "euclidean" else scores[best] >= score_threshold
+            best = best[keep]
+        return (best if rows is None else rows[best]), scores[best]
+
+    def _read_documents(self, rows: list[int]) -> dict[int, tuple[str, str, dict[str, Any]]]:
+        """Return the point id, text and metadata of the documents of ``rows`` that have not been removed."""
+        found: dict[int, tuple[str, str, dict[str, Any]]] = {}
+        reader = self._reader()
+        for i in range(0, len(rows), self.SQL_BATCH_SIZE):
+            chunk = rows[i : i + self.SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            for idx, pid, content, metadata in reader.execute(
+                "SELECT idx, point_id, page_content, metadata FROM documents "
+                f"WHERE deleted = 0 AND idx IN ({placeholders})",
+                chunk,
+            ):
+                found[idx] = (pid, content, json.loads(metadata))
+        return found
+
+    def stats(self) -> dict[str, Any]:
+        """Return the configuration and size on disk of the index."""
+        if not self.exists:
+            return {}
+        size = sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file())
+        return {**self.config, "path": self.path, "bytes": size}
+
+
+_indexes: dict[str, LocalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_local_index(path: str) -> LocalIndex:
+    """Return this process's :class:`LocalIndex` for ``path``. The index is loaded lazily."""
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = LocalIndex(path)
+            _indexes[path] = index
+        return index
+
+
+def to_documents(results: list[tuple[str, str, dict[str, Any], float]]) -> list[tuple[Document, float]]:
+    """Return the documents and scores of the results of :meth:`LocalIndex.search`."""
+    return [
+        (Document(id=pid, page_content=content, metadata=metadata), score) for pid, content, metadata, score in results
+    ]
+
+
+class LocalConnection(VectorStoreBackendConnection):
+    """A connection to a local vectorstore."""
+
+    def __init__(self, index: LocalIndex):
+        super().__init__()
+        self._connection = index
+
+    @property
+    def index(self) -> LocalIndex:
+        """The local index."""
+        return self._connection  # type: ignore[return-value]
+
+    @property
+    def ready(self) -> bool:
+        """Check if the connection is ready for operations."""
+        return super().ready and self._connection is not None
+
+
+class LocalBackend(SmarterVectorstoreBackend):
+    """
+    Backend implementation for the local, in-process vectorstore.
+    """
+
+    _connection: Optional[LocalConnection] = None
+
+    def __init__(
+        self,
+        db: VectorstoreMeta,
+        embeddings: Optional[Embeddings] = None,
+        vector_store: Optional[VectorStore] = None,
+    ):
+        """
+        Initialize the LocalBackend instance.
+
+        :param db: The VectorstoreMeta configuration object.
+        :type db: VectorstoreMeta
+        :param embeddings: The embeddings used to vectorize documents and text queries.
+        :type embeddings: Optional[Embeddings]
+
+        :raises VectorStoreBackendError: If the backend type is invalid.
+        """
+        super().__init__(db=db, embeddings=embeddings, vector_store=vector_store)
+
+        # Verify that we're supposed to be here.
+        if db.backend != SmarterVectorStoreBackends.LOCAL.value:
+            raise VectorStoreBackendError(f"Invalid backend for LocalBackend: {db.backend}")
+
+        self.path = os.path.join(smarter_settings.vectorstore_local_path, f"{db.pk}_{db.name}")
+        logger.debug("%s.__init__() initialized with path: %s", self.formatted_class_name, self.path)
+
+    @property
+    def index(self) -> LocalIndex:
+        """The local index, connecting if necessary."""
+        return self.connection.index  # type: ignore[attr-defined]
+
+    @property
+    def initialized(self) -> bool:
+        """True if the local index exists."""
+        return self.index.exists
+
+    @property
+    def ready(self) -> bool:
+        """Check if the local backend is connected, connecting if necessary."""
+        return self.connection.ready and super().ready
+
+    @property
+    def index_stats(self) -> str:
+        """
+        Get the statistics of the local index.
+
+        :returns: A JSON string with the index statistics, or a message if the index does not exist.
+        :rtype: str
+        """
+        if not self.initialized:
+            return "Index not initialized."
+        return json.dumps(self.index.stats(), indent=4)
+
+    @property
+    def metric(self) -> str:
+        """The local index metric for ``indexModel.metric``."""
+        metric = self.index_model_metric
+        if metric not in LOCAL_METRICS:
+            raise VectorStoreBackendError(f"Unsupported metric for LocalBackend: {metric}")
+        return LOCAL_METRICS[metric]
+
+    ###########################################################################
+    # Abstract methods that must be implemented by all backends
+    ###########################################################################
+
+    def add_documents(self, documents: list[Document], embeddings: Optional[list[Any]] = None) -> bool:
+        """
+        Add documents with their corresponding embeddings to the local index.
+
+        Documents are vectorized with :attr:`embeddings` if ``embeddings`` is not provided.
+
+        :param documents: List of LangChain Document objects to be added to the vector store.
+        :type documents: list[Document]
+        :param embeddings: List of embedding vectors corresponding to the documents.
+        :type embeddings: Optional[list[Any]]
+
+        :returns: True if documents were added successfully.
+        :rtype: bool
+
+        :raises VectorStoreBackendError: If there is an error adding documents to the vector store.
+        """
+        provider = self.embeddings_provider
+        try:
+            load_started.send(
+                sender=self.__class__,
+                backend=self,
+                provider=provider,
+                user_profile=self.db.user_profile,
+            )
+            if not self.initialized:
+                self.create()
+            vectors = self.vectorize(documents, embeddings)
+            self.index.upsert(
+                ids=[point_id(document) for document in documents],
+                vectors=np.asarray(vectors, dtype=np.float32),
+                contents=[document.page_content for document in documents],
+                metadatas=[document.metadata for document in documents],
+            )
+            logger.debug(
+                "%s.add_documents() upserted %s documents into %s", self.formatted_class_name, len(documents), self.path
+            )
+            load_success.send(
+                sender=self.__class__,
+                backend=self,
+                provider=provider,
+                user_profile=self.db.user_profile,
+            )
+            return True
+        except Exception as e:
+            logger.error("%s.add_documents() Error adding documents: %s", self.formatted_class_name, str(e))
+            load_failed.send(
+                sender=self.__class__,
+                backend=self,
+                provider=provider,
+                user_profile=self.db.user_profile,
+            )
+            raise VectorStoreBackendError(f"Error adding documents: {str(e)}") from e
+
+    def create(self):
+        """
+        Create the local index, if it does not already exist.
+
+        :raises VectorStoreBackendError: If there is an error creating the index.
+        """
+        try:
+            self.index.create(
+                dimension=self.index_model_dimension,
+                metric=self.metric,
+                quantization=smarter_settings.vectorstore_local_quantization,
+            )
+            logger.debug("%s.create() Index created: %s", self.formatted_class_name, self.path)
+        except (OSError, ValueError) as e:
+            logger.error("%s.create() Error creating index: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error creating index: {str(e)}") from e
+
+    def connect(self) -> LocalConnection:
+        """
+        Open the local index. Its files are loaded on first use.
+
+        :returns: The connection.
+        :rtype: LocalConnection
+
+        :raises VectorStoreBackendConnectionError: If the storage directory is not writable.
+        """
+        logger.debug("%s.connect() connecting...", self.formatted_class_name)
+        try:
+            os.makedirs(smarter_settings.vectorstore_local_path, exist_ok=True)
+        except OSError as e:
+            logger.error("%s.connect() Error opening %s: %s", self.formatted_class_name, self.path, str(e))
+            raise VectorStoreBackendConnectionError(f"Error opening local index: {str(e)}") from e
+        connection = LocalConnection(get_local_index(self.path))
+        connection.connect()
+        self._connection = connection
+        return connection
+
+    def delete(self):
+        """
+        Delete the local index. Does nothing if the index does not exist.
+        """
+        if not self.initialized:
+            logger.debug("%s.delete() Index does not exist. Nothing to delete.", self.formatted_class_name)
+            return
+        logger.debug("%s.delete() Deleting index: %s", self.formatted_class_name, self.path)
+        self.index.drop()
+
+    def delete_documents(self, ids: list[str]) -> int:
+        """
+        Delete documents from the local index by point id.
+
+        :param ids: The point ids of the documents. See :func:`point_id`.
+        :returns: The number of documents deleted.
+        :raises VectorStoreBackendError: If there is an error deleting the documents.
+        """
+        if not ids or not self.initialized:
+            return 0
+        try:
+            return self.index.remove(ids)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error("%s.delete_documents() Error deleting documents: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error deleting documents: {str(e)}") from e
+
+    def disconnect(self) -> None:
+        """
+        Disconnect from the local index.
+
+        The loaded index is shared by the process and remains loaded.
+        """
+        self._connection = None
+        logger.debug("%s.disconnect() disconnected.", self.formatted_class_name)
+
+    def initialize(self):
+        """
+        Initialize the local index.
+
+        Deletes the existing index (if it exists) and creates a new one.
+        """
+        self.delete()
+        self.create()
+
+    # pylint: disable=arguments-differ
+    def query(
+        self,
+        query_vector: Union[str, list[float]],
+        top_k: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        Query the local index for the documents nearest to ``query_vector``.
+
+        :param query_vector: The query embedding, or query text to vectorize with :attr:`embeddings`.
+        :param top_k: The maximum number of results.
+        :param filters: Document metadata values that results must match. A list value matches any of its items.
+        :param score_threshold: The minimum similarity, or maximum euclidean distance, of results.
+        :returns: The matching documents and their scores, best first.
+        :rtype: list[tuple[Document, float]]
+
+        :raises VectorStoreBackendError: If the query fails.
+        """
+        if isinstance(query_vector, str):
+            query_vector = self.embeddings.embed_query(query_vector)
+        try:
+            results = self.index.search(
+                np.asarray(query_vector, dtype=np.float32),
+                top_k=top_k,
+                filters=filters,
+                score_threshold=score_threshold,
+            )
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error("%s.query() Error querying index: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error querying index: {str(e)}") from e
+        return to_documents(results)
+
+    # pylint: disable=arguments-differ
+    def query_batch(
+        self,
+        query_vectors: Sequence[Union[str, list[float]]],
+        top_k: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Query the local index for several query vectors or texts at once.
+
+        Query texts are embedded with one batch request, and the queries are
+        scored together, see :meth:`LocalIndex.search_batch`.
+
+        :param query_vectors: Query embeddings, or query texts to vectorize with :attr:`embeddings`.
+        :param top_k: The maximum number of results per query.
+        :param filters: Document metadata values that results must match. A list value matches any of its items.
+        :param score_threshold: The minimum similarity, or maximum euclidean distance, of results.
+        :returns: The matching documents and their scores, best first, for each query in order.
+        :rtype: list[list[tuple[Document, float]]]
+
+        :raises VectorStoreBackendError: If the query fails.
+        """
+        if not query_vectors:
+            return []
+        vectors = self.embed_queries(query_vectors)
+        try:
+            results = self.index.search_batch(
+                np.asarray(vectors, dtype=np.float32),
+                top_k=top_k,
+                filters=filters,
+                score_threshold=score_threshold,
+            )
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error("%s.query_batch() Error querying index: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error querying index: {str(e)}") from e
+        return [to_documents(result) for result in results]
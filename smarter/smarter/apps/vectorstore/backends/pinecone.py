@@ -5,9 +5,11 @@ see: https://www.pinecone.io/
 """
 
 import logging
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 from langchain_core.documents import Document
+from langchain_core.embeddings.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone
@@ -35,8 +37,12 @@ from .base import (
     SmarterVectorstoreBackend,
     VectorStoreBackendConnectionError,
     VectorStoreBackendError,
+    point_id,
 )
 
+DEFAULT_TEXT_KEY = "text"
+"""The metadata key of the document text when ``vectorstore.textKey`` is not set. Matches ``PineconeVectorStore``."""
+
 
 # pylint: disable=unused-argument
 def should_log(level):
@@ -48,6 +54,39 @@ base_logger = logging.getLogger(__name__)
 logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
 
 
+def build_filter(filters: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """
+    Build a Pinecone metadata filter from a dict of document metadata values.
+
+    Every key must match. A list value matches any of its items.
+
+    .. code-block:: python
+
+        build_filter({"source": ["a.pdf", "b.pdf"], "page": 3})
+        # {"source": {"$in": ["a.pdf", "b.pdf"]}, "page": {"$eq": 3}}
+
+    :param filters: The metadata values to match.
+    :returns: The Pinecone filter, or None.
+    :rtype: Optional[dict[str, Any]]
+    """
+    if not filters:
+        return None
+    return {
+        key: {"$in": list(value)} if isinstance(value, (list, tuple, set)) else {"$eq": value}
+        for key, value in filters.items()
+    }
+
+
+def to_documents(matches: list, text_key: str) -> list[tuple[Document, float]]:
+    """Return the documents and scores of the matches of a query response."""
+    results: list[tuple[Document, float]] = []
+    for match in matches:
+        metadata = dict(match.metadata or {})
+        page_content = metadata.pop(text_key, "")
+        results.append((Document(id=str(match.id), page_content=page_content, metadata=metadata), match.score))
+    return results
+
+
 class PineconeBackend(SmarterVectorstoreBackend):
     """Backend implementation for the Pinecone vectorstore."""
 
@@ -61,7 +100,12 @@ class PineconeBackend(SmarterVectorstoreBackend):
     # validated fields initialized in __init__
     pinecone_api_key: SecretStr
 
-    def __init__(self, db: VectorstoreMeta):
+    def __init__(
+        self,
+        db: VectorstoreMeta,
+        embeddings: Optional[Embeddings] = None,
+        vector_store: Optional[VectorStore] = None,
+    ):
         """
         Initialize the PineconeBackend instance.
 
@@ -71,10 +115,12 @@ class PineconeBackend(SmarterVectorstoreBackend):
 
         :param db: The VectorstoreMeta configuration object.
         :type db: VectorstoreMeta
+        :param embeddings: The embeddings used to vectorize documents and text queries.
+        :type embeddings: Optional[Embeddings]
 
         :raises VectorStoreBackendError: If the backend type, provider, or API keys are invalid.
         """
-        super().__init__(db=db)
+        super().__init__(db=db, embeddings=embeddings, vector_store=vector_store)
         self.init()
 
         # Verify that we're supposed to be here.
@@ -211,12 +257,21 @@ class PineconeBackend(SmarterVectorstoreBackend):
             self._vector_store = PineconeVectorStore(
                 index=self.index,
                 embedding=self.embeddings,
-                text_key=self.db.vectorstore_text_key,
-                namespace=self.db.vectorstore_namespace,
-                distance_strategy=self.db.vectorstore_distance_strategy,
+                text_key=self.text_key,
+                namespace=self.namespace,
             )
         return self._vector_store
 
+    @property
+    def text_key(self) -> str:
+        """The metadata key of the document text, from ``vectorstore.textKey``. Defaults to ``text``."""
+        return getattr(self._related("vectorstore_interface"), "text_key", None) or DEFAULT_TEXT_KEY
+
+    @property
+    def namespace(self) -> Optional[str]:
+        """The Pinecone namespace, from ``vectorstore.namespace``. Defaults to the default namespace."""
+        return getattr(self._related("vectorstore_interface"), "namespace", None) or None
+
     @property
     def pinecone(self) -> Optional[Pinecone]:
         """
@@ -267,8 +322,8 @@ class PineconeBackend(SmarterVectorstoreBackend):
         Initialize Pinecone backend attributes.
 
         Resets all internal attributes related to the Pinecone backend,
-        including index, index name, text splitter, embeddings, and vector
-        store. This is typically called before re-initializing or
+        including index, index name and vector store. The embeddings are
+        kept. This is typically called before re-initializing or
         switching the backend state.
 
         :returns: None
@@ -278,7 +333,6 @@ class PineconeBackend(SmarterVectorstoreBackend):
         self._pinecone = None
         self._index = None
         self._index_name = None
-        self._embeddings = None
         self._vector_store = None
 
     ###########################################################################
@@ -309,7 +363,9 @@ class PineconeBackend(SmarterVectorstoreBackend):
                 provider=self.db.embeddings_provider,
                 user_profile=self.db.user_profile,
             )
-            self.vector_store.add_documents(documents=documents, embeddings=embeddings)
+            self.vector_store.add_documents(
+                documents=documents, embeddings=embeddings, ids=[point_id(document) for document in documents]
+            )
             load_success.send(
                 sender=self.__class__,
                 backend=self,
@@ -424,6 +480,23 @@ class PineconeBackend(SmarterVectorstoreBackend):
         logging.debug("%s.delete() Deleting index: %s", self.formatted_class_name, self.index_name)
         self.pinecone.delete_index(self.index_name)
 
+    def delete_documents(self, ids: list[str]) -> int:
+        """
+        Delete vectors from the Pinecone index by id.
+
+        :param ids: The point ids of the documents. See :func:`point_id`.
+        :returns: The number of ids submitted for deletion.
+        :raises VectorStoreBackendError: If there is an error deleting the vectors.
+        """
+        if not ids or not self.initialized:
+            return 0
+        try:
+            self.vector_store.delete(ids=ids)
+        except PineconeApiException as e:
+            logger.error("%s.delete_documents() Error deleting vectors: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error deleting vectors: {str(e)}") from e
+        return len(ids)
+
     def disconnect(self) -> None:
         """
         Disconnect from the Pinecone index.
@@ -452,5 +525,45 @@ class PineconeBackend(SmarterVectorstoreBackend):
         self.delete()
         self.create()
 
-    def query(self, query_vector: Any, top_k: int = 10):
-        pass
+    # pylint: disable=arguments-differ
+    def query(
+        self,
+        query_vector: Union[str, list[float]],
+        top_k: int = 10,
+        filters: Optional[dict[str, Any]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        Query the Pinecone index for the vectors nearest to ``query_vector``.
+
+        :param query_vector: The query embedding, or query text to vectorize with :attr:`embeddings`.
+        :param top_k: The maximum number of results.
+        :param filters: Document metadata values that results must match. See :func:`build_filter`.
+        :param score_threshold: The minimum similarity, or maximum euclidean distance, of results.
+        :returns: The matching documents and their scores, best first.
+        :rtype: list[tuple[Document, float]]
+
+        :raises VectorStoreBackendError: If the query fails.
+        """
+        if isinstance(query_vector, str):
+            query_vector = self.embeddings.embed_query(query_vector)
+        if self.index is None:
+            raise VectorStoreBackendError("Index not initialized.")
+        try:
+            response = self.index.query(
+                vector=list(query_vector),
+                top_k=top_k,
+                namespace=self.namespace,
+                filter=build_filter(filters),
+                include_metadata=True,
+            )
+        except PineconeApiException as e:
+            logger.error("%s.query() Error querying index: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error querying index: {str(e)}") from e
+        results = to_documents(response.matches, self.text_key)
+        if score_threshold is not None:
+            if self.index_model_metric == "euclidean":
+                results = [result for result in results if result[1] <= score_threshold]
+            else:
+                results = [result for result in results if result[1] >= score_threshold]
+        return results
@@ -1,14 +1,490 @@
 """
 Backend implementation for the Qdrant vectorstore.
 see: https://qdrant.tech/
+
+Qdrant runs either as a self-hosted server inside our own cluster, or embedded
+in the Smarter process (local mode). A vectorstore with an
+:class:`ApiConnection` uses the Qdrant server at the connection's ``base_url``,
+authenticated with its ``api_key``. A vectorstore without a connection runs in
+local mode, stored at ``smarter_settings.vectorstore_qdrant_path``.
+
+Local mode is for development and tests only. Embedded Qdrant takes an
+exclusive lock on its storage directory, so only one process can open it,
+and the other web workers, pods and Celery workers fail to connect, with a
+:class:`VectorStoreBackendConnectionError`. Deployments with more than one
+process must use a Qdrant server.
+
+Each vectorstore is one Qdrant collection, named after the vectorstore.
+Documents are stored as points whose payload holds the document text under
+``page_content`` and its metadata under ``metadata``, which is the layout that
+``langchain_qdrant`` uses, and which query filters address as
+``metadata.<key>``.
 """
 
+import logging
+import threading
+from typing import Any, Optional, Sequence, Union
+
+from langchain_core.documents import Document
+from langchain_core.embeddings.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from smarter.apps.connection.models import ApiConnection
+from smarter.apps.vectorstore.enum import SmarterVectorStoreBackends
+from smarter.apps.vectorstore.models import VectorstoreMeta
+from smarter.apps.vectorstore.signals import load_failed, load_started, load_success
+from smarter.common.conf import smarter_settings
+from smarter.lib import json
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
 from .base import (
     SmarterVectorstoreBackend,
+    VectorStoreBackendConnection,
+    VectorStoreBackendConnectionError,
+    VectorStoreBackendError,
+    point_id,
 )
 
 
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+CONTENT_PAYLOAD_KEY = "page_content"
+METADATA_PAYLOAD_KEY = "metadata"
+
+QDRANT_DISTANCES: dict[str, models.Distance] = {
+    "cosine": models.Distance.COSINE,
+    "euclidean": models.Distance.EUCLID,
+    "euclid": models.Distance.EUCLID,
+    "dotproduct": models.Distance.DOT,
+    "dot_product": models.Distance.DOT,
+    "dot": models.Distance.DOT,
+    "manhattan": models.Distance.MANHATTAN,
+}
+"""Maps the Pinecone-style ``indexModel.metric`` values of a manifest to Qdrant distances."""
+
+# Qdrant clients are thread-safe and hold a pool of HTTP connections, so they
+# are shared by every backend in the process. Local mode clients must be
+# shared, because only one client can open a given storage path.
+_clients: dict[str, QdrantClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_qdrant_client(connection: Optional[ApiConnection] = None) -> QdrantClient:
+    """
+    Return this process's Qdrant client for ``connection``, creating it on first use.
+
+    :param connection: The connection to a Qdrant server, or None for local mode.
+    :returns: The Qdrant client.
+    :rtype: QdrantClient
+    :raises VectorStoreBackendConnectionError: If the local mode storage is locked by another process.
+    """
+    if connection is not None:
+        key = connection.connection_identity
+    else:
+        key = f"local:{smarter_settings.vectorstore_qdrant_path}"
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if connection is not None:
+                api_key = connection.api_key.get_secret() if connection.api_key else None
+                client = QdrantClient(url=connection.base_url, api_key=api_key, timeout=connection.timeout)
+            elif smarter_settings.vectorstore_qdrant_path == ":memory:":
+                client = QdrantClient(location=":memory:")
+            else:
+                try:
+                    client = QdrantClient(path=smarter_settings.vectorstore_qdrant_path)
+                except RuntimeError as e:
+                    raise VectorStoreBackendConnectionError(
+                        f"The embedded Qdrant storage at {smarter_settings.vectorstore_qdrant_path} is locked by "
+                        "another process. Embedded Qdrant is single-process, for development only. Give the "
+                        "vectorstore a connection to a Qdrant server instead."
+                    ) from e
+            _clients[key] = client
+        return client
+
+
+def build_filter(filters: Optional[Union[dict[str, Any], models.Filter]]) -> Optional[models.Filter]:
+    """
+    Build a Qdrant payload filter from a dict of document metadata values.
+
+    Every key must match. A list value matches any of its items.
+
+    .. code-block:: python
+
+        build_filter({"source": ["a.pdf", "b.pdf"], "page": 3})
+
+    :param filters: The metadata values to match, or a Qdrant ``Filter``, which is returned unchanged.
+    :returns: The Qdrant filter, or None.
+    :rtype: Optional[models.Filter]
+    """
+    if filters is None or isinstance(filters, models.Filter):
+        return filters
+    conditions: list[models.Condition] = []
+    for key, value in filters.items():
+        payload_key = f"{METADATA_PAYLOAD_KEY}.{key}"
+        if isinstance(value, (list, tuple, set)):
+            match = models.MatchAny(any=list(value))
+        else:
+            match = models.MatchValue(value=value)
+        conditions.append(models.FieldCondition(key=payload_key, match=match))
+    return models.Filter(must=conditions) if conditions else None
+
+
+def to_documents(points: list[models.ScoredPoint]) -> list[tuple[Document, float]]:
+    """Return the documents and scores of the points of a query response."""
+    results: list[tuple[Document, float]] = []
+    for point in points:
+        payload = point.payload or {}
+        document = Document(
+            id=str(point.id),
+            page_content=payload.get(CONTENT_PAYLOAD_KEY, ""),
+            metadata=payload.get(METADATA_PAYLOAD_KEY) or {},
+        )
+        results.append((document, point.score))
+    return results
+
+
+class QdrantConnection(VectorStoreBackendConnection):
+    """A connection to a Qdrant server, or to a local mode Qdrant store."""
+
+    def __init__(self, client: QdrantClient):
+        super().__init__()
+        self._connection = client
+
+    @property
+    def client(self) -> QdrantClient:
+        """The Qdrant client."""
+        return self._connection  # type: ignore[return-value]
+
+    @property
+    def ready(self) -> bool:
+        """Check if the connection is ready for operations."""
+        return super().ready and self._connection is not None
+
+
 class QdrantBackend(SmarterVectorstoreBackend):
     """
     Backend implementation for the Qdrant vectorstore.
     """
+
+    _connection: Optional[QdrantConnection] = None
+
+    def __init__(
+        self,
+        db: VectorstoreMeta,
+        embeddings: Optional[Embeddings] = None,
+        vector_store: Optional[VectorStore] = None,
+    ):
+        """
+        Initialize the QdrantBackend instance.
+
+        :param db: The VectorstoreMeta configuration object.
+        :type db: VectorstoreMeta
+        :param embeddings: The embeddings used to vectorize documents and text queries.
+        :type embeddings: Optional[Embeddings]
+
+        :raises VectorStoreBackendError: If the backend type or connection is invalid.
+        """
+        super().__init__(db=db, embeddings=embeddings, vector_store=vector_store)
+
+        # Verify that we're supposed to be here.
+        if db.backend != SmarterVectorStoreBackends.QDRANT.value:
+            raise VectorStoreBackendError(f"Invalid backend for QdrantBackend: {db.backend}")
+        if db.connection is not None and not isinstance(db.connection, ApiConnection):
+            raise VectorStoreBackendError(f"Invalid connection for QdrantBackend: {db.connection}")
+
+        self.collection_name = db.name
+        logger.debug(
+            "%s.__init__() initialized with collection_name: %s, mode: %s",
+            self.formatted_class_name,
+            self.collection_name,
+            "server" if self.is_server_mode else "local",
+        )
+
+    @property
+    def is_server_mode(self) -> bool:
+        """True if the vectorstore is on a Qdrant server, False if it runs in local mode."""
+        return self.db.connection is not None
+
+    @property
+    def client(self) -> QdrantClient:
+        """The Qdrant client, connecting if necessary."""
+        return self.connection.client  # type: ignore[attr-defined]
+
+    @property
+    def initialized(self) -> bool:
+        """True if the Qdrant collection exists."""
+        return self.client.collection_exists(self.collection_name)
+
+    @property
+    def ready(self) -> bool:
+        """Check if the Qdrant backend is connected, connecting if necessary."""
+        return self.connection.ready and super().ready
+
+    @property
+    def index_stats(self) -> str:
+        """
+        Get the statistics of the Qdrant collection.
+
+        :returns: A JSON string with the collection statistics, or a message if the
+            collection does not exist.
+        :rtype: str
+        """
+        if not self.initialized:
+            return "Index not initialized."
+        info = self.client.get_collection(self.collection_name)
+        return json.dumps(info.model_dump(mode="json"), indent=4)
+
+    @property
+    def distance(self) -> models.Distance:
+        """The Qdrant distance for ``indexModel.metric``."""
+        metric = self.index_model_metric
+        if metric not in QDRANT_DISTANCES:
+            raise VectorStoreBackendError(f"Unsupported metric for QdrantBackend: {metric}")
+        return QDRANT_DISTANCES[metric]
+
+    ###########################################################################
+    # Abstract methods that must be implemented by all backends
+    ###########################################################################
+
+    def add_documents(self, documents: list[Document], embeddings: Optional[list[Any]] = None) -> bool:
+        """
+        Add documents with their corresponding embeddings to the Qdrant collection.
+
+        Points are upserted in batches of ``smarter_settings.vectorstore_upsert_batch_size``.
+        Documents are vectorized with :attr:`embeddings` if ``embeddings`` is not provided.
+
+        :param documents: List of LangChain Document objects to be added to the vector store.
+        :type documents: list[Document]
+        :param embeddings: List of embedding vectors corresponding to the documents.
+        :type embeddings: Optional[list[Any]]
+
+        :returns: True if documents were added successfully.
+        :rtype: bool
+
+        :raises VectorStoreBackendError: If there is an error adding documents to the vector store.
+        """
+        provider = self.embeddings_provider
+        try:
+            load_started.send(
+                sender=self.__class__,
+                backend=self,
+                provider=provider,
+                user_profile=self.db.user_profile,
+            )
+            if not self.initialized:
+                self.create()
+            vectors = self.vectorize(documents, embeddings)
+            batch_size = smarter_settings.vectorstore_upsert_batch_size
+            for start in range(0, len(documents), batch_size):
+                points = [
+                    models.PointStruct(
+                        id=point_id(document),
+                        vector=list(vector),
+                        payload={CONTENT_PAYLOAD_KEY: document.page_content, METADATA_PAYLOAD_KEY: document.metadata},
+                    )
+                    for document, vector in zip(
+                        documents[start : start + batch_size], vectors[start : start + batch_size]
+                    )
+                ]
+                self.client.upsert(collection_name=self.collection_name, points=points, wait=True)
+            logger.debug(
+                "%s.add_documents() upserted %s documents into %s",
+                self.formatted_class_name,
+                len(documents),
+                self.collection_name,
+            )
+            load_success.send(
+                sender=self.__class__,
+                backend=self,
+                provider=provider,
+                user_profile=self.db.user_profile,
+            )
+            return True
+        except Exception as e:
+            logger.error("%s.add_documents() Error adding documents: %s", self.formatted_class_name, str(e))
+            load_failed.send(
+                sender=self.__class__,
+                backend=self,
+                provider=provider,
+                user_profile=self.db.user_profile,
+            )
+            raise VectorStoreBackendError(f"Error adding documents: {str(e)}") from e
+
+    def create(self):
+        """
+        Create the Qdrant collection, if it does not already exist.
+
+        :raises VectorStoreBackendError: If there is an error creating the collection.
+        """
+        if self.initialized:
+            logger.debug("%s.create() Collection already exists: %s", self.formatted_class_name, self.collection_name)
+            return
+        try:
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=self.index_model_dimension, distance=self.distance),
+            )
+            logger.debug("%s.create() Collection created: %s", self.formatted_class_name, self.collection_name)
+        except (UnexpectedResponse, ValueError) as e:
+            logger.error("%s.create() Error creating collection: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error creating collection: {str(e)}") from e
+
+    def connect(self) -> QdrantConnection:
+        """
+        Connect to the Qdrant server, or open the local mode store.
+
+        :returns: The connection.
+        :rtype: QdrantConnection
+
+        :raises VectorStoreBackendConnectionError: If the Qdrant client cannot be initialized.
+        """
+        logger.debug("%s.connect() connecting...", self.formatted_class_name)
+        try:
+            connection = QdrantConnection(get_qdrant_client(self.db.connection))
+        # pylint: disable=broad-except
+        except Exception as e:
+            logger.error("%s.connect() Error initializing Qdrant: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendConnectionError(f"Error initializing Qdrant: {str(e)}") from e
+        connection.connect()
+        self._connection = connection
+        return connection
+
+    def delete(self):
+        """
+        Delete the Qdrant collection. Does nothing if the collection does not exist.
+        """
+        if not self.initialized:
+            logger.debug("%s.delete() Collection does not exist. Nothing to delete.", self.formatted_class_name)
+            return
+        logger.debug("%s.delete() Deleting collection: %s", self.formatted_class_name, self.collection_name)
+        self.client.delete_collection(collection_name=self.collection_name)
+
+    def delete_documents(self, ids: list[str]) -> int:
+        """
+        Delete points from the Qdrant collection by id.
+
+        :param ids: The point ids of the documents. See :func:`point_id`.
+        :returns: The number of point ids submitted for deletion.
+        :raises VectorStoreBackendError: If there is an error deleting the points.
+        """
+        if not ids or not self.initialized:
+            return 0
+        try:
+            batch_size = smarter_settings.vectorstore_upsert_batch_size
+            for start in range(0, len(ids), batch_size):
+                self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.PointIdsList(points=ids[start : start + batch_size]),  # type: ignore[arg-type]
+                    wait=True,
+                )
+        except (UnexpectedResponse, ValueError) as e:
+            logger.error("%s.delete_documents() Error deleting points: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error deleting points: {str(e)}") from e
+        logger.debug("%s.delete_documents() deleted %s points", self.formatted_class_name, len(ids))
+        return len(ids)
+
+    def disconnect(self) -> None:
+        """
+        Disconnect from Qdrant.
+
+        The underlying client is shared by the process and remains open.
+        """
+        self._connection = None
+        logger.debug("%s.disconnect() disconnected.", self.formatted_class_name)
+
+    def initialize(self):
+        """
+        Initialize the Qdrant collection.
+
+        Deletes the existing collection (if it exists) and creates a new one.
+        """
+        self.delete()
+        self.create()
+
+    # pylint: disable=arguments-differ
+    def query(
+        self,
+        query_vector: Union[str, list[float]],
+        top_k: int = 10,
+        filters: Optional[Union[dict[str, Any], models.Filter]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        Query the Qdrant collection for the points nearest to ``query_vector``.
+
+        :param query_vector: The query embedding, or query text to vectorize with :attr:`embeddings`.
+        :param top_k: The maximum number of results.
+        :param filters: Document metadata values that results must match. See :func:`build_filter`.
+        :param score_threshold: The minimum score of results.
+        :returns: The matching documents and their scores, best first.
+        :rtype: list[tuple[Document, float]]
+
+        :raises VectorStoreBackendError: If the query fails.
+        """
+        if isinstance(query_vector, str):
+            query_vector = self.embeddings.embed_query(query_vector)
+        try:
+            response = self.client.query_points(
+                collection_name=self.collection_name,
+                query=list(query_vector),
+                query_filter=build_filter(filters),
+                limit=top_k,
+                score_threshold=score_threshold,
+                with_payload=True,
+            )
+        except (UnexpectedResponse, ValueError) as e:
+            logger.error("%s.query() Error querying collection: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error querying collection: {str(e)}") from e
+        return to_documents(response.points)
+
+    # pylint: disable=arguments-differ
+    def query_batch(
+        self,
+        query_vectors: Sequence[Union[str, list[float]]],
+        top_k: int = 10,
+        filters: Optional[Union[dict[str, Any], models.Filter]] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[list[tuple[Document, float]]]:
+        """
+        Query the Qdrant collection for several query vectors or texts with one request.
+
+        :param query_vectors: Query embeddings, or query texts to vectorize with :attr:`embeddings`.
+        :param top_k: The maximum number of results per query.
+        :param filters: Document metadata values that results must match. See :func:`build_filter`.
+        :param score_threshold: The minimum score of results.
+        :returns: The matching documents and their scores, best first, for each query in order.
+        :rtype: list[list[tuple[Document, float]]]
+
+        :raises VectorStoreBackendError: If the query fails.
+        """
+        if not query_vectors:
+            return []
+        query_filter = build_filter(filters)
+        requests = [
+            models.QueryRequest(
+                query=list(vector),
+                filter=query_filter,
+                limit=top_k,
+                score_threshold=score_threshold,
+                with_payload=True,
+            )
+            for vector in self.embed_queries(query_vectors)
+        ]
+        try:
+            responses = self.client.query_batch_points(collection_name=self.collection_name, requests=requests)
+        except (UnexpectedResponse, ValueError) as e:
+            logger.error("%s.query_batch() Error querying collection: %s", self.formatted_class_name, str(e))
+            raise VectorStoreBackendError(f"Error querying collection: {str(e)}") from e
+        return [to_documents(response.points) for response in responses]
@@ -35,6 +35,8 @@ from django.db import models
 from smarter.apps.account.models.user_profile import UserProfile
 from smarter.lib import logging
 from smarter.lib.cache import cache_results
+from smarter.lib.cache.codec import materialize
+from smarter.lib.cache.tags import model_tag
 from smarter.lib.django.waffle import SmarterWaffleSwitches
 
 from .models import VectorstoreMeta
@@ -46,10 +48,15 @@ logger = logging.getSmarterLogger(
 logger_prefix = logging.formatted_text(__name__)
 
 
-@cache_results()
+def _tags(user_profile_id: int) -> list[str]:
+    """Return the cache tags of the VectorstoreMetas of a user profile, see ``smarter.lib.cache.tags``."""
+    return [model_tag(VectorstoreMeta), model_tag(UserProfile, user_profile_id)]
+
+
+@cache_results(tags=_tags)
 def _get_cached_proxies_owned_by_user_profile(user_profile_id: int) -> models.QuerySet[VectorstoreMeta]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
-    retval = VectorstoreMeta.objects.owned_by(user_profile.user)  # type: ignore
+    retval = materialize(VectorstoreMeta.objects.owned_by(user_profile.user))  # type: ignore
     logger.debug(
         "%s.post() Fetching and caching Proxies owned by user: %s",
         logger_prefix,
@@ -91,10 +98,10 @@ def invalidate_cached_proxies_owned_by_user_profile(user_profile: UserProfile) -
     _get_cached_proxies_owned_by_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_proxies_shared_with_user_profile(user_profile_id: int) -> models.QuerySet[VectorstoreMeta]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
-    retval = VectorstoreMeta.objects.shared_with(user_profile.user)  # type: ignore
+    retval = materialize(VectorstoreMeta.objects.shared_with(user_profile.user))  # type: ignore
     logger.debug(
         "%s.post() Fetching and caching Proxies shared with user: %s",
         logger_prefix,
@@ -135,10 +142,10 @@ def invalidate_cached_proxies_shared_with_user_profile(user_profile: UserProfile
     _get_cached_proxies_shared_with_user_profile.invalidate(user_profile.id)  # type: ignore
 
 
-@cache_results()
+@cache_results(tags=_tags)
 def _get_cached_proxies_available_to_user_profile(user_profile_id) -> models.QuerySet[VectorstoreMeta]:
     user_profile = UserProfile.objects.get(id=user_profile_id)  # type: ignore
-    retval = VectorstoreMeta.objects.with_read_permission_for(user_profile.user)  # type: ignore
+    retval = materialize(VectorstoreMeta.objects.with_read_permission_for(user_profile.user))  # type: ignore
     logger.debug(
         "%s.post() Fetching and caching Proxies available to user: %s",
         logger_prefix,
@@ -20,6 +20,7 @@ class SmarterVectorStoreBackends(SmarterEnumAbstract):
         QDRANT: Represents the Qdrant vector store backend.
         WEAVIATE: Represents the Weaviate vector store backend.
         PINECONE: Represents the Pinecone vector store backend.
+        LOCAL: Represents the in-process vector store backend.
 
     Methods:
         str_to_backend(cls, backend_str: str) -> "SmarterVectorStoreBackends":
@@ -31,6 +32,7 @@ class SmarterVectorStoreBackends(SmarterEnumAbstract):
     QDRANT = "qdrant"
     WEAVIATE = "weaviate"
     PINECONE = "pinecone"
+    LOCAL = "local"
 
     @classmethod
     def str_to_backend(cls, backend_str: str) -> "SmarterVectorStoreBackends":
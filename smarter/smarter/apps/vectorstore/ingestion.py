@@ -0,0 +1,380 @@
+"""
+Parallel, batched ingestion of documents into a vectorstore.
+
+The pipeline streams documents through five stages:
+
+1. load: pages are streamed from local or S3 files, one file at a time
+   (see :mod:`smarter.apps.vectorstore.loaders`),
+2. split: pages are split into chunks that keep the page metadata,
+3. deduplicate: chunks that were already seen in the run are dropped,
+4. embed: chunks are embedded in batches of up to
+   ``smarter_settings.vectorstore_embedding_batch_size`` texts, and up to an
+   estimated token budget per request, with at most
+   ``smarter_settings.vectorstore_embedding_concurrency`` requests in flight,
+5. upsert: embedded chunks are added to the backend in large batches, and
+   to the vectorstore's lexical index, if any (see
+   :mod:`smarter.apps.vectorstore.lexical`).
+
+At most two batches per worker are embedded or waiting to be embedded, so
+that loading and splitting never run far ahead of the embeddings provider.
+When the provider rate limits a request, every worker waits for the
+provider's ``retry-after`` delay, or for an exponential backoff with jitter,
+before the request is retried.
+
+With an :class:`IngestionCheckpoint`, the point ids of each upserted batch
+are recorded in Redis, and a retried run skips the chunks that were already
+upserted, so that only the failed batches are embedded again.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from langchain_core.documents import Document
+from langchain_text_splitters import TextSplitter
+
+from smarter.apps.vectorstore.backends import SmarterVectorstoreBackend
+from smarter.apps.vectorstore.backends.base import point_id
+from smarter.apps.vectorstore.lexical import LexicalIndex
+from smarter.apps.vectorstore.loaders import list_sources, load_document
+from smarter.common.conf import smarter_settings
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Return True if ``error`` is a rate limit response of an embeddings provider."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(error).__name__
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Return the retry delay in seconds requested by a rate limit response, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+@dataclass
+class IngestionProgress:
+    """The progress of an ingestion run."""
+
+    files: int = 0
+    pages: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    checkpointed: int = 0
+    embedded: int = 0
+    upserted: int = 0
+    embedding_requests: int = 0
+    rate_limited: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Return the duration of the run in seconds, or None if it has not finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round(self.finished_at - self.started_at, 3)
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the progress as a JSON-serializable dict."""
+        return {**asdict(self), "duration": self.duration}
+
+
+class IngestionCheckpoint:
+    """
+    The ids of the work that an ingestion has completed, in a Redis set.
+
+    An :class:`IngestionPipeline` records the point ids of the chunks that it
+    upserts, so that a retry skips them.
+
+    :param key: The Redis key of the set, unique to the ingestion.
+    :param ttl: The lifetime in seconds of the set after its last update.
+    :param client: A Redis client. Defaults to the ``default`` Django Redis connection.
+    """
+
+    TTL = 7 * 24 * 60 * 60
+
+    def __init__(self, key: str, ttl: Optional[int] = None, client: Any = None):
+        self.key = key
+        self.ttl = ttl or self.TTL
+        if client is None:
+            # pylint: disable=import-outside-toplevel
+            from django_redis import get_redis_connection
+
+            client = get_redis_connection("default")
+        self.client = client
+        self._done: Optional[set[str]] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.key}>"
+
+    def __contains__(self, chunk_id: str) -> bool:
+        if self._done is None:
+            self._done = {
+                member.decode("utf-8") if isinstance(member, bytes) else member
+                for member in self.client.smembers(self.key)
+            }
+        return chunk_id in self._done
+
+    def __len__(self) -> int:
+        return int(self.client.scard(self.key))
+
+    def add(self, ids: list[str]) -> int:
+        """
+        Record completed ids, e.g. the point ids of an upserted batch.
+
+        :returns: The number of ids that were not recorded before.
+        """
+        if not ids:
+            return 0
+        pipe = self.client.pipeline()
+        pipe.sadd(self.key, *ids)
+        pipe.expire(self.key, self.ttl)
+        added, _ = pipe.execute()
+        if self._done is not None:
+            self._done.update(ids)
+        return int(added)
+
+    def clear(self) -> None:
+        """Delete the checkpoint, once the ingestion is complete."""
+        self.client.delete(self.key)
+        self._done = None
+
+
+class IngestionPipeline:
+    """
+    Loads, splits, deduplicates, embeds and upserts documents into a vectorstore backend.
+
+    :param backend: The vectorstore backend to add the documents to.
+    :param embed_documents: A function that returns one embedding vector per text.
+    :param text_splitter: The text splitter for the split stage.
+    :param batch_size: The maximum number of texts per embedding request. Defaults to
+        ``smarter_settings.vectorstore_embedding_batch_size``, capped by the ``chunk_size``
+        of the backend's embeddings configuration.
+    :param concurrency: The maximum number of concurrent embedding requests. Defaults to
+        ``smarter_settings.vectorstore_embedding_concurrency``.
+    :param upsert_batch_size: The number of embedded chunks per ``add_documents`` call.
+        Defaults to one embedding batch per worker.
+    :param on_progress: Called with the :class:`IngestionProgress` after each upsert.
+    :param lexical_index: The lexical index to add upserted chunks to, for hybrid queries.
+    :param checkpoint: Records upserted chunks, and skips the chunks that a previous attempt upserted.
+    """
+
+    MAX_BATCH_TOKENS = 250_000
+    CHARS_PER_TOKEN = 4
+    MAX_RETRIES = 6
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 60.0
+
+    def __init__(
+        self,
+        backend: SmarterVectorstoreBackend,
+        embed_documents: Callable[[list[str]], list[list[float]]],
+        text_splitter: TextSplitter,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+        lexical_index: Optional[LexicalIndex] = None,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+    ):
+        self.backend = backend
+        self.embed_documents = embed_documents
+        self.text_splitter = text_splitter
+        self.batch_size = batch_size or smarter_settings.vectorstore_embedding_batch_size
+        if backend.embeddings_chunk_size:
+            self.batch_size = min(self.batch_size, backend.embeddings_chunk_size)
+        self.concurrency = concurrency or smarter_settings.vectorstore_embedding_concurrency
+        self.upsert_batch_size = upsert_batch_size or self.batch_size * self.concurrency
+        self.on_progress = on_progress
+        self.lexical_index = lexical_index
+        self.checkpoint = checkpoint
+        self.progress = IngestionProgress()
+        self._lock = threading.Lock()
+        self._throttle_until = 0.0
+        self._seen: set[str] = set()
+
+    def load(self, location: str) -> Iterator[Document]:
+        """
+        Yield the pages of the supported files at ``location``, one file at a time.
+
+        :param location: A local file or directory, or an ``s3://`` object or prefix.
+            See :func:`smarter.apps.vectorstore.loaders.list_sources`.
+        """
+        for uri in list_sources(location):
+            self.progress.files += 1
+            logger.debug("%s.load() Loading file %d: %s", __name__, self.progress.files, uri)
+            yield from load_document(uri)
+
+    def split(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Split each document into chunks."""
+        for document in documents:
+            self.progress.pages += 1
+            for chunk in self.text_splitter.split_documents([document]):
+                self.progress.chunks += 1
+                yield chunk
+
+    def deduplicate(self, chunks: Iterable[Document]) -> Iterator[Document]:
+        """
+        Drop empty chunks, chunks that were already seen in this run, and chunks of the checkpoint.
+
+        Chunks are identified by :func:`point_id`, that is by source and content,
+        because each source owns its chunks. Equal chunks of different sources
+        are embedded once by the embedding cache.
+        """
+        for chunk in chunks:
+            if not chunk.page_content.strip():
+                continue
+            chunk_id = point_id(chunk)
+            if chunk_id in self._seen:
+                self.progress.duplicates += 1
+                continue
+            self._seen.add(chunk_id)
+            if self.checkpoint is not None and chunk_id in self.checkpoint:
+                self.progress.checkpointed += 1
+                continue
+            yield chunk
+
+    def batches(self, chunks: Iterable[Document]) -> Iterator[list[Document]]:
+        """Group chunks into embedding requests of up to :attr:`batch_size` texts and :attr:`MAX_BATCH_TOKENS`."""
+        batch: list[Document] = []
+        tokens = 0
+        for chunk in chunks:
+            chunk_tokens = len(chunk.page_content) // self.CHARS_PER_TOKEN + 1
+            if batch and (len(batch) >= self.batch_size or tokens + chunk_tokens > self.MAX_BATCH_TOKENS):
+                yield batch
+                batch, tokens = [], 0
+            batch.append(chunk)
+            tokens += chunk_tokens
+        if batch:
+            yield batch
+
+    def embed(self, batch: list[Document]) -> tuple[list[Document], list[list[float]]]:
+        """
+        Embed a batch of chunks, retrying rate limited requests.
+
+        :raises Exception: The provider's error, if it is not a rate limit or the retries are exhausted.
+        """
+        texts = [chunk.page_content for chunk in batch]
+        attempt = 0
+        while True:
+            delay = self._throttle_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                embeddings = self.embed_documents(texts)
+            # pylint: disable=broad-except
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.MAX_RETRIES:
+                    raise
+                delay = retry_after(e)
+                if delay is None:
+                    delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2**attempt) * random.uniform(0.5, 1.0)
+                attempt += 1
+                with self._lock:
+                    self.progress.rate_limited += 1
+                    self._throttle_until = max(self._throttle_until, time.monotonic() + delay)
+                logger.warning(
+                    "%s.embed() rate limited, retrying %d texts in %.1fs (attempt %d of %d): %s",
+                    __name__,
+                    len(texts),
+                    delay,
+                    attempt,
+                    self.MAX_RETRIES,
+                    e,
+                )
+                continue
+            with self._lock:
+                self.progress.embedding_requests += 1
+            return batch, embeddings
+
+    def run(self, documents: Iterable[Document]) -> IngestionProgress:
+        """
+        Ingest ``documents`` into the backend.
+
+        :param documents: The documents to ingest, for example :meth:`load`.
+        :returns: The progress of the completed run.
+        """
+        return self.run_chunks(self.split(documents))
+
+    def run_chunks(self, chunks: Iterable[Document]) -> IngestionProgress:
+        """
+        Ingest chunks that are already split into the backend.
+
+        :param chunks: The chunks to ingest.
+        :returns: The progress of the completed run.
+        """
+        self.progress.started_at = time.time()
+        pending: set[Future] = set()
+        documents_buffer: list[Document] = []
+        embeddings_buffer: list[list[float]] = []
+
+        def collect(done: set[Future]):
+            for future in done:
+                batch, embeddings = future.result()
+                documents_buffer.extend(batch)
+                embeddings_buffer.extend(embeddings)
+                self.progress.embedded += len(batch)
+            while len(documents_buffer) >= self.upsert_batch_size:
+                self.upsert(documents_buffer[: self.upsert_batch_size], embeddings_buffer[: self.upsert_batch_size])
+                del documents_buffer[: self.upsert_batch_size]
+                del embeddings_buffer[: self.upsert_batch_size]
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="vectorstore-embed")
+        try:
+            for batch in self.batches(self.deduplicate(chunks)):
+                while len(pending) >= 2 * self.concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(self.embed, batch))
+            done, pending = wait(pending)
+            collect(done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if documents_buffer:
+            self.upsert(documents_buffer, embeddings_buffer)
+        self.progress.finished_at = time.time()
+        logger.debug("%s.run() Finished ingestion: %s", __name__, self.progress.to_json())
+        return self.progress
+
+    def upsert(self, documents: list[Document], embeddings: list[list[float]]):
+        """Add a batch of embedded chunks to the backend and report progress."""
+        self.backend.add_documents(documents=documents, embeddings=embeddings)
+        if self.lexical_index is not None:
+            self.lexical_index.add(documents)
+        if self.checkpoint is not None:
+            self.checkpoint.add([point_id(document) for document in documents])
+        self.progress.upserted += len(documents)
+        logger.debug("%s.upsert() Upserted %d of %d chunks.", __name__, self.progress.upserted, self.progress.chunks)
+        if self.on_progress:
+            self.on_progress(self.progress)
+
+
+__all__ = ["IngestionCheckpoint", "IngestionPipeline", "IngestionProgress", "is_rate_limit_error", "retry_after"]
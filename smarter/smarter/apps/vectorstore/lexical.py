@@ -0,0 +1,220 @@
+"""
+Lexical retrieval and hybrid fusion for vectorstores.
+
+Dense vector search ranks paraphrases well but ranks exact identifiers, such
+as SKUs, error codes and names, poorly. Each vectorstore therefore keeps a
+BM25 inverted index of its chunks beside it, in a SQLite FTS5 database,
+``lexical.sqlite3``, in the vectorstore's directory under
+``smarter_settings.vectorstore_local_path``:
+
+- ``documents`` holds the point id, text and metadata of each chunk,
+- ``lexical`` is an external content FTS5 table over ``documents``, so the
+  text is stored once and the inverted index only holds postings. Triggers
+  keep it in step with ``documents``.
+
+Hybrid queries run a lexical and a vector search concurrently and merge the
+two rankings with :func:`reciprocal_rank_fusion`.
+
+The index is written by the process that ingests documents, usually a
+Celery worker, and read by the pods that serve prompts, so in a multi-pod
+deployment ``smarter_settings.vectorstore_local_path`` must be a volume
+that they share. A hybrid query that finds no lexical index logs a warning
+and is vector-only.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+from contextlib import closing
+from typing import Any, Iterable, Optional
+
+from langchain_core.documents import Document
+
+from smarter.apps.vectorstore.backends.base import point_id
+from smarter.apps.vectorstore.models import VectorstoreMeta
+from smarter.common.conf import smarter_settings
+from smarter.lib import json
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+TOKEN_PATTERN = re.compile(r"[\w][\w\-]*")
+"""Query terms: words, including identifiers with inner hyphens or underscores such as ``ERR-4012``."""
+
+
+def document_key(document: Document) -> str:
+    """Return the point id of a retrieved document, which identifies it across retrievers."""
+    return str(document.id) if document.id else point_id(document)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[list[Document]], k: Optional[int] = None) -> list[tuple[Document, float]]:
+    """
+    Merge rankings of documents with reciprocal rank fusion.
+
+    Each document scores the sum of ``1 / (k + rank)`` over the rankings that
+    contain it, with ranks starting at 1. Scores of the retrievers are ignored,
+    so rankings with incomparable scores, such as BM25 and cosine, can be merged.
+
+    :param rankings: The rankings to merge, best first.
+    :param k: The rank constant. Defaults to ``smarter_settings.vectorstore_hybrid_rrf_k``.
+    :returns: The documents and their fused scores, best first.
+    """
+    k = k or smarter_settings.vectorstore_hybrid_rrf_k
+    documents: dict[str, Document] = {}
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = document_key(document)
+            documents.setdefault(key, document)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return [(documents[key], scores[key]) for key in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+def match_expression(query: str) -> str:
+    """Return an FTS5 query that matches any term of ``query``, with each term quoted so it is taken literally."""
+    terms = dict.fromkeys(term.lower() for term in TOKEN_PATTERN.findall(query))
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class LexicalIndex:
+    """
+    A BM25 inverted index of the chunks of a vectorstore. See :mod:`smarter.apps.vectorstore.lexical`.
+
+    :param path: The path of the SQLite database.
+    """
+
+    FILE = "lexical.sqlite3"
+    TOKENIZER = "unicode61 remove_diacritics 2 tokenchars '-_'"
+    """Keeps hyphenated and underscored identifiers as single tokens, for queries and documents alike."""
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.path}>"
+
+    @classmethod
+    def for_vectorstore(cls, db: VectorstoreMeta) -> "LexicalIndex":
+        """Return the lexical index of a vector database."""
+        return cls(os.path.join(smarter_settings.vectorstore_local_path, f"{db.pk}_{db.name}", cls.FILE))
+
+    @property
+    def exists(self) -> bool:
+        """True if the index has been created."""
+        return os.path.isfile(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                point_id TEXT NOT NULL UNIQUE,
+                page_content TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS lexical USING fts5(
+                page_content, content='documents', content_rowid='id', tokenize="{self.TOKENIZER}"
+            );
+            CREATE TRIGGER IF NOT EXISTS documents_insert AFTER INSERT ON documents BEGIN
+                INSERT INTO lexical (rowid, page_content) VALUES (new.id, new.page_content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_delete AFTER DELETE ON documents BEGIN
+                INSERT INTO lexical (lexical, rowid, page_content) VALUES ('delete', old.id, old.page_content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_update AFTER UPDATE ON documents BEGIN
+                INSERT INTO lexical (lexical, rowid, page_content) VALUES ('delete', old.id, old.page_content);
+                INSERT INTO lexical (rowid, page_content) VALUES (new.id, new.page_content);
+            END;
+            """
+        )
+        return connection
+
+    def add(self, documents: list[Document]) -> None:
+        """Insert or replace documents, by point id. See :func:`point_id`."""
+        if not documents:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        rows = [
+            (point_id(document), document.page_content, json.SmarterJSONEncoder(default=str).encode(document.metadata))
+            for document in documents
+        ]
+        with closing(self._connect()) as connection:
+            connection.executemany(
+                "INSERT INTO documents (point_id, page_content, metadata) VALUES (?, ?, ?) "
+                "ON CONFLICT(point_id) DO UPDATE SET page_content = excluded.page_content, metadata = excluded.metadata",
+                rows,
+            )
+            connection.commit()
+
+    def remove(self, ids: list[str]) -> int:
+        """
+        Remove documents by point id. Unknown ids are ignored.
+
+        :returns: The number of documents removed.
+        """
+        if not ids or not self.exists:
+            return 0
+        removed = 0
+        with closing(self._connect()) as connection:
+            for i in range(0, len(ids), self.BATCH_SIZE):
+                chunk = ids[i : i + self.BATCH_SIZE]
+                cursor = connection.execute(
+                    f"DELETE FROM documents WHERE point_id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                removed += cursor.rowcount
+            connection.commit()
+        return removed
+
+    def drop(self) -> None:
+        """Delete the index."""
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def search(self, query: str, top_k: int = 10) -> list[tuple[Document, float]]:
+        """
+        Return the documents that best match the terms of ``query``, by BM25.
+
+        :param query: The query text. Any term may match; operators are not interpreted.
+        :param top_k: The maximum number of results.
+        :returns: The matching documents and their BM25 scores, higher is better, best first.
+        """
+        expression = match_expression(query)
+        if not expression or not self.exists:
+            return []
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT documents.point_id, documents.page_content, documents.metadata, bm25(lexical) AS score "
+                "FROM lexical JOIN documents ON documents.id = lexical.rowid "
+                "WHERE lexical MATCH ? ORDER BY score LIMIT ?",
+                (expression, top_k),
+            ).fetchall()
+        # fts5 bm25() is negated, so that better matches sort first.
+        return [
+            (Document(id=pid, page_content=content, metadata=json.loads(metadata)), -score)
+            for pid, content, metadata, score in rows
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of documents and the size on disk of the index."""
+        if not self.exists:
+            return {}
+        with closing(self._connect()) as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM documents").fetchone()
+        return {"path": self.path, "count": count, "bytes": os.path.getsize(self.path)}
+
+
+__all__ = ["LexicalIndex", "match_expression", "reciprocal_rank_fusion"]
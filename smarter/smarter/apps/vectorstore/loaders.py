@@ -0,0 +1,303 @@
+"""
+Streaming document loaders for vectorstore ingestion.
+
+Loaders yield :class:`Document` pages lazily, so that a file is never held
+in memory in full:
+
+- PDF files yield one document per page. Pages are extracted one at a time
+  and pypdf's object cache is cleared after each page.
+- Plain text and Markdown files yield one document per block of up to
+  ``smarter_settings.vectorstore_loader_block_size`` characters, cut at a
+  paragraph or line break where possible.
+- HTML files are parsed incrementally and yield their visible text in blocks
+  of the same size.
+
+Sources are local files, local directories (searched recursively), and S3
+objects or prefixes given as ``s3://bucket/key``. S3 objects are read with
+range requests of ``vectorstore_loader_block_size`` bytes, so that PDF
+parsing, which seeks, only downloads the parts of the file that it reads.
+
+Memory use per file is therefore bounded by the block size plus the current
+page, and the backpressure of :class:`IngestionPipeline` bounds the number of
+pages in flight.
+"""
+
+import io
+import logging
+import os
+from html.parser import HTMLParser
+from typing import Any, BinaryIO, Callable, Iterator, Optional
+
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+from smarter.common.conf import smarter_settings
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+S3_SCHEME = "s3://"
+
+
+def split_s3_uri(uri: str) -> tuple[str, str]:
+    """Return the bucket and key of ``s3://bucket/key``."""
+    bucket, _, key = uri[len(S3_SCHEME) :].partition("/")
+    return bucket, key
+
+
+def get_s3_client() -> Any:
+    """Return the boto3 S3 client of the Smarter AWS configuration."""
+    # pylint: disable=import-outside-toplevel
+    from smarter.common.helpers.aws_helpers import aws_helper
+
+    return aws_helper.s3.client
+
+
+class S3RangeReader(io.RawIOBase):
+    """
+    A seekable, read-only file over an S3 object that fetches bytes with range requests.
+
+    Wrap it in :class:`io.BufferedReader` to read in blocks. See :func:`open_source`.
+
+    :param client: A boto3 S3 client.
+    :param bucket: The bucket name.
+    :param key: The object key.
+    :param block_size: The maximum number of bytes per range request.
+    """
+
+    def __init__(self, client: Any, bucket: str, key: str, block_size: int):
+        super().__init__()
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.block_size = block_size
+        self.size = int(client.head_object(Bucket=bucket, Key=key)["ContentLength"])
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self.position = max(0, position)
+        return self.position
+
+    def readinto(self, buffer: Any) -> int:
+        if self.position >= self.size:
+            return 0
+        end = min(self.position + min(len(buffer), self.block_size), self.size) - 1
+        response = self.client.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={self.position}-{end}")
+        data = response["Body"].read()
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def open_source(uri: str) -> BinaryIO:
+    """
+    Open a local path or an ``s3://`` object for buffered binary reading.
+
+    :param uri: A local file path, or ``s3://bucket/key``.
+    :returns: A seekable binary file.
+    """
+    block_size = smarter_settings.vectorstore_loader_block_size
+    if uri.startswith(S3_SCHEME):
+        bucket, key = split_s3_uri(uri)
+        return io.BufferedReader(
+            S3RangeReader(get_s3_client(), bucket, key, block_size), buffer_size=block_size
+        )  # type: ignore[return-value]
+    return open(uri, "rb", buffering=block_size)  # pylint: disable=consider-using-with
+
+
+def load_pdf(uri: str, stream: BinaryIO) -> Iterator[Document]:
+    """Yield the text of each page of a PDF file."""
+    reader = PdfReader(stream)
+    for i, page in enumerate(reader.pages):
+        text = page.extract_text() or ""
+        # drop the parsed objects of this page. Shared resources are parsed again as needed.
+        reader.resolved_objects.clear()
+        yield Document(page_content=text, metadata={"source": uri, "page": i, "total_pages": len(reader.pages)})
+
+
+def split_blocks(parts: Iterator[str], block_size: int) -> Iterator[str]:
+    """
+    Regroup text ``parts`` into blocks of up to ``block_size`` characters.
+
+    Blocks are cut at the last paragraph break, else line break, else space of
+    each block, when there is one in its second half.
+    """
+    buffer = ""
+    for part in parts:
+        buffer += part
+        while len(buffer) >= block_size:
+            block = buffer[:block_size]
+            cut = block_size
+            for separator in ("\n\n", "\n", " "):
+                position = block.rfind(separator)
+                if position >= block_size // 2:
+                    cut = position + len(separator)
+                    break
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+    if buffer:
+        yield buffer
+
+
+def load_text(uri: str, stream: BinaryIO) -> Iterator[Document]:
+    """Yield the text of a plain text or Markdown file in blocks."""
+    block_size = smarter_settings.vectorstore_loader_block_size
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")  # type: ignore[arg-type]
+    parts = iter(lambda: text.read(block_size), "")
+    for i, block in enumerate(split_blocks(parts, block_size)):
+        yield Document(page_content=block, metadata={"source": uri, "page": i})
+
+
+class HTMLTextParser(HTMLParser):
+    """An incremental HTML parser that collects visible text."""
+
+    SKIPPED_TAGS = {"script", "style", "noscript", "template", "head"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "pre"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+    def take(self) -> str:
+        """Return and clear the text collected so far."""
+        text = "".join(self.parts)
+        self.parts = []
+        return text
+
+
+def load_html(uri: str, stream: BinaryIO) -> Iterator[Document]:
+    """Yield the visible text of an HTML file in blocks."""
+    block_size = smarter_settings.vectorstore_loader_block_size
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="replace")  # type: ignore[arg-type]
+    parser = HTMLTextParser()
+
+    def parts() -> Iterator[str]:
+        for markup in iter(lambda: text.read(block_size), ""):
+            parser.feed(markup)
+            yield parser.take()
+        parser.close()
+        yield parser.take()
+
+    for i, block in enumerate(split_blocks(parts(), block_size)):
+        if block.strip():
+            yield Document(page_content=block, metadata={"source": uri, "page": i})
+
+
+LOADERS: dict[str, Callable[[str, BinaryIO], Iterator[Document]]] = {
+    ".pdf": load_pdf,
+    ".txt": load_text,
+    ".md": load_text,
+    ".markdown": load_text,
+    ".html": load_html,
+    ".htm": load_html,
+}
+"""The loader of each supported file extension."""
+
+
+def is_supported(uri: str) -> bool:
+    """True if there is a loader for the file extension of ``uri``."""
+    return os.path.splitext(uri)[1].lower() in LOADERS
+
+
+def list_sources(location: str) -> Iterator[str]:
+    """
+    Yield the supported files at ``location``, in sorted order.
+
+    :param location: A local file or directory, which is searched recursively,
+        or an ``s3://bucket/key`` object or ``s3://bucket/prefix``.
+    """
+    if location.startswith(S3_SCHEME):
+        bucket, prefix = split_s3_uri(location)
+        paginator = get_s3_client().get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                if is_supported(item["Key"]):
+                    yield f"{S3_SCHEME}{bucket}/{item['Key']}"
+        return
+    if os.path.isfile(location):
+        if is_supported(location):
+            yield location
+        return
+    for directory, subdirectories, files in os.walk(location):
+        subdirectories.sort()
+        for name in sorted(files):
+            if is_supported(name):
+                yield os.path.join(directory, name)
+
+
+def load_document(
+    uri: str, loader: Optional[Callable[[str, BinaryIO], Iterator[Document]]] = None
+) -> Iterator[Document]:
+    """
+    Yield the pages of a single file, closing the file when done.
+
+    :param uri: A local file path, or ``s3://bucket/key``.
+    :param loader: The loader to use. Defaults to the loader of the file extension.
+    :raises ValueError: If the file type is not supported.
+    """
+    loader = loader or LOADERS.get(os.path.splitext(uri)[1].lower())
+    if loader is None:
+        raise ValueError(f"Unsupported file type: {uri}")
+    logger.debug("%s.load_document() loading %s", __name__, uri)
+    with open_source(uri) as stream:
+        yield from loader(uri, stream)
+
+
+def stream_documents(location: str) -> Iterator[Document]:
+    """Yield the pages of every supported file at ``location``, one file at a time. See :func:`list_sources`."""
+    for uri in list_sources(location):
+        yield from load_document(uri)
+
+
+__all__ = [
+    "LOADERS",
+    "S3RangeReader",
+    "list_sources",
+    "load_document",
+    "open_source",
+    "stream_documents",
+]
@@ -0,0 +1,28 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vectorstore", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vectorstoremeta",
+            name="backend",
+            field=models.CharField(
+                choices=[
+                    ("qdrant", "qdrant"),
+                    ("weaviate", "weaviate"),
+                    ("pinecone", "pinecone"),
+                    ("local", "local"),
+                ],
+                help_text="The backend type for the vector database (e.g., qdrant, weaviate, pinecone, local).",
+                max_length=50,
+            ),
+        ),
+    ]
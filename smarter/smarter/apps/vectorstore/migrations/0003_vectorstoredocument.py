@@ -0,0 +1,93 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 14:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import smarter.common.mixins.helper_mixin
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vectorstore", "0002_alter_vectorstoremeta_backend"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VectorstoreDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, db_index=True, null=True),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        help_text="The URI of the source document, e.g. a file path or URL.",
+                        max_length=2048,
+                    ),
+                ),
+                (
+                    "source_hash",
+                    models.CharField(
+                        editable=False,
+                        help_text="The sha256 hash of the source URI. Set on save.",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(
+                        help_text="The sha256 hash of the source document content when it was loaded.",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "chunk_ids",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="The point ids of the document's chunks in the vector database.",
+                    ),
+                ),
+                (
+                    "embedding_model",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="The embedding model that the chunks were embedded with.",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "vectorstore_meta",
+                    models.ForeignKey(
+                        help_text="The vector database that the document is loaded into.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="documents",
+                        to="vectorstore.vectorstoremeta",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Vectorstore Document",
+                "verbose_name_plural": "Vectorstore Documents",
+                "unique_together": {("vectorstore_meta", "source_hash")},
+            },
+            bases=(models.Model, smarter.common.mixins.helper_mixin.SmarterHelperMixin),
+        ),
+    ]
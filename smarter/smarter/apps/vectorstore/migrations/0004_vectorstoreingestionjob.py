@@ -0,0 +1,127 @@
+# pylint: disable=all
+# Generated by Django 6.0.5 on 2026-10-18 17:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import smarter.common.mixins.helper_mixin
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vectorstore", "0003_vectorstoredocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VectorstoreIngestionJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, db_index=True, null=True),
+                ),
+                (
+                    "location",
+                    models.CharField(
+                        help_text="The local path or s3:// prefix of the documents.",
+                        max_length=2048,
+                    ),
+                ),
+                (
+                    "prune",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Remove the documents that are no longer at the location from the vector database.",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        help_text="The status of the job.",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "sources",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="The URIs of the documents to load, listed when the job started.",
+                    ),
+                ),
+                (
+                    "documents_done",
+                    models.PositiveIntegerField(default=0, help_text="The number of documents that were loaded."),
+                ),
+                (
+                    "documents_failed",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of documents that failed to load after all retries.",
+                    ),
+                ),
+                (
+                    "chunks_added",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of chunks that were embedded and added to the vector database.",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="The errors of the documents that failed to load.",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(blank=True, help_text="When the job started.", null=True),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the last document of the job completed.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "vectorstore_meta",
+                    models.ForeignKey(
+                        help_text="The vector database that the documents are loaded into.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingestion_jobs",
+                        to="vectorstore.vectorstoremeta",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Vectorstore Ingestion Job",
+                "verbose_name_plural": "Vectorstore Ingestion Jobs",
+            },
+            bases=(models.Model, smarter.common.mixins.helper_mixin.SmarterHelperMixin),
+        ),
+    ]
@@ -2,6 +2,11 @@
 
 from .embeddings_interface import EmbeddingsInterface
 from .index_model import IndexModelInterface
+from .vectorstore_document import VectorstoreDocument
+from .vectorstore_ingestion_job import (
+    VectorstoreIngestionJob,
+    VectorstoreIngestionStatus,
+)
 from .vectorstore_interface import VectorstoreInterface
 from .vectorstore_meta import (
     VectorstoreBackendKind,
@@ -12,6 +17,9 @@ from .vectorstore_meta import (
 __all__ = [
     "EmbeddingsInterface",
     "IndexModelInterface",
+    "VectorstoreDocument",
+    "VectorstoreIngestionJob",
+    "VectorstoreIngestionStatus",
     "VectorstoreInterface",
     "VectorstoreMeta",
     "VectorstoreBackendKind",
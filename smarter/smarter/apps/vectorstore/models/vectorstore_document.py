@@ -0,0 +1,83 @@
+"""Models for the vectorstore app."""
+
+import hashlib
+import logging
+
+from django.db import models
+
+from smarter.lib.django import waffle
+from smarter.lib.django.models import TimestampedModel
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+from .vectorstore_meta import VectorstoreMeta
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+
+class VectorstoreDocument(TimestampedModel):
+    """
+    Manifest entry for a source document that is loaded into a vector database.
+
+    Records what is in the index for each source, so that a sync can skip
+    unchanged sources, add the chunks of new and changed sources, and delete
+    the chunks of changed and removed sources. See :mod:`smarter.apps.vectorstore.sync`.
+    """
+
+    # pylint: disable=C0115
+    class Meta:
+        verbose_name = "Vectorstore Document"
+        verbose_name_plural = "Vectorstore Documents"
+        # source is too long to index on MySQL (utf8mb4), so uniqueness is enforced on its hash.
+        unique_together = ("vectorstore_meta", "source_hash")
+
+    vectorstore_meta = models.ForeignKey(
+        VectorstoreMeta,
+        help_text="The vector database that the document is loaded into.",
+        on_delete=models.CASCADE,
+        related_name="documents",
+    )
+    source = models.CharField(
+        help_text="The URI of the source document, e.g. a file path or URL.",
+        max_length=2048,
+    )
+    source_hash = models.CharField(
+        help_text="The sha256 hash of the source URI. Set on save.",
+        max_length=64,
+        editable=False,
+    )
+    content_hash = models.CharField(
+        help_text="The sha256 hash of the source document content when it was loaded.",
+        max_length=64,
+    )
+    chunk_ids = models.JSONField(
+        help_text="The point ids of the document's chunks in the vector database.",
+        default=list,
+        blank=True,
+    )
+    embedding_model = models.CharField(
+        help_text="The embedding model that the chunks were embedded with.",
+        max_length=255,
+        blank=True,
+        default="",
+    )
+
+    @staticmethod
+    def hash_source(source: str) -> str:
+        """Return the sha256 hash of a source URI, for lookups by ``source_hash``."""
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.source_hash = self.hash_source(self.source)
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return f"{self.vectorstore_meta} - {self.source}"
@@ -0,0 +1,136 @@
+"""Models for the vectorstore app."""
+
+import logging
+from typing import Optional
+
+from django.db import models
+from django.utils import timezone
+
+from smarter.lib.django import waffle
+from smarter.lib.django.models import TimestampedModel
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+from .vectorstore_meta import VectorstoreMeta
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+
+class VectorstoreIngestionStatus(models.TextChoices):
+    """Enum representing the possible statuses of an ingestion job."""
+
+    PENDING = ("pending", "Pending")
+    RUNNING = ("running", "Running")
+    SUCCEEDED = ("succeeded", "Succeeded")
+    FAILED = ("failed", "Failed")
+
+
+class VectorstoreIngestionJob(TimestampedModel):
+    """
+    A resumable ingestion of the documents at a location into a vector database.
+
+    The job records the list of sources when it starts, and counts the sources
+    as the per-document Celery tasks complete, so that progress and an ETA can
+    be reported, and so that a job that was interrupted can be resumed with the
+    same sources. See :mod:`smarter.apps.vectorstore.tasks`.
+    """
+
+    # pylint: disable=C0115
+    class Meta:
+        verbose_name = "Vectorstore Ingestion Job"
+        verbose_name_plural = "Vectorstore Ingestion Jobs"
+
+    vectorstore_meta = models.ForeignKey(
+        VectorstoreMeta,
+        help_text="The vector database that the documents are loaded into.",
+        on_delete=models.CASCADE,
+        related_name="ingestion_jobs",
+    )
+    location = models.CharField(
+        help_text="The local path or s3:// prefix of the documents.",
+        max_length=2048,
+    )
+    prune = models.BooleanField(
+        help_text="Remove the documents that are no longer at the location from the vector database.",
+        default=True,
+    )
+    status = models.CharField(
+        help_text="The status of the job.",
+        max_length=20,
+        choices=VectorstoreIngestionStatus.choices,
+        default=VectorstoreIngestionStatus.PENDING,
+    )
+    sources = models.JSONField(
+        help_text="The URIs of the documents to load, listed when the job started.",
+        default=list,
+        blank=True,
+    )
+    documents_done = models.PositiveIntegerField(
+        help_text="The number of documents that were loaded.",
+        default=0,
+    )
+    documents_failed = models.PositiveIntegerField(
+        help_text="The number of documents that failed to load after all retries.",
+        default=0,
+    )
+    chunks_added = models.PositiveIntegerField(
+        help_text="The number of chunks that were embedded and added to the vector database.",
+        default=0,
+    )
+    error = models.TextField(
+        help_text="The errors of the documents that failed to load.",
+        blank=True,
+        default="",
+    )
+    started_at = models.DateTimeField(
+        help_text="When the job started.",
+        null=True,
+        blank=True,
+    )
+    finished_at = models.DateTimeField(
+        help_text="When the last document of the job completed.",
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self) -> str:
+        return f"{self.vectorstore_meta} - {self.location} ({self.status})"
+
+    @property
+    def documents_total(self) -> int:
+        """The number of documents of the job."""
+        return len(self.sources or [])
+
+    @property
+    def documents_remaining(self) -> int:
+        """The number of documents that have not completed yet."""
+        return max(0, self.documents_total - self.documents_done - self.documents_failed)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """The estimated number of seconds until the job completes, from the average time per completed document."""
+        completed = self.documents_done + self.documents_failed
+        if not self.started_at or not completed:
+            return None
+        elapsed = (timezone.now() - self.started_at).total_seconds()
+        return round(elapsed / completed * self.documents_remaining, 1)
+
+    def progress(self) -> dict:
+        """Return the progress of the job as a JSON-serializable dict."""
+        return {
+            "job": self.pk,
+            "status": self.status,
+            "documents_total": self.documents_total,
+            "documents_done": self.documents_done,
+            "documents_failed": self.documents_failed,
+            "chunks_added": self.chunks_added,
+            "eta": self.eta,
+        }
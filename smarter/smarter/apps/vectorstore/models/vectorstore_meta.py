@@ -35,6 +35,7 @@ class VectorstoreBackendKind(models.TextChoices):
     QDRANT = (SmarterVectorStoreBackends.QDRANT.value, SmarterVectorStoreBackends.QDRANT.value)
     WEAVIATE = (SmarterVectorStoreBackends.WEAVIATE.value, SmarterVectorStoreBackends.WEAVIATE.value)
     PINECONE = (SmarterVectorStoreBackends.PINECONE.value, SmarterVectorStoreBackends.PINECONE.value)
+    LOCAL = (SmarterVectorStoreBackends.LOCAL.value, SmarterVectorStoreBackends.LOCAL.value)
 
 
 class VectorstoreStatus(models.TextChoices):
@@ -65,7 +66,7 @@ class VectorstoreMeta(MetaDataWithOwnershipModel):
         related_name="vector_databases",
     )
     backend = models.CharField(
-        help_text="The backend type for the vector database (e.g., qdrant, weaviate, pinecone).",
+        help_text="The backend type for the vector database (e.g., qdrant, weaviate, pinecone, local).",
         max_length=50,
         choices=VectorstoreBackendKind.choices,
         blank=False,
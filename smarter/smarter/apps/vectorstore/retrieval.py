@@ -0,0 +1,263 @@
+"""
+Retrieval-augmented context for prompts.
+
+Before the first request of a prompt, the chat provider retrieves the chunks
+of the vectorstores that are attached to its LLMClient (see
+:class:`smarter.apps.llm_client.models.LLMClientVectorstore`) that best match
+the user's input, and adds them to the request as a system message. Each
+vectorstore contributes its best chunks up to its own token budget. Retrieval
+runs in a worker thread while plugins are selected.
+
+Two caches keep repeated questions cheap:
+
+- query embeddings are cached by the embedding cache, see
+  :mod:`smarter.apps.provider.services.embedding_cache`,
+- retrieval results are cached in the Django cache per vectorstore, retrieval
+  mode, ``top_k`` and normalized question, for
+  ``smarter_settings.vectorstore_retrieval_cache_ttl`` seconds.
+
+Loading, syncing or deleting a vectorstore starts a new cache generation for
+it, so that results of the previous contents are not served.
+
+The :class:`VectorstoreService` of each vectorstore is created once per
+process, see :func:`get_service`, rather than once per prompt.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
+
+from smarter.apps.provider.services.embedding_cache import normalize_text
+from smarter.apps.provider.services.text_completion.lib.response_shaping import (
+    count_tokens,
+)
+from smarter.apps.vectorstore.models import VectorstoreMeta
+from smarter.apps.vectorstore.service import VectorstoreService
+from smarter.common.conf import smarter_settings
+from smarter.lib.cache import lazy_cache as cache
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+if TYPE_CHECKING:
+    from smarter.apps.llm_client.models import LLMClientVectorstore
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+CACHE_PREFIX = "smarter.vectorstore.retrieval."
+CONTEXT_PREAMBLE = (
+    "Use the following context, retrieved from the knowledge base, to answer the user's next message. "
+    "If the context is not relevant, ignore it."
+)
+
+
+@dataclass
+class RetrievedChunk:
+    """A chunk of a vectorstore that was retrieved as context."""
+
+    vectorstore: str
+    content: str
+    score: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def citation(self) -> str:
+        """The source and page of the chunk, e.g. ``handbook.pdf p.3``."""
+        citation = str(self.metadata.get("source") or self.vectorstore)
+        if self.metadata.get("page") is not None:
+            citation += f" p.{int(self.metadata['page']) + 1}"
+        return citation
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the chunk as a JSON serializable dict."""
+        return asdict(self)
+
+
+_services: dict[str, VectorstoreService] = {}
+_services_lock = threading.Lock()
+
+
+def get_service(db: VectorstoreMeta) -> VectorstoreService:
+    """
+    Return this process's service of a vector database, creating it on first use.
+
+    A service is replaced when its vector database is edited.
+
+    :param db: The vector database.
+    :return: The service.
+    :rtype: VectorstoreService
+    """
+    prefix = f"{db.pk}:"
+    identity = f"{prefix}{db.updated_at.isoformat() if db.updated_at else ''}"
+    service = _services.get(identity)
+    if service is None:
+        service = VectorstoreService(db)
+        with _services_lock:
+            for key in [key for key in _services if key.startswith(prefix) and key != identity]:
+                del _services[key]
+            service = _services.setdefault(identity, service)
+    return service
+
+
+def generation_key(db: VectorstoreMeta) -> str:
+    """Return the cache key of the current cache generation of a vector database."""
+    return f"{CACHE_PREFIX}{db.pk}.generation"
+
+
+def invalidate(db: VectorstoreMeta) -> None:
+    """Start a new cache generation for a vector database, so that its cached retrieval results are not served."""
+    cache.set(generation_key(db), time.time_ns(), timeout=None)
+
+
+def cache_key(db: VectorstoreMeta, question: str, top_k: int, hybrid: bool) -> str:
+    """
+    Return the cache key of the retrieval results of ``question``.
+
+    :param db: The vector database.
+    :param question: The user's input. Questions with the same normalized form share results.
+    :param top_k: The maximum number of chunks.
+    :param hybrid: True for hybrid lexical and vector retrieval.
+    :return: The cache key, in the current cache generation of ``db``.
+    :rtype: str
+    """
+    generation = cache.get(generation_key(db)) or 0
+    digest = hashlib.sha256(normalize_text(question).encode("utf-8")).hexdigest()
+    mode = "hybrid" if hybrid else "vector"
+    return f"{CACHE_PREFIX}{db.pk}.{generation}.{mode}.{top_k}.{digest}"
+
+
+def retrieve(service: VectorstoreService, question: str, top_k: int = 5, hybrid: bool = False) -> list[RetrievedChunk]:
+    """
+    Return the chunks of a vectorstore that best match ``question``, from the cache when possible.
+
+    :param service: The service of the vector database.
+    :param question: The user's input.
+    :param top_k: The maximum number of chunks.
+    :param hybrid: Use hybrid lexical and vector retrieval, see :meth:`VectorstoreService.hybrid_query`.
+    :return: The chunks, best first.
+    :rtype: list[RetrievedChunk]
+    """
+    ttl = smarter_settings.vectorstore_retrieval_cache_ttl
+    key = cache_key(service.db, question, top_k, hybrid) if ttl > 0 else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug("%s.retrieve() cache hit for %s", __name__, service.db)
+            return [RetrievedChunk(**chunk) for chunk in cached]
+
+    results = service.hybrid_query(question, top_k=top_k) if hybrid else service.query(question, top_k=top_k)
+    chunks = [
+        RetrievedChunk(
+            vectorstore=service.db.name,
+            content=document.page_content,
+            score=float(score),
+            metadata=dict(document.metadata or {}),
+        )
+        for document, score in results or []
+    ]
+    if key is not None:
+        cache.set(key, [chunk.to_json() for chunk in chunks], timeout=ttl)
+    return chunks
+
+
+def pack(chunks: list[RetrievedChunk], max_tokens: int, model: Optional[str] = None) -> list[RetrievedChunk]:
+    """
+    Return the best chunks whose combined length fits in ``max_tokens``.
+
+    Chunks are taken best first. A chunk that does not fit is skipped, so that a
+    smaller chunk further down can still use the rest of the budget.
+
+    :param chunks: The chunks, best first.
+    :param max_tokens: The token budget.
+    :param model: The LLM model, used to select the tokenizer.
+    :return: The chunks that fit, best first.
+    :rtype: list[RetrievedChunk]
+    """
+    packed = []
+    remaining = max_tokens
+    for chunk in chunks:
+        tokens = count_tokens(chunk.content, model)
+        if tokens <= remaining:
+            packed.append(chunk)
+            remaining -= tokens
+    return packed
+
+
+def format_context(chunks: list[RetrievedChunk]) -> str:
+    """Return the system message content that presents ``chunks`` to the LLM, with a numbered citation per chunk."""
+    sections = [f"[{i}] {chunk.citation}\n{chunk.content.strip()}" for i, chunk in enumerate(chunks, start=1)]
+    return "\n\n".join([CONTEXT_PREAMBLE, *sections])
+
+
+class ContextRetriever:
+    """
+    Retrieves context for prompts from the vectorstores that are attached to a LLMClient.
+
+    The vectorstore services are looked up by the constructor, in the calling
+    thread, so that :meth:`retrieve` does not use the database and can run in
+    a worker thread. See :func:`get_service`.
+
+    :param attachments: The vectorstores of the LLMClient, see :meth:`LLMClientVectorstore.vectorstores`.
+    :param model: The LLM model, used to count tokens.
+    """
+
+    def __init__(self, attachments: list["LLMClientVectorstore"], model: Optional[str] = None):
+        self.model = model
+        self.sources: list[tuple[VectorstoreService, "LLMClientVectorstore"]] = []
+        for attachment in attachments:
+            try:
+                self.sources.append((get_service(attachment.vectorstore_meta), attachment))
+            # pylint: disable=broad-except
+            except Exception as e:
+                logger.error("%s.__init__() skipping vectorstore %s: %s", self, attachment.vectorstore_meta, e)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} vectorstores={len(self.sources)}>"
+
+    def __bool__(self) -> bool:
+        return bool(self.sources)
+
+    def retrieve(self, question: str) -> list[RetrievedChunk]:
+        """
+        Return the context for ``question`` from every attached vectorstore.
+
+        A vectorstore that fails is logged and skipped, so that retrieval never
+        fails the prompt.
+
+        :param question: The user's input.
+        :return: The chunks of each vectorstore that fit its token budget, best first per vectorstore.
+        :rtype: list[RetrievedChunk]
+        """
+        context = []
+        for service, attachment in self.sources:
+            try:
+                chunks = retrieve(service, question, top_k=attachment.top_k, hybrid=attachment.hybrid)
+            # pylint: disable=broad-except
+            except Exception as e:
+                logger.error("%s.retrieve() vectorstore %s failed: %s", self, service.db, e)
+                continue
+            context.extend(pack(chunks, attachment.max_context_tokens, self.model))
+        logger.debug("%s.retrieve() retrieved %d chunks", self, len(context))
+        return context
+
+
+__all__ = [
+    "ContextRetriever",
+    "RetrievedChunk",
+    "format_context",
+    "get_service",
+    "invalidate",
+    "pack",
+    "retrieve",
+]
@@ -4,12 +4,11 @@ Service layer for managing vector databases, providing abstractions for.
 provisioning, deleting, and interacting
 """
 
-import glob
 import logging
-import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
-from langchain_community.document_loaders.pdf import PyPDFLoader
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from smarter.apps.provider.models import Provider, ProviderModel
@@ -18,7 +17,15 @@ from smarter.apps.provider.services import (
     get_embedding_service,
 )
 from smarter.apps.vectorstore.backends import Backends, SmarterVectorstoreBackend
-from smarter.apps.vectorstore.models import VectorstoreMeta
+from smarter.apps.vectorstore.ingestion import (
+    IngestionCheckpoint,
+    IngestionPipeline,
+    IngestionProgress,
+)
+from smarter.apps.vectorstore.lexical import LexicalIndex, reciprocal_rank_fusion
+from smarter.apps.vectorstore.models import VectorstoreDocument, VectorstoreMeta
+from smarter.apps.vectorstore.sync import SyncResult, VectorstoreSync, file_sources
+from smarter.common.conf import smarter_settings
 from smarter.common.mixins import SmarterHelperMixin
 from smarter.lib.django import waffle
 from smarter.lib.django.waffle import SmarterWaffleSwitches
@@ -52,6 +59,7 @@ class VectorstoreService(SmarterHelperMixin):
     """
 
     _text_splitter: Optional[RecursiveCharacterTextSplitter] = None
+    _lexical_index: Optional[LexicalIndex] = None
 
     # Vector metadata and backend implementation
     db: VectorstoreMeta  # the VectorstoreMeta ORM model instance containing metadata and configuration for the vector database
@@ -83,8 +91,9 @@ class VectorstoreService(SmarterHelperMixin):
         # 4.) the embedding service that we need is determined by the provider model attributes.
         self.embedding_service = get_embedding_service(self.provider_model)
 
-        # 5.) initialize the vectorstore backend implementation
-        embeddings = self.embedding_service.embeddings
+        # 5.) initialize the vectorstore backend implementation. Query-time embeddings
+        #     of repeated questions are served from the embedding cache.
+        embeddings = self.embedding_service.cached_embeddings
         self.backend = Backends.get_backend(name=db.name, backend=db.backend, embeddings=embeddings, vector_store=None)
 
         if self.ready:
@@ -112,6 +121,20 @@ class VectorstoreService(SmarterHelperMixin):
             self._text_splitter = RecursiveCharacterTextSplitter()
         return self._text_splitter
 
+    @property
+    def lexical_index(self) -> LexicalIndex:
+        """Get the BM25 lexical index that is kept beside the vector database for hybrid queries."""
+        if self._lexical_index is None:
+            self._lexical_index = LexicalIndex.for_vectorstore(self.db)
+        return self._lexical_index
+
+    def invalidate_retrieval_cache(self):
+        """Stop serving cached prompt retrieval results of the previous contents of the vector database."""
+        # pylint: disable=import-outside-toplevel
+        from smarter.apps.vectorstore.retrieval import invalidate
+
+        invalidate(self.db)
+
     def provision(self):
         """Provision a new vector database using the appropriate backend."""
         self.backend.create()
@@ -119,6 +142,10 @@ class VectorstoreService(SmarterHelperMixin):
     def delete(self):
         """Delete an existing vector database using the appropriate backend."""
         self.backend.delete()
+        self.lexical_index.drop()
+        # the document manifest describes the deleted index, so the next sync must add every document again.
+        VectorstoreDocument.objects.filter(vectorstore_meta=self.db).delete()
+        self.invalidate_retrieval_cache()
 
     def query(self, query_vector, top_k=10):
         """
@@ -128,46 +155,185 @@ class VectorstoreService(SmarterHelperMixin):
         """
         return self.backend.query(query_vector, top_k)
 
-    def pdf_loader(self, filepath: str):
+    def query_batch(self, queries: list, top_k: int = 10, **kwargs) -> list[list[tuple[Document, float]]]:
+        """
+        Query the vector database for several query vectors or texts at once.
+
+        Query texts are embedded with one batch request, and the backend queries
+        them in one round trip when it supports multi-query requests, or
+        concurrently otherwise. See :meth:`SmarterVectorstoreBackend.query_batch`.
+
+        :param queries: Query vectors, or query texts.
+        :param top_k: The maximum number of results per query.
+        :param kwargs: Backend query options, e.g. ``filters``.
+        :returns: The matching documents and their scores, best first, for each query in order.
+        """
+        return self.backend.query_batch(queries, top_k, **kwargs)
+
+    def hybrid_query(
+        self,
+        query: str,
+        top_k: int = 10,
+        candidates: Optional[int] = None,
+        rerank: Optional[Callable[[str, list[Document]], list[float]]] = None,
+        rerank_top_n: Optional[int] = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        Query the vector database with hybrid lexical and vector retrieval.
+
+        A BM25 search of the lexical index and a vector search of the backend run
+        concurrently, each for ``candidates`` documents, and their rankings are merged
+        with reciprocal rank fusion. Exact identifiers such as SKUs and error codes
+        are found by the lexical search even when they embed poorly.
+
+        :param query: The query text.
+        :param top_k: The maximum number of results.
+        :param candidates: The number of candidates of each retriever. Defaults to
+            ``smarter_settings.vectorstore_hybrid_candidates``, and is at least ``top_k``.
+        :param rerank: Optional. Returns a relevance score, higher is better, for each of
+            the documents of ``query``, for example with a cross-encoder.
+        :param rerank_top_n: The number of fused results to rerank. Defaults to ``top_k``.
+        :returns: The documents and their fused, or reranked, scores, best first.
+        """
+        candidates = max(top_k, candidates or smarter_settings.vectorstore_hybrid_candidates)
+        if not self.lexical_index.exists:
+            # the lexical index is written by the process that ingests documents, usually a Celery worker.
+            logger.warning(
+                "%s.hybrid_query() %s has no lexical index at %s, so the query is vector-only. "
+                "smarter_settings.vectorstore_local_path must be a volume that is shared with the ingesting workers.",
+                self.formatted_class_name,
+                self.db.name,
+                self.lexical_index.path,
+            )
+            rankings = [[], [document for document, _ in self.backend.query(query, candidates)]]
+        else:
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="vectorstore-hybrid") as executor:
+                lexical = executor.submit(self.lexical_index.search, query, candidates)
+                vector = executor.submit(self.backend.query, query, candidates)
+                rankings = [[document for document, _ in future.result()] for future in (lexical, vector)]
+        results = reciprocal_rank_fusion(rankings)
+
+        if rerank is not None:
+            rerank_top_n = max(top_k, rerank_top_n or top_k)
+            head = [document for document, _ in results[:rerank_top_n]]
+            scores = rerank(query, head)
+            results = sorted(zip(head, scores), key=lambda result: result[1], reverse=True)
+
+        logger.debug(
+            "%s.hybrid_query() %d lexical and %d vector candidates fused into %d results",
+            self.formatted_class_name,
+            len(rankings[0]),
+            len(rankings[1]),
+            len(results),
+        )
+        return results[:top_k]
+
+    def ingestion_pipeline(
+        self,
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+    ) -> IngestionPipeline:
+        """Return an ingestion pipeline into the vector database and its lexical index."""
+        return IngestionPipeline(
+            backend=self.backend,
+            embed_documents=self.embedding_service.embed_documents,
+            text_splitter=self.text_splitter,
+            on_progress=on_progress,
+            lexical_index=self.lexical_index,
+            checkpoint=checkpoint,
+        )
+
+    def pdf_loader(
+        self, filepath: str, on_progress: Optional[Callable[[IngestionProgress], None]] = None
+    ) -> IngestionProgress:
         """
         Embed PDF.
 
-        1. Load PDF document text data
-        2. Split into pages
-        3. Embed each page
-        4. Store in Pinecone
+        Loads the PDF, text, Markdown and HTML files at ``filepath`` into the vector database
+        with an :class:`IngestionPipeline`, streaming their pages with bounded memory (see
+        :mod:`smarter.apps.vectorstore.loaders`). The pipeline splits pages into chunks, drops
+        duplicate chunks, embeds them in concurrent batches and upserts them in large batches.
+        The index is rebuilt, and its document manifest is cleared, so that a later
+        :meth:`sync_pdfs` adds every document again.
 
-        Note: it's important to make sure that the "context" field that holds the document text
-        in the metadata is not indexed. Currently you need to specify explicitly the fields you
-        do want to index. For more information checkout
-        https://docs.pinecone.io/docs/manage-indexes#selective-metadata-indexing
+        :param filepath: A local file or directory, or an ``s3://bucket/prefix``.
+        :param on_progress: Called with the :class:`IngestionProgress` after each upsert.
+        :returns: The progress of the completed ingestion.
         """
         self.backend.initialize()
+        self.lexical_index.drop()
+        VectorstoreDocument.objects.filter(vectorstore_meta=self.db).delete()
 
-        pdf_files = glob.glob(os.path.join(filepath, "*.pdf"))
-        i = 0
-        for pdf_file in pdf_files:
-            i += 1
-            j = len(pdf_files)
-            logger.debug("%s.pdf_loader() Loading PDF %d of %d: %s", self.formatted_class_name, i, j, pdf_file)
-            loader = PyPDFLoader(file_path=pdf_file)
-            docs = loader.load()
-            k = 0
-            for doc in docs:
-                k += 1
-                logger.debug(
-                    "%s.pdf_loader() Loading page %d of %d from PDF: %s",
-                    self.formatted_class_name,
-                    k,
-                    len(docs),
-                    pdf_file,
-                )
-                documents = self.text_splitter.create_documents([doc.page_content])
-                document_texts = [doc.page_content for doc in documents]
-                embeddings = self.embedding_service.embed_documents(document_texts)
-                self.backend.add_documents(documents=documents, embeddings=embeddings)
+        pipeline = self.ingestion_pipeline(on_progress=on_progress)
+        progress = pipeline.run(pipeline.load(filepath))
+        self.invalidate_retrieval_cache()
 
         logger.debug("%s.pdf_loader() Finished loading PDFs. \n%s", self.formatted_class_name, self.backend.index_stats)
+        return progress
+
+    def sync_pdfs(
+        self,
+        filepath: str,
+        prune: bool = True,
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+    ) -> SyncResult:
+        """
+        Incrementally sync the supported files at ``filepath`` into the vector database.
+
+        Unlike :meth:`pdf_loader`, the index is not rebuilt: unchanged files are skipped,
+        the new chunks of new and changed files are added, and the chunks of changed and
+        removed files are deleted. See :mod:`smarter.apps.vectorstore.sync`.
+
+        :param filepath: A local file or directory, or an ``s3://bucket/prefix``.
+        :param prune: Remove files that are no longer in ``filepath`` from the index.
+        :param on_progress: Called with the :class:`IngestionProgress` after each upsert.
+        :returns: The outcome of the sync.
+        """
+        pipeline = self.ingestion_pipeline(on_progress=on_progress)
+        result = VectorstoreSync(self.db, pipeline, self.embedding_service.embedding_model).sync(
+            file_sources(filepath), prune=prune
+        )
+        self.invalidate_retrieval_cache()
+        logger.debug("%s.sync_pdfs() Finished syncing PDFs: %s", self.formatted_class_name, result.to_json())
+        return result
+
+    def sync_source(
+        self,
+        uri: str,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+    ) -> SyncResult:
+        """
+        Incrementally sync a single file into the vector database, without pruning other files.
+
+        This is the unit of work of a chunked ingestion job, see :mod:`smarter.apps.vectorstore.tasks`.
+        The retrieval cache is not invalidated, see :meth:`prune_sources`.
+
+        :param uri: A local file, or an ``s3://bucket/key`` object.
+        :param checkpoint: Records upserted batches, so that a retry skips them.
+        :param on_progress: Called with the :class:`IngestionProgress` after each upsert.
+        :returns: The outcome of the sync.
+        """
+        pipeline = self.ingestion_pipeline(on_progress=on_progress, checkpoint=checkpoint)
+        return VectorstoreSync(self.db, pipeline, self.embedding_service.embedding_model).sync(
+            file_sources(uri), prune=False
+        )
+
+    def prune_sources(self, keep: list[str], prune: bool = True) -> SyncResult:
+        """
+        Complete a chunked ingestion job: remove the files that are not in ``keep``, and invalidate the retrieval cache.
+
+        :param keep: The files of the job.
+        :param prune: Remove the files that are not in ``keep`` from the vector database.
+        :returns: The number of removed files and deleted chunks.
+        """
+        result = SyncResult()
+        if prune:
+            result = VectorstoreSync(self.db, self.ingestion_pipeline(), self.embedding_service.embedding_model).prune(
+                keep
+            )
+        self.invalidate_retrieval_cache()
+        return result
 
 
 __all__ = ["VectorstoreService"]
@@ -0,0 +1,246 @@
+"""
+Incremental sync of source documents into a vectorstore.
+
+Each vector database keeps a manifest of its source documents, one
+:class:`VectorstoreDocument` per source, with the hash of the source content,
+the point ids of its chunks and the embedding model. A sync compares each
+source with its manifest entry:
+
+- unchanged sources, with the same content hash and embedding model, are
+  skipped without being loaded,
+- new and changed sources are loaded and split. Only chunks whose point ids
+  are not in the manifest are embedded and upserted, and chunks that are no
+  longer in the source are deleted,
+- sources that were not seen are removed from the index and the manifest,
+  unless ``prune`` is False.
+
+Sources whose embedding model changed are re-embedded in full. Point ids are
+stable (see :func:`point_id`), so a sync that fails part way can simply be
+run again: the manifest is only updated after the chunks are upserted.
+"""
+
+import hashlib
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from django.db import transaction
+from langchain_core.documents import Document
+
+from smarter.apps.vectorstore.backends.base import point_id
+from smarter.apps.vectorstore.ingestion import IngestionPipeline, IngestionProgress
+from smarter.apps.vectorstore.loaders import (
+    S3_SCHEME,
+    get_s3_client,
+    list_sources,
+    load_document,
+    split_s3_uri,
+)
+from smarter.apps.vectorstore.models import VectorstoreDocument, VectorstoreMeta
+from smarter.lib.django import waffle
+from smarter.lib.django.waffle import SmarterWaffleSwitches
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper
+
+
+# pylint: disable=unused-argument
+def should_log(level):
+    """Check if logging should be done based on the waffle switch."""
+    return waffle.switch_is_active(SmarterWaffleSwitches.VECTORSTORE_LOGGING)
+
+
+base_logger = logging.getLogger(__name__)
+logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
+
+
+@dataclass
+class SyncSource:
+    """
+    A source document to sync.
+
+    :param source: The URI of the source, e.g. a file path or URL.
+    :param content_hash: The sha256 hash of the source content.
+    :param load: Returns the pages of the source. Only called if the source changed.
+    """
+
+    source: str
+    content_hash: str
+    load: Callable[[], Iterable[Document]]
+
+
+def content_hash(uri: str) -> str:
+    """
+    Return the content hash of a local file or ``s3://`` object.
+
+    Local files are hashed with sha256 in blocks. S3 objects are not downloaded:
+    their ETag, which changes with their content, is hashed instead.
+    """
+    digest = hashlib.sha256()
+    if uri.startswith(S3_SCHEME):
+        bucket, key = split_s3_uri(uri)
+        digest.update(get_s3_client().head_object(Bucket=bucket, Key=key)["ETag"].encode("utf-8"))
+        return digest.hexdigest()
+    with open(uri, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_sources(location: str) -> Iterator[SyncSource]:
+    """
+    Yield a :class:`SyncSource` for each supported file at ``location``, hashed by content.
+
+    :param location: A local file or directory, or an ``s3://`` object or prefix.
+        See :func:`smarter.apps.vectorstore.loaders.list_sources`.
+    """
+    for uri in list_sources(location):
+        yield SyncSource(source=uri, content_hash=content_hash(uri), load=lambda uri=uri: load_document(uri))
+
+
+def document_sources(documents: Iterable[Document]) -> list[SyncSource]:
+    """Return a :class:`SyncSource` for each ``source`` metadata value of ``documents``, hashed by page content."""
+    pages: dict[str, list[Document]] = {}
+    for document in documents:
+        pages.setdefault(str(document.metadata.get("source", "")), []).append(document)
+    sources = []
+    for source, source_pages in pages.items():
+        digest = hashlib.sha256()
+        for page in source_pages:
+            digest.update(hashlib.sha256(page.page_content.encode("utf-8")).digest())
+        sources.append(SyncSource(source=source, content_hash=digest.hexdigest(), load=lambda p=source_pages: p))
+    return sources
+
+
+@dataclass
+class SyncResult:
+    """The outcome of a sync."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    chunks_added: int = 0
+    chunks_deleted: int = 0
+    chunks_unchanged: int = 0
+    ingestion: IngestionProgress = field(default_factory=IngestionProgress)
+
+    def to_json(self) -> dict[str, Any]:
+        """Return the result as a JSON-serializable dict."""
+        return {**asdict(self), "ingestion": self.ingestion.to_json()}
+
+
+class VectorstoreSync:
+    """
+    Syncs source documents into a vector database, using its document manifest.
+
+    :param db: The vector database.
+    :param pipeline: The ingestion pipeline that embeds and upserts new chunks into the database's backend.
+    :param embedding_model: Identifies the embedding model.
+        See :attr:`SmarterEmbeddingServiceInterface.embedding_model`.
+    """
+
+    def __init__(self, db: VectorstoreMeta, pipeline: IngestionPipeline, embedding_model: str):
+        self.db = db
+        self.pipeline = pipeline
+        self.backend = pipeline.backend
+        self.embedding_model = embedding_model
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.db}>"
+
+    def sync(self, sources: Iterable[SyncSource], prune: bool = True) -> SyncResult:
+        """
+        Sync ``sources`` into the vector database.
+
+        :param sources: The source documents, for example :func:`file_sources`.
+        :param prune: Remove the sources in the manifest that are not in ``sources``.
+        :returns: The outcome of the sync.
+        """
+        if not self.backend.initialized:
+            self.backend.create()
+        result = SyncResult()
+        manifest = {entry.source: entry for entry in VectorstoreDocument.objects.filter(vectorstore_meta=self.db)}
+        seen: set[str] = set()
+        changed: list[tuple[SyncSource, list[str]]] = []
+        stale_ids: list[str] = []
+
+        def new_chunks() -> Iterator[Document]:
+            for item in sources:
+                seen.add(item.source)
+                entry = manifest.get(item.source)
+                same_model = entry is not None and entry.embedding_model == self.embedding_model
+                if same_model and entry.content_hash == item.content_hash:  # type: ignore[union-attr]
+                    result.unchanged += 1
+                    continue
+                chunks = [chunk for chunk in self.pipeline.split(item.load()) if chunk.page_content.strip()]
+                ids = list(dict.fromkeys(point_id(chunk) for chunk in chunks))
+                existing = set(entry.chunk_ids) if same_model else set()  # type: ignore[union-attr]
+                for chunk in chunks:
+                    if point_id(chunk) not in existing:
+                        yield chunk
+                current = set(ids)
+                if entry is None:
+                    result.added += 1
+                else:
+                    result.updated += 1
+                    stale_ids.extend(chunk_id for chunk_id in entry.chunk_ids if chunk_id not in current)
+                result.chunks_added += len(current - existing)
+                result.chunks_unchanged += len(current & existing)
+                changed.append((item, ids))
+
+        result.ingestion = self.pipeline.run_chunks(new_chunks())
+
+        removed = [entry for source, entry in manifest.items() if source not in seen] if prune else []
+        for entry in removed:
+            stale_ids.extend(entry.chunk_ids)
+        result.removed = len(removed)
+        self.delete_chunks(stale_ids)
+        result.chunks_deleted = len(stale_ids)
+
+        with transaction.atomic():
+            for item, ids in changed:
+                VectorstoreDocument.objects.update_or_create(
+                    vectorstore_meta=self.db,
+                    source_hash=VectorstoreDocument.hash_source(item.source),
+                    defaults={
+                        "source": item.source,
+                        "content_hash": item.content_hash,
+                        "chunk_ids": ids,
+                        "embedding_model": self.embedding_model,
+                    },
+                )
+            if removed:
+                VectorstoreDocument.objects.filter(id__in=[entry.id for entry in removed]).delete()  # type: ignore[attr-defined]
+
+        logger.debug("%s.sync() %s", self, result.to_json())
+        return result
+
+    def prune(self, keep: Iterable[str]) -> SyncResult:
+        """
+        Remove the sources in the manifest that are not in ``keep`` from the index and the manifest.
+
+        Used after the sources of a location were synced one at a time, with ``prune=False``.
+
+        :param keep: The sources to keep.
+        :returns: The number of removed sources and deleted chunks.
+        """
+        keep = set(keep)
+        removed = [
+            entry for entry in VectorstoreDocument.objects.filter(vectorstore_meta=self.db) if entry.source not in keep
+        ]
+        stale_ids = [chunk_id for entry in removed for chunk_id in entry.chunk_ids]
+        self.delete_chunks(stale_ids)
+        VectorstoreDocument.objects.filter(id__in=[entry.id for entry in removed]).delete()  # type: ignore[attr-defined]
+        result = SyncResult(removed=len(removed), chunks_deleted=len(stale_ids))
+        logger.debug("%s.prune() %s", self, result.to_json())
+        return result
+
+    def delete_chunks(self, ids: list[str]) -> None:
+        """Delete chunks from the backend and the lexical index, by point id."""
+        if not ids:
+            return
+        self.backend.delete_documents(ids)
+        if self.pipeline.lexical_index is not None:
+            self.pipeline.lexical_index.remove(ids)
+
+
+__all__ = ["SyncResult", "SyncSource", "VectorstoreSync", "document_sources", "file_sources"]
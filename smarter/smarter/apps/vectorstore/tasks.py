@@ -1,15 +1,47 @@
-"""Celery tasks for the vectorstore app."""
+"""
+Celery tasks for the vectorstore app.
 
+Ingestion runs as a :class:`VectorstoreIngestionJob` that is split into one
+:func:`ingest_document` task per source document, dispatched as a Celery
+group. Each document task is an incremental sync of one file, so that:
+
+- the documents of a job are loaded concurrently by all workers,
+- a failed document is retried on its own, and a document that is retried
+  skips the batches that it already upserted, which are checkpointed in Redis
+  (see :class:`IngestionCheckpoint`),
+- tasks are acknowledged late, so that the tasks of a worker that is
+  restarted are delivered again, and :func:`resume_ingestion` restarts a job
+  without loading the documents that are already complete again.
+
+The last document task to complete finishes the job: it prunes the documents
+that are no longer at the job's location and invalidates the retrieval cache.
+Progress and an ETA are published to the job's Redis log stream,
+``logs:vectorstore_ingestion_<job id>``, as each batch and document completes.
+"""
+
+import hashlib
 import logging
 import os
+from typing import Optional
 
-from smarter.apps.vectorstore.models import VectorstoreMeta
+from celery import group
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from smarter.apps.vectorstore.ingestion import IngestionCheckpoint
+from smarter.apps.vectorstore.loaders import list_sources
+from smarter.apps.vectorstore.models import (
+    VectorstoreIngestionJob,
+    VectorstoreIngestionStatus,
+    VectorstoreMeta,
+)
 from smarter.apps.vectorstore.service import VectorstoreService
 from smarter.common.conf import smarter_settings
 from smarter.common.helpers.console_helpers import formatted_text
 from smarter.lib.django import waffle
 from smarter.lib.django.waffle import SmarterWaffleSwitches
-from smarter.lib.logging import WaffleSwitchedLoggerWrapper, user_id_context
+from smarter.lib.logging import WaffleSwitchedLoggerWrapper, publish, user_id_context
 from smarter.workers.celery import app
 
 
@@ -27,6 +59,121 @@ logger = WaffleSwitchedLoggerWrapper(base_logger, should_log)
 logger_prefix = formatted_text(__name__)
 
 HERE = os.path.abspath(os.path.dirname(__file__))
+CHECKPOINT_PREFIX = "smarter.vectorstore.ingestion."
+
+
+def job_context(job: VectorstoreIngestionJob) -> str:
+    """Return the logging context, and so the Redis log stream, of an ingestion job."""
+    return f"vectorstore_ingestion_{job.pk}"
+
+
+def completed_documents(job: VectorstoreIngestionJob) -> IngestionCheckpoint:
+    """Return the set of the documents of a job that completed, loaded or failed."""
+    return IngestionCheckpoint(f"{CHECKPOINT_PREFIX}{job.pk}.documents")
+
+
+def document_checkpoint(job: VectorstoreIngestionJob, uri: str) -> IngestionCheckpoint:
+    """Return the checkpoint of the upserted batches of a document of a job."""
+    digest = hashlib.sha256(uri.encode("utf-8")).hexdigest()[:16]
+    return IngestionCheckpoint(f"{CHECKPOINT_PREFIX}{job.pk}.{digest}")
+
+
+def publish_progress(job: VectorstoreIngestionJob, message: str, level: str = "INFO") -> None:
+    """Publish a progress message, with the progress and ETA of ``job``, to the job's Redis log stream."""
+    progress = job.progress()
+    eta = f", ETA {progress['eta']:.0f}s" if progress["eta"] is not None else ""
+    done = progress["documents_done"] + progress["documents_failed"]
+    publish(
+        job_context(job),
+        f"{message} [{done}/{progress['documents_total']} documents{eta}]",
+        level=level,
+        progress=progress,
+    )
+
+
+def dispatch(job: VectorstoreIngestionJob) -> None:
+    """Start the document tasks of a job, or finish it if it has no documents."""
+    publish_progress(job, f"Ingesting {job.documents_total} documents from {job.location}")
+    if not job.sources:
+        finish_ingestion(job)
+        return
+    group(ingest_document.s(job.pk, uri) for uri in job.sources).apply_async()
+
+
+def complete_document(
+    job: VectorstoreIngestionJob, uri: str, chunks_added: int = 0, error: Optional[str] = None
+) -> VectorstoreIngestionJob:
+    """
+    Count a completed document of a job, once, and finish the job after its last document.
+
+    :returns: The job, refreshed from the database.
+    """
+    if completed_documents(job).add([uri]):
+        updates = {"chunks_added": F("chunks_added") + chunks_added}
+        if error:
+            updates["documents_failed"] = F("documents_failed") + 1
+            updates["error"] = Concat(F("error"), Value(f"{error}\n"))
+        else:
+            updates["documents_done"] = F("documents_done") + 1
+        VectorstoreIngestionJob.objects.filter(pk=job.pk).update(**updates)
+    job.refresh_from_db()
+    publish_progress(job, f"Failed {uri}: {error}" if error else f"Loaded {uri}", level="ERROR" if error else "INFO")
+    if job.documents_remaining == 0:
+        finish_ingestion(job)
+    return job
+
+
+def finish_ingestion(job: VectorstoreIngestionJob) -> None:
+    """Prune the documents that are not in a job, and mark the job as finished. Only the first call has an effect."""
+    status = VectorstoreIngestionStatus.FAILED if job.documents_failed else VectorstoreIngestionStatus.SUCCEEDED
+    finished = VectorstoreIngestionJob.objects.filter(pk=job.pk, status=VectorstoreIngestionStatus.RUNNING).update(
+        status=status, finished_at=timezone.now()
+    )
+    if not finished:
+        return
+    job.refresh_from_db()
+    try:
+        result = VectorstoreService(db=job.vectorstore_meta).prune_sources(job.sources, prune=job.prune)
+    # pylint: disable=broad-except
+    except Exception as e:
+        logger.error("%s.finish_ingestion() job %s failed to prune: %s", logger_prefix, job.pk, e)
+        VectorstoreIngestionJob.objects.filter(pk=job.pk).update(
+            status=VectorstoreIngestionStatus.FAILED, error=Concat(F("error"), Value(f"prune: {e}\n"))
+        )
+        job.refresh_from_db()
+        publish_progress(job, f"Failed to prune: {e}", level="ERROR")
+        return
+    completed_documents(job).clear()
+    publish_progress(job, f"Ingestion {job.status}, removed {result.removed} documents")
+
+
+@app.task(
+    bind=True,
+    queue=smarter_settings.llm_client_tasks_celery_task_queue,
+)
+def ingest_documents(self, vectorstore_id: int, location: str, prune: bool = True) -> Optional[int]:
+    """
+    Celery task to start an ingestion job of the documents at ``location``, a local path or ``s3://`` prefix.
+
+    The documents are listed once, when the job starts, and loaded by one
+    :func:`ingest_document` task each.
+
+    Returns the id of the :class:`VectorstoreIngestionJob`, or None if the vectorstore does not exist.
+    """
+    db = VectorstoreMeta.objects.filter(id=vectorstore_id).first()
+    if not db:
+        logger.error(f"{logger_prefix} Vector database {vectorstore_id} not found.")
+        return None
+    job = VectorstoreIngestionJob.objects.create(
+        vectorstore_meta=db,
+        location=location,
+        prune=prune,
+        status=VectorstoreIngestionStatus.RUNNING,
+        sources=list(list_sources(location)),
+        started_at=timezone.now(),
+    )
+    dispatch(job)
+    return job.pk
 
 
 @app.task(
@@ -36,24 +183,107 @@ HERE = os.path.abspath(os.path.dirname(__file__))
     max_retries=smarter_settings.llm_client_tasks_celery_max_retries,
     queue=smarter_settings.llm_client_tasks_celery_task_queue,
 )
-def embed_and_load_pdf(self) -> bool:
-    """Celery task to load pdf documents into a vectorstore."""
+def resume_ingestion(self, job_id: int) -> Optional[int]:
+    """
+    Celery task to restart an interrupted ingestion job with the same documents.
+
+    Documents that were loaded are unchanged in the vectorstore's manifest, so
+    they are skipped without being loaded again, and documents that were loaded
+    in part skip the batches of their checkpoint.
+
+    Returns the id of the job, or None if it does not exist.
+    """
+    job = VectorstoreIngestionJob.objects.filter(pk=job_id).first()
+    if not job:
+        logger.error(f"{logger_prefix} Ingestion job {job_id} not found.")
+        return None
+    completed_documents(job).clear()
+    VectorstoreIngestionJob.objects.filter(pk=job.pk).update(
+        status=VectorstoreIngestionStatus.RUNNING,
+        documents_done=0,
+        documents_failed=0,
+        chunks_added=0,
+        error="",
+        started_at=timezone.now(),
+        finished_at=None,
+    )
+    job.refresh_from_db()
+    dispatch(job)
+    return job.pk
+
+
+@app.task(
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    max_retries=smarter_settings.llm_client_tasks_celery_max_retries,
+    queue=smarter_settings.llm_client_tasks_celery_task_queue,
+)
+def ingest_document(self, job_id: int, uri: str) -> Optional[dict]:
+    """
+    Celery task to load one document of an ingestion job into its vectorstore.
+
+    Upserted batches are checkpointed, so a retry, or a delivery of the task
+    again after a worker restart, only embeds and upserts the remaining
+    batches. After the last retry, the document is counted as failed.
+
+    Returns the sync result, or None if the job does not exist or the document is already complete.
+    """
+    job = VectorstoreIngestionJob.objects.select_related("vectorstore_meta").filter(pk=job_id).first()
+    if not job or uri in completed_documents(job):
+        return None
+    token = user_id_context.set(job_context(job))
+    checkpoint = document_checkpoint(job, uri)
+
+    try:
+
+        def on_progress(progress):
+            publish_progress(job, f"{uri}: {progress.upserted} chunks upserted, {progress.checkpointed} resumed")
+
+        service = VectorstoreService(db=job.vectorstore_meta)
+        result = service.sync_source(uri, checkpoint=checkpoint, on_progress=on_progress)
+    # pylint: disable=broad-except
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"{logger_prefix} Retrying {uri} of ingestion job {job_id}: {e}")
+            raise self.retry(exc=e, countdown=2**self.request.retries)
+        logger.error(f"{logger_prefix} Failed to load {uri} of ingestion job {job_id}: {e}")
+        complete_document(job, uri, error=f"{uri}: {e}")
+        return None
+    finally:
+        user_id_context.reset(token)
+
+    checkpoint.clear()
+    complete_document(job, uri, chunks_added=result.chunks_added)
+    return result.to_json()
+
+
+@app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=smarter_settings.llm_client_tasks_celery_retry_backoff,
+    max_retries=smarter_settings.llm_client_tasks_celery_max_retries,
+    queue=smarter_settings.llm_client_tasks_celery_task_queue,
+)
+def sync_pdfs(self, vectorstore_id: int, filepath: str, prune: bool = True) -> Optional[dict]:
+    """
+    Celery task to incrementally sync the documents at ``filepath``, a local path or ``s3://`` prefix, into a vectorstore.
+
+    Returns the sync result, or None if the vectorstore does not exist.
+    """
     job_id = self.request.id
     token = user_id_context.set(job_id)
 
     try:
-        db = VectorstoreMeta.objects.first()
+        db = VectorstoreMeta.objects.filter(id=vectorstore_id).first()
         if not db:
-            logger.error(f"{logger_prefix} No vector database found.")
-            return False
+            logger.error(f"{logger_prefix} Vector database {vectorstore_id} not found.")
+            return None
         service = VectorstoreService(db=db)
 
-        service.pdf_loader("")
+        def on_progress(progress):
+            self.update_state(state="PROGRESS", meta=progress.to_json())
 
-        return True
-    # pylint: disable=broad-except
-    except Exception as e:
-        logger.error(f"{logger_prefix} Error occurred: {e}")
-        return False
+        return service.sync_pdfs(filepath, prune=prune, on_progress=on_progress).to_json()
     finally:
         user_id_context.reset(token)
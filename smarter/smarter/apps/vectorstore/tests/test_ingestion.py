@@ -0,0 +1,181 @@
+"""Test the vectorstore ingestion pipeline."""
+
+import threading
+from unittest.mock import MagicMock
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from smarter.apps.vectorstore.ingestion import (
+    IngestionCheckpoint,
+    IngestionPipeline,
+    is_rate_limit_error,
+    retry_after,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class RateLimitError(Exception):
+    """A stand-in for a provider's rate limit error."""
+
+    status_code = 429
+
+    def __init__(self, headers: dict):
+        super().__init__("rate limited")
+        self.response = MagicMock(headers=headers)
+
+
+class FakeRedis:
+    """A stand-in for the Redis set commands of IngestionCheckpoint."""
+
+    def __init__(self):
+        self.sets: dict[str, set[str]] = {}
+        self.results: list = []
+
+    def pipeline(self):
+        self.results = []
+        return self
+
+    def sadd(self, key, *members):
+        before = len(self.sets.setdefault(key, set()))
+        self.sets[key].update(members)
+        self.results.append(len(self.sets[key]) - before)
+
+    def expire(self, key, ttl):
+        self.results.append(True)
+
+    def execute(self):
+        return self.results
+
+    def smembers(self, key):
+        return {member.encode("utf-8") for member in self.sets.get(key, set())}
+
+    def scard(self, key):
+        return len(self.sets.get(key, set()))
+
+    def delete(self, key):
+        self.sets.pop(key, None)
+
+
+class TestIngestionPipeline(SmarterTestBase):
+    """Test IngestionPipeline with fake embeddings and a fake backend."""
+
+    def setUp(self):
+        super().setUp()
+        self.backend = MagicMock(embeddings_chunk_size=None)
+        self.embeddings = DeterministicFakeEmbedding(size=8)
+        self.requests: list[list[str]] = []
+        self.lock = threading.Lock()
+        self.pages = [
+            Document(page_content=f"page {i % 10}", metadata={"source": "a.pdf", "page": i}) for i in range(30)
+        ]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        with self.lock:
+            self.requests.append(texts)
+        return self.embeddings.embed_documents(texts)
+
+    def pipeline(self, **kwargs) -> IngestionPipeline:
+        return IngestionPipeline(
+            backend=self.backend,
+            embed_documents=kwargs.pop("embed_documents", self.embed_documents),
+            text_splitter=RecursiveCharacterTextSplitter(chunk_size=100, chunk_overlap=0),
+            **kwargs,
+        )
+
+    def test_run(self):
+        progress = self.pipeline(batch_size=3, concurrency=2, upsert_batch_size=4).run(self.pages)
+        self.assertEqual(progress.pages, 30)
+        self.assertEqual(progress.chunks, 30)
+        self.assertEqual(progress.duplicates, 20)
+        self.assertEqual(progress.embedded, 10)
+        self.assertEqual(progress.upserted, 10)
+        self.assertEqual(progress.embedding_requests, 4)
+        self.assertTrue(all(len(texts) <= 3 for texts in self.requests))
+        self.assertEqual(
+            [len(call.kwargs["documents"]) for call in self.backend.add_documents.call_args_list], [4, 4, 2]
+        )
+
+        call = self.backend.add_documents.call_args_list[0]
+        self.assertEqual(call.kwargs["documents"][0].metadata["source"], "a.pdf")
+        self.assertEqual(len(call.kwargs["embeddings"]), 4)
+        self.assertIsNotNone(progress.to_json()["duration"])
+
+    def test_batch_size_is_capped_by_chunk_size(self):
+        self.backend.embeddings_chunk_size = 2
+        self.assertEqual(self.pipeline(batch_size=100).batch_size, 2)
+
+    def test_token_budget(self):
+        pipeline = self.pipeline(batch_size=100)
+        pipeline.MAX_BATCH_TOKENS = 10
+        chunks = [Document(page_content="x" * 20) for _ in range(4)]
+        self.assertEqual([len(batch) for batch in pipeline.batches(chunks)], [1, 1, 1, 1])
+
+    def test_rate_limit_retry(self):
+        failures = [RateLimitError({"retry-after-ms": "10"})]
+
+        def embed_documents(texts):
+            if failures:
+                raise failures.pop()
+            return self.embed_documents(texts)
+
+        progress = self.pipeline(embed_documents=embed_documents, concurrency=1).run(self.pages)
+        self.assertEqual(progress.rate_limited, 1)
+        self.assertEqual(progress.upserted, 10)
+
+    def test_other_errors_are_raised(self):
+        def embed_documents(texts):
+            raise ValueError("bad request")
+
+        with self.assertRaises(ValueError):
+            self.pipeline(embed_documents=embed_documents).run(self.pages)
+        self.backend.add_documents.assert_not_called()
+
+    def test_progress_callback(self):
+        reports = []
+        self.pipeline(batch_size=5, concurrency=1, upsert_batch_size=5, on_progress=reports.append).run(self.pages)
+        self.assertEqual(len(reports), 2)
+
+    def test_lexical_index(self):
+        lexical_index = MagicMock()
+        self.pipeline(batch_size=5, concurrency=1, upsert_batch_size=5, lexical_index=lexical_index).run(self.pages)
+        added = [document for call in lexical_index.add.call_args_list for document in call.args[0]]
+        self.assertEqual(len(added), 10)
+
+    def test_checkpoint_resumes_failed_batches(self):
+        checkpoint = IngestionCheckpoint("test", client=FakeRedis())
+        calls = []
+
+        def failing_embed_documents(texts):
+            calls.append(texts)
+            if len(calls) == 3:
+                raise ValueError("provider error")
+            return self.embed_documents(texts)
+
+        pipeline = self.pipeline(
+            embed_documents=failing_embed_documents,
+            batch_size=3,
+            concurrency=1,
+            upsert_batch_size=3,
+            checkpoint=checkpoint,
+        )
+        with self.assertRaises(ValueError):
+            pipeline.run(self.pages)
+        upserted = len(checkpoint)
+        self.assertGreater(upserted, 0)
+
+        self.requests = []
+        progress = self.pipeline(batch_size=3, concurrency=1, checkpoint=checkpoint).run(self.pages)
+        self.assertEqual(progress.checkpointed, upserted)
+        self.assertEqual(progress.upserted, 10 - upserted)
+        self.assertEqual(sum(len(texts) for texts in self.requests), 10 - upserted)
+        self.assertEqual(len(checkpoint), 10)
+
+    def test_rate_limit_helpers(self):
+        self.assertTrue(is_rate_limit_error(RateLimitError({})))
+        self.assertFalse(is_rate_limit_error(ValueError()))
+        self.assertEqual(retry_after(RateLimitError({"retry-after": "2"})), 2.0)
+        self.assertEqual(retry_after(RateLimitError({"retry-after-ms": "500"})), 0.5)
+        self.assertIsNone(retry_after(RateLimitError({"retry-after": "soon"})))
+        self.assertIsNone(retry_after(ValueError()))
@@ -0,0 +1,84 @@
+"""Test the lexical index and reciprocal rank fusion."""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+
+from langchain_core.documents import Document
+
+from smarter.apps.vectorstore.backends.base import point_id
+from smarter.apps.vectorstore.lexical import (
+    LexicalIndex,
+    match_expression,
+    reciprocal_rank_fusion,
+)
+from smarter.apps.vectorstore.service import VectorstoreService
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestLexicalIndex(SmarterTestBase):
+    """Test LexicalIndex."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.mkdtemp()
+        self.index = LexicalIndex(os.path.join(self.path, "store", LexicalIndex.FILE))
+        self.documents = [
+            Document(page_content="Error ERR-4012 means the disk is full.", metadata={"source": "a.md"}),
+            Document(page_content="The SKU_998 widget ships in blue.", metadata={"source": "a.md"}),
+            Document(page_content="Disks fill up when logs are not rotated.", metadata={"source": "b.md"}),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        super().tearDown()
+
+    def test_match_expression(self):
+        self.assertEqual(
+            match_expression('What is ERR-4012? "x" OR y'), '"what" OR "is" OR "err-4012" OR "x" OR "or" OR "y"'
+        )
+        self.assertEqual(match_expression("?!"), "")
+
+    def test_search(self):
+        self.assertEqual(self.index.search("disk"), [])
+        self.index.add(self.documents)
+        results = self.index.search("what does err-4012 mean")
+        self.assertEqual(results[0][0].page_content, self.documents[0].page_content)
+        self.assertEqual(results[0][0].id, point_id(self.documents[0]))
+        self.assertEqual(results[0][0].metadata, {"source": "a.md"})
+        self.assertGreater(results[0][1], 0)
+
+        results = self.index.search("sku_998")
+        self.assertEqual([document.page_content for document, _ in results], [self.documents[1].page_content])
+
+    def test_add_is_idempotent_and_remove(self):
+        self.index.add(self.documents)
+        self.index.add(self.documents)
+        self.assertEqual(self.index.stats()["count"], 3)
+        self.assertEqual(self.index.remove([point_id(self.documents[0]), "unknown"]), 1)
+        self.assertEqual(self.index.search("err-4012"), [])
+        self.assertEqual(self.index.stats()["count"], 2)
+        self.index.drop()
+        self.assertFalse(self.index.exists)
+
+    def test_hybrid_query_without_lexical_index(self):
+        service = VectorstoreService.__new__(VectorstoreService)
+        service.db = MagicMock()
+        service.backend = MagicMock()
+        service.backend.query.return_value = [(self.documents[2], 0.9)]
+        service._lexical_index = self.index
+        with self.assertLogs("smarter.apps.vectorstore.service", level="WARNING"):
+            results = service.hybrid_query("disk full", top_k=1)
+        self.assertEqual([document for document, _ in results], [self.documents[2]])
+
+
+class TestReciprocalRankFusion(SmarterTestBase):
+    """Test reciprocal_rank_fusion."""
+
+    def test_fusion(self):
+        a, b, c = (Document(id=name, page_content=name) for name in "abc")
+        results = reciprocal_rank_fusion([[a, b], [c, b]], k=60)
+        self.assertEqual([document.id for document, _ in results], ["b", "a", "c"])
+        self.assertAlmostEqual(results[0][1], 1 / 62 + 1 / 62)
+        self.assertAlmostEqual(results[1][1], 1 / 61)
@@ -0,0 +1,161 @@
+"""Test the streaming document loaders."""
+
+import io
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from smarter.apps.vectorstore.loaders import (
+    S3RangeReader,
+    list_sources,
+    load_document,
+    open_source,
+    stream_documents,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+def make_pdf(path: str, texts: list[str]):
+    """Write a PDF with one page of text per item of ``texts``."""
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for text in texts:
+        page = writer.add_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(content)  # pylint: disable=protected-access
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+class FakeS3Client:
+    """A fake boto3 S3 client over in-memory objects that records range requests."""
+
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.ranges: list[str] = []
+
+    def head_object(self, Bucket, Key):  # pylint: disable=invalid-name,unused-argument
+        return {"ContentLength": len(self.objects[Key]), "ETag": f'"{hash(self.objects[Key])}"'}
+
+    def get_object(self, Bucket, Key, Range):  # pylint: disable=invalid-name,unused-argument
+        self.ranges.append(Range)
+        start, end = (int(value) for value in Range[len("bytes=") :].split("-"))
+        return {"Body": io.BytesIO(self.objects[Key][start : end + 1])}
+
+    def get_paginator(self, operation):  # pylint: disable=unused-argument
+        paginator = MagicMock()
+        paginator.paginate.return_value = [{"Contents": [{"Key": key} for key in sorted(self.objects)]}]
+        return paginator
+
+
+class TestLoaders(SmarterTestBase):
+    """Test the loaders with small block sizes."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.mkdtemp()
+        settings_patcher = patch("smarter.apps.vectorstore.loaders.smarter_settings")
+        self.smarter_settings = settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+        self.smarter_settings.vectorstore_loader_block_size = 64
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        super().tearDown()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.path, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_list_sources(self):
+        self.write("b.md", "b")
+        self.write("a.txt", "a")
+        self.write("sub/c.html", "c")
+        self.write("image.png", "x")
+        names = [os.path.relpath(uri, self.path) for uri in list_sources(self.path)]
+        self.assertEqual(names, ["a.txt", "b.md", os.path.join("sub", "c.html")])
+
+    def test_load_text(self):
+        text = "\n".join(f"line {i} of the document" for i in range(40))
+        path = self.write("a.txt", text)
+        documents = list(load_document(path))
+        self.assertGreater(len(documents), 1)
+        self.assertEqual("".join(document.page_content for document in documents), text)
+        for document in documents:
+            self.assertLessEqual(len(document.page_content), 64)
+            self.assertEqual(document.metadata["source"], path)
+        self.assertTrue(documents[0].page_content.endswith("\n"))
+
+    def test_load_html(self):
+        path = self.write(
+            "a.html",
+            "<html><head><title>t</title><style>p {}</style></head><body>"
+            "<h1>Title</h1><script>var x = 1;</script><p>First &amp; paragraph.</p><p>Second.</p></body></html>",
+        )
+        text = "".join(document.page_content for document in load_document(path))
+        self.assertIn("Title", text)
+        self.assertIn("First & paragraph.", text)
+        self.assertIn("Second.", text)
+        self.assertNotIn("var x", text)
+        self.assertNotIn("p {}", text)
+
+    def test_load_pdf(self):
+        path = os.path.join(self.path, "a.pdf")
+        make_pdf(path, ["alpha page", "beta page", "gamma page"])
+        documents = list(stream_documents(self.path))
+        self.assertEqual([document.metadata["page"] for document in documents], [0, 1, 2])
+        self.assertIn("beta page", documents[1].page_content)
+
+    def test_unsupported(self):
+        path = self.write("image.png", "x")
+        with self.assertRaises(ValueError):
+            list(load_document(path))
+
+    def test_s3(self):
+        pdf_path = os.path.join(self.path, "a.pdf")
+        make_pdf(pdf_path, ["alpha page", "beta page"])
+        with open(pdf_path, "rb") as f:
+            pdf = f.read()
+        client = FakeS3Client({"docs/a.pdf": pdf, "docs/b.txt": b"hello world", "docs/c.png": b"x"})
+        with patch("smarter.apps.vectorstore.loaders.get_s3_client", return_value=client):
+            self.assertEqual(
+                list(list_sources("s3://bucket/docs/")), ["s3://bucket/docs/a.pdf", "s3://bucket/docs/b.txt"]
+            )
+            documents = list(stream_documents("s3://bucket/docs/"))
+        self.assertEqual([document.metadata["source"] for document in documents][-1], "s3://bucket/docs/b.txt")
+        self.assertIn("alpha page", documents[0].page_content)
+        self.assertEqual(documents[-1].page_content, "hello world")
+        self.assertTrue(client.ranges)
+        for value in client.ranges:
+            start, end = (int(part) for part in value[len("bytes=") :].split("-"))
+            self.assertLessEqual(end - start + 1, 64)
+
+    def test_s3_range_reader(self):
+        data = bytes(range(256)) * 4
+        client = FakeS3Client({"key": data})
+        reader = S3RangeReader(client, "bucket", "key", block_size=64)
+        self.assertEqual(reader.read(10), data[:10])
+        reader.seek(-6, io.SEEK_END)
+        self.assertEqual(reader.read(), data[-6:])
+        reader.seek(100)
+        self.assertEqual(reader.read(3), data[100:103])
+        with patch("smarter.apps.vectorstore.loaders.get_s3_client", return_value=client):
+            with open_source("s3://bucket/key") as stream:
+                self.assertEqual(stream.read(), data)
@@ -0,0 +1,177 @@
+"""Test the local vectorstore backend."""
+
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from smarter.apps.account.tests.mixins import TestAccountMixin
+from smarter.apps.vectorstore.backends.base import point_id
+from smarter.apps.vectorstore.backends.local import LocalBackend, LocalIndex
+from smarter.apps.vectorstore.models import (
+    VectorstoreBackendKind,
+    VectorstoreMeta,
+    VectorstoreStatus,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestLocalBackend(TestAccountMixin):
+    """Test LocalBackend in a temporary directory."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.mkdtemp()
+        settings_patcher = patch("smarter.apps.vectorstore.backends.local.smarter_settings")
+        self.smarter_settings = settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+        self.smarter_settings.vectorstore_local_path = self.path
+        self.smarter_settings.vectorstore_local_quantization = "float16"
+
+        self.vector_database = VectorstoreMeta.objects.create(
+            name=f"test_local_{self.hash_suffix}",
+            description="A test local vector database",
+            user_profile=self.user_profile,
+            backend=VectorstoreBackendKind.LOCAL,
+            status=VectorstoreStatus.PROVISIONING,
+        )
+        self.backend = LocalBackend(self.vector_database, embeddings=DeterministicFakeEmbedding(size=8))
+        self.documents = [
+            Document(page_content=f"document {i}", metadata={"source": f"{i % 2}.pdf", "page": i}) for i in range(5)
+        ]
+
+    def tearDown(self):
+        self.backend.delete()
+        self.vector_database.delete()
+        shutil.rmtree(self.path, ignore_errors=True)
+        super().tearDown()
+
+    def test_create_and_delete(self):
+        self.assertTrue(self.backend.ready)
+        self.backend.create()
+        self.assertTrue(self.backend.initialized)
+        self.assertIn('"count": 0', self.backend.index_stats)
+        self.backend.delete()
+        self.assertFalse(self.backend.initialized)
+
+    def test_add_documents_is_idempotent(self):
+        self.assertTrue(self.backend.add_documents(self.documents))
+        self.assertTrue(self.backend.add_documents(self.documents))
+        self.assertEqual(self.backend.index.config["count"], len(self.documents))
+
+    def test_query(self):
+        self.backend.add_documents(self.documents)
+        results = self.backend.query("document 3", top_k=2)
+        self.assertEqual(len(results), 2)
+        document, score = results[0]
+        self.assertEqual(document.page_content, "document 3")
+        self.assertEqual(document.metadata, {"source": "1.pdf", "page": 3})
+        self.assertAlmostEqual(score, 1.0, places=2)
+
+    def test_query_with_filters(self):
+        self.backend.add_documents(self.documents)
+        results = self.backend.query("document 3", top_k=5, filters={"source": "0.pdf"})
+        self.assertEqual({document.metadata["page"] for document, _ in results}, {0, 2, 4})
+        results = self.backend.query("document 3", top_k=5, filters={"page": [1, 4]})
+        self.assertEqual({document.metadata["page"] for document, _ in results}, {1, 4})
+
+    def test_query_batch(self):
+        self.backend.add_documents(self.documents)
+        queries = ["document 3", self.backend.embeddings.embed_query("document 0"), "document 1"]
+        results = self.backend.query_batch(queries, top_k=2)
+        self.assertEqual(len(results), 3)
+        for query, batch_result in zip(queries, results):
+            single = self.backend.query(query, top_k=2)
+            self.assertEqual([document.id for document, _ in batch_result], [document.id for document, _ in single])
+            for (_, batch_score), (_, score) in zip(batch_result, single):
+                self.assertAlmostEqual(batch_score, score, places=5)
+
+        filtered = self.backend.query_batch(["document 3", "document 1"], top_k=5, filters={"source": "0.pdf"})
+        self.assertEqual(
+            [{document.metadata["page"] for document, _ in result} for result in filtered], [{0, 2, 4}] * 2
+        )
+        self.assertEqual(self.backend.query_batch([]), [])
+
+    def test_delete_documents(self):
+        self.backend.add_documents(self.documents)
+        self.assertEqual(self.backend.delete_documents([point_id(self.documents[1]), point_id(self.documents[3])]), 2)
+        self.assertEqual(self.backend.delete_documents([point_id(self.documents[1])]), 0)
+        self.assertEqual(self.backend.index.config["count"], 3)
+        results = self.backend.query("document 4", top_k=5)
+        self.assertEqual(sorted(document.metadata["page"] for document, _ in results), [0, 2, 4])
+        document, score = results[0]
+        self.assertEqual(document.page_content, "document 4")
+        self.assertAlmostEqual(score, 1.0, places=2)
+
+    def test_int8_quantization(self):
+        self.smarter_settings.vectorstore_local_quantization = "int8"
+        self.backend.add_documents(self.documents)
+        self.assertEqual(self.backend.index.config["quantization"], "int8")
+        document, score = self.backend.query("document 3", top_k=1)[0]
+        self.assertEqual(document.page_content, "document 3")
+        self.assertAlmostEqual(score, 1.0, places=2)
+
+
+class TestLocalIndex(SmarterTestBase):
+    """Test the IVF search of LocalIndex."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        super().tearDown()
+
+    def test_ivf_search(self):
+        rng = np.random.default_rng(0)
+        centers = rng.standard_normal((20, 16)).astype(np.float32)
+        vectors = centers[rng.integers(0, 20, 400)] + 0.1 * rng.standard_normal((400, 16)).astype(np.float32)
+        index = LocalIndex(self.path)
+        index.IVF_MIN_VECTORS = 100
+        index.create(dimension=16, metric="euclidean", quantization="float16")
+        index.upsert([str(i) for i in range(400)], vectors, [f"v{i}" for i in range(400)], [{}] * 400)
+        self.assertEqual(index.config["nlist"], 20)
+
+        for i in (0, 57, 399):
+            point_id, content, _, distance = index.search(vectors[i], top_k=1)[0]
+            self.assertEqual(point_id, str(i))
+            self.assertEqual(content, f"v{i}")
+            self.assertLess(distance, 0.01)
+
+    def test_ivf_retrained_after_growth(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((400, 16)).astype(np.float32)
+        index = LocalIndex(self.path)
+        index.IVF_MIN_VECTORS = 100
+        index.create(dimension=16, metric="euclidean", quantization="float16")
+        index.upsert([str(i) for i in range(150)], vectors[:150], [f"v{i}" for i in range(150)], [{}] * 150)
+        self.assertEqual((index.config["nlist"], index.config["trained"]), (12, 150))
+        index.upsert(
+            [str(i) for i in range(150, 250)], vectors[150:250], [f"v{i}" for i in range(150, 250)], [{}] * 100
+        )
+        self.assertEqual(index.config["trained"], 150)
+        index.upsert([str(i) for i in range(250, 400)], vectors[250:], [f"v{i}" for i in range(250, 400)], [{}] * 150)
+        self.assertEqual((index.config["nlist"], index.config["trained"]), (20, 400))
+        self.assertEqual(index.search(vectors[399], top_k=1)[0][0], "399")
+
+    def test_remove_keeps_slots(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((4, 8)).astype(np.float32)
+        index = LocalIndex(self.path)
+        index.create(dimension=8, metric="cosine", quantization="int8")
+        index.upsert(["a", "b", "c"], vectors[:3], ["a", "b", "c"], [{}] * 3)
+        reader = LocalIndex(self.path)
+        self.assertEqual(reader.search(vectors[2], top_k=1)[0][0], "c")
+
+        self.assertEqual(index.remove(["a"]), 1)
+        self.assertEqual(reader.search(vectors[2], top_k=1)[0][0], "c")
+        self.assertNotIn("a", [result[0] for result in reader.search(vectors[0], top_k=3)])
+
+        # the slot of a removed vector is reused, rather than the arrays growing.
+        index.upsert(["d"], vectors[3:], ["d"], [{}])
+        self.assertEqual((index.config["count"], index.config["slots"]), (3, 3))
+        self.assertEqual(reader.search(vectors[3], top_k=1)[0][0], "d")
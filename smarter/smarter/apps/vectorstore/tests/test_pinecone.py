@@ -0,0 +1,65 @@
+"""Test the Pinecone vectorstore backend against a mocked Pinecone index."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from smarter.apps.vectorstore.backends.base import SmarterVectorstoreBackend
+from smarter.apps.vectorstore.backends.pinecone import PineconeBackend, build_filter
+from smarter.apps.vectorstore.retrieval import RetrievedChunk, retrieve
+from smarter.apps.vectorstore.service import VectorstoreService
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestPineconeBackend(SmarterTestBase):
+    """Test PineconeBackend.query() and the retrieval of its documents."""
+
+    def setUp(self):
+        super().setUp()
+        self.db = SimpleNamespace(pk=f"test-pinecone-{self.hash_suffix}", name="handbook")
+        self.backend = PineconeBackend.__new__(PineconeBackend)
+        SmarterVectorstoreBackend.__init__(self.backend, db=self.db, embeddings=DeterministicFakeEmbedding(size=8))
+        self.backend._index = MagicMock()
+        self.backend._index.query.return_value = SimpleNamespace(
+            matches=[
+                SimpleNamespace(id="a", score=0.9, metadata={"text": "Refunds take 5 days.", "source": "faq.md"}),
+                SimpleNamespace(id="b", score=0.2, metadata={"text": "Shipping is free.", "source": "faq.md"}),
+            ]
+        )
+
+    def test_build_filter(self):
+        self.assertIsNone(build_filter(None))
+        self.assertEqual(
+            build_filter({"source": ["a.pdf", "b.pdf"], "page": 3}),
+            {"source": {"$in": ["a.pdf", "b.pdf"]}, "page": {"$eq": 3}},
+        )
+
+    def test_query(self):
+        results = self.backend.query("refunds", top_k=2, filters={"source": "faq.md"}, score_threshold=0.5)
+        self.assertEqual(len(results), 1)
+        document, score = results[0]
+        self.assertEqual(
+            (document.id, document.page_content, document.metadata), ("a", "Refunds take 5 days.", {"source": "faq.md"})
+        )
+        self.assertEqual(score, 0.9)
+        kwargs = self.backend._index.query.call_args.kwargs
+        self.assertEqual(len(kwargs["vector"]), 8)
+        self.assertEqual((kwargs["top_k"], kwargs["filter"]), (2, {"source": {"$eq": "faq.md"}}))
+
+    def test_retrieve(self):
+        service = VectorstoreService.__new__(VectorstoreService)
+        service.db = self.db
+        service.backend = self.backend
+        service._lexical_index = MagicMock(exists=False)
+        chunks = retrieve(service, "How long do refunds take?", top_k=2)
+        self.assertEqual(chunks[0], RetrievedChunk("handbook", "Refunds take 5 days.", 0.9, {"source": "faq.md"}))
+        self.assertEqual(len(chunks), 2)
+        chunks = retrieve(service, "How long do refunds take?", top_k=2, hybrid=True)
+        self.assertEqual([chunk.content for chunk in chunks], ["Refunds take 5 days.", "Shipping is free."])
+
+    def test_query_batch(self):
+        results = self.backend.query_batch(["refunds", "shipping"], top_k=2)
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual([document.id for document, _ in result], ["a", "b"])
@@ -0,0 +1,97 @@
+"""Test the Qdrant vectorstore backend in embedded local mode."""
+
+from unittest.mock import patch
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from smarter.apps.account.tests.mixins import TestAccountMixin
+from smarter.apps.vectorstore.backends.base import (
+    VectorStoreBackendConnectionError,
+    point_id,
+)
+from smarter.apps.vectorstore.backends.qdrant import (
+    QdrantBackend,
+    build_filter,
+    get_qdrant_client,
+)
+from smarter.apps.vectorstore.models import (
+    VectorstoreBackendKind,
+    VectorstoreMeta,
+    VectorstoreStatus,
+)
+
+
+class TestQdrantBackend(TestAccountMixin):
+    """Test QdrantBackend against an in-memory Qdrant store."""
+
+    def setUp(self):
+        super().setUp()
+        self.vector_database = VectorstoreMeta.objects.create(
+            name=f"test_qdrant_{self.hash_suffix}",
+            description="A test Qdrant vector database",
+            user_profile=self.user_profile,
+            backend=VectorstoreBackendKind.QDRANT,
+            status=VectorstoreStatus.PROVISIONING,
+        )
+        self.backend = QdrantBackend(self.vector_database, embeddings=DeterministicFakeEmbedding(size=8))
+        self.documents = [
+            Document(page_content=f"document {i}", metadata={"source": f"{i % 2}.pdf", "page": i}) for i in range(5)
+        ]
+
+    def tearDown(self):
+        self.backend.delete()
+        self.vector_database.delete()
+        super().tearDown()
+
+    def test_create_and_delete(self):
+        self.assertTrue(self.backend.ready)
+        self.backend.create()
+        self.assertTrue(self.backend.initialized)
+        self.assertIn("points_count", self.backend.index_stats)
+        self.backend.delete()
+        self.assertFalse(self.backend.initialized)
+
+    def test_add_documents_is_idempotent(self):
+        self.assertTrue(self.backend.add_documents(self.documents))
+        self.assertTrue(self.backend.add_documents(self.documents))
+        info = self.backend.client.get_collection(self.backend.collection_name)
+        self.assertEqual(info.points_count, len(self.documents))
+
+    def test_query(self):
+        self.backend.add_documents(self.documents)
+        results = self.backend.query("document 3", top_k=2)
+        self.assertEqual(len(results), 2)
+        document, score = results[0]
+        self.assertEqual(document.page_content, "document 3")
+        self.assertAlmostEqual(score, 1.0, places=3)
+
+    def test_query_with_filters(self):
+        self.backend.add_documents(self.documents)
+        results = self.backend.query("document 3", top_k=5, filters={"source": "0.pdf"})
+        self.assertEqual({document.metadata["page"] for document, _ in results}, {0, 2, 4})
+        results = self.backend.query("document 3", top_k=5, filters={"page": [1, 4]})
+        self.assertEqual({document.metadata["page"] for document, _ in results}, {1, 4})
+
+    def test_delete_documents(self):
+        self.backend.add_documents(self.documents)
+        self.assertEqual(self.backend.delete_documents([point_id(self.documents[1]), point_id(self.documents[3])]), 2)
+        info = self.backend.client.get_collection(self.backend.collection_name)
+        self.assertEqual(info.points_count, 3)
+        results = self.backend.query("document 3", top_k=5)
+        self.assertEqual(sorted(document.metadata["page"] for document, _ in results), [0, 2, 4])
+
+    def test_locked_local_storage(self):
+        with (
+            patch("smarter.apps.vectorstore.backends.qdrant.smarter_settings") as smarter_settings,
+            patch("smarter.apps.vectorstore.backends.qdrant.QdrantClient", side_effect=RuntimeError("locked")),
+        ):
+            smarter_settings.vectorstore_qdrant_path = f"/tmp/test_qdrant_locked_{self.hash_suffix}"
+            with self.assertRaises(VectorStoreBackendConnectionError):
+                get_qdrant_client()
+
+    def test_build_filter(self):
+        self.assertIsNone(build_filter(None))
+        self.assertIsNone(build_filter({}))
+        qdrant_filter = build_filter({"source": "a.pdf"})
+        self.assertEqual(qdrant_filter.must[0].key, "metadata.source")  # type: ignore[union-attr,index]
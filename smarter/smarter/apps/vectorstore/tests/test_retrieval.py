@@ -0,0 +1,71 @@
+"""Test retrieval-augmented context for prompts."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+
+from smarter.apps.vectorstore.retrieval import (
+    CONTEXT_PREAMBLE,
+    RetrievedChunk,
+    format_context,
+    get_service,
+    invalidate,
+    pack,
+    retrieve,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestRetrieval(SmarterTestBase):
+    """Test retrieve, pack and format_context."""
+
+    def setUp(self):
+        super().setUp()
+        self.service = MagicMock()
+        self.service.db = SimpleNamespace(pk=f"test-retrieval-{self.hash_suffix}", name="handbook")
+        self.service.query.return_value = [
+            (Document(page_content="Refunds take 5 days.", metadata={"source": "faq.md", "page": 0}), 0.9),
+        ]
+        self.service.hybrid_query.return_value = [(Document(page_content="ERR-4012 means disk full."), 0.03)]
+
+    def test_retrieve_is_cached_per_normalized_question(self):
+        chunks = retrieve(self.service, "How long do refunds take?", top_k=3)
+        self.assertEqual(
+            chunks, [RetrievedChunk("handbook", "Refunds take 5 days.", 0.9, {"source": "faq.md", "page": 0})]
+        )
+
+        self.assertEqual(retrieve(self.service, "  How long do\nrefunds take? ", top_k=3), chunks)
+        self.service.query.assert_called_once_with("How long do refunds take?", top_k=3)
+
+        retrieve(self.service, "How long do refunds take?", top_k=3, hybrid=True)
+        self.service.hybrid_query.assert_called_once()
+
+        invalidate(self.service.db)
+        retrieve(self.service, "How long do refunds take?", top_k=3)
+        self.assertEqual(self.service.query.call_count, 2)
+
+    def test_get_service_is_reused_until_the_vectorstore_is_edited(self):
+        db = SimpleNamespace(
+            pk=f"test-retrieval-{self.hash_suffix}", updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc)
+        )
+        with patch("smarter.apps.vectorstore.retrieval.VectorstoreService", side_effect=lambda db: MagicMock()) as cls:
+            service = get_service(db)
+            self.assertIs(get_service(db), service)
+            db.updated_at += timedelta(minutes=1)
+            self.assertIsNot(get_service(db), service)
+        self.assertEqual(cls.call_count, 2)
+
+    def test_pack_and_format_context(self):
+        chunks = [
+            RetrievedChunk("handbook", "word " * 50, 0.9, {"source": "big.md"}),
+            RetrievedChunk("handbook", "Refunds take 5 days.", 0.8, {"source": "faq.md", "page": 2}),
+        ]
+        self.assertEqual(pack(chunks, 20), chunks[1:])
+        self.assertEqual(pack(chunks, 1000), chunks)
+        self.assertEqual(pack(chunks, 0), [])
+
+        context = format_context(chunks[1:])
+        self.assertTrue(context.startswith(CONTEXT_PREAMBLE))
+        self.assertIn("[1] faq.md p.3\nRefunds take 5 days.", context)
@@ -0,0 +1,143 @@
+"""Test the incremental vectorstore sync."""
+
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from smarter.apps.account.tests.mixins import TestAccountMixin
+from smarter.apps.vectorstore.backends.local import LocalBackend
+from smarter.apps.vectorstore.ingestion import IngestionPipeline
+from smarter.apps.vectorstore.models import (
+    VectorstoreBackendKind,
+    VectorstoreDocument,
+    VectorstoreMeta,
+    VectorstoreStatus,
+)
+from smarter.apps.vectorstore.service import VectorstoreService
+from smarter.apps.vectorstore.sync import VectorstoreSync, document_sources
+
+
+class TestVectorstoreSync(TestAccountMixin):
+    """Test VectorstoreSync with a local backend."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.mkdtemp()
+        settings_patcher = patch("smarter.apps.vectorstore.backends.local.smarter_settings")
+        self.smarter_settings = settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+        self.smarter_settings.vectorstore_local_path = self.path
+        self.smarter_settings.vectorstore_local_quantization = "float16"
+
+        self.vector_database = VectorstoreMeta.objects.create(
+            name=f"test_sync_{self.hash_suffix}",
+            description="A test vector database",
+            user_profile=self.user_profile,
+            backend=VectorstoreBackendKind.LOCAL,
+            status=VectorstoreStatus.PROVISIONING,
+        )
+        self.embeddings = DeterministicFakeEmbedding(size=8)
+        self.backend = LocalBackend(self.vector_database, embeddings=self.embeddings)
+        self.embedded: list[str] = []
+
+    def tearDown(self):
+        self.backend.delete()
+        self.vector_database.delete()
+        shutil.rmtree(self.path, ignore_errors=True)
+        super().tearDown()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return self.embeddings.embed_documents(texts)
+
+    def sync(self, pages: dict[str, list[str]], embedding_model: str = "test:fake:8", prune: bool = True):
+        pipeline = IngestionPipeline(
+            backend=self.backend,
+            embed_documents=self.embed_documents,
+            text_splitter=RecursiveCharacterTextSplitter(chunk_size=20, chunk_overlap=0),
+            batch_size=4,
+            concurrency=2,
+        )
+        documents = [
+            Document(page_content=text, metadata={"source": source, "page": i})
+            for source, texts in pages.items()
+            for i, text in enumerate(texts)
+        ]
+        self.embedded = []
+        return VectorstoreSync(self.vector_database, pipeline, embedding_model).sync(
+            document_sources(documents), prune=prune
+        )
+
+    def count(self) -> int:
+        return self.backend.index.config["count"]
+
+    def test_sync(self):
+        corpus = {"a.pdf": ["alpha one", "alpha two"], "b.pdf": ["beta one"]}
+        result = self.sync(corpus)
+        self.assertEqual((result.added, result.updated, result.unchanged), (2, 0, 0))
+        self.assertEqual(result.chunks_added, 3)
+        self.assertEqual(self.count(), 3)
+        self.assertEqual(VectorstoreDocument.objects.filter(vectorstore_meta=self.vector_database).count(), 2)
+
+        result = self.sync(corpus)
+        self.assertEqual((result.added, result.updated, result.unchanged), (0, 0, 2))
+        self.assertEqual(self.embedded, [])
+        self.assertEqual(self.count(), 3)
+
+        result = self.sync({"a.pdf": ["alpha one", "alpha three"], "b.pdf": ["beta one"]})
+        self.assertEqual((result.updated, result.unchanged), (1, 1))
+        self.assertEqual((result.chunks_added, result.chunks_unchanged, result.chunks_deleted), (1, 1, 1))
+        self.assertEqual(self.embedded, ["alpha three"])
+        self.assertEqual(self.count(), 3)
+        document, _ = self.backend.query("alpha three", top_k=1)[0]
+        self.assertEqual(document.page_content, "alpha three")
+
+        result = self.sync({"a.pdf": ["alpha one", "alpha three"]}, prune=False)
+        self.assertEqual(result.removed, 0)
+        self.assertEqual(self.count(), 3)
+
+        result = self.sync({"a.pdf": ["alpha one", "alpha three"]})
+        self.assertEqual(result.removed, 1)
+        self.assertEqual(self.count(), 2)
+        self.assertFalse(VectorstoreDocument.objects.filter(vectorstore_meta=self.vector_database, source="b.pdf"))
+
+    def test_embedding_model_change(self):
+        corpus = {"a.pdf": ["alpha one", "alpha two"]}
+        self.sync(corpus)
+        result = self.sync(corpus, embedding_model="test:other:8")
+        self.assertEqual(result.updated, 1)
+        self.assertEqual(sorted(self.embedded), ["alpha one", "alpha two"])
+        self.assertEqual(self.count(), 2)
+        entry = VectorstoreDocument.objects.get(vectorstore_meta=self.vector_database, source="a.pdf")
+        self.assertEqual(entry.embedding_model, "test:other:8")
+        self.assertEqual(entry.source_hash, VectorstoreDocument.hash_source("a.pdf"))
+
+    def test_prune(self):
+        self.sync({"a.pdf": ["alpha one", "alpha two"], "b.pdf": ["beta one"]})
+        pipeline = IngestionPipeline(
+            backend=self.backend,
+            embed_documents=self.embed_documents,
+            text_splitter=RecursiveCharacterTextSplitter(chunk_size=20, chunk_overlap=0),
+        )
+        result = VectorstoreSync(self.vector_database, pipeline, "test:fake:8").prune(["a.pdf"])
+        self.assertEqual((result.removed, result.chunks_deleted), (1, 1))
+        self.assertEqual(self.count(), 2)
+        self.assertFalse(VectorstoreDocument.objects.filter(vectorstore_meta=self.vector_database, source="b.pdf"))
+
+    def test_sync_after_delete(self):
+        corpus = {"a.pdf": ["alpha one", "alpha two"], "b.pdf": ["beta one"]}
+        self.sync(corpus)
+        service = VectorstoreService.__new__(VectorstoreService)
+        service.db = self.vector_database
+        service.backend = self.backend
+        service._lexical_index = MagicMock()
+        service.delete()
+        self.assertFalse(VectorstoreDocument.objects.filter(vectorstore_meta=self.vector_database))
+
+        result = self.sync(corpus)
+        self.assertEqual((result.added, result.unchanged), (2, 0))
+        self.assertEqual(self.count(), 3)
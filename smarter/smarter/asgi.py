@@ -19,12 +19,20 @@ from django.core.asgi import get_asgi_application
 from smarter import consumers
 from smarter.common.conf import smarter_settings
 from smarter.lib import logging
+from smarter.lib.django.cancellation import CancelOnDisconnectMiddleware
 
 os.environ["DJANGO_SETTINGS_MODULE"] = "smarter.settings." + smarter_settings.environment
 
 
 django_asgi_app = get_asgi_application()
-static_asgi_app = ASGIStaticFilesHandler(django_asgi_app)
+
+# pylint: disable=wrong-import-position
+from smarter.apps.llm_client.warmup import warmup  # noqa: E402
+
+# warm up deployed llm_clients in the background. See ReadinessView.
+warmup.start()
+
+static_asgi_app = ASGIStaticFilesHandler(CancelOnDisconnectMiddleware(django_asgi_app))
 websocket_application = AllowedHostsOriginValidator(AuthMiddlewareStack(URLRouter(consumers.urlpatterns)))
 
 
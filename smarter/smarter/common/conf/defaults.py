@@ -117,6 +117,9 @@ class SettingsDefaults:
     )
 
     CACHE_EXPIRATION: int = int(get_env("CACHE_EXPIRATION", 60 * 1))  # 1 minute
+    CACHE_LOCAL_EXPIRATION: int = int(get_env("CACHE_LOCAL_EXPIRATION", 10))
+    CACHE_LOCAL_MAX_ENTRIES: int = int(get_env("CACHE_LOCAL_MAX_ENTRIES", 1024))
+    CACHE_METRICS_SAMPLE_RATE: float = float(get_env("CACHE_METRICS_SAMPLE_RATE", 0.01))
     CHAT_CACHE_EXPIRATION: int = int(get_env("CHAT_CACHE_EXPIRATION", 60 * 5))  # 5 minutes
     CONFIGURE_UBC_ACCOUNT: bool = bool_environment_variable("CONFIGURE_UBC_ACCOUNT", False)
     LLM_CLIENT_CACHE_EXPIRATION: int = int(get_env("LLM_CLIENT_CACHE_EXPIRATION", 60 * 5))  # 5 minutes
@@ -132,7 +135,20 @@ class SettingsDefaults:
         "LLM_CLIENT_TASKS_CELERY_RETRY_BACKOFF", True
     )
     LLM_CLIENT_TASKS_CELERY_TASK_QUEUE: str = get_env("LLM_CLIENT_TASKS_CELERY_TASK_QUEUE", "default_celery_task_queue")
+    LLM_CLIENT_WARMUP_ENABLED: bool = bool_environment_variable("LLM_CLIENT_WARMUP_ENABLED", True)
+    LLM_CLIENT_WARMUP_TIMEOUT: int = int(get_env("LLM_CLIENT_WARMUP_TIMEOUT", 120))
+    PLUGIN_API_MAX_RETRIES: int = int(get_env("PLUGIN_API_MAX_RETRIES", 2))
+    PLUGIN_API_POOL_MAXSIZE: int = int(get_env("PLUGIN_API_POOL_MAXSIZE", 10))
+    PLUGIN_API_RETRY_BACKOFF_FACTOR: float = float(get_env("PLUGIN_API_RETRY_BACKOFF_FACTOR", 0.5))
+    PLUGIN_BULKHEAD_MAX_CONCURRENCY: int = int(get_env("PLUGIN_BULKHEAD_MAX_CONCURRENCY", 8))
+    PLUGIN_CIRCUIT_BREAKER_FAILURE_RATE: float = float(get_env("PLUGIN_CIRCUIT_BREAKER_FAILURE_RATE", 0.5))
+    PLUGIN_CIRCUIT_BREAKER_MIN_CALLS: int = int(get_env("PLUGIN_CIRCUIT_BREAKER_MIN_CALLS", 5))
+    PLUGIN_CIRCUIT_BREAKER_RESET_TIMEOUT: int = int(get_env("PLUGIN_CIRCUIT_BREAKER_RESET_TIMEOUT", 30))
+    PLUGIN_CIRCUIT_BREAKER_WINDOW: int = int(get_env("PLUGIN_CIRCUIT_BREAKER_WINDOW", 60))
     PLUGIN_MAX_DATA_RESULTS: int = int(get_env("PLUGIN_MAX_DATA_RESULTS", 50))
+    PLUGIN_RESPONSE_MAX_TOKENS: int = int(get_env("PLUGIN_RESPONSE_MAX_TOKENS", 4000))
+    PLUGIN_RESPONSE_STRATEGY: str = get_env("PLUGIN_RESPONSE_STRATEGY", "truncate")
+    PLUGIN_RESULT_CACHE_TTL: int = int(get_env("PLUGIN_RESULT_CACHE_TTL", 300))
 
     SENSITIVE_FILES_AMNESTY_PATTERNS: List[Pattern] = [
         re.compile(r"^/$"),
@@ -146,6 +162,17 @@ class SettingsDefaults:
         re.compile(r"^/logout/?$"),
         re.compile(r"^/admin/?$"),
     ]
+    VECTORSTORE_EMBEDDING_BATCH_SIZE: int = int(get_env("VECTORSTORE_EMBEDDING_BATCH_SIZE", 256))
+    VECTORSTORE_EMBEDDING_CACHE_TTL: int = int(get_env("VECTORSTORE_EMBEDDING_CACHE_TTL", 2592000))
+    VECTORSTORE_EMBEDDING_CONCURRENCY: int = int(get_env("VECTORSTORE_EMBEDDING_CONCURRENCY", 4))
+    VECTORSTORE_HYBRID_CANDIDATES: int = int(get_env("VECTORSTORE_HYBRID_CANDIDATES", 50))
+    VECTORSTORE_HYBRID_RRF_K: int = int(get_env("VECTORSTORE_HYBRID_RRF_K", 60))
+    VECTORSTORE_LOADER_BLOCK_SIZE: int = int(get_env("VECTORSTORE_LOADER_BLOCK_SIZE", 1048576))
+    VECTORSTORE_LOCAL_PATH: str = get_env("VECTORSTORE_LOCAL_PATH", "/tmp/smarter/vectorstore")
+    VECTORSTORE_LOCAL_QUANTIZATION: str = get_env("VECTORSTORE_LOCAL_QUANTIZATION", "float16")
+    VECTORSTORE_QDRANT_PATH: str = get_env("VECTORSTORE_QDRANT_PATH", ":memory:")
+    VECTORSTORE_RETRIEVAL_CACHE_TTL: int = int(get_env("VECTORSTORE_RETRIEVAL_CACHE_TTL", 300))
+    VECTORSTORE_UPSERT_BATCH_SIZE: int = int(get_env("VECTORSTORE_UPSERT_BATCH_SIZE", 256))
 
     DEBUG_MODE: bool = bool_environment_variable("DEBUG_MODE", False)
     DEVELOPER_MODE: bool = bool_environment_variable("DEVELOPER_MODE", False)
@@ -1241,6 +1241,124 @@ class Settings(BaseSettings):
         except ValueError as e:
             raise SmarterConfigurationError("could not validate cache_expiration") from e
 
+    cache_local_expiration: int = Field(
+        settings_defaults.CACHE_LOCAL_EXPIRATION,
+        ge=0,
+        description="The maximum lifetime in seconds of @cache_results values in the per-process local cache.",
+        title="Local Cache Expiration",
+    )
+    """
+    The maximum lifetime in seconds of ``@cache_results`` values in the per-process local cache.
+
+    Functions that are decorated with ``@cache_results(local=True)`` keep their
+    results in an in-process LRU cache in front of Redis, for at most this many
+    seconds, or the decorator's own timeout if it is shorter. Invalidations are
+    broadcast to all processes, so this only bounds the staleness of values
+    whose invalidation message is lost. ``0`` disables the local cache.
+
+    :type: int
+    :default: Value from ``settings_defaults.CACHE_LOCAL_EXPIRATION``
+    :raises SmarterConfigurationError: If the value is not a non-negative integer.
+    """
+
+    @before_field_validator("cache_local_expiration")
+    def parse_cache_local_expiration(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'cache_local_expiration' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the cache_local_expiration value to validate
+        Returns:
+            int: The validated cache_local_expiration.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.CACHE_LOCAL_EXPIRATION
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 0:
+                raise SmarterConfigurationError(f"cache_local_expiration {int_value} must not be negative.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate cache_local_expiration: {v}") from e
+
+    cache_local_max_entries: int = Field(
+        settings_defaults.CACHE_LOCAL_MAX_ENTRIES,
+        gt=0,
+        description="The maximum number of @cache_results values in the per-process local cache.",
+        title="Local Cache Max Entries",
+    )
+    """
+    The maximum number of ``@cache_results`` values in the per-process local cache.
+
+    When the local cache is full, the least recently used value is evicted.
+
+    :type: int
+    :default: Value from ``settings_defaults.CACHE_LOCAL_MAX_ENTRIES``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("cache_local_max_entries")
+    def parse_cache_local_max_entries(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'cache_local_max_entries' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the cache_local_max_entries value to validate
+        Returns:
+            int: The validated cache_local_max_entries.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.CACHE_LOCAL_MAX_ENTRIES
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(f"cache_local_max_entries {int_value} must be a positive integer.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate cache_local_max_entries: {v}") from e
+
+    cache_metrics_sample_rate: float = Field(
+        settings_defaults.CACHE_METRICS_SAMPLE_RATE,
+        ge=0,
+        le=1,
+        description="The fraction of @cache_results calls that are recorded in the cache metrics.",
+        title="Cache Metrics Sample Rate",
+    )
+    """
+    The fraction of ``@cache_results`` calls that are recorded in the cache metrics,
+    from 0 to 1. Each sampled call is counted as ``1 / sample_rate`` calls, so the
+    reported counts estimate the totals. 0 disables the metrics.
+
+    :type: float
+    :default: Value from ``settings_defaults.CACHE_METRICS_SAMPLE_RATE``
+    :raises SmarterConfigurationError: If the value is not a number from 0 to 1.
+    """
+
+    @before_field_validator("cache_metrics_sample_rate")
+    def parse_cache_metrics_sample_rate(cls, v: Optional[Union[float, int, str]]) -> float:
+        """Validates the 'cache_metrics_sample_rate' field.
+
+        Args:
+            v (Optional[Union[float, int, str]]): the cache_metrics_sample_rate value to validate
+        Returns:
+            float: The validated cache_metrics_sample_rate.
+        """
+        if isinstance(v, (float, int)) and not isinstance(v, bool):
+            return float(v)
+        if v in THE_EMPTY_SET:
+            return settings_defaults.CACHE_METRICS_SAMPLE_RATE
+        try:
+            float_value = float(v)  # type: ignore[reportArgumentType]
+            if not 0 <= float_value <= 1:
+                raise SmarterConfigurationError(
+                    f"cache_metrics_sample_rate {float_value} must be a number from 0 to 1."
+                )
+            return float_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate cache_metrics_sample_rate: {v}") from e
+
     chat_cache_expiration: int = Field(
         settings_defaults.CHAT_CACHE_EXPIRATION,
         gt=0,
@@ -1561,109 +1679,1048 @@ class Settings(BaseSettings):
 
         return v
 
-    plugin_max_data_results: int = Field(
-        settings_defaults.PLUGIN_MAX_DATA_RESULTS,
+    llm_client_warmup_enabled: bool = Field(
+        settings_defaults.LLM_CLIENT_WARMUP_ENABLED,
+        description="True if each web worker should warm up the plugins and connections of deployed LLMClients when it starts.",
+        title="LLMClient Warm-up Enabled",
+    )
+    """
+    True if each web worker should warm up the plugins and connections of deployed LLMClients when it starts.
+
+    While warm-up is running the readiness endpoint returns HTTP 503, so that
+    Kubernetes only routes traffic to warm pods. See :mod:`smarter.apps.llm_client.warmup`.
+
+    :type: bool
+    :default: Value from ``settings_defaults.LLM_CLIENT_WARMUP_ENABLED``
+    :raises SmarterConfigurationError: If the value is not a boolean.
+    """
+
+    @before_field_validator("llm_client_warmup_enabled")
+    def parse_llm_client_warmup_enabled(cls, v: Optional[Union[bool, str]]) -> bool:
+        """Validates the 'llm_client_warmup_enabled' field.
+
+        Args:
+            v (Optional[Union[bool, str]]): the llm_client_warmup_enabled value to validate
+
+        Returns:
+            bool: The validated llm_client_warmup_enabled.
+        """
+        if isinstance(v, bool):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.LLM_CLIENT_WARMUP_ENABLED
+        if isinstance(v, str):
+            return v.lower() in ["true", "1", "t", "y", "yes"]
+
+        raise SmarterConfigurationError(f"could not validate llm_client_warmup_enabled: {v}")
+
+    llm_client_warmup_timeout: int = Field(
+        settings_defaults.LLM_CLIENT_WARMUP_TIMEOUT,
         gt=0,
-        description="A global maximum number of data row results that can be returned by any Smarter plugin.",
-        title="Plugin Max Data Results",
+        description="The maximum time in seconds that a web worker spends warming up before it reports ready.",
+        title="LLMClient Warm-up Timeout",
     )
     """
-    A global maximum number of data row results that can be returned by any Smarter plugin.
+    The maximum time in seconds that a web worker spends warming up before it reports ready.
+
+    Warm-up stops when this deadline passes, and the worker reports ready with
+    whatever it has warmed so far, so that a slow or unreachable customer
+    database can never keep a pod out of service.
 
-    This setting helps to prevent excessive data retrieval that could impact performance
-    or lead to resource exhaustion. Plugins should respect this limit when querying
-    data sources and returning results to ensure efficient operation of the platform.
     :type: int
-    :default: Value from ``settings_defaults.PLUGIN_MAX_DATA_RESULTS``
+    :default: Value from ``settings_defaults.LLM_CLIENT_WARMUP_TIMEOUT``
     :raises SmarterConfigurationError: If the value is not a positive integer.
     """
 
-    @before_field_validator("plugin_max_data_results")
-    def parse_plugin_max_data_results(cls, v: Optional[Union[int, str]]) -> int:
-        """Validates the 'plugin_max_data_results' field.
+    @before_field_validator("llm_client_warmup_timeout")
+    def parse_llm_client_warmup_timeout(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'llm_client_warmup_timeout' field.
 
         Args:
-            v (Optional[Union[int, str]]): the plugin_max_data_results value to validate
+            v (Optional[Union[int, str]]): the llm_client_warmup_timeout value to validate
         Returns:
-            int: The validated plugin_max_data_results.
+            int: The validated llm_client_warmup_timeout.
         """
         if isinstance(v, int):
             return v
         if v in THE_EMPTY_SET:
-            return settings_defaults.PLUGIN_MAX_DATA_RESULTS
+            return settings_defaults.LLM_CLIENT_WARMUP_TIMEOUT
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(f"llm_client_warmup_timeout {int_value} must be a positive integer.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate llm_client_warmup_timeout: {v}") from e
+
+    plugin_api_max_retries: int = Field(
+        settings_defaults.PLUGIN_API_MAX_RETRIES,
+        ge=0,
+        description="The maximum number of retries for idempotent API plugin requests that fail with a connection error or a retryable HTTP status.",
+        title="Plugin API Max Retries",
+    )
+    """
+    The maximum number of retries for idempotent API plugin requests.
+
+    Requests are retried on connection errors and on HTTP 429, 502, 503 and 504
+    responses, with exponential backoff. Non-idempotent methods such as POST are
+    never retried. Set to 0 to disable retries.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_API_MAX_RETRIES``
+    :raises SmarterConfigurationError: If the value is not a non-negative integer.
+    """
+
+    @before_field_validator("plugin_api_max_retries")
+    def parse_plugin_api_max_retries(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_api_max_retries' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_api_max_retries value to validate
+        Returns:
+            int: The validated plugin_api_max_retries.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_API_MAX_RETRIES
         try:
             int_value = int(v)  # type: ignore[reportArgumentType]
             if int_value < 0:
-                raise SmarterConfigurationError(f"plugin_max_data_results {int_value} must be a positive integer.")
+                raise SmarterConfigurationError(f"plugin_api_max_retries {int_value} must be a non-negative integer.")
             return int_value
         except ValueError as e:
-            raise SmarterConfigurationError(f"could not validate plugin_max_data_results: {v}") from e
+            raise SmarterConfigurationError(f"could not validate plugin_api_max_retries: {v}") from e
 
-    sensitive_files_amnesty_patterns: List[Pattern] = Field(
-        settings_defaults.SENSITIVE_FILES_AMNESTY_PATTERNS,
-        description="List of regex patterns for sensitive file amnesty.",
-        title="Sensitive Files Amnesty Patterns",
-        examples=[
-            re.compile(r"^/dashboard/account/password-reset-link/[^/]+/[^/]+/$"),
-            re.compile(r"^/api(/.*)?$"),
-            re.compile(r"^/admin(/.*)?$"),
-        ],
+    plugin_api_pool_maxsize: int = Field(
+        settings_defaults.PLUGIN_API_POOL_MAXSIZE,
+        gt=0,
+        description="The maximum number of keep-alive HTTP connections that each worker process holds open per API connection.",
+        title="Plugin API Pool Max Size",
     )
     """
-    Sensitive file amnesty patterns used by smarter.lib.django.middleware.sensitive_files.SensitiveFileAccessMiddleware.
+    The maximum number of keep-alive HTTP connections that each worker process
+    holds open per :class:`ApiConnection`.
 
-    Requests matching these patterns will be allowed even if they match sensitive file names.
+    API plugin requests reuse these connections, which avoids a new TCP and TLS
+    handshake with the remote API on every plugin call.
 
-    .. note::
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_API_POOL_MAXSIZE``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
 
-        Do not modify this setting unless you fully understand the implications of doing so.
+    @before_field_validator("plugin_api_pool_maxsize")
+    def parse_plugin_api_pool_maxsize(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_api_pool_maxsize' field.
 
-    List of regex patterns for sensitive file amnesty.
-    This setting defines a list of regular expression patterns that identify files
-    considered sensitive. Files matching these patterns may be subject to special handling,
-    such as exclusion from certain operations or additional security measures.
+        Args:
+            v (Optional[Union[int, str]]): the plugin_api_pool_maxsize value to validate
+        Returns:
+            int: The validated plugin_api_pool_maxsize.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_API_POOL_MAXSIZE
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(f"plugin_api_pool_maxsize {int_value} must be a positive integer.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_api_pool_maxsize: {v}") from e
 
-    :type: List[Pattern]
-    :default: Value from ``settings_defaults.SENSITIVE_FILES_AMNESTY_PATTERNS``
-    :raises SmarterConfigurationError: If the value is not a list of valid regex patterns.
+    plugin_api_retry_backoff_factor: float = Field(
+        settings_defaults.PLUGIN_API_RETRY_BACKOFF_FACTOR,
+        ge=0,
+        description="The exponential backoff factor, in seconds, between API plugin request retries.",
+        title="Plugin API Retry Backoff Factor",
+    )
     """
+    The exponential backoff factor, in seconds, between API plugin request retries.
 
-    @before_field_validator("sensitive_files_amnesty_patterns")
-    def parse_sensitive_files_amnesty_patterns(cls, v: Optional[Union[List[str], str]]) -> List[Pattern]:
-        """Validates the 'sensitive_files_amnesty_patterns' field.
+    The delay before retry ``n`` is ``backoff_factor * 2 ** (n - 1)``. A
+    ``Retry-After`` header sent by the remote API takes precedence.
+
+    :type: float
+    :default: Value from ``settings_defaults.PLUGIN_API_RETRY_BACKOFF_FACTOR``
+    :raises SmarterConfigurationError: If the value is not a non-negative number.
+    """
+
+    @before_field_validator("plugin_api_retry_backoff_factor")
+    def parse_plugin_api_retry_backoff_factor(cls, v: Optional[Union[float, int, str]]) -> float:
+        """Validates the 'plugin_api_retry_backoff_factor' field.
 
         Args:
-            v (Optional[Union[List[str], str]]): the sensitive_files_amnesty_patterns value to validate
+            v (Optional[Union[float, int, str]]): the plugin_api_retry_backoff_factor value to validate
         Returns:
-            List[Pattern]: The validated sensitive_files_amnesty_patterns.
-        Examples:
-            >>> parse_sensitive_files_amnesty_patterns([r"^/api(/.*)?$", r"^/admin(/.*)?$"])
-            [re.compile('^/api(/.*)?$'), re.compile('^/admin(/.*)?$')]
+            float: The validated plugin_api_retry_backoff_factor.
         """
-        if isinstance(v, list):
-            patterns = []
-            for item in v:
-                if isinstance(item, str):
-                    try:
-                        patterns.append(re.compile(item))
-                    except re.error as e:
-                        raise SmarterConfigurationError(f"Invalid regex pattern: {item}") from e
-                elif hasattr(item, "pattern") and hasattr(item, "match"):
-                    patterns.append(item)
-                else:
-                    raise SmarterConfigurationError(
-                        "sensitive_files_amnesty_patterns must be a list of strings or compiled regex patterns."
-                    )
-            return patterns
+        if isinstance(v, (float, int)) and not isinstance(v, bool):
+            return float(v)
         if v in THE_EMPTY_SET:
-            return settings_defaults.SENSITIVE_FILES_AMNESTY_PATTERNS
-        if isinstance(v, str):
-            try:
-                return [re.compile(v)]
-            except re.error as e:
-                raise SmarterConfigurationError(f"Invalid regex pattern: {v}") from e
+            return settings_defaults.PLUGIN_API_RETRY_BACKOFF_FACTOR
+        try:
+            float_value = float(v)  # type: ignore[reportArgumentType]
+            if float_value < 0:
+                raise SmarterConfigurationError(
+                    f"plugin_api_retry_backoff_factor {float_value} must be a non-negative number."
+                )
+            return float_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_api_retry_backoff_factor: {v}") from e
 
-        raise SmarterConfigurationError(f"could not validate sensitive_files_amnesty_patterns: {v}")
+    plugin_bulkhead_max_concurrency: int = Field(
+        settings_defaults.PLUGIN_BULKHEAD_MAX_CONCURRENCY,
+        gt=0,
+        description="The maximum number of concurrent plugin executions per connection in each worker process.",
+        title="Plugin Bulkhead Max Concurrency",
+    )
+    """
+    The maximum number of concurrent plugin executions per connection in each worker process.
+
+    Executions beyond this limit are rejected with a "temporarily unavailable"
+    result rather than queued, so one slow customer database or API cannot tie
+    up every worker thread.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_BULKHEAD_MAX_CONCURRENCY``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("plugin_bulkhead_max_concurrency")
+    def parse_plugin_bulkhead_max_concurrency(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_bulkhead_max_concurrency' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_bulkhead_max_concurrency value to validate
+        Returns:
+            int: The validated plugin_bulkhead_max_concurrency.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_BULKHEAD_MAX_CONCURRENCY
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"plugin_bulkhead_max_concurrency {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_bulkhead_max_concurrency: {v}") from e
+
+    plugin_circuit_breaker_failure_rate: float = Field(
+        settings_defaults.PLUGIN_CIRCUIT_BREAKER_FAILURE_RATE,
+        gt=0,
+        le=1,
+        description="The fraction of failed plugin connection calls within the window that opens the connection's circuit breaker.",
+        title="Plugin Circuit Breaker Failure Rate",
+    )
+    """
+    The fraction of failed plugin connection calls within
+    ``plugin_circuit_breaker_window`` seconds that opens the connection's circuit
+    breaker. While the circuit is open, plugins that use the connection return a
+    "temporarily unavailable" result immediately instead of waiting for a timeout.
+
+    :type: float
+    :default: Value from ``settings_defaults.PLUGIN_CIRCUIT_BREAKER_FAILURE_RATE``
+    :raises SmarterConfigurationError: If the value is not a number greater than 0 and at most 1.
+    """
+
+    @before_field_validator("plugin_circuit_breaker_failure_rate")
+    def parse_plugin_circuit_breaker_failure_rate(cls, v: Optional[Union[float, int, str]]) -> float:
+        """Validates the 'plugin_circuit_breaker_failure_rate' field.
+
+        Args:
+            v (Optional[Union[float, int, str]]): the plugin_circuit_breaker_failure_rate value to validate
+        Returns:
+            float: The validated plugin_circuit_breaker_failure_rate.
+        """
+        if isinstance(v, (float, int)) and not isinstance(v, bool):
+            return float(v)
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_CIRCUIT_BREAKER_FAILURE_RATE
+        try:
+            float_value = float(v)  # type: ignore[reportArgumentType]
+            if not 0 < float_value <= 1:
+                raise SmarterConfigurationError(
+                    f"plugin_circuit_breaker_failure_rate {float_value} must be greater than 0 and at most 1."
+                )
+            return float_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_circuit_breaker_failure_rate: {v}") from e
+
+    plugin_circuit_breaker_min_calls: int = Field(
+        settings_defaults.PLUGIN_CIRCUIT_BREAKER_MIN_CALLS,
+        gt=0,
+        description="The minimum number of plugin connection calls within the window before the circuit breaker can open.",
+        title="Plugin Circuit Breaker Min Calls",
+    )
+    """
+    The minimum number of plugin connection calls within
+    ``plugin_circuit_breaker_window`` seconds before the failure rate is
+    evaluated, so that a single failure on a quiet connection does not open it.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_CIRCUIT_BREAKER_MIN_CALLS``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("plugin_circuit_breaker_min_calls")
+    def parse_plugin_circuit_breaker_min_calls(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_circuit_breaker_min_calls' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_circuit_breaker_min_calls value to validate
+        Returns:
+            int: The validated plugin_circuit_breaker_min_calls.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_CIRCUIT_BREAKER_MIN_CALLS
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"plugin_circuit_breaker_min_calls {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_circuit_breaker_min_calls: {v}") from e
+
+    plugin_circuit_breaker_reset_timeout: int = Field(
+        settings_defaults.PLUGIN_CIRCUIT_BREAKER_RESET_TIMEOUT,
+        gt=0,
+        description="How long, in seconds, a connection's circuit stays open before a trial call is allowed.",
+        title="Plugin Circuit Breaker Reset Timeout",
+    )
+    """
+    How long, in seconds, a connection's circuit stays open before it becomes
+    half-open and a single trial call is allowed through. A successful trial
+    closes the circuit. A failed trial opens it again.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_CIRCUIT_BREAKER_RESET_TIMEOUT``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("plugin_circuit_breaker_reset_timeout")
+    def parse_plugin_circuit_breaker_reset_timeout(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_circuit_breaker_reset_timeout' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_circuit_breaker_reset_timeout value to validate
+        Returns:
+            int: The validated plugin_circuit_breaker_reset_timeout.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_CIRCUIT_BREAKER_RESET_TIMEOUT
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"plugin_circuit_breaker_reset_timeout {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_circuit_breaker_reset_timeout: {v}") from e
+
+    plugin_circuit_breaker_window: int = Field(
+        settings_defaults.PLUGIN_CIRCUIT_BREAKER_WINDOW,
+        gt=0,
+        description="The length, in seconds, of the window in which plugin connection failures are counted.",
+        title="Plugin Circuit Breaker Window",
+    )
+    """
+    The length, in seconds, of the window in which plugin connection calls and
+    failures are counted. Counters are held in the Django cache (Redis), so all
+    workers share them.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_CIRCUIT_BREAKER_WINDOW``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("plugin_circuit_breaker_window")
+    def parse_plugin_circuit_breaker_window(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_circuit_breaker_window' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_circuit_breaker_window value to validate
+        Returns:
+            int: The validated plugin_circuit_breaker_window.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_CIRCUIT_BREAKER_WINDOW
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"plugin_circuit_breaker_window {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_circuit_breaker_window: {v}") from e
+
+    plugin_max_data_results: int = Field(
+        settings_defaults.PLUGIN_MAX_DATA_RESULTS,
+        gt=0,
+        description="A global maximum number of data row results that can be returned by any Smarter plugin.",
+        title="Plugin Max Data Results",
+    )
+    """
+    A global maximum number of data row results that can be returned by any Smarter plugin.
+
+    This setting helps to prevent excessive data retrieval that could impact performance
+    or lead to resource exhaustion. Plugins should respect this limit when querying
+    data sources and returning results to ensure efficient operation of the platform.
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_MAX_DATA_RESULTS``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("plugin_max_data_results")
+    def parse_plugin_max_data_results(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_max_data_results' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_max_data_results value to validate
+        Returns:
+            int: The validated plugin_max_data_results.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_MAX_DATA_RESULTS
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 0:
+                raise SmarterConfigurationError(f"plugin_max_data_results {int_value} must be a positive integer.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_max_data_results: {v}") from e
+
+    plugin_response_max_tokens: int = Field(
+        settings_defaults.PLUGIN_RESPONSE_MAX_TOKENS,
+        gt=0,
+        description="The default token budget for a single plugin or tool result that is passed back to the LLM.",
+        title="Plugin Response Max Tokens",
+    )
+    """
+    The default token budget for a single plugin or tool result that is passed back to the LLM.
+
+    Tool results larger than this are shaped (truncated, projected, re-encoded or
+    summarized) before the second prompt completion request, which keeps that
+    request's latency and cost predictable. Individual plugins can override this
+    with ``spec.prompt.responseMaxTokens``.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_RESPONSE_MAX_TOKENS``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("plugin_response_max_tokens")
+    def parse_plugin_response_max_tokens(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_response_max_tokens' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_response_max_tokens value to validate
+        Returns:
+            int: The validated plugin_response_max_tokens.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_RESPONSE_MAX_TOKENS
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(f"plugin_response_max_tokens {int_value} must be a positive integer.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_response_max_tokens: {v}") from e
+
+    plugin_response_strategy: str = Field(
+        settings_defaults.PLUGIN_RESPONSE_STRATEGY,
+        description="The default strategy for shaping a plugin result that exceeds its token budget.",
+        examples=["truncate", "project", "tabular", "summarize"],
+        title="Plugin Response Strategy",
+    )
+    """
+    The default strategy for shaping a plugin result that exceeds its token budget.
+
+    - ``truncate``: keep as many leading rows as fit.
+    - ``project``: keep only the plugin's ``responseColumns``, then truncate.
+    - ``tabular``: re-encode rows as a compact ``columns`` / ``rows`` table, then truncate.
+    - ``summarize``: replace the rows with per-column statistics and a sample of rows.
+
+    Individual plugins can override this with ``spec.prompt.responseStrategy``.
+
+    :type: str
+    :default: Value from ``settings_defaults.PLUGIN_RESPONSE_STRATEGY``
+    :raises SmarterConfigurationError: If the value is not one of the strategies above.
+    """
+
+    @before_field_validator("plugin_response_strategy")
+    def parse_plugin_response_strategy(cls, v: Optional[str]) -> str:
+        """Validates the 'plugin_response_strategy' field.
+
+        Args:
+            v (Optional[str]): the plugin_response_strategy value to validate
+        Returns:
+            str: The validated plugin_response_strategy.
+        """
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_RESPONSE_STRATEGY
+        valid_strategies = ["truncate", "project", "tabular", "summarize"]
+        if str(v) not in valid_strategies:
+            raise SmarterConfigurationError(
+                f"plugin_response_strategy {v} is not one of {', '.join(valid_strategies)}."
+            )
+        return str(v)
+
+    plugin_result_cache_ttl: int = Field(
+        settings_defaults.PLUGIN_RESULT_CACHE_TTL,
+        ge=0,
+        description="The default lifetime in seconds of cached plugin results. 0 disables plugin result caching.",
+        title="Plugin Result Cache TTL",
+    )
+    """
+    The default lifetime in seconds of cached plugin results.
+
+    Results are cached per plugin version, connection version and arguments, and
+    are invalidated when the plugin is updated or deleted. Individual plugins can
+    override this with ``spec.sqlData.cacheTtl``. ``0`` disables plugin result
+    caching.
+
+    :type: int
+    :default: Value from ``settings_defaults.PLUGIN_RESULT_CACHE_TTL``
+    :raises SmarterConfigurationError: If the value is not a non-negative integer.
+    """
+
+    @before_field_validator("plugin_result_cache_ttl")
+    def parse_plugin_result_cache_ttl(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'plugin_result_cache_ttl' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the plugin_result_cache_ttl value to validate
+        Returns:
+            int: The validated plugin_result_cache_ttl.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.PLUGIN_RESULT_CACHE_TTL
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 0:
+                raise SmarterConfigurationError(f"plugin_result_cache_ttl {int_value} must not be negative.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate plugin_result_cache_ttl: {v}") from e
+
+    sensitive_files_amnesty_patterns: List[Pattern] = Field(
+        settings_defaults.SENSITIVE_FILES_AMNESTY_PATTERNS,
+        description="List of regex patterns for sensitive file amnesty.",
+        title="Sensitive Files Amnesty Patterns",
+        examples=[
+            re.compile(r"^/dashboard/account/password-reset-link/[^/]+/[^/]+/$"),
+            re.compile(r"^/api(/.*)?$"),
+            re.compile(r"^/admin(/.*)?$"),
+        ],
+    )
+    """
+    Sensitive file amnesty patterns used by smarter.lib.django.middleware.sensitive_files.SensitiveFileAccessMiddleware.
+
+    Requests matching these patterns will be allowed even if they match sensitive file names.
+
+    .. note::
+
+        Do not modify this setting unless you fully understand the implications of doing so.
+
+    List of regex patterns for sensitive file amnesty.
+    This setting defines a list of regular expression patterns that identify files
+    considered sensitive. Files matching these patterns may be subject to special handling,
+    such as exclusion from certain operations or additional security measures.
+
+    :type: List[Pattern]
+    :default: Value from ``settings_defaults.SENSITIVE_FILES_AMNESTY_PATTERNS``
+    :raises SmarterConfigurationError: If the value is not a list of valid regex patterns.
+    """
+
+    @before_field_validator("sensitive_files_amnesty_patterns")
+    def parse_sensitive_files_amnesty_patterns(cls, v: Optional[Union[List[str], str]]) -> List[Pattern]:
+        """Validates the 'sensitive_files_amnesty_patterns' field.
+
+        Args:
+            v (Optional[Union[List[str], str]]): the sensitive_files_amnesty_patterns value to validate
+        Returns:
+            List[Pattern]: The validated sensitive_files_amnesty_patterns.
+        Examples:
+            >>> parse_sensitive_files_amnesty_patterns([r"^/api(/.*)?$", r"^/admin(/.*)?$"])
+            [re.compile('^/api(/.*)?$'), re.compile('^/admin(/.*)?$')]
+        """
+        if isinstance(v, list):
+            patterns = []
+            for item in v:
+                if isinstance(item, str):
+                    try:
+                        patterns.append(re.compile(item))
+                    except re.error as e:
+                        raise SmarterConfigurationError(f"Invalid regex pattern: {item}") from e
+                elif hasattr(item, "pattern") and hasattr(item, "match"):
+                    patterns.append(item)
+                else:
+                    raise SmarterConfigurationError(
+                        "sensitive_files_amnesty_patterns must be a list of strings or compiled regex patterns."
+                    )
+            return patterns
+        if v in THE_EMPTY_SET:
+            return settings_defaults.SENSITIVE_FILES_AMNESTY_PATTERNS
+        if isinstance(v, str):
+            try:
+                return [re.compile(v)]
+            except re.error as e:
+                raise SmarterConfigurationError(f"Invalid regex pattern: {v}") from e
+
+        raise SmarterConfigurationError(f"could not validate sensitive_files_amnesty_patterns: {v}")
+
+    vectorstore_embedding_batch_size: int = Field(
+        settings_defaults.VECTORSTORE_EMBEDDING_BATCH_SIZE,
+        gt=0,
+        description="The maximum number of document chunks per embedding request during vectorstore ingestion.",
+        title="Vectorstore Embedding Batch Size",
+    )
+    """
+    The maximum number of document chunks per embedding request during vectorstore ingestion.
+
+    Batches are also limited by the ``chunk_size`` of the vectorstore's embeddings
+    configuration, and to an estimated token budget per request.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_EMBEDDING_BATCH_SIZE``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("vectorstore_embedding_batch_size")
+    def parse_vectorstore_embedding_batch_size(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_embedding_batch_size' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_embedding_batch_size value to validate
+        Returns:
+            int: The validated vectorstore_embedding_batch_size.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_EMBEDDING_BATCH_SIZE
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"vectorstore_embedding_batch_size {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_embedding_batch_size: {v}") from e
+
+    vectorstore_embedding_cache_ttl: int = Field(
+        settings_defaults.VECTORSTORE_EMBEDDING_CACHE_TTL,
+        ge=0,
+        description="The lifetime in seconds of cached embedding vectors. 0 disables embedding caching.",
+        title="Vectorstore Embedding Cache TTL",
+    )
+    """
+    The lifetime in seconds of cached embedding vectors.
+
+    Vectors are cached per embedding model and normalized text, so that unchanged
+    chunks and repeated questions are not embedded again. Least recently used
+    entries are evicted first when Redis is configured with an ``allkeys-lru``
+    maxmemory policy. ``0`` disables embedding caching.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_EMBEDDING_CACHE_TTL``
+    :raises SmarterConfigurationError: If the value is not a non-negative integer.
+    """
+
+    @before_field_validator("vectorstore_embedding_cache_ttl")
+    def parse_vectorstore_embedding_cache_ttl(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_embedding_cache_ttl' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_embedding_cache_ttl value to validate
+        Returns:
+            int: The validated vectorstore_embedding_cache_ttl.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_EMBEDDING_CACHE_TTL
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 0:
+                raise SmarterConfigurationError(f"vectorstore_embedding_cache_ttl {int_value} must not be negative.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_embedding_cache_ttl: {v}") from e
+
+    vectorstore_embedding_concurrency: int = Field(
+        settings_defaults.VECTORSTORE_EMBEDDING_CONCURRENCY,
+        gt=0,
+        description="The maximum number of concurrent embedding requests per vectorstore ingestion.",
+        title="Vectorstore Embedding Concurrency",
+    )
+    """
+    The maximum number of concurrent embedding requests per vectorstore ingestion.
+
+    When the embeddings provider rate limits a request, every request of the
+    ingestion waits for the provider's retry delay.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_EMBEDDING_CONCURRENCY``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("vectorstore_embedding_concurrency")
+    def parse_vectorstore_embedding_concurrency(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_embedding_concurrency' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_embedding_concurrency value to validate
+        Returns:
+            int: The validated vectorstore_embedding_concurrency.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_EMBEDDING_CONCURRENCY
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"vectorstore_embedding_concurrency {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_embedding_concurrency: {v}") from e
+
+    vectorstore_hybrid_candidates: int = Field(
+        settings_defaults.VECTORSTORE_HYBRID_CANDIDATES,
+        gt=0,
+        description="The number of candidates that each retriever of a hybrid vectorstore query returns for fusion.",
+        title="Vectorstore Hybrid Candidates",
+    )
+    """
+    The number of candidates that each retriever of a hybrid vectorstore query returns for fusion.
+
+    Hybrid queries run a BM25 lexical search and a vector search, each for
+    this many candidates, and fuse the two rankings with reciprocal rank
+    fusion. It should be well above the ``top_k`` of the query so that
+    documents ranked well by only one retriever can still reach the top.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_HYBRID_CANDIDATES``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("vectorstore_hybrid_candidates")
+    def parse_vectorstore_hybrid_candidates(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_hybrid_candidates' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_hybrid_candidates value to validate
+        Returns:
+            int: The validated vectorstore_hybrid_candidates.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_HYBRID_CANDIDATES
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"vectorstore_hybrid_candidates {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_hybrid_candidates: {v}") from e
+
+    vectorstore_hybrid_rrf_k: int = Field(
+        settings_defaults.VECTORSTORE_HYBRID_RRF_K,
+        gt=0,
+        description="The rank constant of the reciprocal rank fusion of hybrid vectorstore queries.",
+        title="Vectorstore Hybrid RRF K",
+    )
+    """
+    The rank constant of the reciprocal rank fusion of hybrid vectorstore queries.
+
+    A document scores ``1 / (k + rank)`` for each ranking it appears in. Larger
+    values flatten the difference between the top ranks and the rest; 60 is
+    the value of the original RRF paper.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_HYBRID_RRF_K``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("vectorstore_hybrid_rrf_k")
+    def parse_vectorstore_hybrid_rrf_k(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_hybrid_rrf_k' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_hybrid_rrf_k value to validate
+        Returns:
+            int: The validated vectorstore_hybrid_rrf_k.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_HYBRID_RRF_K
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(f"vectorstore_hybrid_rrf_k {int_value} must be a positive integer.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_hybrid_rrf_k: {v}") from e
+
+    vectorstore_loader_block_size: int = Field(
+        settings_defaults.VECTORSTORE_LOADER_BLOCK_SIZE,
+        gt=0,
+        description="The size in bytes of the blocks that vectorstore document loaders read at a time.",
+        title="Vectorstore Loader Block Size",
+    )
+    """
+    The size in bytes of the blocks that vectorstore document loaders read at a time.
+
+    This is the size of each S3 range request, and the maximum size of each
+    document that is yielded for plain text, Markdown and HTML files. Together
+    with the backpressure of the ingestion pipeline, it bounds the memory used
+    to ingest a file regardless of the file's size.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_LOADER_BLOCK_SIZE``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("vectorstore_loader_block_size")
+    def parse_vectorstore_loader_block_size(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_loader_block_size' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_loader_block_size value to validate
+        Returns:
+            int: The validated vectorstore_loader_block_size.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_LOADER_BLOCK_SIZE
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"vectorstore_loader_block_size {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_loader_block_size: {v}") from e
+
+    vectorstore_local_path: str = Field(
+        settings_defaults.VECTORSTORE_LOCAL_PATH,
+        description="The directory in which local vectorstores are stored.",
+        title="Vectorstore Local Path",
+    )
+    """
+    The directory in which local vectorstores are stored.
+
+    Each local vectorstore is a subdirectory holding its vectors as NumPy arrays,
+    which every worker memory-maps, and its documents in a SQLite sidecar file.
+    The directory also holds the BM25 lexical index of every vectorstore, whatever
+    its backend, for hybrid retrieval.
+
+    Documents are ingested by Celery workers and queried by the web pods, so in a
+    multi-pod deployment this directory must be a volume that all of them share,
+    for example a ReadWriteMany persistent volume. Otherwise the web pods find no
+    lexical index, and hybrid queries are vector-only.
+
+    :type: str
+    :default: Value from ``settings_defaults.VECTORSTORE_LOCAL_PATH``
+    :raises SmarterConfigurationError: If the value is not a string.
+    """
+
+    @before_field_validator("vectorstore_local_path")
+    def parse_vectorstore_local_path(cls, v: Optional[str]) -> str:
+        """Validates the 'vectorstore_local_path' field.
+
+        Args:
+            v (Optional[str]): the vectorstore_local_path value to validate
+        Returns:
+            str: The validated vectorstore_local_path.
+        """
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_LOCAL_PATH
+        if not isinstance(v, str):
+            raise SmarterConfigurationError(f"vectorstore_local_path of type {type(v)} is not a str: {v}")
+        return v
+
+    vectorstore_local_quantization: str = Field(
+        settings_defaults.VECTORSTORE_LOCAL_QUANTIZATION,
+        description="How local vectorstores store vectors. One of 'float16' or 'int8'.",
+        title="Vectorstore Local Quantization",
+    )
+    """
+    How local vectorstores store vectors.
+
+    ``float16`` halves the size of float32 embeddings with no measurable loss of
+    retrieval quality. ``int8`` quarters it, with a per-vector scale, at a small
+    loss of precision. Applies to local vectorstores when they are created.
+
+    :type: str
+    :default: Value from ``settings_defaults.VECTORSTORE_LOCAL_QUANTIZATION``
+    :raises SmarterConfigurationError: If the value is not one of 'float16' or 'int8'.
+    """
+
+    @before_field_validator("vectorstore_local_quantization")
+    def parse_vectorstore_local_quantization(cls, v: Optional[str]) -> str:
+        """Validates the 'vectorstore_local_quantization' field.
+
+        Args:
+            v (Optional[str]): the vectorstore_local_quantization value to validate
+        Returns:
+            str: The validated vectorstore_local_quantization.
+        """
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_LOCAL_QUANTIZATION
+        valid_quantizations = ["float16", "int8"]
+        if str(v) not in valid_quantizations:
+            raise SmarterConfigurationError(
+                f"vectorstore_local_quantization {v} is not one of {', '.join(valid_quantizations)}."
+            )
+        return str(v)
+
+    vectorstore_qdrant_path: str = Field(
+        settings_defaults.VECTORSTORE_QDRANT_PATH,
+        description="The storage path of embedded Qdrant vectorstores, or ':memory:'.",
+        title="Vectorstore Qdrant Path",
+    )
+    """
+    The storage path of Qdrant vectorstores that run in embedded local mode.
+
+    Qdrant vectorstores without a connection run inside the Smarter process
+    rather than on a Qdrant server. ``:memory:`` keeps their collections in
+    memory, which suits local development and tests. A directory path persists
+    them to disk, but embedded Qdrant locks it, so only one process at a time can
+    open it, and the other processes fail to connect. Local mode is therefore for
+    single-process development only. Deployments with several web workers, pods or
+    Celery workers must give their Qdrant vectorstores a connection to a Qdrant server.
+
+    :type: str
+    :default: Value from ``settings_defaults.VECTORSTORE_QDRANT_PATH``
+    :raises SmarterConfigurationError: If the value is not a string.
+    """
+
+    @before_field_validator("vectorstore_qdrant_path")
+    def parse_vectorstore_qdrant_path(cls, v: Optional[str]) -> str:
+        """Validates the 'vectorstore_qdrant_path' field.
+
+        Args:
+            v (Optional[str]): the vectorstore_qdrant_path value to validate
+        Returns:
+            str: The validated vectorstore_qdrant_path.
+        """
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_QDRANT_PATH
+        if not isinstance(v, str):
+            raise SmarterConfigurationError(f"vectorstore_qdrant_path of type {type(v)} is not a str: {v}")
+        return v
+
+    vectorstore_retrieval_cache_ttl: int = Field(
+        settings_defaults.VECTORSTORE_RETRIEVAL_CACHE_TTL,
+        ge=0,
+        description="The lifetime in seconds of cached vectorstore retrieval results. 0 disables retrieval caching.",
+        title="Vectorstore Retrieval Cache TTL",
+    )
+    """
+    The lifetime in seconds of cached vectorstore retrieval results.
+
+    The chunks that are retrieved as context for a prompt are cached per
+    vectorstore, retrieval mode and normalized question, so that repeated
+    questions do not query the vectorstore again. Loading or syncing a
+    vectorstore invalidates its cached results. ``0`` disables retrieval caching.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_RETRIEVAL_CACHE_TTL``
+    :raises SmarterConfigurationError: If the value is not a non-negative integer.
+    """
+
+    @before_field_validator("vectorstore_retrieval_cache_ttl")
+    def parse_vectorstore_retrieval_cache_ttl(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_retrieval_cache_ttl' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_retrieval_cache_ttl value to validate
+        Returns:
+            int: The validated vectorstore_retrieval_cache_ttl.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_RETRIEVAL_CACHE_TTL
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 0:
+                raise SmarterConfigurationError(f"vectorstore_retrieval_cache_ttl {int_value} must not be negative.")
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_retrieval_cache_ttl: {v}") from e
+
+    vectorstore_upsert_batch_size: int = Field(
+        settings_defaults.VECTORSTORE_UPSERT_BATCH_SIZE,
+        gt=0,
+        description="The number of vectors sent to the vectorstore per upsert request.",
+        title="Vectorstore Upsert Batch Size",
+    )
+    """
+    The number of vectors sent to the vectorstore per upsert request.
+
+    :type: int
+    :default: Value from ``settings_defaults.VECTORSTORE_UPSERT_BATCH_SIZE``
+    :raises SmarterConfigurationError: If the value is not a positive integer.
+    """
+
+    @before_field_validator("vectorstore_upsert_batch_size")
+    def parse_vectorstore_upsert_batch_size(cls, v: Optional[Union[int, str]]) -> int:
+        """Validates the 'vectorstore_upsert_batch_size' field.
+
+        Args:
+            v (Optional[Union[int, str]]): the vectorstore_upsert_batch_size value to validate
+        Returns:
+            int: The validated vectorstore_upsert_batch_size.
+        """
+        if isinstance(v, int):
+            return v
+        if v in THE_EMPTY_SET:
+            return settings_defaults.VECTORSTORE_UPSERT_BATCH_SIZE
+        try:
+            int_value = int(v)  # type: ignore[reportArgumentType]
+            if int_value < 1:
+                raise SmarterConfigurationError(
+                    f"vectorstore_upsert_batch_size {int_value} must be a positive integer."
+                )
+            return int_value
+        except ValueError as e:
+            raise SmarterConfigurationError(f"could not validate vectorstore_upsert_batch_size: {v}") from e
 
     debug_mode: bool = Field(
         settings_defaults.DEBUG_MODE,
@@ -126,6 +126,15 @@ class TestSettings(SmarterTestBase):
     def test_cache_expiration(self):
         self.assertIsNotNone(smarter_settings.cache_expiration)
 
+    def test_cache_local_expiration(self):
+        self.assertIsNotNone(smarter_settings.cache_local_expiration)
+
+    def test_cache_local_max_entries(self):
+        self.assertIsNotNone(smarter_settings.cache_local_max_entries)
+
+    def test_cache_metrics_sample_rate(self):
+        self.assertIsNotNone(smarter_settings.cache_metrics_sample_rate)
+
     def test_chat_cache_expiration(self):
         self.assertIsNotNone(smarter_settings.chat_cache_expiration)
 
@@ -153,12 +162,84 @@ class TestSettings(SmarterTestBase):
     def test_llm_client_tasks_celery_task_queue(self):
         self.assertIsNotNone(smarter_settings.llm_client_tasks_celery_task_queue)
 
+    def test_llm_client_warmup_enabled(self):
+        self.assertIsNotNone(smarter_settings.llm_client_warmup_enabled)
+
+    def test_llm_client_warmup_timeout(self):
+        self.assertIsNotNone(smarter_settings.llm_client_warmup_timeout)
+
+    def test_plugin_api_max_retries(self):
+        self.assertIsNotNone(smarter_settings.plugin_api_max_retries)
+
+    def test_plugin_api_pool_maxsize(self):
+        self.assertIsNotNone(smarter_settings.plugin_api_pool_maxsize)
+
+    def test_plugin_api_retry_backoff_factor(self):
+        self.assertIsNotNone(smarter_settings.plugin_api_retry_backoff_factor)
+
+    def test_plugin_bulkhead_max_concurrency(self):
+        self.assertIsNotNone(smarter_settings.plugin_bulkhead_max_concurrency)
+
+    def test_plugin_circuit_breaker_failure_rate(self):
+        self.assertIsNotNone(smarter_settings.plugin_circuit_breaker_failure_rate)
+
+    def test_plugin_circuit_breaker_min_calls(self):
+        self.assertIsNotNone(smarter_settings.plugin_circuit_breaker_min_calls)
+
+    def test_plugin_circuit_breaker_reset_timeout(self):
+        self.assertIsNotNone(smarter_settings.plugin_circuit_breaker_reset_timeout)
+
+    def test_plugin_circuit_breaker_window(self):
+        self.assertIsNotNone(smarter_settings.plugin_circuit_breaker_window)
+
     def test_plugin_max_data_results(self):
         self.assertIsNotNone(smarter_settings.plugin_max_data_results)
 
+    def test_plugin_response_max_tokens(self):
+        self.assertIsNotNone(smarter_settings.plugin_response_max_tokens)
+
+    def test_plugin_response_strategy(self):
+        self.assertIsNotNone(smarter_settings.plugin_response_strategy)
+
+    def test_plugin_result_cache_ttl(self):
+        self.assertIsNotNone(smarter_settings.plugin_result_cache_ttl)
+
     def test_sensitive_files_amnesty_patterns(self):
         self.assertIsNotNone(smarter_settings.sensitive_files_amnesty_patterns)
 
+    def test_vectorstore_embedding_batch_size(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_embedding_batch_size)
+
+    def test_vectorstore_embedding_cache_ttl(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_embedding_cache_ttl)
+
+    def test_vectorstore_embedding_concurrency(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_embedding_concurrency)
+
+    def test_vectorstore_hybrid_candidates(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_hybrid_candidates)
+
+    def test_vectorstore_hybrid_rrf_k(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_hybrid_rrf_k)
+
+    def test_vectorstore_loader_block_size(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_loader_block_size)
+
+    def test_vectorstore_local_path(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_local_path)
+
+    def test_vectorstore_local_quantization(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_local_quantization)
+
+    def test_vectorstore_qdrant_path(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_qdrant_path)
+
+    def test_vectorstore_retrieval_cache_ttl(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_retrieval_cache_ttl)
+
+    def test_vectorstore_upsert_batch_size(self):
+        self.assertIsNotNone(smarter_settings.vectorstore_upsert_batch_size)
+
     def test_debug_mode(self):
         self.assertIsNotNone(smarter_settings.debug_mode)
 
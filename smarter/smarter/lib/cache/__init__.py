@@ -4,5 +4,7 @@ Smarter caching.
 
 from .decorators import cache_results
 from .lazy_cache import lazy_cache
+from .local_cache import local_cache
+from .tags import invalidate_tags
 
-__all__ = ["decorators", "lazy_cache"]
+__all__ = ["decorators", "invalidate_tags", "lazy_cache", "local_cache"]
@@ -0,0 +1,296 @@
+"""
+smarter.lib.cache.codec
+=======================
+
+This module provides the compact value serializer that ``@cache_results``
+uses for the values that it stores in Redis.
+
+**Key Features:**
+
+- Values are serialized with msgpack, and compressed with zstd when they are
+  larger than ``COMPRESSION_THRESHOLD`` bytes.
+- Django model instances are stored as compact rows: the model label and the
+  values of the loaded concrete fields, plus their cached related objects and
+  cached properties. They are rehydrated with ``Model.from_db()``, without a
+  database query.
+- QuerySets of model instances are materialized into rows, and rehydrated as
+  a ``pk__in`` QuerySet of the same model whose result cache is filled, so that
+  iterating it does not query the database. ``values()`` and ``values_list()``
+  QuerySets are cached as lists. A QuerySet that was not evaluated before it
+  was cached is logged as a warning, see :func:`materialize`.
+- Date and time values, ``Decimal``, ``UUID``, tuples and sets keep their
+  types. Any other object is pickled.
+- Values that were not encoded by this module, such as values cached before it
+  existed, are returned as is by :func:`decode`.
+
+**Usage Example:**
+
+.. code-block:: python
+
+    from smarter.lib.cache.codec import decode, encode
+
+    data = encode(Account.objects.filter(is_active=True))
+    accounts = decode(data)  # a QuerySet, without a database query
+"""
+
+import datetime
+import decimal
+import pickle
+import uuid
+from typing import Any, Optional
+
+import msgpack
+import zstandard
+from django.apps import apps
+from django.db import models
+from django.db.models.query import ModelIterable
+
+from smarter.lib import logging
+
+logger = logging.getLogger(__name__)
+logger_prefix = logging.formatted_text(f"{__name__}")
+
+MAGIC = b"\x93sc1"
+"""The prefix of encoded values, followed by one of ``PLAIN`` and ``ZSTD``."""
+PLAIN = b"\x00"
+ZSTD = b"\x01"
+
+COMPRESSION_THRESHOLD = 1024
+"""Encoded values of more than this many bytes are compressed."""
+COMPRESSION_LEVEL = 3
+
+# msgpack extension type codes
+EXT_DATETIME = 1
+EXT_DATE = 2
+EXT_TIME = 3
+EXT_TIMEDELTA = 4
+EXT_DECIMAL = 5
+EXT_UUID = 6
+EXT_TUPLE = 7
+EXT_SET = 8
+EXT_FROZENSET = 9
+EXT_MODEL = 10
+EXT_QUERYSET = 11
+EXT_DEFERRED = 12
+EXT_PICKLE = 127
+
+
+class CodecError(Exception):
+    """Raised when a cached value cannot be decoded."""
+
+
+def materialize(queryset: models.QuerySet) -> models.QuerySet:
+    """
+    Evaluate ``queryset``, so that it is cached with its results rather than as a lazy query.
+
+    :param queryset: A QuerySet.
+    :return: The same QuerySet, with its result cache filled.
+    """
+    # pylint: disable=protected-access
+    queryset._fetch_all()  # type: ignore[attr-defined]
+    return queryset
+
+
+class Encoder:
+    """
+    Encodes one value. Model instances that are already being encoded, further up
+    a chain of cached related objects, are not encoded again, so that cycles end.
+
+    :param name: The name of the value in warnings, e.g. its cache key.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.stack: set[int] = set()
+
+    def pack(self, value: Any) -> bytes:
+        """Return the msgpack bytes of ``value``."""
+        return msgpack.packb(value, default=self.default, strict_types=True, use_bin_type=True)
+
+    def default(self, obj: Any) -> msgpack.ExtType:
+        """Return the msgpack extension type of an object that msgpack does not serialize."""
+        # pylint: disable=too-many-return-statements
+        if isinstance(obj, datetime.datetime):
+            return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode("utf-8"))
+        if isinstance(obj, datetime.date):
+            return msgpack.ExtType(EXT_DATE, obj.isoformat().encode("utf-8"))
+        if isinstance(obj, datetime.time):
+            return msgpack.ExtType(EXT_TIME, obj.isoformat().encode("utf-8"))
+        if isinstance(obj, datetime.timedelta):
+            return msgpack.ExtType(EXT_TIMEDELTA, self.pack([obj.days, obj.seconds, obj.microseconds]))
+        if isinstance(obj, decimal.Decimal):
+            return msgpack.ExtType(EXT_DECIMAL, str(obj).encode("utf-8"))
+        if isinstance(obj, uuid.UUID):
+            return msgpack.ExtType(EXT_UUID, obj.bytes)
+        if type(obj) is tuple:  # pylint: disable=unidiomatic-typecheck
+            return msgpack.ExtType(EXT_TUPLE, self.pack(list(obj)))
+        if type(obj) is set:  # pylint: disable=unidiomatic-typecheck
+            return msgpack.ExtType(EXT_SET, self.pack(list(obj)))
+        if type(obj) is frozenset:  # pylint: disable=unidiomatic-typecheck
+            return msgpack.ExtType(EXT_FROZENSET, self.pack(list(obj)))
+        if obj is models.DEFERRED:
+            return msgpack.ExtType(EXT_DEFERRED, b"")
+        if isinstance(obj, models.Model) and obj.pk is not None and id(obj) not in self.stack:
+            return msgpack.ExtType(EXT_MODEL, self.pack(self.model(obj)))
+        if isinstance(obj, models.QuerySet) and issubclass(obj._iterable_class, ModelIterable):
+            return msgpack.ExtType(EXT_QUERYSET, self.pack(self.queryset(obj)))
+        if isinstance(obj, models.QuerySet):
+            # values() and values_list() QuerySets are cached as lists of their results.
+            self.warn_lazy(obj)
+            return list(obj)
+        return msgpack.ExtType(EXT_PICKLE, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def warn_lazy(self, queryset: models.QuerySet) -> None:
+        """Log a warning if ``queryset`` was not evaluated, because caching it runs its query."""
+        # pylint: disable=protected-access
+        if queryset._result_cache is None:  # type: ignore[attr-defined]
+            logger.warning(
+                "%s caching an unevaluated QuerySet of %s for %s. Evaluate it with materialize() before returning it.",
+                logger_prefix,
+                queryset.model.__name__,
+                self.name,
+            )
+
+    def row(self, instance: models.Model, attnames: list[str]) -> list[Any]:
+        """
+        Return the compact row of a model instance: the values of ``attnames``,
+        its cached related objects, and its other public attributes, such as
+        cached properties and annotations.
+        """
+        self.stack.add(id(instance))
+        try:
+            values = [instance.__dict__.get(attname, models.DEFERRED) for attname in attnames]
+            related = {
+                name: value
+                for name, value in instance._state.fields_cache.items()
+                if value is None or id(value) not in self.stack
+            }
+            fields = set(attnames) | {field.attname for field in instance._meta.concrete_fields}
+            extra = {
+                name: value
+                for name, value in instance.__dict__.items()
+                if not name.startswith("_") and name not in fields and id(value) not in self.stack
+            }
+            return [values, self.pack(related) if related else None, self.pack(extra) if extra else None]
+        finally:
+            self.stack.discard(id(instance))
+
+    def model(self, instance: models.Model) -> list[Any]:
+        """Return the label, database, field names and compact row of a model instance."""
+        attnames = [field.attname for field in instance._meta.concrete_fields if field.attname in instance.__dict__]
+        return [instance._meta.label, instance._state.db, attnames, self.row(instance, attnames)]
+
+    def queryset(self, queryset: models.QuerySet) -> list[Any]:
+        """Return the label, database, ordering, field names and compact rows of a QuerySet of model instances."""
+        self.warn_lazy(queryset)
+        instances = list(queryset)
+        meta = queryset.model._meta
+        attnames = [field.attname for field in meta.concrete_fields]
+        if instances:
+            loaded = set().union(*(instance.__dict__ for instance in instances))
+            attnames = [attname for attname in attnames if attname in loaded]
+        ordering = [str(field) for field in queryset.query.order_by if isinstance(field, str)]
+        rows = [self.row(instance, attnames) for instance in instances]
+        return [meta.label, queryset.db, ordering, attnames, rows]
+
+
+def encode(value: Any, name: Optional[str] = None, compress: bool = True) -> bytes:
+    """
+    Serialize a value for the cache.
+
+    :param value: The value.
+    :param name: The name of the value in warnings, e.g. its cache key.
+    :param compress: Compress values larger than ``COMPRESSION_THRESHOLD`` bytes with zstd.
+    :return: The encoded value.
+    :rtype: bytes
+    """
+    data = Encoder(name).pack(value)
+    if compress and len(data) > COMPRESSION_THRESHOLD:
+        return MAGIC + ZSTD + zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data)
+    return MAGIC + PLAIN + data
+
+
+def unpack(data: bytes) -> Any:
+    """Return the value of msgpack bytes that were packed by :class:`Encoder`."""
+    return msgpack.unpackb(data, ext_hook=ext_hook, raw=False, strict_map_key=False)
+
+
+def from_row(model: type[models.Model], db: str, attnames: list[str], row: list[Any]) -> models.Model:
+    """Return the model instance of a compact row, without a database query."""
+    values, related, extra = row
+    loaded = dict(zip(attnames, values))
+    fields = model._meta.concrete_fields
+    instance = model.from_db(
+        db, [field.attname for field in fields], [loaded.get(field.attname, models.DEFERRED) for field in fields]
+    )
+    if related:
+        instance._state.fields_cache.update(unpack(related))
+    if extra:
+        instance.__dict__.update(unpack(extra))
+    return instance
+
+
+def ext_hook(code: int, data: bytes) -> Any:
+    """Return the object of a msgpack extension type."""
+    # pylint: disable=too-many-return-statements
+    if code == EXT_DATETIME:
+        return datetime.datetime.fromisoformat(data.decode("utf-8"))
+    if code == EXT_DATE:
+        return datetime.date.fromisoformat(data.decode("utf-8"))
+    if code == EXT_TIME:
+        return datetime.time.fromisoformat(data.decode("utf-8"))
+    if code == EXT_TIMEDELTA:
+        days, seconds, microseconds = unpack(data)
+        return datetime.timedelta(days=days, seconds=seconds, microseconds=microseconds)
+    if code == EXT_DECIMAL:
+        return decimal.Decimal(data.decode("utf-8"))
+    if code == EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == EXT_TUPLE:
+        return tuple(unpack(data))
+    if code == EXT_SET:
+        return set(unpack(data))
+    if code == EXT_FROZENSET:
+        return frozenset(unpack(data))
+    if code == EXT_DEFERRED:
+        return models.DEFERRED
+    if code == EXT_MODEL:
+        label, db, attnames, row = unpack(data)
+        return from_row(apps.get_model(label), db, attnames, row)
+    if code == EXT_QUERYSET:
+        label, db, ordering, attnames, rows = unpack(data)
+        model = apps.get_model(label)
+        instances = [from_row(model, db, attnames, row) for row in rows]
+        queryset = model._default_manager.using(db).filter(pk__in=[instance.pk for instance in instances])
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        # pylint: disable=protected-access
+        queryset._result_cache = instances  # type: ignore[attr-defined]
+        queryset._prefetch_done = True  # type: ignore[attr-defined]
+        return queryset
+    if code == EXT_PICKLE:
+        return pickle.loads(data)
+    return msgpack.ExtType(code, data)
+
+
+def decode(value: Any) -> Any:
+    """
+    Return the value of an encoded cache value.
+
+    :param value: A value that was returned by :func:`encode`. Any other value is returned as is.
+    :return: The decoded value.
+    :raises CodecError: If the value cannot be decoded, e.g. because a cached model no longer exists.
+    """
+    if not isinstance(value, bytes) or not value.startswith(MAGIC):
+        return value
+    header = len(MAGIC)
+    data = value[header + 1 :]
+    try:
+        if value[header : header + 1] == ZSTD:
+            data = zstandard.ZstdDecompressor().decompress(data)
+        return unpack(data)
+    except (LookupError, TypeError, ValueError, msgpack.UnpackException, zstandard.ZstdError) as e:
+        raise CodecError(f"could not decode cached value: {e}") from e
+
+
+__all__ = ["CodecError", "decode", "encode", "materialize"]
@@ -18,6 +18,16 @@ for persistent, argument-based function result caching in the Smarter framework.
 - Optional logging for cache hits, misses, and invalidations for debugging and transparency.
 - Provides an ``invalidate`` method on decorated functions to manually clear cache entries
   for specific arguments.
+- Optional per-process LRU cache in front of Redis (``local=True``) for hot keys,
+  invalidated across processes and pods with Redis pub/sub (see ``local_cache``).
+- Compact msgpack serialization of cached values, in which model instances and
+  QuerySets are stored as rows and rehydrated without a query (see ``codec``).
+- Optional cache stampede protection: a per-key recompute lock, stale-while-revalidate
+  and probabilistic early expiration (see ``stampede``).
+- Optional tag-based invalidation of all the results of a tag at once, with
+  versioned tag namespaces (see ``tags``).
+- Sampled per-function metrics of hits, misses, errors, recompute time and
+  stored value sizes (see ``metrics``).
 
 **Usage Example:**
 
@@ -44,6 +54,7 @@ for persistent, argument-based function result caching in the Smarter framework.
 """
 
 import hashlib
+import time
 from functools import lru_cache, wraps
 from typing import Callable, Optional, Union
 
@@ -51,7 +62,12 @@ from smarter.common.conf import smarter_settings
 from smarter.lib import json, logging
 
 from .cache_sentinel import CACHE_MISS_SENTINEL, CACHE_NONE_SENTINEL
+from .codec import CodecError, decode, encode
 from .lazy_cache import lazy_cache
+from .local_cache import local_cache
+from .metrics import CacheMetrics
+from .stampede import get_or_compute, unwrap
+from .tags import versioned_key
 
 logger = logging.getLogger(__name__)
 logger_prefix_normal = logging.formatted_text(f"{__name__}.@cache_results()")
@@ -61,6 +77,7 @@ logger_prefix_blue = logging.formatted_text_blue(f"{__name__}.@cache_results()")
 
 LRU_CACHE_MAXSIZE = 128
 KwargsTupleType = tuple[tuple[str, object], ...]
+TagsType = Union[list[str], Callable[..., list[str]]]
 
 
 @lru_cache(maxsize=LRU_CACHE_MAXSIZE)
@@ -161,7 +178,47 @@ def _generate_cache_key_cached(func: Callable, key_data: bytes) -> str:
     return f"{func.__module__}.{func.__name__}()_" + hashlib.sha256(key_data).hexdigest()[:32]
 
 
-def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional[str] = None, logging_enabled=False):
+def _encode(value: object, cache_key: str, metrics: Optional[CacheMetrics] = None) -> object:
+    """
+    Return the compact serialization of a value to cache, or the value itself,
+    to be pickled by the cache backend, if it cannot be encoded.
+    """
+    try:
+        return encode(value, name=cache_key)
+    # pylint: disable=broad-except
+    except Exception as e:
+        logger.warning("%s could not encode %s, caching it as a pickle: %s", logger_prefix_normal, cache_key, e)
+        if metrics:
+            metrics.error()
+        return value
+
+
+def _encode_local(value: object, cache_key: str, metrics: Optional[CacheMetrics] = None) -> object:
+    """
+    Return the uncompressed serialization of a value to cache in the per-process
+    local cache, so that each hit decodes a copy that callers may modify.
+    """
+    try:
+        return encode(value, name=cache_key, compress=False)
+    # pylint: disable=broad-except
+    except Exception as e:
+        logger.warning("%s could not encode %s, caching it locally as is: %s", logger_prefix_normal, cache_key, e)
+        if metrics:
+            metrics.error()
+        return value
+
+
+def cache_results(
+    timeout=smarter_settings.cache_expiration,
+    cache_key: Optional[str] = None,
+    logging_enabled=False,
+    local: bool = False,
+    codec: bool = True,
+    lock: bool = False,
+    stale_timeout: int = 0,
+    early_expiration: float = 0.0,
+    tags: Optional[TagsType] = None,
+):
     """
     A decorator that caches the result of a function based on the arguments
     passed to it.
@@ -217,7 +274,38 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
     :type cache_key: Optional[str]
     :param logging_enabled: Whether to enable logging for cache hits and misses. Defaults to ``True``.
     :type logging_enabled: bool
-    :return: The decorated function with caching applied.
+    :param local: Whether to also cache results in the per-process LRU cache in front of Redis,
+        for at most ``smarter_settings.cache_local_expiration`` seconds. This saves the Redis
+        round trip of hot keys that are read many times per request. With ``codec``, results
+        are kept serialized and each hit decodes a copy, so callers may modify them; without it,
+        results are shared by the callers of a process, so only use it for functions whose
+        callers do not modify the results. Defaults to ``False``.
+    :type local: bool
+    :param codec: Whether to store results in Redis with the compact serializer of
+        :mod:`smarter.lib.cache.codec` rather than as pickles. Model instances and QuerySets
+        are stored as rows of their field values, and are rehydrated without a database query.
+        Defaults to ``True``.
+    :type codec: bool
+    :param lock: Whether only one caller at a time, across all processes, recomputes a missing
+        result, while the others wait for it. Defaults to ``False``.
+    :type lock: bool
+    :param stale_timeout: The number of seconds after ``timeout`` for which an expired result
+        is still returned while one caller recomputes it (stale-while-revalidate). Implies ``lock``.
+        Defaults to ``0``.
+    :type stale_timeout: int
+    :param early_expiration: The ``beta`` of probabilistic early expiration. When greater than 0,
+        callers recompute a result before it expires, with a probability that grows as it nears
+        its expiry and with the time that it took to compute, so that recomputation of hot keys
+        is spread out. ``1.0`` is a good default. Implies ``lock``. Defaults to ``0.0``.
+    :type early_expiration: float
+    :param tags: The tags of the results, or a function that is called with the arguments of the
+        decorated function and returns them. All the results of a tag are invalidated at once
+        with :func:`smarter.lib.cache.tags.invalidate_tags`. Looking up the versions of the tags
+        costs one more Redis round trip per call, also with ``local=True``. Defaults to ``None``.
+    :type tags: Optional[Union[list[str], Callable[..., list[str]]]]
+    :return: The decorated function with caching applied. Its ``metrics`` attribute is the
+        :class:`smarter.lib.cache.metrics.CacheMetrics` of the function, which are sampled
+        with ``smarter_settings.cache_metrics_sample_rate``.
     :rtype: Callable
 
     .. note::
@@ -236,8 +324,49 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
 
     """
 
+    protected = lock or stale_timeout > 0 or early_expiration > 0
+
+    def tagged_key(computed_cache_key: str, args: tuple, kwargs: dict) -> str:
+        if not tags:
+            return computed_cache_key
+        return versioned_key(computed_cache_key, tags(*args, **kwargs) if callable(tags) else tags)
+
     def decorator(func: Callable) -> Callable:
 
+        metrics = CacheMetrics(f"{func.__module__}.{func.__qualname__}")
+
+        def load(computed_cache_key: str) -> object:
+            cached_result = lazy_cache.get(computed_cache_key, CACHE_MISS_SENTINEL)
+            if codec and cached_result is not CACHE_MISS_SENTINEL:
+                try:
+                    cached_result = decode(cached_result)
+                except CodecError as e:
+                    logger.warning("%s discarding cached %s: %s", logger_prefix_normal, computed_cache_key, e)
+                    metrics.error()
+                    cached_result = CACHE_MISS_SENTINEL
+            return cached_result
+
+        def store(computed_cache_key: str, cache_value: object, cache_timeout: Optional[float]) -> object:
+            stored = _encode(cache_value, computed_cache_key, metrics) if codec else cache_value
+            lazy_cache.set(computed_cache_key, stored, cache_timeout)
+            return stored
+
+        def load_local(computed_cache_key: str) -> object:
+            local_result = local_cache.get(computed_cache_key)
+            if codec and local_result is not CACHE_MISS_SENTINEL:
+                try:
+                    local_result = decode(local_result)
+                except CodecError as e:
+                    logger.warning("%s discarding local %s: %s", logger_prefix_normal, computed_cache_key, e)
+                    metrics.error()
+                    local_cache.delete(computed_cache_key)
+                    local_result = CACHE_MISS_SENTINEL
+            return local_result
+
+        def store_local(computed_cache_key: str, cache_value: object, cache_timeout: Optional[float]) -> None:
+            stored = _encode_local(cache_value, computed_cache_key, metrics) if codec else cache_value
+            local_cache.set(computed_cache_key, stored, cache_timeout)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             """
@@ -269,7 +398,21 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
                 If the function returns ``None``, a special sentinel value is cached to distinguish between a
                 cached ``None`` and a true cache miss.
 
-            5. **Logging (Optional):**
+            5. **Local Cache (Optional):**
+                With ``local=True``, the per-process LRU cache is checked before Redis, and results
+                that are read from Redis or computed are also cached in it, serialized, so that
+                each hit returns a copy.
+
+            6. **Stampede Protection (Optional):**
+                With ``lock``, ``stale_timeout`` or ``early_expiration``, results are cached with
+                their expiry and compute time, and only the caller that holds the per-key lock
+                recomputes them. See :func:`smarter.lib.cache.stampede.get_or_compute`.
+
+            7. **Tags (Optional):**
+                With ``tags``, the cache key includes the current versions of the tags, so that
+                invalidating a tag moves its results to a new namespace.
+
+            8. **Logging (Optional):**
                 If logging is enabled, the wrapper logs cache hits, misses, and cache invalidations for
                 debugging and transparency.
 
@@ -311,16 +454,75 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
                 # This is a fallback to avoid breaking the application in case of pickling errors.
                 if key_data is None:
                     logger.error("%s Failed to generate cache key data for %s", logger_prefix_normal, func.__name__)
+                    metrics.error()
                     return func(*args, **kwargs)
                 computed_cache_key = _generate_cache_key_cached(func, key_data)
+            computed_cache_key = tagged_key(computed_cache_key, args, kwargs)
+
+            weight = metrics.sample()
+            use_local = local and local_cache.enabled
+            if use_local:
+                local_result = load_local(computed_cache_key)
+                if local_result is not CACHE_MISS_SENTINEL:
+                    if weight:
+                        metrics.hit(weight, local=True)
+                    return (
+                        None if isinstance(local_result, str) and local_result == CACHE_NONE_SENTINEL else local_result
+                    )
+
+            if protected:
+                observed: dict[str, object] = {}
+
+                def compute() -> object:
+                    start = time.monotonic()
+                    result = func(*args, **kwargs)
+                    observed["seconds"] = time.monotonic() - start
+                    return CACHE_NONE_SENTINEL if result is None else result
+
+                def store_observed(computed_cache_key: str, cache_value: object, cache_timeout: Optional[float]):
+                    observed["stored"] = store(computed_cache_key, cache_value, cache_timeout)
+
+                cache_value, hit = get_or_compute(
+                    computed_cache_key,
+                    compute,
+                    load=load,
+                    store=store_observed,
+                    timeout=timeout,
+                    stale_timeout=stale_timeout,
+                    early_expiration=early_expiration,
+                )
+                if weight and hit:
+                    metrics.hit(weight)
+                elif weight:
+                    metrics.miss(weight, observed.get("seconds"), observed.get("stored"))  # type: ignore[arg-type]
+                if use_local:
+                    store_local(computed_cache_key, cache_value, timeout)
+                if logging_enabled or lazy_cache.cache_logging:
+                    logger.info(
+                        "%s cache %s for %s args: %s kwargs: %s",
+                        logger_prefix_green if hit else logger_prefix_red,
+                        "hit" if hit else "miss",
+                        computed_cache_key,
+                        args,
+                        kwargs,
+                    )
+                return None if isinstance(cache_value, str) and cache_value == CACHE_NONE_SENTINEL else cache_value
 
             # look for a cached result ...
-            cached_result = lazy_cache.get(computed_cache_key, CACHE_MISS_SENTINEL)
+            cached_result = load(computed_cache_key)
+            envelope = unwrap(cached_result)
+            if envelope is not None:
+                # cached while the decorator had stampede protection
+                cached_result = envelope[0]
             if cached_result is not CACHE_MISS_SENTINEL:
                 # cache hit, hooray!
                 result = (
                     None if isinstance(cached_result, str) and cached_result == CACHE_NONE_SENTINEL else cached_result
                 )
+                if weight:
+                    metrics.hit(weight)
+                if use_local:
+                    store_local(computed_cache_key, cached_result, timeout)
                 if logging_enabled or lazy_cache.verbose_logging:
                     class_name = kwargs.get("class_name", "")
                     class_name = f"{class_name} - " if class_name else ""
@@ -346,9 +548,15 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
                     )
             else:
                 # Cache miss, boo! Call the function ...
+                start = time.monotonic()
                 result = func(*args, **kwargs)
+                seconds = time.monotonic() - start
                 cache_value = CACHE_NONE_SENTINEL if result is None else result
-                lazy_cache.set(computed_cache_key, cache_value, timeout)
+                stored = store(computed_cache_key, cache_value, timeout)
+                if weight:
+                    metrics.miss(weight, seconds, stored)
+                if use_local:
+                    store_local(computed_cache_key, cache_value, timeout)
                 if logging_enabled or lazy_cache.verbose_logging:
                     logger.info(
                         "%s caching %s - %s, with timeout %s args: %s kwargs: %s for %s",
@@ -400,6 +608,7 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
                 if key_data is None:
                     return
                 computed_cache_key: str = _generate_cache_key_cached(func, key_data)
+            computed_cache_key = tagged_key(computed_cache_key, args, kwargs)
             if lazy_cache.has_key(computed_cache_key):
                 cached_value = lazy_cache.get(computed_cache_key)
                 lazy_cache.delete(computed_cache_key)
@@ -415,8 +624,13 @@ def cache_results(timeout=smarter_settings.cache_expiration, cache_key: Optional
                     logger_prefix_red + logging.formatted_text_red(func.__name__ + "().invalidate()"),
                     computed_cache_key,
                 )
+            # after Redis, so that other processes do not cache the value again from Redis
+            if local:
+                local_cache.delete(computed_cache_key)
+                local_cache.broadcast(computed_cache_key)
 
         wrapper.invalidate = invalidate  # type: ignore[attr-defined]
+        wrapper.metrics = metrics  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
@@ -0,0 +1,186 @@
+"""
+smarter.lib.cache.local_cache
+=============================
+
+This module provides the per-process, in-memory cache that ``@cache_results``
+uses in front of Redis for functions that are decorated with ``local=True``.
+
+**Key Features:**
+
+- Defines the ``LocalCache`` class, a thread-safe, size-bounded LRU cache in
+  which each value has its own lifetime.
+- Invalidations are broadcast to every process of every pod with Redis
+  pub/sub, on the ``INVALIDATION_CHANNEL`` channel. Each process listens on a
+  daemon thread that is started when the process first caches a value, so
+  that forked workers listen too.
+- When the listener loses its connection to Redis, it clears the cache,
+  because invalidations may have been missed, and reconnects.
+
+**Usage Example:**
+
+.. code-block:: python
+
+    from smarter.lib.cache.local_cache import local_cache
+
+    local_cache.set("my_key", "my_value", timeout=10)
+    value = local_cache.get("my_key")
+
+    # delete the key in this process and all others
+    local_cache.delete("my_key")
+    local_cache.broadcast("my_key")
+
+**Notes:**
+
+- Values are not copied, so the callers of a process share the same objects.
+  Only cache values that callers do not modify. ``@cache_results`` caches the
+  serialization of its results here, so that each hit decodes a copy.
+- The lifetime of local values is bounded by ``smarter_settings.cache_local_expiration``,
+  which also bounds the staleness of a value whose invalidation is lost.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from smarter.common.conf import smarter_settings
+from smarter.lib import logging
+
+from .cache_sentinel import CACHE_MISS_SENTINEL
+
+logger = logging.getLogger(__name__)
+logger_prefix = logging.formatted_text(f"{__name__}.LocalCache()")
+
+INVALIDATION_CHANNEL = "smarter.cache.invalidate"
+"""The Redis pub/sub channel of the keys that are invalidated."""
+
+RECONNECT_DELAY = 5
+"""Seconds to wait before the listener reconnects to Redis."""
+
+
+def get_redis_client() -> Any:
+    """Return a client of the default Redis cache."""
+    # pylint: disable=import-outside-toplevel
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+class LocalCache:
+    """
+    A thread-safe, size-bounded LRU cache with a lifetime per value, for one process.
+
+    :param max_entries: The maximum number of values. Defaults to ``smarter_settings.cache_local_max_entries``.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener_pid: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} entries={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_entries(self) -> int:
+        """The maximum number of values."""
+        return self._max_entries or smarter_settings.cache_local_max_entries
+
+    @property
+    def enabled(self) -> bool:
+        """True if values can be cached, see ``smarter_settings.cache_local_expiration``."""
+        return smarter_settings.cache_local_expiration > 0
+
+    def get(self, key: str, default: Any = CACHE_MISS_SENTINEL) -> Any:
+        """Return the value of ``key``, or ``default`` if it is not cached or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        """
+        Cache ``value`` for at most ``smarter_settings.cache_local_expiration`` seconds.
+
+        :param key: The cache key.
+        :param value: The value.
+        :param timeout: A shorter lifetime in seconds, e.g. the timeout of the value in Redis.
+        """
+        lifetime = smarter_settings.cache_local_expiration
+        if timeout is not None:
+            lifetime = min(lifetime, timeout)
+        if lifetime <= 0:
+            return
+        self.listen()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        """Delete ``key`` from the cache of this process. Returns True if it was cached."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Delete all values from the cache of this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def broadcast(self, key: str) -> None:
+        """Delete ``key`` from the local caches of all other processes."""
+        try:
+            get_redis_client().publish(INVALIDATION_CHANNEL, key)
+        # pylint: disable=broad-except
+        except Exception as e:
+            logger.warning("%s.broadcast() failed to publish the invalidation of %s: %s", logger_prefix, key, e)
+
+    def listen(self) -> None:
+        """Start the invalidation listener of this process, unless it is already running."""
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            # values of a parent process were not invalidated since the fork.
+            self._entries.clear()
+            self._listener_pid = pid
+        threading.Thread(target=self._listen, name="local-cache-invalidation", daemon=True).start()
+
+    def _listen(self) -> None:
+        """Delete the keys that are published to ``INVALIDATION_CHANNEL``, reconnecting when the connection is lost."""
+        while True:
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    key = message.get("data")
+                    if isinstance(key, bytes):
+                        key = key.decode("utf-8")
+                    if isinstance(key, str):
+                        self.delete(key)
+            # pylint: disable=broad-except
+            except Exception as e:
+                logger.warning("%s._listen() lost the invalidation channel, clearing the cache: %s", logger_prefix, e)
+            self.clear()
+            time.sleep(RECONNECT_DELAY)
+
+
+local_cache = LocalCache()
+"""The local cache of this process."""
+
+
+__all__ = ["INVALIDATION_CHANNEL", "LocalCache", "local_cache"]
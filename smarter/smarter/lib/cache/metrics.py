@@ -0,0 +1,189 @@
+"""
+smarter.lib.cache.metrics
+=========================
+
+This module provides the per-function metrics of ``@cache_results``: hits,
+misses, errors, recompute time, and a histogram of the sizes of the values
+that are stored in Redis.
+
+**Key Features:**
+
+- Counters are kept in one Redis hash per decorated function, so that they
+  aggregate the calls of every process of every pod.
+- Calls are sampled with ``smarter_settings.cache_metrics_sample_rate``, and
+  each sampled call is counted as ``1 / sample_rate`` calls, so that the counts
+  estimate the totals without a Redis write on every call. Errors are always
+  counted.
+- Metrics are read with :func:`get_metrics`, which adds the hit rate and the
+  average recompute time and value size of each function. They are exposed by
+  the dashboard ``cache-metrics`` API endpoint and the ``cache_metrics``
+  management command.
+
+**Usage Example:**
+
+.. code-block:: python
+
+    from smarter.lib.cache.metrics import get_metrics
+
+    for metrics in get_metrics():
+        print(metrics["name"], metrics["hit_rate"])
+
+**Notes:**
+
+- Failures to write metrics are logged and otherwise ignored, so that they
+  never fail a cached function call.
+"""
+
+import pickle
+import random
+from typing import Any, Optional
+
+from smarter.common.conf import smarter_settings
+from smarter.lib import logging
+
+from .local_cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+logger_prefix = logging.formatted_text(f"{__name__}")
+
+METRICS_KEY = "smarter.cache.metrics"
+"""The Redis set of the names of the functions that have metrics, and the prefix of their hashes."""
+
+COUNTERS = ["hits", "local_hits", "misses", "errors", "compute_ms", "stored", "stored_bytes"]
+"""The counters of each function."""
+
+SIZE_BUCKETS = [(1024, "size_1kb"), (10 * 1024, "size_10kb"), (100 * 1024, "size_100kb"), (1024 * 1024, "size_1mb")]
+"""The upper bounds, in bytes, and the counters of the histogram of the sizes of stored values."""
+SIZE_OVERFLOW = "size_over_1mb"
+SIZE_COUNTERS = [counter for _, counter in SIZE_BUCKETS] + [SIZE_OVERFLOW]
+
+
+def metrics_key(name: str) -> str:
+    """Return the key of the Redis hash of the metrics of function ``name``."""
+    return f"{METRICS_KEY}:{name}"
+
+
+def size_of(value: Any) -> Optional[int]:
+    """Return the size in bytes of a value that is stored in Redis, or None if it cannot be pickled."""
+    if isinstance(value, bytes):
+        return len(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    # pylint: disable=broad-except
+    except Exception:
+        return None
+
+
+def size_counter(size: int) -> str:
+    """Return the histogram counter of a value of ``size`` bytes."""
+    for bound, counter in SIZE_BUCKETS:
+        if size <= bound:
+            return counter
+    return SIZE_OVERFLOW
+
+
+class CacheMetrics:
+    """
+    The metrics of one function that is decorated with ``@cache_results``.
+
+    :param name: The name of the function, e.g. ``smarter.apps.plugin.caching._get_cached_plugins_owned_by_user_profile``.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name}>"
+
+    def sample(self) -> int:
+        """
+        Decide whether to record the current call.
+
+        :return: The number of calls that the call counts for, or 0 if it is not recorded.
+        :rtype: int
+        """
+        rate = smarter_settings.cache_metrics_sample_rate
+        if rate <= 0 or random.random() >= rate:
+            return 0
+        return max(1, round(1 / rate))
+
+    def hit(self, weight: int, local: bool = False) -> None:
+        """Record a cache hit, from the local cache if ``local``."""
+        counters = {"hits": weight}
+        if local:
+            counters["local_hits"] = weight
+        self.record(counters)
+
+    def miss(self, weight: int, seconds: Optional[float] = None, stored: Any = None) -> None:
+        """
+        Record a cache miss.
+
+        :param weight: The number of calls that the call counts for.
+        :param seconds: The time that the function took to compute the value.
+        :param stored: The value that was stored in Redis, for the size histogram.
+        """
+        counters = {"misses": weight}
+        if seconds is not None:
+            counters["compute_ms"] = round(seconds * 1000) * weight
+        size = None if stored is None else size_of(stored)
+        if size is not None:
+            counters["stored"] = weight
+            counters["stored_bytes"] = size * weight
+            counters[size_counter(size)] = weight
+        self.record(counters)
+
+    def error(self) -> None:
+        """Record a cache error, such as a value that could not be encoded or decoded. Errors are not sampled."""
+        self.record({"errors": 1})
+
+    def record(self, counters: dict[str, int]) -> None:
+        """Add ``counters`` to the metrics of the function in Redis."""
+        try:
+            pipeline = get_redis_client().pipeline(transaction=False)
+            pipeline.sadd(METRICS_KEY, self.name)
+            for counter, value in counters.items():
+                pipeline.hincrby(metrics_key(self.name), counter, value)
+            pipeline.execute()
+        # pylint: disable=broad-except
+        except Exception as e:
+            logger.debug("%s could not record the metrics of %s: %s", logger_prefix, self.name, e)
+
+
+def get_metrics() -> list[dict[str, Any]]:
+    """
+    Return the metrics of every function that has any.
+
+    Besides its counters, the metrics of each function include ``calls``,
+    ``hit_rate``, ``avg_compute_ms`` and ``avg_bytes``.
+
+    :return: The metrics, as dicts, sorted by name.
+    :rtype: list[dict[str, Any]]
+    """
+    client = get_redis_client()
+    names = sorted(name.decode("utf-8") if isinstance(name, bytes) else name for name in client.smembers(METRICS_KEY))
+    pipeline = client.pipeline(transaction=False)
+    for name in names:
+        pipeline.hgetall(metrics_key(name))
+    retval = []
+    for name, values in zip(names, pipeline.execute()):
+        counters = {key.decode("utf-8") if isinstance(key, bytes) else key: int(value) for key, value in values.items()}
+        metrics: dict[str, Any] = {"name": name}
+        metrics.update({counter: counters.get(counter, 0) for counter in COUNTERS + SIZE_COUNTERS})
+        calls = metrics["hits"] + metrics["misses"]
+        metrics["calls"] = calls
+        metrics["hit_rate"] = round(metrics["hits"] / calls, 4) if calls else None
+        metrics["avg_compute_ms"] = round(metrics["compute_ms"] / metrics["misses"], 1) if metrics["misses"] else None
+        metrics["avg_bytes"] = round(metrics["stored_bytes"] / metrics["stored"]) if metrics["stored"] else None
+        retval.append(metrics)
+    return retval
+
+
+def reset_metrics() -> None:
+    """Delete the metrics of every function."""
+    client = get_redis_client()
+    names = client.smembers(METRICS_KEY)
+    keys = [metrics_key(name.decode("utf-8") if isinstance(name, bytes) else name) for name in names]
+    client.delete(METRICS_KEY, *keys)
+
+
+__all__ = ["CacheMetrics", "get_metrics", "reset_metrics"]
@@ -0,0 +1,159 @@
+"""
+smarter.lib.cache.stampede
+==========================
+
+This module provides the cache stampede protection of ``@cache_results``,
+for functions that are decorated with ``stale_timeout`` or ``early_expiration``.
+
+When a popular key expires, every concurrent caller misses at the same moment
+and runs the same expensive function. With stampede protection:
+
+- values are cached with the time at which they expire and the time that
+  they took to compute, and are kept in Redis for ``stale_timeout`` seconds
+  more than their timeout,
+- only the caller that acquires a per-key Redis lock recomputes an expired
+  value. The other callers are served the expired value meanwhile
+  (stale-while-revalidate), or, if there is none, wait for the lock holder,
+- with ``early_expiration``, each caller recomputes a value before it expires
+  with a probability that grows as it nears its expiry, and with the time that
+  it took to compute (probabilistic early expiration, or "XFetch"), so that
+  recomputation is spread out rather than aligned with TTL boundaries.
+
+See: https://cseweb.ucsd.edu/~avattani/papers/cache_stampede.pdf
+"""
+
+import math
+import random
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from smarter.lib import logging
+
+from .cache_sentinel import CACHE_MISS_SENTINEL
+from .lazy_cache import lazy_cache
+
+logger = logging.getLogger(__name__)
+logger_prefix = logging.formatted_text(f"{__name__}")
+
+ENVELOPE = "smarter.cache.stampede"
+"""The first item of the tuples in which values with stampede protection are cached."""
+
+LOCK_TIMEOUT = 30
+"""Seconds after which the recompute lock of a key expires, in case its holder dies."""
+LOCK_WAIT = 5
+"""The maximum number of seconds that a caller waits for the lock holder to cache a missing value."""
+LOCK_POLL_INTERVAL = 0.05
+
+
+def lock_key(cache_key: str) -> str:
+    """Return the key of the recompute lock of ``cache_key``."""
+    return f"{cache_key}.lock"
+
+
+def wrap(value: Any, timeout: Optional[float], delta: float) -> tuple:
+    """Return the cached envelope of a value that took ``delta`` seconds to compute."""
+    expires = math.inf if timeout is None else time.time() + timeout
+    return (ENVELOPE, value, expires, delta)
+
+
+def unwrap(cached: Any) -> Optional[tuple[Any, float, float]]:
+    """Return the value, expiry time and compute time of a cached envelope, or None if ``cached`` is not one."""
+    if isinstance(cached, tuple) and len(cached) == 4 and cached[0] == ENVELOPE:
+        return cached[1], cached[2], cached[3]
+    return None
+
+
+def is_expired(expires: float, delta: float, early_expiration: float = 0.0) -> bool:
+    """
+    Return True if a value should be recomputed.
+
+    With ``early_expiration`` (the XFetch ``beta``, typically 1.0), a value is
+    recomputed early with a probability that grows as ``expires`` nears, and with
+    the time that it took to compute, ``delta``.
+    """
+    now = time.time()
+    if early_expiration > 0 and delta > 0:
+        now -= delta * early_expiration * math.log(1.0 - random.random())
+    return now >= expires
+
+
+def acquire(cache_key: str) -> Optional[str]:
+    """Acquire the recompute lock of ``cache_key``. Returns the lock token, or None if it is held."""
+    token = uuid.uuid4().hex
+    if lazy_cache.add(lock_key(cache_key), token, timeout=LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def release(cache_key: str, token: str) -> None:
+    """Release the recompute lock of ``cache_key``, unless it expired and another caller holds it."""
+    if lazy_cache.get(lock_key(cache_key)) == token:
+        lazy_cache.delete(lock_key(cache_key))
+
+
+def get_or_compute(
+    cache_key: str,
+    compute: Callable[[], Any],
+    load: Callable[[str], Any],
+    store: Callable[[str, Any, Optional[float]], None],
+    timeout: Optional[float],
+    stale_timeout: float = 0,
+    early_expiration: float = 0.0,
+) -> tuple[Any, bool]:
+    """
+    Return the cached value of ``cache_key``, recomputing it with stampede protection.
+
+    :param cache_key: The cache key.
+    :param compute: Returns the value.
+    :param load: Returns the cached envelope of a key, or ``CACHE_MISS_SENTINEL``.
+    :param store: Caches the envelope of a key for a timeout.
+    :param timeout: The number of seconds for which values are fresh, or None for no expiry.
+    :param stale_timeout: The number of seconds after ``timeout`` for which values are served
+        while a caller recomputes them.
+    :param early_expiration: The XFetch ``beta`` of probabilistic early expiration. 0 disables it.
+    :return: The value, and True if it was served from the cache.
+    :rtype: tuple[Any, bool]
+    """
+
+    def recompute() -> Any:
+        start = time.monotonic()
+        value = compute()
+        envelope = wrap(value, timeout, time.monotonic() - start)
+        store(cache_key, envelope, None if timeout is None else timeout + stale_timeout)
+        return value
+
+    envelope = unwrap(load(cache_key))
+    if envelope is not None:
+        value, expires, delta = envelope
+        if not is_expired(expires, delta, early_expiration):
+            return value, True
+        token = acquire(cache_key)
+        if token is None:
+            logger.debug("%s serving stale %s while it is recomputed", logger_prefix, cache_key)
+            return value, True
+        try:
+            return recompute(), False
+        finally:
+            release(cache_key, token)
+
+    token = acquire(cache_key)
+    if token is not None:
+        try:
+            return recompute(), False
+        finally:
+            release(cache_key, token)
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        envelope = unwrap(load(cache_key))
+        if envelope is not None:
+            return envelope[0], True
+        if lazy_cache.get(lock_key(cache_key), CACHE_MISS_SENTINEL) is CACHE_MISS_SENTINEL:
+            break
+    logger.warning("%s recomputing %s without the lock", logger_prefix, cache_key)
+    return recompute(), False
+
+
+__all__ = ["get_or_compute", "is_expired", "unwrap", "wrap"]
@@ -0,0 +1,108 @@
+"""
+smarter.lib.cache.tags
+======================
+
+This module provides the tag-based invalidation of ``@cache_results``,
+for functions that are decorated with ``tags``.
+
+Each tag has a version number in Redis. The cache key of a tagged result
+includes the current versions of its tags, so invalidating a tag is a
+single ``incr`` of its version, however many results it tags: the results
+that were cached under the old version are no longer read, and expire.
+
+**Usage Example:**
+
+.. code-block:: python
+
+    from smarter.lib.cache import cache_results
+    from smarter.lib.cache.tags import invalidate_tags, model_tag
+
+    @cache_results(tags=lambda user_profile_id: [model_tag(Plugin), model_tag(UserProfile, user_profile_id)])
+    def get_plugins(user_profile_id: int):
+        ...
+
+    # invalidate the cached results of every user profile
+    invalidate_tags(model_tag(Plugin))
+
+**Notes:**
+
+- Tags of model classes are invalidated when any instance of a
+  ``MetaDataWithOwnershipModel`` is saved or deleted, see
+  ``smarter.apps.account.receivers``. ``QuerySet.update()`` and
+  ``bulk_create()`` do not send these signals.
+- New tag versions are initialized with the current time in nanoseconds
+  rather than 0, so that a tag whose version was evicted from Redis does
+  not return to a version under which stale results are still cached.
+"""
+
+import hashlib
+import time
+from typing import Iterable, Optional, Union
+
+from django.db import models
+
+from smarter.lib import logging
+
+from .lazy_cache import lazy_cache
+
+logger = logging.getLogger(__name__)
+logger_prefix = logging.formatted_text(f"{__name__}")
+
+TAG_PREFIX = "smarter.cache.tag."
+"""The prefix of the cache keys of tag versions."""
+
+
+def tag_key(tag: str) -> str:
+    """Return the cache key of the version of ``tag``."""
+    return f"{TAG_PREFIX}{tag}"
+
+
+def model_tag(model: Union[type[models.Model], models.Model], pk: Optional[object] = None) -> str:
+    """
+    Return the tag of a model class, or of one of its instances.
+
+    :param model: A model class or instance.
+    :param pk: The primary key of an instance. Defaults to the class tag.
+    :return: e.g. ``model:plugin.pluginmeta`` or ``model:account.userprofile:42``.
+    :rtype: str
+    """
+    tag = f"model:{model._meta.label_lower}"
+    return tag if pk is None else f"{tag}:{pk}"
+
+
+def model_tags(instance: models.Model) -> list[str]:
+    """Return the class tags of a model instance: its model, and its concrete parent models."""
+    return [model_tag(model) for model in [type(instance), *instance._meta.get_parent_list()]]
+
+
+def get_tag_versions(tags: Iterable[str]) -> list[int]:
+    """Return the current versions of ``tags``, initializing the missing ones."""
+    keys = [tag_key(tag) for tag in tags]
+    versions = lazy_cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = time.time_ns()
+            if not lazy_cache.add(key, version, timeout=None):
+                version = lazy_cache.get(key, version)
+            versions[key] = version
+    return [versions[key] for key in keys]
+
+
+def versioned_key(cache_key: str, tags: Iterable[str]) -> str:
+    """Return ``cache_key`` in the namespace of the current versions of ``tags``."""
+    versions = ".".join(str(version) for version in get_tag_versions(tags))
+    return f"{cache_key}_" + hashlib.sha256(versions.encode("utf-8")).hexdigest()[:16]
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Invalidate the cached results of every function call that is tagged with any of ``tags``."""
+    for tag in tags:
+        try:
+            lazy_cache.incr(tag_key(tag))
+        except ValueError:
+            # the version was evicted or never read. A new one starts a new namespace.
+            lazy_cache.set(tag_key(tag), time.time_ns(), timeout=None)
+        logger.debug("%s invalidated tag %s", logger_prefix, tag)
+
+
+__all__ = ["get_tag_versions", "invalidate_tags", "model_tag", "model_tags", "versioned_key"]
@@ -1,7 +1,23 @@
 """Test cases for the cache decorators."""
 
+import datetime
+import decimal
+import time
+import uuid
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from smarter.lib.cache import cache_results
+from smarter.lib.cache.cache_sentinel import CACHE_MISS_SENTINEL
+from smarter.lib.cache.codec import decode, encode, materialize
 from smarter.lib.cache.lazy_cache import LazyCache
+from smarter.lib.cache.local_cache import LocalCache, local_cache
+from smarter.lib.cache.metrics import CacheMetrics, size_counter
+from smarter.lib.cache.stampede import is_expired
+from smarter.lib.cache.tags import invalidate_tags, model_tag, model_tags
 from smarter.lib.unittest.base_classes import SmarterTestBase
 
 
@@ -111,6 +127,7 @@ class TestCacheResults(SmarterTestBase):
         # Clear cache before each test to avoid interference
         lazy_cache = LazyCache()
         lazy_cache.clear()
+        local_cache.clear()
 
     def test_cache_miss_and_hit(self):
         calls = []
@@ -189,3 +206,201 @@ class TestCacheResults(SmarterTestBase):
         self.assertEqual(len(calls), 2)
         self.assertEqual(f(2, 3), 6)
         self.assertEqual(len(calls), 2)
+
+    def test_cache_local(self):
+        calls = []
+
+        @cache_results(timeout=60, local=True)
+        def cube(x):
+            calls.append(x)
+            return x**3
+
+        self.assertEqual(cube(2), 8)
+        # served from the local cache without Redis
+        with patch("smarter.lib.cache.decorators.lazy_cache") as redis_cache:
+            self.assertEqual(cube(2), 8)
+            redis_cache.get.assert_not_called()
+        self.assertEqual(len(calls), 1)
+        with patch.object(local_cache, "broadcast") as broadcast:
+            cube.invalidate(2)
+            broadcast.assert_called_once()
+        self.assertEqual(cube(2), 8)
+        self.assertEqual(len(calls), 2)
+
+    def test_cache_local_returns_copies(self):
+        @cache_results(timeout=60, local=True)
+        def settings_of(name):
+            return {"name": name, "tags": ["a"]}
+
+        first = settings_of("x")
+        first["tags"].append("b")
+        with patch("smarter.lib.cache.decorators.lazy_cache") as redis_cache:
+            second = settings_of("x")
+            redis_cache.get.assert_not_called()
+        self.assertEqual(second, {"name": "x", "tags": ["a"]})
+        self.assertIsNot(settings_of("x"), second)
+        settings_of.invalidate("x")
+
+    def test_cache_stale_while_revalidate(self):
+        calls = []
+
+        @cache_results(timeout=60, stale_timeout=60)
+        def square(x):
+            calls.append(x)
+            return x * len(calls)
+
+        self.assertEqual(square(3), 3)
+        self.assertEqual(square(3), 3)
+        self.assertEqual(len(calls), 1)
+        with patch("smarter.lib.cache.stampede.time.time", return_value=time.time() + 90):
+            # expired, and another caller holds the lock: the stale value is served
+            with patch("smarter.lib.cache.stampede.acquire", return_value=None):
+                self.assertEqual(square(3), 3)
+            self.assertEqual(len(calls), 1)
+            # expired, and this caller holds the lock: the value is recomputed
+            self.assertEqual(square(3), 6)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(square(3), 6)
+
+    def test_cache_early_expiration(self):
+        calls = []
+
+        @cache_results(timeout=60, early_expiration=1.0)
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        self.assertEqual(double(4), 8)
+        with patch("smarter.lib.cache.stampede.random.random", return_value=0.0):
+            self.assertEqual(double(4), 8)
+        self.assertEqual(len(calls), 1)
+        with patch("smarter.lib.cache.stampede.is_expired", return_value=True):
+            self.assertEqual(double(4), 8)
+        self.assertEqual(len(calls), 2)
+
+    def test_is_expired(self):
+        expires = time.time() + 10
+        self.assertFalse(is_expired(expires, delta=1.0))
+        self.assertTrue(is_expired(time.time() - 1, delta=1.0))
+        # the later a value expires, and the faster it computes, the less likely an early expiration
+        with patch("smarter.lib.cache.stampede.random.random", return_value=0.0):
+            self.assertFalse(is_expired(expires, delta=1.0, early_expiration=1.0))
+        with patch("smarter.lib.cache.stampede.random.random", return_value=1.0 - 2**-53):
+            self.assertTrue(is_expired(expires, delta=1.0, early_expiration=1.0))
+            self.assertFalse(is_expired(expires, delta=0.1, early_expiration=1.0))
+
+    def test_cache_tags(self):
+        calls = []
+
+        @cache_results(timeout=60, tags=lambda x: [f"test_tags:{x}", "test_tags:all"])
+        def triple(x):
+            calls.append(x)
+            return x * 3
+
+        self.assertEqual(triple(1), 3)
+        self.assertEqual(triple(2), 6)
+        self.assertEqual(triple(1), 3)
+        self.assertEqual(len(calls), 2)
+        invalidate_tags("test_tags:1")
+        self.assertEqual(triple(1), 3)
+        self.assertEqual(triple(2), 6)
+        self.assertEqual(len(calls), 3)
+        invalidate_tags("test_tags:all")
+        self.assertEqual(triple(1), 3)
+        self.assertEqual(triple(2), 6)
+        self.assertEqual(len(calls), 5)
+        triple.invalidate(2)
+        self.assertEqual(triple(2), 6)
+        self.assertEqual(len(calls), 6)
+
+    def test_model_tags(self):
+        self.assertEqual(model_tag(User), "model:auth.user")
+        self.assertEqual(model_tag(User, 42), "model:auth.user:42")
+        self.assertEqual(model_tags(User()), ["model:auth.user"])
+
+    def test_cache_metrics(self):
+        @cache_results(timeout=60)
+        def halve(x):
+            return x / 2
+
+        with patch.object(CacheMetrics, "sample", return_value=1), patch.object(CacheMetrics, "record") as record:
+            self.assertEqual(halve(4), 2)
+            self.assertEqual(halve(4), 2)
+        miss, hit = (call.args[0] for call in record.call_args_list)
+        self.assertEqual(miss["misses"], 1)
+        self.assertEqual(miss["stored"], 1)
+        self.assertEqual(sum(miss[counter] for counter in miss if counter.startswith("size_")), 1)
+        self.assertIn("compute_ms", miss)
+        self.assertEqual(hit, {"hits": 1})
+        self.assertTrue(halve.metrics.name.endswith("test_cache_metrics.<locals>.halve"))
+        # calls that are not sampled are not recorded
+        with patch.object(CacheMetrics, "sample", return_value=0), patch.object(CacheMetrics, "record") as record:
+            self.assertEqual(halve(4), 2)
+        record.assert_not_called()
+        self.assertEqual(size_counter(100), "size_1kb")
+        self.assertEqual(size_counter(2 * 1024 * 1024), "size_over_1mb")
+
+
+class TestLocalCache(SmarterTestBase):
+    """Unit tests for the per-process LocalCache."""
+
+    def setUp(self):
+        self.local_cache = LocalCache(max_entries=2)
+        listen = patch.object(self.local_cache, "listen")
+        listen.start()
+        self.addCleanup(listen.stop)
+
+    def test_lru_eviction(self):
+        self.local_cache.set("a", 1)
+        self.local_cache.set("b", 2)
+        self.assertEqual(self.local_cache.get("a"), 1)
+        self.local_cache.set("c", 3)
+        self.assertIs(self.local_cache.get("b"), CACHE_MISS_SENTINEL)
+        self.assertEqual(self.local_cache.get("a"), 1)
+        self.assertEqual(len(self.local_cache), 2)
+
+    def test_expiration_and_delete(self):
+        self.local_cache.set("a", 1, timeout=0)
+        self.assertIs(self.local_cache.get("a"), CACHE_MISS_SENTINEL)
+        self.local_cache.set("a", None, timeout=60)
+        self.assertIsNone(self.local_cache.get("a"))
+        self.assertTrue(self.local_cache.delete("a"))
+        self.assertFalse(self.local_cache.delete("a"))
+
+
+class TestCodec(SmarterTestBase):
+    """Unit tests for the compact cache value codec."""
+
+    def setUp(self):
+        self.user = User.objects.create(username=f"test_codec_{self.hash_suffix}", first_name="Ada")
+
+    def tearDown(self):
+        self.user.delete()
+
+    def test_values_keep_their_types(self):
+        value = {
+            "tuple": (1, "a"),
+            "set": {1, 2},
+            "decimal": decimal.Decimal("1.50"),
+            "uuid": uuid.uuid4(),
+            "datetime": datetime.datetime.now(datetime.timezone.utc),
+            "none": None,
+            1: [True, 2.5],
+        }
+        self.assertEqual(decode(encode(value)), value)
+        self.assertEqual(decode(encode("x" * 5000)), "x" * 5000)
+        self.assertEqual(decode("not encoded"), "not encoded")
+
+    def test_models_are_rehydrated_without_queries(self):
+        user = User.objects.get(pk=self.user.pk)
+        users = materialize(User.objects.filter(pk=self.user.pk))
+        user_data, users_data = encode(user), encode(users)
+        with CaptureQueriesContext(connection) as queries:
+            cached_user = decode(user_data)
+            cached_users = decode(users_data)
+            self.assertEqual(cached_user.pk, self.user.pk)
+            self.assertEqual(cached_user.first_name, "Ada")
+            self.assertEqual(cached_user.date_joined, user.date_joined)
+            self.assertEqual([cached.username for cached in cached_users], [self.user.username])
+        self.assertEqual(len(queries), 0)
+        self.assertTrue(cached_users.filter(first_name="Ada").exists())
@@ -0,0 +1,164 @@
+"""
+Request-scoped cancellation of long-running work.
+
+When a client disconnects, Django stops waiting for the response but any blocking
+work the view started, such as a SQL query on a customer database or an outbound
+HTTP request, keeps running until it finishes on its own. This module lets that
+work register a cancellation callback with the current request, and provides an
+ASGI wrapper that runs those callbacks as soon as the client disconnects.
+
+Usage
+=====
+
+.. code-block:: python
+
+    from smarter.lib.django.cancellation import cancel_on_disconnect
+
+    with cancel_on_disconnect(response.close):
+        for chunk in response.iter_content():
+            ...
+
+The request scope is stored in a :class:`contextvars.ContextVar`, which ``asgiref``
+copies into the worker thread of synchronous views, so the scope is visible from
+both sync and async code. Outside of a request (Celery tasks, management commands,
+unit tests) :func:`cancel_on_disconnect` is a no-op.
+"""
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from smarter.lib import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationScope:
+    """
+    A set of cancellation callbacks belonging to a single request.
+
+    Callbacks are invoked at most once, from whichever thread calls :meth:`cancel`.
+    A callback registered after the scope was cancelled is invoked immediately.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._next_id = 0
+        self.cancelled = False
+
+    def register(self, callback: Callable[[], None]) -> int:
+        """
+        Register a cancellation callback.
+
+        :param callback: A callable that takes no arguments.
+        :return: A handle that can be passed to :meth:`unregister`.
+        :rtype: int
+        """
+        with self._lock:
+            self._next_id += 1
+            handle = self._next_id
+            if not self.cancelled:
+                self._callbacks[handle] = callback
+                return handle
+        self._invoke(callback)
+        return handle
+
+    def unregister(self, handle: int) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    def cancel(self) -> None:
+        """Mark the scope as cancelled and invoke all registered callbacks."""
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            self._invoke(callback)
+
+    def _invoke(self, callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        # pylint: disable=W0718
+        except Exception as e:
+            logger.warning("CancellationScope.cancel() callback %s raised: %s", callback, e)
+
+
+_current_scope: ContextVar[Optional[CancellationScope]] = ContextVar("smarter_cancellation_scope", default=None)
+
+
+def current_cancellation_scope() -> Optional[CancellationScope]:
+    """Return the cancellation scope of the current request, if any."""
+    return _current_scope.get()
+
+
+@contextmanager
+def cancel_on_disconnect(callback: Callable[[], None]) -> Iterator[Optional[CancellationScope]]:
+    """
+    Invoke ``callback`` if the client disconnects while the ``with`` block is running.
+
+    :param callback: A callable that takes no arguments and interrupts the work in progress.
+    :return: The current cancellation scope, or None outside of a request.
+    """
+    scope = current_cancellation_scope()
+    if scope is None:
+        yield None
+        return
+    handle = scope.register(callback)
+    try:
+        yield scope
+    finally:
+        scope.unregister(handle)
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    ASGI middleware that cancels the request's :class:`CancellationScope` when the
+    client disconnects before the response has been sent.
+
+    :param app: The ASGI application to wrap.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        cancellation_scope = CancellationScope()
+        response_complete = False
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.disconnect" and not response_complete and not cancellation_scope.cancelled:
+                logger.debug("CancelOnDisconnectMiddleware() client disconnected from %s", scope.get("path"))
+                # callbacks may block on network I/O, so keep them off the event loop.
+                await asyncio.get_running_loop().run_in_executor(None, cancellation_scope.cancel)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        token = _current_scope.set(cancellation_scope)
+        try:
+            return await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            _current_scope.reset(token)
+
+
+__all__ = [
+    "CancellationScope",
+    "CancelOnDisconnectMiddleware",
+    "cancel_on_disconnect",
+    "current_cancellation_scope",
+]
@@ -19,6 +19,7 @@ from smarter.common.helpers.console_helpers import formatted_text
 from smarter.common.mixins import SmarterHelperMixin
 from smarter.lib import logging
 from smarter.lib.cache import cache_results
+from smarter.lib.cache.codec import materialize
 from smarter.lib.json import SmarterJSONEncoder
 from smarter.lib.logging import WaffleSwitchedLoggerWrapper
 
@@ -626,7 +627,7 @@ class TimestampedModel(models.Model, SmarterHelperMixin):
 
         @cache_results(timeout=cls.cache_expiration)
         def _get_all_models(class_name: str = cls.__name__) -> QuerySet["TimestampedModel"]:
-            retval = cls.objects.all()
+            retval = materialize(cls.objects.all())
             verbose_logger.debug(
                 "%s._get_all_models() fetched and cached all %s instances",
                 logger_prefix,
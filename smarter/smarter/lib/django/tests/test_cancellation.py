@@ -0,0 +1,69 @@
+"""Test request-scoped cancellation."""
+
+import asyncio
+
+from smarter.lib.django.cancellation import (
+    CancellationScope,
+    CancelOnDisconnectMiddleware,
+    cancel_on_disconnect,
+    current_cancellation_scope,
+)
+from smarter.lib.unittest.base_classes import SmarterTestBase
+
+
+class TestCancellation(SmarterTestBase):
+    """Test CancellationScope, cancel_on_disconnect() and CancelOnDisconnectMiddleware."""
+
+    def test_scope_cancel(self):
+        scope = CancellationScope()
+        calls = []
+        scope.register(lambda: calls.append("a"))
+        handle = scope.register(lambda: calls.append("b"))
+        scope.unregister(handle)
+        scope.cancel()
+        scope.cancel()
+        self.assertTrue(scope.cancelled)
+        self.assertEqual(calls, ["a"])
+
+        # callbacks registered after cancellation run immediately.
+        scope.register(lambda: calls.append("c"))
+        self.assertEqual(calls, ["a", "c"])
+
+    def test_cancel_on_disconnect_outside_request(self):
+        self.assertIsNone(current_cancellation_scope())
+        with cancel_on_disconnect(lambda: None) as scope:
+            self.assertIsNone(scope)
+
+    def test_middleware_cancels_on_disconnect(self):
+        calls = []
+
+        async def app(scope, receive, send):
+            with cancel_on_disconnect(lambda: calls.append("cancelled")):
+                await receive()
+                await receive()
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            pass
+
+        asyncio.run(CancelOnDisconnectMiddleware(app)({"type": "http", "path": "/"}, receive, send))
+        self.assertEqual(calls, ["cancelled"])
+
+    def test_middleware_ignores_disconnect_after_response(self):
+        calls = []
+
+        async def app(scope, receive, send):
+            with cancel_on_disconnect(lambda: calls.append("cancelled")):
+                await send({"type": "http.response.body", "body": b""})
+                await receive()
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            pass
+
+        asyncio.run(CancelOnDisconnectMiddleware(app)({"type": "http", "path": "/"}, receive, send))
+        self.assertEqual(calls, [])
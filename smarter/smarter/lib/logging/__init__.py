@@ -66,6 +66,7 @@ from .redis_log_handler import (
     build_channel,
     get_user_context,
     job_id_factory,
+    publish,
     user_id_context,
 )
 from .streaming_file_handler import StreamingFileHandler
@@ -77,6 +78,7 @@ __all__ = [
     "build_channel",
     "user_id_context",
     "job_id_factory",
+    "publish",
     "StreamingFileHandler",
     "RedisLogHandler",
     "GLOBAL_LOG_CHANNEL",
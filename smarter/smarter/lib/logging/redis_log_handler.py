@@ -81,6 +81,7 @@ import atexit
 import os
 import queue
 import threading
+import time
 import uuid
 from contextvars import ContextVar
 from typing import Any
@@ -426,10 +427,38 @@ class RedisLogHandler(logging.Handler):
             logger.exception("%s.emit() Failed to emit log record.", logger_prefix, exc_info=True)
 
 
+def publish(context: str, message: str, level: str = "INFO", **fields: Any) -> None:
+    """
+    Publish a message to the Redis log stream of ``context``, regardless of logger levels.
+
+    Used for progress reports of long running jobs, which the UI shows while
+    the job runs. Unlike :class:`RedisLogHandler`, the message is not also
+    published to the global log stream.
+
+    :param context: The logging context, e.g. a Celery job id. See :obj:`user_id_context`.
+    :param message: The message.
+    :param level: The log level name.
+    :param fields: Additional JSON-serializable fields of the payload, e.g. progress counters.
+    """
+    payload = {
+        "message": message,
+        "level": level,
+        "timestamp": time.time(),
+        "logger": __name__,
+        "pod": os.getenv("HOSTNAME"),
+        **fields,
+    }
+    try:
+        log_queue.put_nowait({"channel": build_channel(context), "data": json.dumps(payload)})
+    except queue.Full:
+        RedisLogHandler.dropped_logs += 1
+
+
 __all__ = [
     "get_user_context",
     "GLOBAL_LOG_CHANNEL",
     "user_id_context",
     "RedisLogHandler",
     "job_id_factory",
+    "publish",
 ]